@@ -24,7 +24,7 @@ import logging
 import os
 import json
 from frame.src.services.context.execution_context_service import ExecutionContext
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from frame.src.framer.brain.plugins.base import BasePlugin
 from frame.src.framer.agency.goals import Goal, GoalStatus
@@ -36,6 +36,8 @@ from frame.src.framer.brain.memory.memory_adapters.mem0_adapter.mem0_adapter imp
 )
 
 from frame.src.constants import MEM0_API_KEY
+from frame.src.services.llm.context_assembler import ContextAssembler
+from frame.src.services.llm.prompt_layout import PromptSection
 
 
 class Mem0SearchExtractSummarizePlugin(BasePlugin):
@@ -50,7 +52,7 @@ class Mem0SearchExtractSummarizePlugin(BasePlugin):
             )
         )
         self.logger.addHandler(handler)
-        
+
         # Try to load API key from config.json
         config_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
         try:
@@ -74,14 +76,14 @@ class Mem0SearchExtractSummarizePlugin(BasePlugin):
         except Exception as e:
             self.logger.error(f"Error loading config.json: {e}")
             api_key = os.getenv("MEM0_API_KEY", MEM0_API_KEY)
-            
+
         self.logger.info(f"Initializing Mem0Adapter with API key")
         self.mem0_adapter = Mem0Adapter(api_key=api_key)
 
     async def on_load(self, framer) -> None:
         # Store a reference to the framer
         self.framer = framer
-        
+
         # Check for the correct permission before registering the action
         if "with_mem0_search_extract_summarize_plugin" in framer.permissions:
             # Use the API key that was already loaded in the constructor
@@ -260,16 +262,14 @@ class Mem0SearchExtractSummarizePlugin(BasePlugin):
         # Filter search results by memory text (remove same text results)
         search_results = self.filter_search_results(search_results)
 
-        context = "\n".join(
-            [
-                result["content"]["memory"]
-                for result in search_results
-                if isinstance(result, dict)
-                and "content" in result
-                and isinstance(result["content"], dict)
-                and "memory" in result["content"]
-            ]
-        )
+        context = [
+            result["content"]["memory"]
+            for result in search_results
+            if isinstance(result, dict)
+            and "content" in result
+            and isinstance(result["content"], dict)
+            and "memory" in result["content"]
+        ]
         if not context:
             return "No relevant information found in Mem0."
 
@@ -282,27 +282,45 @@ class Mem0SearchExtractSummarizePlugin(BasePlugin):
         return summary
 
     async def summarize(
-        self, query: str, context: str, model_name: str, llm_service: Any
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        model_name: str,
+        llm_service: Any,
     ) -> str:
-        prompt = f"""
-        Given the following context and query, provide a comprehensive answer:
-
-        Context:
-        {context}
-
-        Query: {query}
-
-        Answer:
-        """
-
         if not llm_service:
             raise ValueError("LLM service is required but not provided")
 
+        # Search results come most relevant first, so the least relevant
+        # memories are dropped when they do not fit the model's budget.
+        budget = getattr(llm_service, "max_prompt_tokens", None)
+        assembler = ContextAssembler(
+            model_name,
+            max_tokens=1000,
+            budget=budget if isinstance(budget, int) else None,
+        )
+        assembler.add(
+            "instructions",
+            "Given the following context and query, provide a comprehensive answer:",
+            required=True,
+        )
+        assembler.add(
+            "memories", context, section=PromptSection.MEMORIES, header="Context:"
+        )
+        assembler.add(
+            "query",
+            f"Query: {query}\n\nAnswer:",
+            section=PromptSection.INPUT,
+            required=True,
+        )
+        prompt = (await assembler.assemble()).layout.text()
+
         response = await llm_service.get_completion(
             prompt,
             model=model_name,
             max_tokens=1000,
             temperature=0.5,
+            call_site="summarize",
         )
 
-        return response.strip()
\ No newline at end of file
+        return response.strip()
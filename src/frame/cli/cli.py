@@ -89,19 +89,9 @@ def cli(
     logging.getLogger().setLevel(logging.DEBUG if debug else logging.INFO)
 
 
-async def wait_for_streaming(framer):
-    last_position = 0
-    while framer._streamed_response["status"] != "finished":
-        new_text = framer._streamed_response["result"][last_position:]
-        if new_text:
-            print(new_text, end="", flush=True)
-            last_position += len(new_text)
-        await asyncio.sleep(0.1)  # Wait for streaming to complete
-    # Print any remaining text after status is finished
-    new_text = framer._streamed_response["result"][last_position:]
-    if new_text:
-        print(new_text, end="", flush=True)
-    return framer._streamed_response["result"]
+def print_stream_chunk(chunk: str) -> None:
+    """Print a chunk of a streamed response as soon as it arrives."""
+    print(chunk, end="", flush=True)
 
 
 async def execute_framer(frame, data, sync, stream):
@@ -173,8 +163,6 @@ async def execute_framer(frame, data, sync, stream):
                 )
             )
         logger.info(f"Execution completed. Result: {framer}")
-        if stream:
-            asyncio.create_task(wait_for_streaming(framer))
         return framer
     except Exception as e:
         logger.error(f"An error occurred during framer execution: {str(e)}")
@@ -415,6 +403,8 @@ async def run_async(
     )
     logger.info(f"Using model: {framer.config.default_model}")
     logger.debug(f"Prompt: {prompt}")
+    if stream:
+        framer.add_stream_observer(print_stream_chunk)
 
     try:
         logger.debug(f"Framer agency before generate_roles_and_goals: {framer.agency}")
@@ -427,7 +417,9 @@ async def run_async(
         # logger.info(f"Generated goals: {framer.agency.goals}")
 
         if prompt:
-            decision = await framer.prompt(prompt)
+            decision = await framer.prompt(prompt, stream=stream)
+            if stream:
+                print()
         else:
             if isinstance(perception, str):
                 perception = json.loads(perception)
@@ -445,7 +437,9 @@ async def run_async(
                 )
 
             perception_obj = Perception.from_dict(perception)
-            decision = await framer.sense(perception_obj)
+            decision = await framer.sense(perception_obj, stream=stream)
+            if stream:
+                print()
             if decision:
                 # Log the summary
                 logger.info("Execution Summary:")
@@ -500,8 +494,11 @@ async def run_async(
 
 async def stream_output(framer, prompt):
     """Stream the output from a Framer."""
-    async for chunk in framer.stream_completion(prompt):
-        print(chunk, end="", flush=True)
+    framer.add_stream_observer(print_stream_chunk)
+    try:
+        await framer.prompt(prompt, stream=True)
+    finally:
+        framer.remove_stream_observer(print_stream_chunk)
     print()  # Print a newline at the end
 
 
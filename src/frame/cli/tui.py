@@ -312,8 +312,18 @@ class FramerTUI(App):
             # Create a perception from the prompt
             perception_data = {"type": "input", "description": prompt}
 
-            # Use the Framer's sense method to process the perception
-            decision = await self.framer.sense(perception_data)
+            # Show the response as it streams in, then process the decision
+            streamed = []
+
+            def on_chunk(chunk: str) -> None:
+                streamed.append(chunk)
+                self.update_response("".join(streamed))
+
+            self.framer.add_stream_observer(on_chunk)
+            try:
+                decision = await self.framer.sense(perception_data, stream=True)
+            finally:
+                self.framer.remove_stream_observer(on_chunk)
 
             if decision:
                 self.update_response(f"Decision: {decision.action}")
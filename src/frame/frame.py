@@ -10,8 +10,19 @@ from .src.framed.framed_factory import FramedFactory
 from .src.constants.models import DEFAULT_MODEL
 from .src.framed.framed_factory import FramedBuilder
 from .src.framer.config import FramerConfig
-from .src.services.llm import LLMService
+from .src.services.llm import (
+    LLMService,
+    CompletionCache,
+    ClientRegistry,
+    ModelRouter,
+    RetryPolicy,
+    HedgePolicy,
+)
+from .src.services.llm.llm_adapters import ReplayAdapter
 from .src.utils.llm_utils import LLMMetrics, llm_metrics, track_llm_usage
+from .src.utils.metrics import FramerMetrics
+from .src.utils.openmetrics import MetricsServer
+from .src.utils.id_generator import generate_id
 from .src.utils.plugin_loader import load_plugins
 from .src.services.context.execution_context_service import ExecutionContext
 from .src.utils.plugin_loader import load_plugins
@@ -33,6 +44,7 @@ class Frame:
     5. Loading and managing plugins.
 
     Attributes:
+        name (str): Label of this Frame's metrics.
         _default_model (str): The default language model to use.
         llm_service (LLMService): The language model service instance.
         plugins_dir (str): The directory containing plugins.
@@ -50,6 +62,14 @@ class Frame:
         huggingface_api_key: str = "",
         default_model: str = DEFAULT_MODEL,
         plugins_dir: Optional[str] = None,
+        completion_cache: Optional[CompletionCache] = None,
+        client_registry: Optional[ClientRegistry] = None,
+        model_router: Optional[ModelRouter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        replay: Optional[ReplayAdapter] = None,
+        local_options: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
     ):
         """
         Initialize the Frame instance.
@@ -64,7 +84,17 @@ class Frame:
             huggingface_api_key (Optional[str]): API key for Hugging Face services.
             default_model (Optional[str]): The default language model to use.
             plugins_dir (Optional[str]): The directory containing plugins.
+            completion_cache (Optional[CompletionCache]): Cache for identical LLM requests. Disabled when None.
+            client_registry (Optional[ClientRegistry]): Pooled provider clients. A new registry is created when None.
+            model_router (Optional[ModelRouter]): Chooses models per call site. Calls use the requested model when None.
+            retry_policy (Optional[RetryPolicy]): Retry and circuit breaker settings. Defaults are used when None.
+            hedge_policy (Optional[HedgePolicy]): Duplicates slow LLM requests. Hedging is disabled when None.
+            replay (Optional[ReplayAdapter]): Serves "replay/<model>" models offline and records "record/<model>" calls.
+            local_options (Optional[Dict[str, Any]]): Options of the adapter running "local/<model>" models,
+                such as ``max_batch_size``, ``max_wait`` or ``num_threads``.
+            name (Optional[str]): Label of this Frame's metrics. A unique id is generated when None.
         """
+        self.name = name or generate_id()
         self._default_model = default_model
         # Initialize the language model service with provided API keys
         # Initialize the language model service with provided API keys
@@ -73,6 +103,14 @@ class Frame:
             mistral_api_key=mistral_api_key,
             huggingface_api_key=huggingface_api_key,
             default_model=self._default_model,
+            metrics=llm_metrics.scoped(self.name),
+            cache=completion_cache,
+            client_registry=client_registry,
+            router=model_router,
+            retry_policy=retry_policy,
+            hedge_policy=hedge_policy,
+            replay=replay,
+            local_options=local_options,
         )
         self.plugins_dir = plugins_dir or os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "plugins"
@@ -186,25 +224,41 @@ class Frame:
         """
         # Ensure 'stream' parameter is included with a default value of False
         kwargs.setdefault("stream", False)
-        model = kwargs.get("model", self.default_model)
-        result = await self.llm_service.get_completion(prompt, **kwargs)
+        # Token usage and cost are tracked by the LLM service.
+        return await self.llm_service.get_completion(prompt, **kwargs)
 
-        # Calculate tokens used (you may need to implement this based on your LLM service)
-        tokens_used = self.calculate_tokens_used(prompt, str(result))
+    def get_metrics(self, framer: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the current LLM usage and Framer metrics of this Frame.
 
-        track_llm_usage(model, tokens_used)
+        Args:
+            framer (Optional[str]): Only count calls made by this Framer. None counts every call.
 
-        return result
+        Returns:
+            A dictionary containing the call count and cost for each model,
+            as well as the total calls and total cost, along with the decision
+            rule, decision cache, mailbox and coalescing metrics of its Framers.
+        """
+        metrics = self.llm_service.get_metrics(framer)
+        metrics.update(
+            FramerMetrics.alongside(self.llm_service.metrics).get_metrics(framer)
+        )
+        return metrics
 
-    def get_metrics(self) -> Dict[str, Any]:
+    async def serve_metrics(
+        self, host: str = "127.0.0.1", port: int = 9464
+    ) -> MetricsServer:
         """
-        Get the current LLM usage metrics.
+        Serve LLM metrics in the OpenMetrics text format at ``/metrics``.
+
+        Args:
+            host (str): The interface to listen on. Defaults to localhost only.
+            port (int): The port to listen on. 0 picks a free port.
 
         Returns:
-            A dictionary containing the call count and cost for each model,
-            as well as the total calls and total cost.
+            MetricsServer: The running server. Call ``stop`` to shut it down.
         """
-        return self.llm_service.get_metrics()
+        return await MetricsServer(self.llm_service.metrics, host, port).start()
 
     def shut_down(self, save_state: bool = False, reset: bool = True):
         """
@@ -247,9 +301,9 @@ class Frame:
             if hasattr(plugin, "on_shutdown"):
                 plugin.on_shutdown()
 
-        # Implement any final cleanup or resource release
-        # if hasattr(self, 'llm_service') and hasattr(self.llm_service, 'close'):
-        #     self.llm_service.close()
+        # Release pooled provider clients and cached model interfaces
+        if hasattr(self, "llm_service") and hasattr(self.llm_service, "close"):
+            self.llm_service.close()
 
         logger.info("Frame has been shut down.")
 
@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional, Tuple, Union, TYPE_CHECKING
+import asyncio
 import json
 import logging
 import time
@@ -251,25 +252,16 @@ class Agency:
         result = await self._perform_task(task_obj)
         return result if result is not None else {"output": "No result returned"}
 
-    async def _perform_task(self, task: Task) -> Dict[str, Any]:
+    def _task_prompt(self, task: Task) -> str:
         """
-        Internal method to perform a task asynchronously.
+        Build the prompt used to execute a task.
 
         Args:
-            task (Task): Task object to be performed.
+            task (Task): The task to execute.
 
         Returns:
-            Dict[str, Any]: Result of the task execution.
+            str: The prompt.
         """
-        logger.debug(f"_perform_task called with task: {task.description}")
-        start_time = time.time()
-
-        if task.workflow_id not in self.completion_calls:
-            self.completion_calls[task.workflow_id] = {}
-        if task.id not in self.completion_calls[task.workflow_id]:
-            self.completion_calls[task.workflow_id][task.id] = 0
-
-        # Perform the task
         priority_explanation = """
         Priority levels are defined as follows:
         1 - LOWEST
@@ -293,6 +285,61 @@ class Agency:
 
         Consider the context and relevance of each task, and introduce some variability in your decision-making process.
         """
+        return prompt
+
+    async def perform_tasks(
+        self, tasks: List[Task], max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform several tasks concurrently with one batch of completions.
+
+        Tasks whose completion fails are marked as failed; the others are completed.
+
+        Args:
+            tasks (List[Task]): The tasks to perform.
+            max_concurrency (int): Maximum number of completions in flight at once.
+
+        Returns:
+            List[Dict[str, Any]]: The result of each task, in input order.
+        """
+        results = await self.llm_service.get_completions(
+            [self._task_prompt(task) for task in tasks],
+            max_concurrency=max_concurrency,
+            model=self.default_model,
+            max_tokens=200,
+            temperature=0.7,
+        )
+        outputs = []
+        for task, result in zip(tasks, results):
+            if result.ok:
+                task.update_status(TaskStatus.COMPLETED)
+                task.set_result(result.result)
+                outputs.append({"output": result.result})
+            else:
+                task.update_status(TaskStatus.FAILED)
+                outputs.append({"output": None, "error": str(result.error)})
+        return outputs
+
+    async def _perform_task(self, task: Task) -> Dict[str, Any]:
+        """
+        Internal method to perform a task asynchronously.
+
+        Args:
+            task (Task): Task object to be performed.
+
+        Returns:
+            Dict[str, Any]: Result of the task execution.
+        """
+        logger.debug(f"_perform_task called with task: {task.description}")
+        start_time = time.time()
+
+        if task.workflow_id not in self.completion_calls:
+            self.completion_calls[task.workflow_id] = {}
+        if task.id not in self.completion_calls[task.workflow_id]:
+            self.completion_calls[task.workflow_id][task.id] = 0
+
+        # Perform the task
+        prompt = self._task_prompt(task)
         response = await self.llm_service.get_completion(
             prompt,
             model=self.default_model,
@@ -333,7 +380,11 @@ class Agency:
         logger.debug(f"Role generation prompt: {prompt}")
         try:
             response = await self.llm_service.get_completion(
-                prompt, model=self.default_model, max_tokens=150, temperature=0.5
+                prompt,
+                model=self.default_model,
+                max_tokens=150,
+                temperature=0.5,
+                call_site="role_generation",
             )
             if isinstance(response, AsyncMock):
                 response = '{"id": "1", "name": "Assistant", "description": "Helps users", "permissions": [], "priority": 5, "status": "ACTIVE"}'
@@ -422,7 +473,11 @@ class Agency:
         logger.debug(f"Goal generation prompt: {prompt}")
         try:
             response = await self.llm_service.get_completion(
-                prompt, model=self.default_model, max_tokens=150, temperature=0.5
+                prompt,
+                model=self.default_model,
+                max_tokens=150,
+                temperature=0.5,
+                call_site="role_generation",
             )
             logger.debug(f"Goal generation response: {response}")
             if response is None:
@@ -492,8 +547,9 @@ class Agency:
         Returns:
             Tuple[List[Role], List[Goal]]: A tuple containing the final roles and goals.
         """
-        new_roles = await self.generate_roles()
-        new_goals = await self.generate_goals()
+        new_roles, new_goals = await asyncio.gather(
+            self.generate_roles(), self.generate_goals()
+        )
         if self.roles is None:
             roles = new_roles
         else:
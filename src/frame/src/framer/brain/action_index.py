@@ -0,0 +1,233 @@
+import json
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence
+
+# Actions every pruned manifest keeps, so the Brain can always answer or report a failure.
+MANDATORY_ACTIONS = ("respond", "error")
+
+# Pruned manifests kept per index; repeated perceptions tend to select the same actions.
+_MANIFEST_CACHE_SIZE = 64
+
+# Terms in an action's name count this many times its description terms.
+_NAME_WEIGHT = 2.0
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    """a an and any are as at be been but by can do for from has have if in into is it
+    its no not of on or so such than that the their then there these this to was were
+    will with you your we our i me my all also about only other some what when which
+    who how need needed use used using""".split()
+)
+
+
+def _stem(word: str) -> str:
+    # Just enough stemming for "brake", "brakes" and "braking" to meet.
+    if word.endswith("es") and word[:-2].endswith(("s", "x", "z", "ch", "sh")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        word = word[:-1]
+    else:
+        for suffix in ("ing", "ed"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[: -len(suffix)]
+                break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """
+    Split text into lowercase, lightly stemmed terms, without stopwords.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        List[str]: The terms, in order, with repeats.
+    """
+    return [
+        _stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS
+    ]
+
+
+def perception_terms(perception: Any) -> List[str]:
+    """
+    Get the terms of a perception: its type and source, and its data's keys and text values.
+
+    Args:
+        perception (Any): A Perception, or any object with ``type``, ``source`` and ``data``.
+
+    Returns:
+        List[str]: The perception's terms.
+    """
+    parts = [
+        str(getattr(perception, "type", "") or ""),
+        str(getattr(perception, "source", "") or ""),
+    ]
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                parts.append(str(key))
+                collect(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                collect(item)
+        elif isinstance(value, str):
+            parts.append(value)
+
+    collect(getattr(perception, "data", None) or {})
+    return terms(" ".join(parts))
+
+
+@dataclass(frozen=True)
+class IndexedAction:
+    """
+    An action with what the decision prompt and relevance ranking need, computed once.
+
+    Attributes:
+        name (str): The action name.
+        manifest (Dict[str, Any]): The action's entry in the decision prompt's manifest.
+        priority (int): The action priority, used to break relevance ties.
+        order (int): Position in the registry, used to break priority ties.
+        name_terms (FrozenSet[str]): Terms of the name.
+        description_terms (FrozenSet[str]): Terms of the description.
+    """
+
+    name: str
+    manifest: Dict[str, Any]
+    priority: int
+    order: int
+    name_terms: FrozenSet[str]
+    description_terms: FrozenSet[str]
+
+
+class ActionIndex:
+    """
+    Lexical index of a registry's actions, built once per registry version.
+
+    Each action's name and description are reduced to term sets, and every
+    term is weighted by its inverse document frequency across the actions,
+    so words most actions share, like "response", count for little. An
+    action's relevance to a perception is the weight of the terms they
+    share, with name terms counting double.
+
+    Attributes:
+        version (Any): The registry state the index was built from.
+        actions (Dict[str, IndexedAction]): The indexed actions, by name.
+    """
+
+    def __init__(self, actions: Dict[str, Dict[str, Any]], version: Any = None):
+        self.version = version
+        self.actions: Dict[str, IndexedAction] = {}
+        document_frequency: Counter = Counter()
+        for order, (name, info) in enumerate(actions.items()):
+            description = info.get("description", "") or ""
+            action = IndexedAction(
+                name=name,
+                manifest={
+                    "description": description,
+                    "expected_parameters": info.get("expected_parameters", []),
+                    "priority": info.get("priority"),
+                },
+                priority=int(info.get("priority") or 0),
+                order=order,
+                name_terms=frozenset(terms(name)),
+                description_terms=frozenset(terms(description)),
+            )
+            self.actions[name] = action
+            document_frequency.update(action.name_terms | action.description_terms)
+        count = len(self.actions)
+        self._idf = {
+            term: math.log(1 + count / frequency)
+            for term, frequency in document_frequency.items()
+        }
+        self._manifests: "OrderedDict[tuple, str]" = OrderedDict()
+
+    def score(self, query: Iterable[str]) -> Dict[str, float]:
+        """
+        Score every action against query terms.
+
+        Args:
+            query (Iterable[str]): Terms from ``terms`` or ``perception_terms``.
+
+        Returns:
+            Dict[str, float]: Relevance by action name. Zero means no shared terms.
+        """
+        query = set(query)
+        return {
+            name: sum(
+                self._idf[term] * (_NAME_WEIGHT if term in action.name_terms else 1.0)
+                for term in query & (action.name_terms | action.description_terms)
+            )
+            for name, action in self.actions.items()
+        }
+
+    def top_k(
+        self,
+        query: Iterable[str],
+        k: int,
+        mandatory: Sequence[str] = MANDATORY_ACTIONS,
+    ) -> List[str]:
+        """
+        Get the names of the ``k`` most relevant actions plus the mandatory ones.
+
+        Ties, including actions that share no terms with the query, go to the
+        higher-priority action, then to the one registered first.
+
+        Args:
+            query (Iterable[str]): The query terms.
+            k (int): Number of actions to rank in, besides the mandatory ones.
+            mandatory (Sequence[str]): Actions always included when registered.
+
+        Returns:
+            List[str]: The ranked names, most relevant first, then the mandatory ones.
+        """
+        scores = self.score(query)
+        ranked = sorted(
+            (name for name in self.actions if name not in mandatory),
+            key=lambda name: (
+                -scores[name],
+                -self.actions[name].priority,
+                self.actions[name].order,
+            ),
+        )
+        return ranked[: max(k, 0)] + [
+            name for name in mandatory if name in self.actions
+        ]
+
+    def manifest(self, names: Iterable[str]) -> str:
+        """
+        Serialize the manifest entries of some actions, in registry order.
+
+        The same set of actions always gives the same string, so prompts that
+        select the same actions keep sharing a prefix.
+
+        Args:
+            names (Iterable[str]): The action names. Unknown names are skipped.
+
+        Returns:
+            str: The actions as indented JSON.
+        """
+        key = tuple(
+            sorted(
+                {name for name in names if name in self.actions},
+                key=lambda name: self.actions[name].order,
+            )
+        )
+        manifest = self._manifests.get(key)
+        if manifest is None:
+            manifest = json.dumps(
+                {name: self.actions[name].manifest for name in key}, indent=2
+            )
+            self._manifests[key] = manifest
+            while len(self._manifests) > _MANIFEST_CACHE_SIZE:
+                self._manifests.popitem(last=False)
+        else:
+            self._manifests.move_to_end(key)
+        return manifest
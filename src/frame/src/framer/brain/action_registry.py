@@ -1,7 +1,13 @@
 import asyncio
+import inspect
 import logging
 import json
-from typing import Dict, Any, Callable, Optional, TYPE_CHECKING, Union, List
+from typing import Dict, Any, Callable, Optional, TYPE_CHECKING, Union, List, Sequence
+from frame.src.framer.brain.action_index import (
+    MANDATORY_ACTIONS,
+    ActionIndex,
+    perception_terms,
+)
 from frame.src.framer.brain.actions import BaseAction
 from frame.src.framer.brain.actions.error import ErrorAction
 
@@ -30,6 +36,10 @@ class ActionRegistry:
     def __init__(self, execution_context: Optional["ExecutionContext"] = None):
         self.valid_actions = []
         self.actions: Dict[str, Dict[str, Any]] = {}
+        # Bumped whenever actions are added or removed, so cached views can be invalidated.
+        self.version = 0
+        self._valid: Optional[tuple] = None
+        self._index: Optional[ActionIndex] = None
         self.execution_context = execution_context
         if not self.execution_context or not hasattr(
             self.execution_context, "llm_service"
@@ -156,6 +166,7 @@ class ActionRegistry:
             "priority": priority,
             "expected_parameters": expected_parameters or [],
         }
+        self.version += 1
         if not callable(action_func):
             raise ValueError(f"Action function for '{name}' must be callable.")
         if name not in self.valid_actions:
@@ -172,6 +183,7 @@ class ActionRegistry:
         try:
             if name in self.actions:
                 action = self.actions.pop(name, None)
+                self.version += 1
                 if plugin and hasattr(plugin, "on_remove"):
                     await plugin.on_remove()
                 if name in self.valid_actions:
@@ -194,11 +206,63 @@ class ActionRegistry:
         """
         return self.actions.get(name)
 
+    def _state(self) -> tuple:
+        # Actions and valid_actions may also be replaced or edited directly.
+        return (
+            self.version,
+            id(self.actions),
+            id(self.valid_actions),
+            len(self.valid_actions),
+        )
+
     def get_all_actions(self) -> Dict[str, Dict[str, Any]]:
         """
         Return all actions in the registry that are also in self.valid_actions.
+
+        The dict is rebuilt only when the registry changes, so it must not be modified.
+        """
+        if self._valid is None or self._valid[0] != self._state():
+            valid = set(self.valid_actions)
+            self._valid = (
+                self._state(),
+                {k: v for k, v in self.actions.items() if k in valid},
+            )
+        return self._valid[1]
+
+    def action_index(self) -> ActionIndex:
+        """
+        Get the index of the valid actions, rebuilding it if the registry changed.
+
+        Returns:
+            ActionIndex: The actions with their manifest entries and term signatures.
+        """
+        state = self._state()
+        if self._index is None or self._index.version != state:
+            self._index = ActionIndex(self.get_all_actions(), version=state)
+        return self._index
+
+    def top_k_actions(
+        self,
+        perception: Any,
+        k: int,
+        mandatory: Sequence[str] = MANDATORY_ACTIONS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the actions most relevant to a perception, plus the mandatory ones.
+
+        Actions are ranked by the terms their name and description share with
+        the perception's type, source and data, weighted so rare terms count most.
+
+        Args:
+            perception (Any): The perception, with ``type``, ``source`` and ``data``.
+            k (int): Number of actions to rank in, besides the mandatory ones.
+            mandatory (Sequence[str]): Actions always included when registered.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The selected actions, most relevant first.
         """
-        return {k: v for k, v in self.actions.items() if k in self.valid_actions}
+        names = self.action_index().top_k(perception_terms(perception), k, mandatory)
+        return {name: self.actions[name] for name in names}
 
     async def perform_action(
         self,
@@ -275,7 +339,8 @@ class ActionRegistry:
                 }
             elif isinstance(_result, dict):
                 result = _result if "response" in _result else {"response": _result}
-            elif isinstance(_result, (str, list)):
+            elif isinstance(_result, (str, list)) or inspect.isasyncgen(_result):
+                # Async generators are streamed responses; pass them through unconsumed.
                 result = {"response": _result}
             else:
                 result = {"response": str(_result)}
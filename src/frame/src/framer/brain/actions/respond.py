@@ -1,9 +1,26 @@
-from typing import Dict, Any
+import inspect
+from typing import Any, Dict, List
 from frame.src.services import ExecutionContext
 from frame.src.framer.brain.actions import BaseAction
 from frame.src.framer.agency.priority import Priority
+from frame.src.services.llm.context_assembler import ContextAssembler
+from frame.src.services.llm.prompt_layout import PromptSection
 from frame.src.utils.decorators import log_execution, measure_performance
 
+_INTRODUCTION = "As an AI assistant with the following characteristics:"
+
+_INSTRUCTIONS = """Please generate a response that takes into account all of the above information,
+with particular emphasis on addressing the given input.
+
+Response:"""
+
+
+def _entries(values: Any) -> List[str]:
+    """Turn a list of memories or perceptions into prompt entries."""
+    if isinstance(values, str):
+        return [values]
+    return [str(value) for value in values or []]
+
 
 class RespondAction(BaseAction):
     def __init__(self):
@@ -26,7 +43,8 @@ class RespondAction(BaseAction):
             **kwargs: Additional keyword arguments that might be passed to the action.
 
         Returns:
-            Dict[str, Any]: A dictionary containing the generated response.
+            Dict[str, Any]: A dictionary containing the generated response, which is
+            an async generator of text chunks when the "stream" state is set.
         """
         if isinstance(execution_context, ExecutionContext):
             llm_service = execution_context.llm_service
@@ -54,28 +72,53 @@ class RespondAction(BaseAction):
         # Get the content from kwargs if provided, otherwise use recent_perception
         content = kwargs.get("content", recent_perception)
 
-        # Construct the prompt
-        prompt = f"""
-        As an AI assistant with the following characteristics:
-        
-        Roles: {roles}
-        Goals: {goals}
-        Soul: {soul_state}
-        
-        Recent memories: {recent_memories}
-        Recent perceptions: {recent_perceptions}
-        
-        You are responding to the following input:
-        {content}
-        
-        Please generate a response that takes into account all of the above information, 
-        with particular emphasis on addressing the given input.
-        
-        Response:
-        """
+        # Fit the context into the model's budget, cutting old memories and
+        # perceptions before the soul, roles and goals. The input is never cut.
+        model = getattr(llm_service, "default_model", None)
+        budget = getattr(llm_service, "max_prompt_tokens", None)
+        assembler = ContextAssembler(
+            model if isinstance(model, str) else None,
+            max_tokens=1024,
+            budget=budget if isinstance(budget, int) else None,
+        )
+        assembler.add("introduction", _INTRODUCTION, required=True)
+        assembler.add("roles", f"Roles: {roles}", priority=4)
+        assembler.add("goals", f"Goals: {goals}", priority=4)
+        assembler.add("soul", f"Soul: {soul_state}", priority=3)
+        assembler.add(
+            "perceptions",
+            _entries(recent_perceptions),
+            priority=2,
+            section=PromptSection.MEMORIES,
+            keep="end",
+            header="Recent perceptions:",
+        )
+        assembler.add(
+            "memories",
+            _entries(recent_memories),
+            priority=1,
+            section=PromptSection.MEMORIES,
+            keep="end",
+            header="Recent memories:",
+        )
+        assembler.add(
+            "input",
+            f"You are responding to the following input:\n{content}\n\n{_INSTRUCTIONS}",
+            section=PromptSection.INPUT,
+            required=True,
+        )
+        prompt = (await assembler.assemble()).layout.text()
 
-        # Get the completion from the language model
-        response = await llm_service.get_completion(prompt)
+        # Stream the completion when the caller asked for it; the Framer forwards
+        # the chunks to its stream observers as they arrive.
+        if execution_context.get_state("stream", False):
+            response = await llm_service.get_completion(
+                prompt, stream=True, call_site="respond"
+            )
+            if inspect.isasyncgen(response):
+                return {"response": response}
+        else:
+            response = await llm_service.get_completion(prompt, call_site="respond")
 
         if response is None:
             return {"response": "No response generated."}
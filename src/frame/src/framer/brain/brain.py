@@ -1,8 +1,11 @@
 import json
 import logging
 import re
+import time
 from typing import Any, Dict, List, Optional, Union, Callable, TYPE_CHECKING
 
+from pydantic import ValidationError
+
 logger = logging.getLogger(__name__)
 
 from frame.src.utils.llm_utils import get_llm_provider
@@ -24,8 +27,20 @@ if TYPE_CHECKING:
 from frame.src.framer.soul import Soul
 from frame.src.framer.brain.memory import Memory
 from frame.src.framer.brain.mind import Mind
-from frame.src.framer.brain.mind.perception import Perception
+from frame.src.framer.brain.mind.perception import FeatureExtractor, Perception
+from frame.src.framer.brain.action_index import MANDATORY_ACTIONS
 from frame.src.framer.brain.action_registry import ActionRegistry
+from frame.src.framer.brain.decision_prompt import DecisionPromptTemplate
+from frame.src.framer.brain.decision.decision_cache import DecisionCache
+from frame.src.framer.brain.decision.decision_output import (
+    DECISION_OUTPUT,
+    DecisionOutput,
+    parse_decision_output,
+)
+from frame.src.framer.brain.rules import RuleEngine, Ruleset
+from frame.src.services.llm.model_router import ModelRouter
+from frame.src.services.llm.prompt_layout import PromptSection
+from frame.src.utils.metrics import FramerMetrics
 from frame.src.framer.config import FramerConfig
 
 logger = logging.getLogger(__name__)
@@ -63,6 +78,11 @@ class Brain:
         mind (Mind): The Mind instance for cognitive processing.
         memory_service (Optional[MemoryService]): The memory service for storing and retrieving information.
         action_registry (ActionRegistry): Registry of available actions.
+        ruleset (Ruleset): Decision rules checked before the language model, along with plugin rules.
+        decision_cache (Optional[DecisionCache]): Reuses decisions for repeated perceptions, or None to always decide anew.
+        max_prompt_actions (Optional[int]): Most relevant actions listed in decision prompts, besides the
+            mandatory ones, or None to list every action.
+        metrics (FramerMetrics): Where decision rule and decision cache metrics are recorded.
 
     The Brain class serves as the cognitive core of the Framer, coordinating various components
     to enable intelligent decision-making and action execution.
@@ -77,6 +97,10 @@ class Brain:
         goals: List[Dict[str, Any]] = [],
         default_model: str = "gpt-3.5-turbo",
         soul: Optional[Soul] = None,
+        decision_cache: Optional[DecisionCache] = None,
+        max_prompt_actions: Optional[int] = None,
+        feature_extractor: Optional[FeatureExtractor] = None,
+        metrics: Optional[FramerMetrics] = None,
     ):
         """
         Initialize the Brain with the necessary components.
@@ -89,6 +113,11 @@ class Brain:
             goals (List[Dict[str, Any]]): Initial goals for the Brain.
             default_model (str): The default language model to use.
             soul (Optional[Soul]): The Soul instance for the Brain.
+            decision_cache (Optional[DecisionCache]): Cache of decisions for repeated perceptions.
+            max_prompt_actions (Optional[int]): Most relevant actions to list in decision prompts.
+            feature_extractor (Optional[FeatureExtractor]): Summarizes numeric sensor data before deciding.
+            metrics (Optional[FramerMetrics]): Where decision metrics are recorded. None records
+                them next to the LLM service's metrics.
         """
         self.logger = logging.getLogger(__name__)
         self.llm_service = llm_service
@@ -112,6 +141,20 @@ class Brain:
 
         self.mind = Mind(self)
         self.action_registry = ActionRegistry(execution_context=self.execution_context)
+        self.roles_version = 0
+        self.goals_version = 0
+        self.decision_prompt = DecisionPromptTemplate(self.action_registry)
+        self.ruleset = Ruleset()
+        self.decision_cache = decision_cache
+        self.max_prompt_actions = max_prompt_actions
+        self.feature_extractor = feature_extractor
+        self.metrics = (
+            metrics
+            if metrics is not None
+            else FramerMetrics.alongside(getattr(llm_service, "metrics", None))
+        )
+        self._rule_engine: Optional[RuleEngine] = None
+        self._rule_versions: Optional[tuple] = None
         if not isinstance(self.execution_context, ExecutionContext):
             raise TypeError("execution_context must be an instance of ExecutionContext")
 
@@ -270,6 +313,33 @@ class Brain:
                 "priority": 1,
             }
 
+    def _decision_output(self, response: Any) -> Union[DecisionOutput, Dict[str, Any]]:
+        """
+        Turn a decision response into a DecisionOutput.
+
+        Responses from structured output mode are already DecisionOutput objects
+        and are returned as they are. Anything else goes through
+        ``parse_json_response`` first.
+
+        Args:
+            response (Any): The response from the LLM service.
+
+        Returns:
+            Union[DecisionOutput, Dict[str, Any]]: The decision, or a dict with an
+            ``error`` key if the response reports an error.
+        """
+        if isinstance(response, DecisionOutput):
+            return response
+        decision_data = self.parse_json_response(response)
+        if not isinstance(decision_data, dict):
+            return DecisionOutput(action="no_action")
+        if "error" in decision_data:
+            return decision_data
+        try:
+            return parse_decision_output(decision_data)
+        except ValidationError as e:
+            return {"error": f"Invalid decision: {e}"}
+
     def set_roles(self, roles: List["Role"]) -> None:
         """
         Set the roles for the Agency.
@@ -278,14 +348,102 @@ class Brain:
             roles (List[Role]): List of Role objects to set.
         """
         self.roles = roles
+        self.roles_version += 1
         self.execution_context.set_roles(roles)
 
+    def set_goals(self, goals: List["Goal"]) -> None:
+        """
+        Set the goals for the Brain.
+
+        Args:
+            goals (List[Goal]): List of Goal objects to set.
+        """
+        if goals != self.goals:
+            self.goals_version += 1
+        self.goals = goals
+        self.execution_context.set_goals(goals)
+
+    def _rulesets(self) -> List[Ruleset]:
+        rulesets = [self.ruleset]
+        plugins = getattr(getattr(self, "framer", None), "plugins", None)
+        if isinstance(plugins, dict):
+            rulesets.extend(
+                plugin.ruleset
+                for plugin in plugins.values()
+                if isinstance(getattr(plugin, "ruleset", None), Ruleset)
+            )
+        return rulesets
+
+    def _compiled_rules(self) -> RuleEngine:
+        # Recompile only when a ruleset gained rules or a plugin came or went.
+        rulesets = self._rulesets()
+        versions = tuple((id(ruleset), ruleset.version) for ruleset in rulesets)
+        if self._rule_engine is None or versions != self._rule_versions:
+            self._rule_engine = RuleEngine(
+                rule for ruleset in rulesets for rule in ruleset.rules
+            )
+            self._rule_versions = versions
+        return self._rule_engine
+
+    def decide_by_rules(self, perception: Perception) -> Optional["Decision"]:
+        """
+        Decide on a perception with the decision rules, without the language model.
+
+        Rules from the Brain's ruleset and from every plugin's ruleset are
+        compiled into a ``RuleEngine``, so the perception is only checked
+        against the rules its type and field values select. Hits, misses and
+        evaluation time are recorded in the Brain's metrics.
+
+        Args:
+            perception (Perception): The perception to decide on.
+
+        Returns:
+            Optional[Decision]: The decision of the first matching rule, or None if no rule decided.
+        """
+        engine = self._compiled_rules()
+        if not engine.size:
+            return None
+        start = time.perf_counter()
+        match = engine.decide(perception)
+        elapsed = time.perf_counter() - start
+        self.metrics.record_rule(match[0].name if match else None, elapsed)
+        if match is None:
+            return None
+        rule, decision = match
+        logger.info(
+            f"Rule '{rule.name}' decided on {perception.type} perception: {decision}"
+        )
+        return decision
+
+    def _decision_cache_key(self, perception: Perception) -> Optional[str]:
+        if self.decision_cache is None:
+            return None
+        fingerprint = DecisionCache.fingerprint(
+            (
+                role
+                for role in self.roles
+                if getattr(role, "status", RoleStatus.ACTIVE) == RoleStatus.ACTIVE
+            ),
+            (
+                goal
+                for goal in self.goals
+                if getattr(goal, "status", GoalStatus.ACTIVE) == GoalStatus.ACTIVE
+            ),
+            self.action_registry.version,
+        )
+        return self.decision_cache.make_key(perception, fingerprint)
+
+    def _record_decision_cache(self, perception_type: str, hit: bool) -> None:
+        self.metrics.record_decision_cache(perception_type, hit)
+
     @log_execution
     @measure_performance
     async def process_perception(
         self,
         perception: Union["Perception", Dict[str, Any]],
         goals: Optional[List["Goal"]] = None,
+        decision: Optional["Decision"] = None,
+        execute: bool = True,
     ) -> "Decision":
         """
         Process a perception and make a decision based on it.
@@ -293,14 +451,17 @@ class Brain:
         Args:
             perception (Union['Perception', Dict[str, Any]]): The perception to process.
             goals (Optional[List[Goal]]): List of Goal objects to set.
+            decision (Optional[Decision]): A decision already made for the perception, e.g. while
+                other perceptions were processed. None makes one with ``make_decision``.
+            execute (bool): Whether to execute the decision once the Framer can execute.
+                The Framer passes False, as it executes the decisions it senses itself.
 
         Returns:
             Decision: The decision made based on the perception.
         """
 
         if goals is not None:
-            self.goals = goals
-            self.execution_context.set_goals(goals)
+            self.set_goals(goals)
 
         # Convert perception to Perception object if it is a dictionary
         if isinstance(perception, dict):
@@ -314,7 +475,10 @@ class Brain:
         available_actions = self.action_registry.get_all_actions().keys()
         self.logger.debug(f"Processing perception: {perception}")
         self.logger.debug(f"Avaliable actions: {available_actions}")
-        decision = await self.make_decision(perception)
+        if decision is None:
+            decision = await self.make_decision(perception)
+        if not execute:
+            return decision
         if hasattr(self, "framer") and getattr(self.framer, "can_execute", False):
             if decision is None:
                 self.logger.warning("No decision was made for the given perception.")
@@ -367,6 +531,24 @@ class Brain:
                 related_goals=[],
             )
 
+        # Raw sensor arrays become rolling statistics for the rules and the prompt
+        if self.feature_extractor is not None:
+            perception = self.feature_extractor.extract(perception)
+
+        # Rules answer perceptions that cannot wait for a model round-trip
+        decision = self.decide_by_rules(perception)
+        if decision is not None:
+            return decision
+
+        # Repeated perceptions reuse the decision made the first time
+        cache_key = self._decision_cache_key(perception)
+        if cache_key is not None:
+            decision = self.decision_cache.get(cache_key)
+            self._record_decision_cache(perception.type, decision is not None)
+            if decision is not None:
+                logger.debug(f"Reusing cached decision: {decision}")
+                return decision
+
         # Get a decision prompt based on the current perception
         response = await self._get_decision_prompt(perception)
 
@@ -382,16 +564,30 @@ class Brain:
                 related_goals=[],
             )
 
-        # Parse the response from the LLM service to extract decision data
-        decision_data = self.parse_json_response(response)
+        # Structured responses arrive already parsed; others are parsed here once
+        output = self._decision_output(response)
 
-        logger.debug(f"Decision data received: {decision_data}")
+        # Ask a larger model when a routed decision comes back uncertain
+        router = getattr(self.llm_service, "router", None)
+        if (
+            isinstance(router, ModelRouter)
+            and isinstance(output, DecisionOutput)
+            and router.should_escalate(output.confidence)
+        ):
+            logger.info("Low-confidence decision, escalating to a larger model")
+            escalated = self._decision_output(
+                await self._get_decision_prompt(perception, escalate=True)
+            )
+            if isinstance(escalated, DecisionOutput):
+                output = escalated
 
-        if isinstance(decision_data, dict) and "error" in decision_data:
-            logger.error(f"Error in decision making: {decision_data['error']}")
+        logger.debug(f"Decision data received: {output}")
+
+        if not isinstance(output, DecisionOutput):
+            logger.error(f"Error in decision making: {output['error']}")
             return Decision(
                 action="error",
-                parameters={"error": decision_data["error"]},
+                parameters={"error": output["error"]},
                 reasoning="Error occurred during decision making",
                 confidence=0.0,
                 priority=1,
@@ -399,38 +595,15 @@ class Brain:
                 related_goals=[],
             )
 
-        # Use default action 'respond' if no action is provided
-        try:
-            action = decision_data.get("action", "respond")
-        except:
-            action = "no_action"
-        valid_actions = [
-            str(action).lower()
-            for action in self.action_registry.get_all_actions().keys()
-        ]
-
         # Retrieve context from the execution context
         # If the context indicates high urgency and risk, choose an adaptive decision
         context = self.execution_context.get_full_state()
         # Determine the best action based on context
         if context.get("urgency", 0) > 7 and context.get("risk", 0) > 5:
-            action = "adaptive_decision"
-            decision_data["action"] = action
-            decision_data["reasoning"] = (
-                f"High urgency and risk detected. Using '{action}' to adaptively decide the best course of action."
-            )
+            output.action = "adaptive_decision"
+            output.reasoning = f"High urgency and risk detected. Using '{output.action}' to adaptively decide the best course of action."
 
-        logger.info(f"Decision made: {decision_data}")
-
-        # Merge perception data into parameters
-        parameters = decision_data.get("parameters", {})
-        if not isinstance(parameters, dict):
-            parameters = {}
-        if perception and perception.data:
-            # Ensure that perception data is considered
-            parameters = {**perception.data, **parameters}
-
-        reasoning = decision_data.get("reasoning", "No reasoning provided.")
+        logger.info(f"Decision made: {output}")
 
         # Check if goals are None and generate them if necessary
         # This ensures that the decision-making process has relevant goals to consider
@@ -447,50 +620,19 @@ class Brain:
             for goal in self.execution_context.get_goals()
             if goal.status == GoalStatus.ACTIVE
         ]
-        roles_priority = max(
-            [role.priority for role in active_roles], default=Priority.MEDIUM
-        )
-        goals_priority = max(
-            [goal.priority for goal in active_goals], default=Priority.MEDIUM
-        )
-        
-        # Ensure priority is a Priority enum
-        priority_value = decision_data.get("priority", Priority.MEDIUM)
-        try:
-            if isinstance(priority_value, str):
-                priority_enum = Priority[priority_value.upper()]
-            elif isinstance(priority_value, int):
-                priority_enum = Priority(priority_value)
-            elif isinstance(priority_value, Priority):
-                priority_enum = priority_value
-            else:
-                raise ValueError(f"Unexpected priority type: {type(priority_value)}")
-        except (KeyError, ValueError) as e:
-            logger.error(f"Invalid priority: {priority_value}. Error: {e}")
-            priority_enum = Priority.MEDIUM
-
-        priority_int = priority_enum.value
 
         # Convert related_roles and related_goals to Role and Goal instances
         related_roles = [
-            role
-            for role in active_roles
-            if role.name in decision_data.get("related_roles", [])
+            role for role in active_roles if role.name in output.related_roles
         ]
         related_goals = [
-            goal
-            for goal in active_goals
-            if goal.name in decision_data.get("related_goals", [])
+            goal for goal in active_goals if goal.name in output.related_goals
         ]
 
-        # Ensure parameters is a dictionary
-        parameters = decision_data.get("parameters", {})
-        if not isinstance(parameters, dict):
-            parameters = {}
+        parameters = output.parameters
 
         # Ensure parameters includes the query and execution context for memory retrieval
-        if decision_data.get("action") == "respond with memory retrieval":
-            parameters = {} if isinstance(parameters, list) else parameters
+        if output.action == "respond with memory retrieval":
             if perception and perception.data:
                 parameters.update(
                     {
@@ -504,124 +646,80 @@ class Brain:
                 parameters["user_id"] = parameters.get("user_id", DEFAULT_USER_ID)
 
         decision = Decision(
-            action=decision_data.get("action", "respond"),
+            action=output.action,
             parameters=parameters,
-            reasoning=decision_data.get("reasoning", "No reasoning provided."),
-            confidence=float(decision_data.get("confidence", 0.5)),
-            priority=priority_int,
+            reasoning=output.reasoning,
+            confidence=output.confidence,
+            priority=output.priority,
             related_roles=related_roles,
             related_goals=related_goals,
         )
-        
+
         logger.info(f"Final decision object: {decision}")
-        
+
         if hasattr(decision, "reasoning"):
             decision.reasoning += f" (Aligned with {len(active_goals)} active goals)"
         else:
             logger.error("Decision object does not have a 'reasoning' attribute.")
-            
+
         decision.result = decision.parameters.get("response_content", None)
+        if cache_key is not None:
+            self.decision_cache.set(cache_key, perception.type, decision)
         return decision
 
-    async def _get_decision_prompt(self, perception: Optional[Perception]) -> str:
+    async def _get_decision_prompt(
+        self, perception: Optional[Perception], escalate: bool = False
+    ) -> str:
         """
         Generate a decision prompt based on the current perception and context.
 
         Args:
             perception (Optional[Perception]): The current perception.
+            escalate (bool): Whether a model router should skip its cheapest model.
 
         Returns:
             str: The generated decision prompt.
         """
         valid_actions = self.action_registry.get_all_actions()
-        logger.debug(f"Valid actions: {valid_actions}")
-
-        active_roles = [
-            f"{role.name} (Priority: {role.priority}, Status: {role.status.name})"
-            for role in self.roles
-            if role.status == RoleStatus.ACTIVE
-        ]
-        active_goals = [
-            f"{goal.name} (Priority: {goal.priority}, Status: {goal.status.name})"
-            for goal in self.goals
-            if goal.status == GoalStatus.ACTIVE
-        ]
-
-        prompt = f"""Given the following perception and context, decide on the most appropriate action to take.
-        Perception: {perception}
-        Perception Data: {perception.data}
-        
-        Current active roles:
-        {json.dumps(active_roles, indent=2)}
-        
-        Current active goals:
-        {json.dumps(active_goals, indent=2)}
-
-        Valid actions are:
-        {json.dumps({action_name: {"description": action_info["description"], "expected_parameters": action_info.get("expected_parameters", []), "priority": action_info["priority"]} for action_name, action_info in self.action_registry.actions.items()}, indent=2)}
-        
-        For each perception, carefully evaluate:
-        - The type and content of the perception
-        - The urgency and importance of the information
-        - The current active goals and roles of the system, considering their priorities and statuses
-        - Whether immediate action, further research, or no action is most appropriate
-
-        Examples of personal/memory questions (ALWAYS use 'respond with memory retrieval' for these):
-        - "What is my favorite hobby?" (contains "my" and asks about personal preference)
-        - "When is my next meeting?" (contains "my" and asks about personal schedule)
-        - "What did I mention about..." (contains "I" and refers to past conversation)
-
-        Examples of general knowledge questions (Use 'respond' for basic facts an AI would know):
-        - "What is the largest ocean on Earth?" (basic geography)
-        - "How many planets are in the solar system?" (basic science)
-        - "What is the boiling point of water?" (common knowledge)
-        - "What is the capital of France?" (basic geography)
-
-        Only use 'research' for complex topics requiring detailed investigation or verification, like:
-        - "What are the latest developments in quantum computing?"
-        - "How has climate change affected migration patterns in Arctic birds?"
-        - "What are the economic implications of recent policy changes?"
-
-        IMPORTANT: ONLY use 'respond with memory retrieval' for questions that:
-        1. Contain personal pronouns like "my", "I", "we"
-        2. Ask about personal preferences, schedules, or past conversations
-        3. Request information specific to the user
-
-        For general knowledge, facts, or objective information, ALWAYS use 'respond'.
-
-        Priority levels and their meanings:
-        from frame.src.framer.agency.priority import Priority
-
-        {json.dumps({p.name: p.value for p in Priority}, indent=2)}
-
-        Respond with a JSON object containing the following fields:
-        - action: The action to take (must be EXACTLY one of the valid action names listed above)
-        - parameters: Any relevant parameters for the action (e.g., new roles, goals, tasks, research topic, or response content)
-        - reasoning: Your reasoning for this decision, including how it aligns with current roles and goals
-        - confidence: A float between 0 and 1 indicating your confidence in this decision
-        - priority: A string representing the priority level (e.g., "LOW", "MEDIUM", "HIGH", "CRITICAL") or an integer between 1 and 10 based on the urgency and importance of the action
-        - related_roles: A list of role names that are most relevant to this decision
-        - related_goals: A list of goal names that are most relevant to this decision
-
-        Ensure your decision is well-reasoned, aligns with the current active goals and roles (considering their priorities), and uses only the valid actions provided.
-        Use the provided priority levels when assigning priority to your decision, taking into account the priorities of related roles and goals.
-        """
+        actions = None
+        # Large registries list only the actions relevant to this perception
+        if (
+            perception is not None
+            and isinstance(self.max_prompt_actions, int)
+            and len(valid_actions) > self.max_prompt_actions + len(MANDATORY_ACTIONS)
+        ):
+            valid_actions = self.action_registry.top_k_actions(
+                perception, self.max_prompt_actions
+            )
+            actions = list(valid_actions)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Valid actions: {valid_actions}")
+
+        layout = self.decision_prompt.layout(
+            perception,
+            roles=self.decision_prompt.entries_block(
+                "roles", self.roles, self.roles_version, RoleStatus.ACTIVE
+            ),
+            goals=self.decision_prompt.entries_block(
+                "goals", self.goals, self.goals_version, GoalStatus.ACTIVE
+            ),
+            soul=self._soul_essence(),
+            actions=actions,
+        )
         try:
+            # The static sections go in the system message and the roles and
+            # goals open the user message, ahead of any memories and the
+            # perception, so the stable sections form a cacheable prefix.
             response = await self.llm_service.get_completion(
-                prompt,
+                layout.section(PromptSection.INPUT),
+                system_prompt=layout.system,
+                context=layout.section(PromptSection.CONTEXT),
                 model=self.default_model,
                 additional_context={"valid_actions": valid_actions},
-                expected_output=f"""
-                {{
-                    "action": str where str in {valid_actions},
-                    "parameters": dict,
-                    "reasoning": str,
-                    "confidence": float where 0 <= float <= 1,
-                    "priority": str,
-                    "related_roles": list,
-                    "related_goals": list
-                }}
-                """,
+                expected_output=self.decision_prompt.expected_output(),
+                call_site="decision",
+                escalate=escalate,
+                output_type=DECISION_OUTPUT,
             )
             if isinstance(response, dict) and "error" in response:
                 logger.warning(f"Error in LLM response: {response['error']}")
@@ -634,6 +732,15 @@ class Brain:
                 "fallback_response": "An error occurred while processing your request.",
             }
 
+    def _soul_essence(self) -> Optional[str]:
+        """Get the Soul's essence from either Soul type, or None without a Soul."""
+        if self.soul is None:
+            return None
+        get_essence = getattr(self.soul, "get_essence", None)
+        if callable(get_essence):
+            return get_essence()
+        return getattr(self.soul, "essence", None)
+
     async def execute_decision(
         self, decision: "Decision", perception: Optional[Perception] = None
     ) -> "Decision":
@@ -651,7 +758,7 @@ class Brain:
             f"Executing decision: {decision.action} with params {decision.parameters}"
         )
         logger.debug(f"Perception object: {perception}")
-        
+
         # Handle different execution modes
         if decision.execution_mode == ExecutionMode.AUTO:
             # Execute the action immediately
@@ -695,4 +802,4 @@ class Brain:
         response = await self.llm_service.get_completion(
             prompt, model=self.default_model
         )
-        return response.strip()
\ No newline at end of file
+        return response.strip()
@@ -1 +1,3 @@
 from .decision import Decision
+from .decision_output import DecisionOutput, DECISION_OUTPUT, parse_decision_output
+from .decision_cache import DecisionCache, DecisionCachePolicy
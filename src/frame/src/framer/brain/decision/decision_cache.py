@@ -0,0 +1,214 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from frame.src.framer.brain.decision import Decision
+    from frame.src.framer.brain.mind.perception import Perception
+
+# Data fields left out of every key, at any depth: they change between otherwise
+# identical perceptions, like the timestamps of a coalesced burst.
+VOLATILE_FIELDS = frozenset({"timestamp", "first_seen", "last_seen"})
+
+# Decisions that report a failure rather than a choice are never cached.
+UNCACHEABLE_ACTIONS = frozenset({"error"})
+
+
+@dataclass(frozen=True)
+class DecisionCachePolicy:
+    """
+    How decisions for one perception type are cached.
+
+    Attributes:
+        ttl_seconds (Optional[float]): How long a decision may be reused. None disables expiry.
+        min_confidence (float): Decisions less confident than this are not reused.
+        ignore_fields (Tuple[str, ...]): Data fields, besides ``VOLATILE_FIELDS``, left out of the key.
+    """
+
+    ttl_seconds: Optional[float] = 300.0
+    min_confidence: float = 0.0
+    ignore_fields: Tuple[str, ...] = ()
+
+
+def _normalize(value: Any) -> Any:
+    # Case and spacing do not change what a perception means.
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {
+            str(key): _normalize(item)
+            for key, item in value.items()
+            if key not in VOLATILE_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+class DecisionCache:
+    """
+    Bounded LRU cache of decisions for repeated perceptions.
+
+    Keys combine the perception type, its normalized data and a fingerprint
+    of what else the decision depends on: the active roles and goals and the
+    action registry version. Volatile fields such as timestamps are left out
+    and strings are compared without case or extra spaces, so near-duplicate
+    perceptions share a decision. Each perception type has its own policy;
+    types without one fall back to ``default_policy``, and are not cached
+    at all when it is None.
+
+    Attributes:
+        max_entries (int): Maximum number of decisions kept.
+        default_policy (Optional[DecisionCachePolicy]): Policy for types without their own, or None to not cache them.
+        policies (Dict[str, Optional[DecisionCachePolicy]]): Policy per perception type. None disables caching for a type.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        default_policy: Optional[DecisionCachePolicy] = DecisionCachePolicy(),
+        policies: Optional[Dict[str, Optional[DecisionCachePolicy]]] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.default_policy = default_policy
+        self.policies = dict(policies or {})
+        self._entries: "OrderedDict[str, Tuple[Decision, float]]" = OrderedDict()
+
+    def policy(self, perception_type: str) -> Optional[DecisionCachePolicy]:
+        """
+        Get the policy for a perception type.
+
+        Args:
+            perception_type (str): The perception type.
+
+        Returns:
+            Optional[DecisionCachePolicy]: The policy, or None if the type is not cached.
+        """
+        return self.policies.get(perception_type, self.default_policy)
+
+    @staticmethod
+    def fingerprint(
+        roles: Iterable[Any], goals: Iterable[Any], actions_version: int
+    ) -> Hashable:
+        """
+        Fingerprint the state a decision depends on besides the perception.
+
+        Args:
+            roles (Iterable[Any]): The active roles.
+            goals (Iterable[Any]): The active goals.
+            actions_version (int): The action registry version.
+
+        Returns:
+            Hashable: Equal for equal role and goal names, descriptions and priorities
+            and equal registry versions.
+        """
+        return (
+            tuple(sorted(_describe(role) for role in roles)),
+            tuple(sorted(_describe(goal) for goal in goals)),
+            actions_version,
+        )
+
+    def make_key(
+        self, perception: "Perception", fingerprint: Hashable
+    ) -> Optional[str]:
+        """
+        Build the cache key for a perception.
+
+        Args:
+            perception (Perception): The perception.
+            fingerprint (Hashable): The fingerprint from ``fingerprint``.
+
+        Returns:
+            Optional[str]: A hex digest, or None if the perception type is not cached.
+        """
+        policy = self.policy(perception.type)
+        if policy is None:
+            return None
+        ignored = VOLATILE_FIELDS.union(policy.ignore_fields)
+        data = {
+            key: value
+            for key, value in (perception.data or {}).items()
+            if key not in ignored
+        }
+        payload = json.dumps(
+            [perception.type, _normalize(data), repr(fingerprint)],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional["Decision"]:
+        """
+        Look up a decision.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Decision]: A copy of the cached decision, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        decision, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return _copy(decision)
+
+    def set(self, key: str, perception_type: str, decision: "Decision") -> bool:
+        """
+        Store a decision if its type's policy allows it.
+
+        Args:
+            key (str): The cache key.
+            perception_type (str): The type of the perception the decision was made for.
+            decision (Decision): The decision.
+
+        Returns:
+            bool: Whether the decision was stored.
+        """
+        policy = self.policy(perception_type)
+        if (
+            policy is None
+            or decision.action in UNCACHEABLE_ACTIONS
+            or decision.confidence < policy.min_confidence
+        ):
+            return False
+        expires_at = (
+            float("inf")
+            if policy.ttl_seconds is None
+            else time.time() + policy.ttl_seconds
+        )
+        self._entries[key] = (_copy(decision), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        """Remove every decision."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _describe(entry: Any) -> Tuple[str, str, str]:
+    return (
+        str(getattr(entry, "name", entry)),
+        str(getattr(entry, "description", "")),
+        str(getattr(entry, "priority", "")),
+    )
+
+
+def _copy(decision: "Decision") -> "Decision":
+    # Parameters may hold services, so only the dict itself is copied.
+    return decision.model_copy(update={"parameters": dict(decision.parameters)})
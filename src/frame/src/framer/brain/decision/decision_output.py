@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Union
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+from frame.src.framer.agency.priority import Priority
+
+
+class DecisionOutput(BaseModel):
+    """
+    A decision as returned by the language model, before it becomes a Decision.
+
+    Validation is lenient so that a usable decision is not rejected over a
+    detail: unknown fields are ignored, priorities may be names or numbers,
+    and malformed parameters or related entries are dropped.
+
+    Attributes:
+        action (str): The chosen action.
+        parameters (Dict[str, Any]): Parameters for the action.
+        reasoning (str): The model's reasoning.
+        confidence (float): Confidence between 0 and 1.
+        priority (int): Priority value between 1 and 10.
+        related_roles (List[str]): Names of the roles the decision relates to.
+        related_goals (List[str]): Names of the goals the decision relates to.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    action: str = "respond"
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    reasoning: str = "No reasoning provided."
+    confidence: float = 0.5
+    priority: int = Priority.MEDIUM.value
+    related_roles: List[str] = Field(default_factory=list)
+    related_goals: List[str] = Field(default_factory=list)
+
+    @field_validator("parameters", mode="before")
+    @classmethod
+    def _parameters(cls, value: Any) -> Dict[str, Any]:
+        return value if isinstance(value, dict) else {}
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def _confidence(cls, value: Any) -> float:
+        try:
+            return min(max(float(value), 0.0), 1.0)
+        except (TypeError, ValueError):
+            return 0.5
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _priority(cls, value: Any) -> int:
+        if isinstance(value, str):
+            value = value.replace("_", " ")
+        try:
+            return Priority.get(value).value
+        except (KeyError, ValueError):
+            return Priority.MEDIUM.value
+
+    @field_validator("related_roles", "related_goals", mode="before")
+    @classmethod
+    def _names(cls, value: Any) -> List[str]:
+        if not isinstance(value, list):
+            return []
+        return [str(name) for name in value]
+
+
+# Built once: validating JSON with it parses and validates in a single pass.
+DECISION_OUTPUT = TypeAdapter(DecisionOutput)
+
+
+def parse_decision_output(raw: Union[str, bytes, Dict[str, Any]]) -> DecisionOutput:
+    """
+    Parse a model response into a DecisionOutput.
+
+    Args:
+        raw (Union[str, bytes, Dict[str, Any]]): The JSON text, or already decoded data.
+
+    Returns:
+        DecisionOutput: The validated decision.
+
+    Raises:
+        pydantic.ValidationError: If the response is not a JSON object.
+    """
+    if isinstance(raw, dict):
+        return DECISION_OUTPUT.validate_python(raw)
+    return DECISION_OUTPUT.validate_json(raw)
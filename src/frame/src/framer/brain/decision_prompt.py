@@ -0,0 +1,236 @@
+import json
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from frame.src.framer.agency.priority import Priority
+from frame.src.services.llm.prompt_layout import PromptLayout, PromptSection
+
+# Ordered from the most static to the most dynamic, so providers can reuse
+# the cached prefix of one decision prompt for the next.
+_INSTRUCTIONS = """Given a perception and the current context, decide on the most appropriate action to take.
+
+        For each perception, carefully evaluate:
+        - The type and content of the perception
+        - The urgency and importance of the information
+        - The current active goals and roles of the system, considering their priorities and statuses
+        - Whether immediate action, further research, or no action is most appropriate
+
+        Examples of personal/memory questions (ALWAYS use 'respond with memory retrieval' for these):
+        - "What is my favorite hobby?" (contains "my" and asks about personal preference)
+        - "When is my next meeting?" (contains "my" and asks about personal schedule)
+        - "What did I mention about..." (contains "I" and refers to past conversation)
+
+        Examples of general knowledge questions (Use 'respond' for basic facts an AI would know):
+        - "What is the largest ocean on Earth?" (basic geography)
+        - "How many planets are in the solar system?" (basic science)
+        - "What is the boiling point of water?" (common knowledge)
+        - "What is the capital of France?" (basic geography)
+
+        Only use 'research' for complex topics requiring detailed investigation or verification, like:
+        - "What are the latest developments in quantum computing?"
+        - "How has climate change affected migration patterns in Arctic birds?"
+        - "What are the economic implications of recent policy changes?"
+
+        IMPORTANT: ONLY use 'respond with memory retrieval' for questions that:
+        1. Contain personal pronouns like "my", "I", "we"
+        2. Ask about personal preferences, schedules, or past conversations
+        3. Request information specific to the user
+
+        For general knowledge, facts, or objective information, ALWAYS use 'respond'.
+
+        Priority levels and their meanings:
+        {priority_levels}
+
+        Respond with a JSON object containing the following fields:
+        - action: The action to take (must be EXACTLY one of the valid action names listed below)
+        - parameters: Any relevant parameters for the action (e.g., new roles, goals, tasks, research topic, or response content)
+        - reasoning: Your reasoning for this decision, including how it aligns with current roles and goals
+        - confidence: A float between 0 and 1 indicating your confidence in this decision
+        - priority: A string representing the priority level (e.g., "LOW", "MEDIUM", "HIGH", "CRITICAL") or an integer between 1 and 10 based on the urgency and importance of the action
+        - related_roles: A list of role names that are most relevant to this decision
+        - related_goals: A list of goal names that are most relevant to this decision
+
+        Ensure your decision is well-reasoned, aligns with the current active goals and roles (considering their priorities), and uses only the valid actions provided.
+        Use the provided priority levels when assigning priority to your decision, taking into account the priorities of related roles and goals."""
+
+_ACTIONS = """Valid actions are:
+        {actions}"""
+
+_CONTEXT = """Current active roles:
+        {roles}
+
+        Current active goals:
+        {goals}"""
+
+_INPUT = """Perception: {perception}
+        Perception Data: {perception_data}"""
+
+
+class DecisionPromptTemplate:
+    """
+    Decision prompt with its static sections compiled once.
+
+    The priority table and instructions are rendered when the template is
+    created. The action manifest is cached until the registry's ``version``
+    changes, and the role and goal blocks until the Brain's version counters
+    or the entries' names, priorities or statuses change. Only the perception
+    is rendered on every call.
+
+    Sections are laid out from the most static to the most dynamic: the soul
+    and instructions, the action manifest, roles and goals, then the
+    perception. Consecutive decisions share everything up to the roles and
+    goals, which providers can serve from their prompt cache.
+
+    Attributes:
+        action_registry (ActionRegistry): The registry whose actions are listed in the prompt.
+    """
+
+    def __init__(self, action_registry: Any):
+        self.action_registry = action_registry
+        self._instructions = _INSTRUCTIONS.format(
+            priority_levels=json.dumps({p.name: p.value for p in Priority}, indent=2),
+        )
+        self._actions: Optional[str] = None
+        self._actions_version: Optional[int] = None
+        self._expected_output: Optional[str] = None
+        self._expected_output_version: Optional[int] = None
+        self._blocks: Dict[str, Tuple[Any, str]] = {}
+
+    def action_manifest(self, actions: Optional[Iterable[str]] = None) -> str:
+        """
+        Get the serialized action manifest, rebuilding it if the registry changed.
+
+        Args:
+            actions (Optional[Iterable[str]]): Only list these actions, taken from the
+                registry's action index. None lists every action.
+
+        Returns:
+            str: The valid actions as indented JSON.
+        """
+        if actions is not None:
+            return self.action_registry.action_index().manifest(actions)
+        version = self.action_registry.version
+        if self._actions is None or self._actions_version != version:
+            self._actions = json.dumps(
+                {
+                    name: {
+                        "description": info["description"],
+                        "expected_parameters": info.get("expected_parameters", []),
+                        "priority": info["priority"],
+                    }
+                    for name, info in self.action_registry.actions.items()
+                },
+                indent=2,
+            )
+            self._actions_version = version
+        return self._actions
+
+    def expected_output(self) -> str:
+        """
+        Get the expected output schema, rebuilding it if the registry changed.
+
+        Returns:
+            str: The schema describing the decision JSON.
+        """
+        version = self.action_registry.version
+        if self._expected_output is None or self._expected_output_version != version:
+            self._expected_output = f"""
+                {{
+                    "action": str where str in {self.action_registry.get_all_actions()},
+                    "parameters": dict,
+                    "reasoning": str,
+                    "confidence": float where 0 <= float <= 1,
+                    "priority": str,
+                    "related_roles": list,
+                    "related_goals": list
+                }}
+                """
+            self._expected_output_version = version
+        return self._expected_output
+
+    def entries_block(
+        self, kind: str, entries: Sequence[Any], version: int, active_status: Any
+    ) -> str:
+        """
+        Get the serialized list of active roles or goals, rebuilding it if they changed.
+
+        Args:
+            kind (str): Cache slot, "roles" or "goals".
+            entries (Sequence[Any]): The Role or Goal objects.
+            version (int): The Brain's version counter for these entries.
+            active_status (Any): The status value that marks an entry as active.
+
+        Returns:
+            str: The active entries as an indented JSON list.
+        """
+        # Statuses and priorities can be changed in place, so they are part of the key.
+        key = (
+            version,
+            tuple((entry.name, entry.priority, entry.status) for entry in entries),
+        )
+        cached = self._blocks.get(kind)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        block = json.dumps(
+            [
+                f"{entry.name} (Priority: {entry.priority}, Status: {entry.status.name})"
+                for entry in entries
+                if entry.status == active_status
+            ],
+            indent=2,
+        )
+        self._blocks[kind] = (key, block)
+        return block
+
+    def layout(
+        self,
+        perception: Any,
+        roles: str,
+        goals: str,
+        soul: Optional[str] = None,
+        actions: Optional[Iterable[str]] = None,
+    ) -> PromptLayout:
+        """
+        Lay out the prompt for a perception.
+
+        Args:
+            perception (Any): The perception to decide on.
+            roles (str): The serialized active roles block.
+            goals (str): The serialized active goals block.
+            soul (Optional[str]): The Framer's soul, placed ahead of the instructions.
+            actions (Optional[Iterable[str]]): Only list these actions. None lists every action.
+                A shortened list changes with the perception, so it goes ahead of the
+                perception in the input rather than in the system message.
+
+        Returns:
+            PromptLayout: The prompt's sections.
+        """
+        return (
+            PromptLayout()
+            .add(PromptSection.SYSTEM, soul)
+            .add(PromptSection.SYSTEM, self._instructions)
+            .add(
+                PromptSection.ACTIONS if actions is None else PromptSection.INPUT,
+                _ACTIONS.format(actions=self.action_manifest(actions)),
+            )
+            .add(PromptSection.CONTEXT, _CONTEXT.format(roles=roles, goals=goals))
+            .add(
+                PromptSection.INPUT,
+                _INPUT.format(
+                    perception=str(perception), perception_data=str(perception.data)
+                ),
+            )
+        )
+
+    def render(self, perception: Any, roles: str, goals: str) -> str:
+        """
+        Render the prompt for a perception as one string.
+
+        Args:
+            perception (Any): The perception to decide on.
+            roles (str): The serialized active roles block.
+            goals (str): The serialized active goals block.
+
+        Returns:
+            str: The decision prompt.
+        """
+        return self.layout(perception, roles, goals).text()
@@ -1 +1,3 @@
 from .perception import Perception
+from .coalescer import CoalescingWindow, PerceptionCoalescer, merge_perceptions
+from .features import FeatureExtractor, FeatureSpec, RingBuffer, summarize
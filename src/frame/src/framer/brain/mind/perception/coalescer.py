@@ -0,0 +1,256 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .perception import Perception
+
+# Distinct values kept per field in a coalesced perception's summary.
+MAX_DISTINCT_VALUES = 10
+
+FieldMerge = Callable[[List[Any]], Any]
+Merge = Callable[[List[Perception]], Perception]
+Flush = Callable[[Perception, int, int, bool], Awaitable[Any]]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_perceptions(
+    perceptions: List[Perception], fields: Optional[Mapping[str, FieldMerge]] = None
+) -> Perception:
+    """
+    Merge perceptions into one that carries their latest values and a summary.
+
+    The merged data holds the latest value of every field, except fields with
+    a merge function in ``fields``, which hold what the function returns for
+    the field's values in arrival order. A ``"coalesced"`` entry holds the
+    number of perceptions, when the first and last were made, and per field
+    either the min, max and mean of numeric values or up to
+    ``MAX_DISTINCT_VALUES`` of the most recent distinct scalar values.
+
+    Args:
+        perceptions (List[Perception]): The perceptions, oldest first.
+        fields (Optional[Mapping[str, FieldMerge]]): Merge functions by field name.
+
+    Returns:
+        Perception: The merged perception, or the only perception if there is one.
+    """
+    if len(perceptions) == 1:
+        return perceptions[0]
+    fields = fields or {}
+    latest = perceptions[-1]
+    data: Dict[str, Any] = {}
+    values: Dict[str, List[Any]] = defaultdict(list)
+    for perception in perceptions:
+        for key, value in (perception.data or {}).items():
+            data[key] = value
+            values[key].append(value)
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for key, items in values.items():
+        if key in fields:
+            data[key] = fields[key](items)
+        elif all(_is_number(item) for item in items):
+            summary[key] = {
+                "min": min(items),
+                "max": max(items),
+                "mean": sum(items) / len(items),
+            }
+        else:
+            distinct: List[Any] = []
+            for item in reversed(items):
+                if isinstance(item, (str, int, float, bool)) and item not in distinct:
+                    distinct.append(item)
+            if len(distinct) > 1:
+                summary[key] = {"values": distinct[:MAX_DISTINCT_VALUES][::-1]}
+
+    data["coalesced"] = {
+        "count": len(perceptions),
+        "first_seen": perceptions[0].timestamp.isoformat(),
+        "last_seen": latest.timestamp.isoformat(),
+        "fields": summary,
+    }
+    return Perception(
+        type=latest.type, data=data, source=latest.source, timestamp=latest.timestamp
+    )
+
+
+@dataclass(frozen=True)
+class CoalescingWindow:
+    """
+    How perceptions of one type are coalesced.
+
+    A window opens with the first perception and closes ``seconds`` later,
+    or ``seconds`` after the latest perception when ``debounce`` is set, or
+    as soon as it holds ``max_count`` perceptions. Its perceptions are then
+    merged and processed as one.
+
+    Attributes:
+        seconds (float): How long a window stays open.
+        max_count (int): Most perceptions in a window.
+        debounce (bool): Whether each perception keeps the window open another ``seconds``.
+        key (Optional[Callable[[Perception], Hashable]]): Splits perceptions of the type into
+            separate windows, e.g. by source. None puts them all in one.
+        fields (Mapping[str, FieldMerge]): Merge functions by field name, for ``merge_perceptions``.
+        merge (Optional[Merge]): Replaces ``merge_perceptions``.
+    """
+
+    seconds: float = 0.1
+    max_count: int = 32
+    debounce: bool = False
+    key: Optional[Callable[[Perception], Hashable]] = None
+    fields: Mapping[str, FieldMerge] = field(default_factory=dict)
+    merge: Optional[Merge] = None
+
+    def __post_init__(self):
+        if self.seconds < 0:
+            raise ValueError("seconds must not be negative")
+        if self.max_count < 1:
+            raise ValueError("max_count must be at least 1")
+
+    def merged(self, perceptions: List[Perception]) -> Perception:
+        """
+        Merge a closed window's perceptions.
+
+        Args:
+            perceptions (List[Perception]): The perceptions, oldest first.
+
+        Returns:
+            Perception: The perception to process for the window.
+        """
+        if self.merge is not None:
+            return self.merge(perceptions)
+        return merge_perceptions(perceptions, self.fields)
+
+
+@dataclass
+class _Batch:
+    window: CoalescingWindow
+    future: asyncio.Future
+    priority: int
+    stream: bool = False
+    perceptions: List[Perception] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class PerceptionCoalescer:
+    """
+    Coalesces bursts of perceptions so each burst is processed once.
+
+    Perceptions of a type with a window are held until the window closes,
+    then merged and passed to ``flush``. Everyone who added a perception to
+    the window gets what ``flush`` returned. Perceptions of other types are
+    passed to ``flush`` right away.
+
+    Attributes:
+        windows (Dict[str, CoalescingWindow]): Coalescing windows by perception type.
+    """
+
+    def __init__(
+        self, flush: Flush, windows: Optional[Dict[str, CoalescingWindow]] = None
+    ):
+        """
+        Args:
+            flush (Flush): Processes a perception, given the highest priority, the number
+                of perceptions merged into it and whether any of them asked to stream.
+            windows (Optional[Dict[str, CoalescingWindow]]): Coalescing windows by perception type.
+        """
+        self.windows: Dict[str, CoalescingWindow] = dict(windows or {})
+        self._flush = flush
+        self._batches: Dict[Tuple[str, Hashable], _Batch] = {}
+        self._flushing: Set[asyncio.Task] = set()
+
+    async def add(
+        self, perception: Perception, priority: int, stream: bool = False
+    ) -> Any:
+        """
+        Add a perception and wait for its window to be processed.
+
+        Args:
+            perception (Perception): The perception.
+            priority (int): Its priority. A window is processed with its highest priority.
+            stream (bool): Whether to stream the response. A window streams if any of its
+                perceptions asked to.
+
+        Returns:
+            Any: What ``flush`` returned for the perception's window, or None if the
+            coalescer was cancelled first.
+        """
+        window = self.windows.get(perception.type)
+        if window is None:
+            return await self._flush(perception, priority, 1, stream)
+        key = (perception.type, window.key(perception) if window.key else None)
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = _Batch(
+                window=window, future=loop.create_future(), priority=priority
+            )
+            self._batches[key] = batch
+        else:
+            batch.priority = max(batch.priority, priority)
+        batch.stream = batch.stream or stream
+        batch.perceptions.append(perception)
+
+        if len(batch.perceptions) >= window.max_count:
+            self._close(key, batch)
+        elif batch.timer is None or window.debounce:
+            if batch.timer is not None:
+                batch.timer.cancel()
+            batch.timer = loop.call_later(window.seconds, self._close, key, batch)
+        # Shielded, so one caller giving up does not cancel the window for the others.
+        return await asyncio.shield(batch.future)
+
+    def _close(self, key: Tuple[str, Hashable], batch: _Batch) -> None:
+        if self._batches.get(key) is not batch:
+            return
+        del self._batches[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._run(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        try:
+            perception = batch.window.merged(batch.perceptions)
+            result = await self._flush(
+                perception, batch.priority, len(batch.perceptions), batch.stream
+            )
+        except asyncio.CancelledError:
+            if not batch.future.done():
+                batch.future.set_result(None)
+            raise
+        except Exception as e:
+            if not batch.future.done():
+                batch.future.set_exception(e)
+        else:
+            if not batch.future.done():
+                batch.future.set_result(result)
+
+    def cancel(self) -> None:
+        """Drop the open windows and stop processing closed ones. Their callers get None."""
+        for batch in self._batches.values():
+            if batch.timer is not None:
+                batch.timer.cancel()
+            if not batch.future.done():
+                batch.future.set_result(None)
+        self._batches.clear()
+        for task in list(self._flushing):
+            task.cancel()
+
+    def __len__(self) -> int:
+        return sum(len(batch.perceptions) for batch in self._batches.values())
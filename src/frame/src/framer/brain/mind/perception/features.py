@@ -0,0 +1,220 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with the default requirements
+    np = None
+
+from .perception import Perception
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Perception feature extraction requires numpy. Install it with pip install numpy"
+        )
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of a channel's most recent samples.
+
+    Attributes:
+        capacity (int): Most samples kept.
+    """
+
+    def __init__(self, capacity: int):
+        _require_numpy()
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=float)
+        self._start = 0
+        self._size = 0
+
+    def extend(self, samples: "np.ndarray") -> None:
+        """
+        Append samples, overwriting the oldest ones once the buffer is full.
+
+        Args:
+            samples (np.ndarray): One-dimensional samples, oldest first.
+        """
+        samples = samples[-self.capacity :]
+        count = len(samples)
+        end = (self._start + self._size) % self.capacity
+        first = min(count, self.capacity - end)
+        self._data[end : end + first] = samples[:first]
+        self._data[: count - first] = samples[first:]
+        overflow = max(0, self._size + count - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self.capacity, self._size + count)
+
+    def values(self) -> "np.ndarray":
+        """
+        Get the buffered samples.
+
+        Returns:
+            np.ndarray: The samples, oldest first.
+        """
+        if self._start + self._size <= self.capacity:
+            return self._data[self._start : self._start + self._size]
+        return np.concatenate(
+            (
+                self._data[self._start :],
+                self._data[: (self._start + self._size) % self.capacity],
+            )
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def summarize(
+    samples: "np.ndarray", threshold: Optional[float] = None, precision: int = 4
+) -> Dict[str, Any]:
+    """
+    Compute rolling statistics over a channel's samples.
+
+    Args:
+        samples (np.ndarray): The samples, oldest first. Must not be empty.
+        threshold (Optional[float]): Level whose crossings are counted. None skips them.
+        precision (int): Decimal places the statistics are rounded to.
+
+    Returns:
+        Dict[str, Any]: The sample count and the last, min, max and mean values, the
+        slope per sample from a least-squares fit, the z-score of the last value, and
+        with a threshold, how often the samples crossed it.
+    """
+    _require_numpy()
+    last = samples[-1]
+    mean = samples.mean()
+    std = samples.std()
+    if len(samples) > 1:
+        offsets = np.arange(len(samples)) - (len(samples) - 1) / 2
+        slope = float(offsets @ (samples - mean) / (offsets @ offsets))
+    else:
+        slope = 0.0
+    features = {
+        "n": int(len(samples)),
+        "last": round(float(last), precision),
+        "min": round(float(samples.min()), precision),
+        "max": round(float(samples.max()), precision),
+        "mean": round(float(mean), precision),
+        "slope": round(slope, precision),
+        "zscore": round(float((last - mean) / std), precision) if std > 0 else 0.0,
+    }
+    if threshold is not None:
+        signs = np.sign(samples - threshold)
+        signs = signs[signs != 0]
+        features["crossings"] = int(np.count_nonzero(signs[1:] != signs[:-1]))
+    return features
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    Which fields of a perception type are numeric channels, and how they are summarized.
+
+    Attributes:
+        fields (Optional[Sequence[str]]): Data fields to summarize. Numbers are buffered as one
+            sample each and arrays as one sample per element. None summarizes every numeric
+            array field and leaves single numbers as they are.
+        window (int): Samples kept per channel.
+        thresholds (Mapping[str, float]): Level per field whose crossings are counted.
+        precision (int): Decimal places the statistics are rounded to.
+        channel (Optional[Callable[[Perception], Hashable]]): Identifies the sensor a perception
+            came from, so each sensor's fields are buffered separately. None uses the source.
+    """
+
+    fields: Optional[Sequence[str]] = None
+    window: int = 1024
+    thresholds: Mapping[str, float] = field(default_factory=dict)
+    precision: int = 4
+    channel: Optional[Callable[[Perception], Hashable]] = None
+
+    def __post_init__(self):
+        if self.window < 1:
+            raise ValueError("window must be at least 1")
+
+
+def _samples(value: Any) -> Optional["np.ndarray"]:
+    """Get a value's numeric samples, or None if it is not numeric."""
+    if (
+        isinstance(value, bool)
+        or value is None
+        or isinstance(value, (str, bytes, dict))
+    ):
+        return None
+    if isinstance(value, (int, float)):
+        return np.array([value], dtype=float)
+    try:
+        samples = np.asarray(value, dtype=float).ravel()
+    except (TypeError, ValueError):
+        return None
+    return samples if samples.size else None
+
+
+class FeatureExtractor:
+    """
+    Replaces numeric sensor data in perceptions with compact rolling statistics.
+
+    Each perception type with a ``FeatureSpec`` has a ring buffer per sensor
+    and field. A perception's samples are appended to their buffers, and each
+    summarized field's raw value is replaced by the statistics of its buffer,
+    e.g. a 360-reading lidar sweep by its min, max, mean and trend. Decision
+    prompts stay small, and rules can match on the statistics.
+
+    Attributes:
+        specs (Dict[str, FeatureSpec]): Feature specs by perception type.
+    """
+
+    def __init__(self, specs: Optional[Dict[str, FeatureSpec]] = None):
+        _require_numpy()
+        self.specs: Dict[str, FeatureSpec] = dict(specs or {})
+        self._buffers: Dict[Tuple[str, Hashable, str], RingBuffer] = {}
+
+    def extract(self, perception: Perception) -> Perception:
+        """
+        Buffer a perception's samples and summarize its numeric fields.
+
+        Args:
+            perception (Perception): The perception.
+
+        Returns:
+            Perception: A copy with the summarized fields replaced by their statistics,
+            or the perception itself if its type has no spec or nothing was summarized.
+        """
+        spec = self.specs.get(perception.type)
+        if spec is None or not isinstance(perception.data, dict):
+            return perception
+        channel = spec.channel(perception) if spec.channel else perception.source
+        names = spec.fields if spec.fields is not None else list(perception.data)
+        summarized: Dict[str, Any] = {}
+        for name in names:
+            value = perception.data.get(name)
+            if spec.fields is None and not isinstance(value, (list, tuple, np.ndarray)):
+                continue
+            samples = _samples(value)
+            if samples is None:
+                continue
+            key = (perception.type, channel, name)
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = RingBuffer(spec.window)
+            buffer.extend(samples)
+            summarized[name] = summarize(
+                buffer.values(), spec.thresholds.get(name), spec.precision
+            )
+        if not summarized:
+            return perception
+        return Perception(
+            type=perception.type,
+            data={**perception.data, **summarized},
+            source=perception.source,
+            timestamp=perception.timestamp,
+        )
+
+    def reset(self) -> None:
+        """Forget every buffered sample."""
+        self._buffers.clear()
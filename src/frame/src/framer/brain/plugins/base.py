@@ -2,9 +2,10 @@ from abc import ABC, abstractmethod
 import logging
 import os
 import json
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, Optional, Union
 from frame.src.framer.agency.priority import Priority
-from frame.src.framer.brain.rules.ruleset import Rule, Ruleset
+from frame.src.framer.brain.rules.ruleset import DecisionFactory, Rule, Ruleset
+from frame.src.models.framer.brain.decision.decision import Decision
 
 
 class BasePlugin(ABC):
@@ -68,17 +69,29 @@ class BasePlugin(ABC):
 
     def add_rule(
         self,
-        condition: Callable[[Dict[str, Any]], bool],
-        action: Callable[[Dict[str, Any]], None],
+        condition: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        action: Optional[Callable[[Dict[str, Any]], None]] = None,
+        perception_type: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+        decision: Union[Decision, str, DecisionFactory, None] = None,
+        name: Optional[str] = None,
     ):
         """
         Add a rule to the plugin.
 
+        Rules with a decision are checked by the Brain before it asks the
+        language model, so matching perceptions are decided without a model call.
+
         Args:
-            condition (Callable[[Dict[str, Any]], bool]): The condition function for the rule.
-            action (Callable[[Dict[str, Any]], None]): The action function to execute if the condition is met.
+            condition (Optional[Callable[[Dict[str, Any]], bool]]): The condition function for the rule.
+            action (Optional[Callable[[Dict[str, Any]], None]]): The action function to execute if the condition is met.
+            perception_type (Optional[str]): Perception type a decision rule applies to.
+            match (Optional[Dict[str, Any]]): Values or predicates perception data fields must match.
+            decision (Union[Decision, str, DecisionFactory, None]): The decision, action name or
+                decision factory used when a perception matches.
+            name (Optional[str]): Name rule hits are reported under.
         """
-        rule = Rule(condition, action)
+        rule = Rule(condition, action, perception_type, match, decision, name)
         self.ruleset.add_rule(rule)
 
     @abstractmethod
@@ -198,6 +211,7 @@ class BasePlugin:
     def __init__(self, framer):
         self.framer = framer
         self.actions = {}
+        self.ruleset = Ruleset()
 
     def get_actions(self):
         """
@@ -218,3 +232,29 @@ class BasePlugin:
             "action_func": action_func,
             "description": description,
         }
+
+    def add_rule(
+        self,
+        condition: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        action: Optional[Callable[[Dict[str, Any]], None]] = None,
+        perception_type: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+        decision: Union[Decision, str, DecisionFactory, None] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Add a rule to the plugin's ruleset. Rules with a decision are checked
+        by the Brain before it asks the language model.
+
+        Args:
+            condition (Optional[Callable[[Dict[str, Any]], bool]]): The condition function for the rule.
+            action (Optional[Callable[[Dict[str, Any]], None]]): The action function to execute if the condition is met.
+            perception_type (Optional[str]): Perception type a decision rule applies to.
+            match (Optional[Dict[str, Any]]): Values or predicates perception data fields must match.
+            decision (Union[Decision, str, DecisionFactory, None]): The decision, action name or
+                decision factory used when a perception matches.
+            name (Optional[str]): Name rule hits are reported under.
+        """
+        self.ruleset.add_rule(
+            Rule(condition, action, perception_type, match, decision, name)
+        )
@@ -1,3 +1,4 @@
 from .ruleset import Ruleset, Rule
+from .rule_engine import RuleEngine
 
-__all__ = ["Ruleset", "Rule"]
+__all__ = ["Ruleset", "Rule", "RuleEngine"]
@@ -0,0 +1,105 @@
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from frame.src.framer.brain.rules.ruleset import MISSING, Rule
+
+if TYPE_CHECKING:
+    from frame.src.framer.brain.decision import Decision
+    from frame.src.framer.brain.mind.perception import Perception
+
+# Rules tagged with the order they were added in.
+_Entries = List[Tuple[int, Rule]]
+
+
+class _TypeIndex:
+    """Rules of one perception type, indexed by a field value each rule requires."""
+
+    def __init__(self):
+        self.by_field: Dict[str, Dict[Hashable, _Entries]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self.unindexed: _Entries = []
+
+    def add(self, order: int, rule: Rule) -> None:
+        for field, expected in rule.match.items():
+            if callable(expected):
+                continue
+            try:
+                self.by_field[field][expected].append((order, rule))
+            except TypeError:
+                # Unhashable values are checked when the rule is matched.
+                continue
+            return
+        self.unindexed.append((order, rule))
+
+    def candidates(self, data: Dict) -> _Entries:
+        entries = list(self.unindexed)
+        for field, by_value in self.by_field.items():
+            value = data.get(field, MISSING)
+            if value is MISSING:
+                continue
+            try:
+                entries.extend(by_value.get(value, ()))
+            except TypeError:
+                # Unhashable values cannot equal an indexed value.
+                continue
+        return entries
+
+
+class RuleEngine:
+    """
+    Decision rules compiled into an index for fast matching.
+
+    Rules are indexed by perception type and, when they require a field to
+    equal a value, by that field and value. A perception is only checked
+    against the rules its type and field values select, plus rules with no
+    type or no equality predicate, in the order the rules were added. The
+    first candidate that matches and returns a decision wins.
+
+    Attributes:
+        size (int): Number of compiled rules.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self._indexes: Dict[Optional[str], _TypeIndex] = defaultdict(_TypeIndex)
+        self.size = 0
+        for rule in rules:
+            if rule.decision is None:
+                continue
+            self._indexes[rule.perception_type].add(self.size, rule)
+            self.size += 1
+
+    def candidates(self, perception: "Perception") -> List[Rule]:
+        """
+        Get the rules that may match a perception.
+
+        Args:
+            perception (Perception): The perception.
+
+        Returns:
+            List[Rule]: The candidate rules, in the order they were added.
+        """
+        data = perception.data or {}
+        entries: _Entries = []
+        for perception_type in (perception.type, None):
+            index = self._indexes.get(perception_type)
+            if index is not None:
+                entries.extend(index.candidates(data))
+        return [rule for _, rule in sorted(entries, key=lambda entry: entry[0])]
+
+    def decide(self, perception: "Perception") -> Optional[Tuple[Rule, "Decision"]]:
+        """
+        Find the first rule that decides on a perception.
+
+        Args:
+            perception (Perception): The perception.
+
+        Returns:
+            Optional[Tuple[Rule, Decision]]: The rule and its decision, or None if no rule decided.
+        """
+        for rule in self.candidates(perception):
+            if rule.matches(perception):
+                decision = rule.decide(perception)
+                if decision is not None:
+                    return rule, decision
+        return None
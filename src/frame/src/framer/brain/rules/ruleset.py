@@ -1,29 +1,126 @@
-from typing import Callable, List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from frame.src.framer.brain.decision import Decision
+    from frame.src.framer.brain.mind.perception import Perception
+
+# Stands in for a perception field that is not set.
+MISSING = object()
+
+# Builds a decision for a matched perception, or returns None to fall through.
+DecisionFactory = Callable[["Perception"], Optional["Decision"]]
 
 
 class Rule:
+    """
+    A condition and what to do when it holds.
+
+    Rules with an ``action`` run it against a context dict when their
+    ruleset is evaluated. Rules with a ``decision`` answer perceptions
+    directly: the Brain checks them before asking the language model, and
+    the first one that matches decides.
+
+    Attributes:
+        condition (Optional[Callable[[Dict[str, Any]], bool]]): Must hold for the rule to match.
+            Perception rules call it with the perception's data.
+        action (Optional[Callable[[Dict[str, Any]], None]]): Run when the condition holds.
+        perception_type (Optional[str]): Perception type the rule applies to, or None for every type.
+        match (Dict[str, Any]): Values perception data fields must equal, or predicates they must pass.
+        decision (Union[Decision, str, DecisionFactory, None]): The decision, the name of the
+            action to decide on, or a function building the decision from the perception.
+        name (str): Name hits are reported under.
+    """
+
     def __init__(
         self,
-        condition: Callable[[Dict[str, Any]], bool],
-        action: Callable[[Dict[str, Any]], None],
+        condition: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        action: Optional[Callable[[Dict[str, Any]], None]] = None,
+        perception_type: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+        decision: Union["Decision", str, DecisionFactory, None] = None,
+        name: Optional[str] = None,
     ):
         self.condition = condition
         self.action = action
+        self.perception_type = perception_type
+        self.match = dict(match or {})
+        self.decision = decision
+        self.name = name or (decision if isinstance(decision, str) else "rule")
 
     def evaluate(self, context: Dict[str, Any]) -> bool:
-        return self.condition(context)
+        return self.condition is None or self.condition(context)
 
     def execute(self, context: Dict[str, Any]) -> None:
-        if self.evaluate(context):
+        if self.action is not None and self.evaluate(context):
             self.action(context)
 
+    def matches(self, perception: "Perception") -> bool:
+        """
+        Check whether the rule applies to a perception.
+
+        Args:
+            perception (Perception): The perception.
+
+        Returns:
+            bool: Whether the type, every field predicate and the condition match.
+        """
+        if self.perception_type is not None and perception.type != self.perception_type:
+            return False
+        data = perception.data or {}
+        for field, expected in self.match.items():
+            value = data.get(field, MISSING)
+            if callable(expected):
+                if value is MISSING or not expected(value):
+                    return False
+            elif value != expected:
+                return False
+        return self.evaluate(data)
+
+    def decide(self, perception: "Perception") -> Optional["Decision"]:
+        """
+        Build the rule's decision for a perception it matches.
+
+        Args:
+            perception (Perception): The matched perception.
+
+        Returns:
+            Optional[Decision]: A fresh decision, or None if the rule has none.
+        """
+        from frame.src.framer.brain.decision import Decision
+        from frame.src.models.framer.brain.decision.decision import (
+            Decision as DecisionModel,
+        )
+
+        if self.decision is None:
+            return None
+        if isinstance(self.decision, DecisionModel):
+            return self.decision.model_copy(deep=True)
+        if isinstance(self.decision, str):
+            return Decision(
+                action=self.decision,
+                parameters={},
+                reasoning=f"Matched rule '{self.name}'",
+                confidence=1.0,
+            )
+        return self.decision(perception)
+
 
 class Ruleset:
+    """
+    An ordered collection of rules.
+
+    Attributes:
+        rules (List[Rule]): The rules, in the order they were added.
+        version (int): Incremented whenever a rule is added, so compiled rules can be rebuilt.
+    """
+
     def __init__(self):
         self.rules: List[Rule] = []
+        self.version = 0
 
     def add_rule(self, rule: Rule) -> None:
         self.rules.append(rule)
+        self.version += 1
 
     def evaluate(self, context: Dict[str, Any]) -> None:
         for rule in self.rules:
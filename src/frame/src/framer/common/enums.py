@@ -20,3 +20,11 @@ class TaskStatus(str, Enum):
     COMPLETED = "COMPLETED"
     CANCELED = "CANCELED"
     FAILED = "FAILED"
+
+
+class OverflowPolicy(str, Enum):
+    """What a full Framer mailbox does with a new perception."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_LOWEST_PRIORITY = "drop_lowest_priority"
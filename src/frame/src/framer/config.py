@@ -4,6 +4,7 @@ from frame.src.constants import DEFAULT_MODEL
 from pydantic import BaseModel, Field
 import logging
 from frame.src.constants import HUGGINGFACE_API_KEY, MEM0_API_KEY
+from frame.src.framer.common.enums import OverflowPolicy
 from frame.src.utils.log_manager import setup_logging, get_logger
 
 
@@ -14,6 +15,7 @@ class FramerConfig(BaseModel):
         default="You are a helpful AI assistant."
     )
     use_local_model: bool = False
+    local_model: str = "HuggingFaceTB/SmolLM2-360M-Instruct"
     # Default permissions include services like memory, eq, and shared_context.
     # These services do not require explicit permissions to be accessed.
     permissions: Optional[List[str]] = Field(
@@ -47,6 +49,19 @@ class FramerConfig(BaseModel):
         is_multi_modal (Optional[bool]): Indicates if multi-modal capabilities are enabled.
         roles (Optional[List[Dict[str, str]]]): The roles for the Framer.
         goals (Optional[List[Dict[str, Any]]]): The goals for the Framer.
+        cost_budget (Optional[float]): Spending limit in dollars for this Framer's LLM calls, enforced by a model router.
+        hedge_budget (Optional[float]): Largest share of extra requests this Framer may hedge, e.g. 0.05 for 5%.
+        perception_deadline (Optional[float]): Seconds the LLM calls for one perception may take, retries included.
+        decision_cache_types (Optional[List[str]]): Perception types whose decisions are reused for repeated perceptions. None disables the decision cache.
+        decision_cache_ttl (Optional[float]): Seconds a cached decision may be reused. None disables expiry.
+        decision_cache_min_confidence (float): Decisions less confident than this are not reused.
+        max_prompt_actions (Optional[int]): Most relevant actions listed in decision prompts, besides ``respond`` and ``error``. None lists every action.
+        mailbox_size (int): Most perceptions a Framer holds while it is busy or not ready yet.
+        mailbox_overflow (OverflowPolicy): What a full mailbox does with a new perception: block the caller, drop the oldest perception, or drop the lowest-priority one.
+        coalesce_perceptions (Optional[Dict[str, Dict[str, Any]]]): Coalescing windows by perception type, as ``CoalescingWindow`` arguments, e.g. ``{"visual": {"seconds": 0.5, "max_count": 20}}``. Perceptions of these types arriving within a window are merged and decided on once.
+        perception_features (Optional[Dict[str, Dict[str, Any]]]): Numeric fields to summarize by perception type, as ``FeatureSpec`` arguments, e.g. ``{"lidar": {"fields": ["distances"], "window": 360}}``. Their raw values are replaced by rolling statistics before deciding.
+        use_local_model (bool): Whether to run ``local_model`` on local CPUs instead of calling a provider.
+        local_model (str): The Hugging Face model id run when ``use_local_model`` is set.
     """
 
     description: Optional[str] = None
@@ -63,6 +78,17 @@ class FramerConfig(BaseModel):
     roles: Optional[List[Dict[str, Any]]] = None
     goals: Optional[List[Dict[str, Any]]] = None
     recent_memories_limit: Optional[int] = 5
+    cost_budget: Optional[float] = None
+    hedge_budget: Optional[float] = None
+    perception_deadline: Optional[float] = None
+    decision_cache_types: Optional[List[str]] = None
+    decision_cache_ttl: Optional[float] = 300.0
+    decision_cache_min_confidence: float = 0.0
+    max_prompt_actions: Optional[int] = None
+    mailbox_size: int = 1024
+    mailbox_overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    coalesce_perceptions: Optional[Dict[str, Dict[str, Any]]] = None
+    perception_features: Optional[Dict[str, Dict[str, Any]]] = None
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -94,6 +120,7 @@ from frame.src.constants import DEFAULT_MODEL
 from pydantic import BaseModel, Field
 import logging
 from frame.src.constants import HUGGINGFACE_API_KEY, MEM0_API_KEY
+from frame.src.framer.common.enums import OverflowPolicy
 from frame.src.utils.log_manager import setup_logging, get_logger
 
 
@@ -104,6 +131,7 @@ class FramerConfig(BaseModel):
         default="You are a helpful AI assistant."
     )
     use_local_model: bool = False
+    local_model: str = "HuggingFaceTB/SmolLM2-360M-Instruct"
     # Default permissions include services like memory, eq, and shared_context.
     # These services do not require explicit permissions to be accessed.
     permissions: Optional[List[str]] = Field(
@@ -137,6 +165,19 @@ class FramerConfig(BaseModel):
         is_multi_modal (Optional[bool]): Indicates if multi-modal capabilities are enabled.
         roles (Optional[List[Dict[str, str]]]): The roles for the Framer.
         goals (Optional[List[Dict[str, Any]]]): The goals for the Framer.
+        cost_budget (Optional[float]): Spending limit in dollars for this Framer's LLM calls, enforced by a model router.
+        hedge_budget (Optional[float]): Largest share of extra requests this Framer may hedge, e.g. 0.05 for 5%.
+        perception_deadline (Optional[float]): Seconds the LLM calls for one perception may take, retries included.
+        decision_cache_types (Optional[List[str]]): Perception types whose decisions are reused for repeated perceptions. None disables the decision cache.
+        decision_cache_ttl (Optional[float]): Seconds a cached decision may be reused. None disables expiry.
+        decision_cache_min_confidence (float): Decisions less confident than this are not reused.
+        max_prompt_actions (Optional[int]): Most relevant actions listed in decision prompts, besides ``respond`` and ``error``. None lists every action.
+        mailbox_size (int): Most perceptions a Framer holds while it is busy or not ready yet.
+        mailbox_overflow (OverflowPolicy): What a full mailbox does with a new perception: block the caller, drop the oldest perception, or drop the lowest-priority one.
+        coalesce_perceptions (Optional[Dict[str, Dict[str, Any]]]): Coalescing windows by perception type, as ``CoalescingWindow`` arguments, e.g. ``{"visual": {"seconds": 0.5, "max_count": 20}}``. Perceptions of these types arriving within a window are merged and decided on once.
+        perception_features (Optional[Dict[str, Dict[str, Any]]]): Numeric fields to summarize by perception type, as ``FeatureSpec`` arguments, e.g. ``{"lidar": {"fields": ["distances"], "window": 360}}``. Their raw values are replaced by rolling statistics before deciding.
+        use_local_model (bool): Whether to run ``local_model`` on local CPUs instead of calling a provider.
+        local_model (str): The Hugging Face model id run when ``use_local_model`` is set.
     """
 
     description: Optional[str] = None
@@ -153,6 +194,17 @@ class FramerConfig(BaseModel):
     roles: Optional[List[Dict[str, Any]]] = None
     goals: Optional[List[Dict[str, Any]]] = None
     recent_memories_limit: Optional[int] = 5
+    cost_budget: Optional[float] = None
+    hedge_budget: Optional[float] = None
+    perception_deadline: Optional[float] = None
+    decision_cache_types: Optional[List[str]] = None
+    decision_cache_ttl: Optional[float] = 300.0
+    decision_cache_min_confidence: float = 0.0
+    max_prompt_actions: Optional[int] = None
+    mailbox_size: int = 1024
+    mailbox_overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    coalesce_perceptions: Optional[Dict[str, Dict[str, Any]]] = None
+    perception_features: Optional[Dict[str, Dict[str, Any]]] = None
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -1,30 +1,58 @@
 import asyncio
+import inspect
+import itertools
 import logging
 import time
 import json
 import concurrent.futures
+import contextvars
 from frame.src.utils.decorators import (
     log_execution,
     validate_input,
     measure_performance,
 )
 from collections import deque
-from typing import List, Dict, Any, Optional, Callable, Union, Tuple, Deque
+from typing import (
+    List,
+    Dict,
+    Any,
+    Optional,
+    Callable,
+    Union,
+    Tuple,
+    Deque,
+    Awaitable,
+    AsyncIterator,
+    Iterable,
+)
 
 from frame.src.framer.config import FramerConfig
+from frame.src.framer.common.enums import OverflowPolicy
+from frame.src.framer.mailbox import Envelope, PerceptionMailbox
 from frame.src.framer.agency import Agency, Role, RoleStatus
 from frame.src.framer.agency.workflow import WorkflowManager
 from frame.src.framer.agency.tasks import Task, TaskStatus
 from frame.src.framer.agency.goals import Goal, GoalStatus
 from frame.src.framer.brain import Brain
-from frame.src.framer.brain.decision import Decision
+from frame.src.framer.brain.decision import Decision, DecisionCache, DecisionCachePolicy
 from frame.src.models.framer.soul import Soul
-from frame.src.framer.brain.mind.perception import Perception
+from frame.src.framer.brain.mind.perception import (
+    CoalescingWindow,
+    FeatureExtractor,
+    FeatureSpec,
+    Perception,
+    PerceptionCoalescer,
+)
 from frame.src.models.framer.soul import Soul
 
 from frame.src.services.context.execution_context_service import ExecutionContext
 from frame.src.services.eq import EQService
 from frame.src.services.llm import LLMService
+from frame.src.services.llm.model_router import ModelRouter, budget_owner
+from frame.src.utils.metrics import FramerMetrics, metrics_scope
+from frame.src.services.llm.retry_policy import deadline
+from frame.src.services.llm.hedging import HedgePolicy
+from frame.src.services.llm.llm_adapters.local import LOCAL_PREFIX
 from frame.src.services.memory import MemoryService
 from frame.src.services.context.shared_context_service import SharedContext
 
@@ -47,9 +75,97 @@ if TYPE_CHECKING:
     from frame.src.framer.brain import Brain
 
 Observer = Callable[[Decision], None]
+StreamObserver = Callable[[str], Optional[Awaitable[None]]]
 
 logger = logging.getLogger("frame.framer")
 
+# Mailbox priority of perceptions that set none, matching the default action priority.
+DEFAULT_PERCEPTION_PRIORITY = 5
+
+# The Framer whose mailbox worker is running in this context, so perceptions sensed
+# while it handles one, e.g. by an action, are processed inline instead of queued
+# behind the perception that is waiting for them.
+_processing: contextvars.ContextVar[Optional["Framer"]] = contextvars.ContextVar(
+    "framer_processing", default=None
+)
+
+
+def _brain_model(config: FramerConfig) -> Optional[str]:
+    """Get the model the Brain should use: the local model when enabled, else the default model."""
+    if config.use_local_model:
+        return f"{LOCAL_PREFIX}{config.local_model}"
+    return config.default_model
+
+
+def _decision_cache(config: FramerConfig) -> Optional[DecisionCache]:
+    """Build the Brain's decision cache for the perception types the config lists, if any."""
+    types = getattr(config, "decision_cache_types", None)
+    if not isinstance(types, (list, tuple)) or not types:
+        return None
+    policy = DecisionCachePolicy(
+        ttl_seconds=config.decision_cache_ttl,
+        min_confidence=config.decision_cache_min_confidence,
+    )
+    return DecisionCache(
+        default_policy=None,
+        policies={perception_type: policy for perception_type in types},
+    )
+
+
+def _mailbox(config: FramerConfig) -> PerceptionMailbox:
+    """Build a Framer's mailbox with the size and overflow policy the config sets."""
+    size = getattr(config, "mailbox_size", None)
+    overflow = getattr(config, "mailbox_overflow", None)
+    return PerceptionMailbox(
+        max_size=size if isinstance(size, int) else 1024,
+        overflow=(
+            overflow
+            if isinstance(overflow, (OverflowPolicy, str))
+            else OverflowPolicy.BLOCK
+        ),
+    )
+
+
+def _feature_extractor(config: FramerConfig) -> Optional[FeatureExtractor]:
+    """Build the Brain's feature extractor for the perception types the config lists, if any."""
+    specs = getattr(config, "perception_features", None)
+    if not isinstance(specs, dict) or not specs:
+        return None
+    return FeatureExtractor(
+        {
+            perception_type: FeatureSpec(**(spec or {}))
+            for perception_type, spec in specs.items()
+        }
+    )
+
+
+def _coalescing_windows(config: FramerConfig) -> Dict[str, CoalescingWindow]:
+    """Build the coalescing windows the config sets, by perception type."""
+    windows = getattr(config, "coalesce_perceptions", None)
+    if not isinstance(windows, dict):
+        return {}
+    return {
+        perception_type: CoalescingWindow(**(spec or {}))
+        for perception_type, spec in windows.items()
+    }
+
+
+def _perception_priority(
+    perception: Union[Perception, Dict[str, Any]], priority: Optional[int]
+) -> int:
+    """Get a perception's mailbox priority: the one given, else ``data["priority"]``, else the default."""
+    if priority is not None:
+        return priority
+    data = (
+        perception.get("data")
+        if isinstance(perception, dict)
+        else getattr(perception, "data", None)
+    )
+    value = data.get("priority") if isinstance(data, dict) else None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return DEFAULT_PERCEPTION_PRIORITY
+
 
 class Framer:
     @classmethod
@@ -64,7 +180,6 @@ class Framer:
         await framer._generate_initial_roles_and_goals()
         return framer
 
-    perceptions_queue: Deque[Union[Perception, Dict[str, Any]]] = deque()
     """
     The Framer class represents an AI agent with advanced cognitive capabilities. It integrates various components
     such as agency, brain, soul, and workflow management to create a comprehensive AI entity capable of
@@ -91,6 +206,11 @@ class Framer:
         roles (Optional[List[Dict[str, Any]]]): List of roles for the Framer. Default is None.
         goals (Optional[List[Dict[str, Any]]]): List of goals for the Framer. Default is None.
         observers (List[Observer]): List of observer functions to notify on decisions.
+        perceptions_queue (Deque[Union[Perception, Dict[str, Any]]]): Perceptions sensed before the Framer was ready, oldest dropped past ``config.mailbox_size``.
+        mailbox (PerceptionMailbox): Perceptions waiting for the Framer's worker, highest priority first.
+        coalescer (PerceptionCoalescer): Merges bursts of perceptions of the types it has windows for before they reach the mailbox.
+        metrics (FramerMetrics): Mailbox, coalescing and decision metrics, recorded next to the LLM service's metrics.
+        stream_observers (List[StreamObserver]): Functions called with each chunk of a streamed response.
         can_execute (bool): Determines if decisions are executed automatically. Default is True.
         acting (bool): Indicates if the Framer is actively processing perceptions. Default is False.
         plugins (Dict[str, Any]): Dictionary of loaded plugins for extended functionality.
@@ -157,8 +277,16 @@ class Framer:
         self.plugins = {}
         self.plugin_loading_complete = False
         self.plugin_loading_complete = False
-        self._streamed_response = {"status": "pending", "result": ""}
         self._streaming_task = None
+        self.mailbox = _mailbox(config)
+        self.perceptions_queue: Deque[Union[Perception, Dict[str, Any]]] = deque(
+            maxlen=self.mailbox.max_size
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self.metrics = FramerMetrics.alongside(getattr(llm_service, "metrics", None))
+        self.coalescer = PerceptionCoalescer(
+            self._flush_coalesced, _coalescing_windows(config)
+        )
 
         logger.info("Creating Brain")
         self.brain = Brain(
@@ -167,14 +295,26 @@ class Framer:
             memory_service=self.memory_service,
             roles=self.roles,
             goals=self.goals,
-            default_model=config.default_model,
+            default_model=_brain_model(config),
             soul=soul,
+            decision_cache=_decision_cache(config),
+            max_prompt_actions=config.max_prompt_actions,
+            feature_extractor=_feature_extractor(config),
+            metrics=self.metrics,
         )
         logger.info(f"Brain created with memory service: {self.brain.memory_service}")
         self.brain.action_registry.set_execution_context(self.execution_context)
 
+        router = getattr(llm_service, "router", None)
+        if isinstance(router, ModelRouter) and config.cost_budget is not None:
+            router.set_budget(config.name, config.cost_budget)
+        hedge_policy = getattr(llm_service, "hedge_policy", None)
+        if isinstance(hedge_policy, HedgePolicy) and config.hedge_budget is not None:
+            hedge_policy.set_budget(config.name, config.hedge_budget)
+
         self._dynamic_model_choice = False
         self.observers: List[Observer] = []
+        self.stream_observers: List[StreamObserver] = []
         self.can_execute = True
         self.acting = True
 
@@ -183,7 +323,8 @@ class Framer:
         Initialize the Framer by generating initial roles and goals if not provided.
         """
         if not self.roles or not self.goals:
-            self.roles, self.goals = await self.agency.generate_roles_and_goals()
+            with metrics_scope(self.config.name):
+                self.roles, self.goals = await self.agency.generate_roles_and_goals()
 
         # Ensure uniqueness
         if not self.roles:
@@ -326,7 +467,8 @@ class Framer:
     @measure_performance
     async def _generate_initial_roles_and_goals(self):
         if not self.roles or not self.goals:
-            self.roles, self.goals = await self.agency.generate_roles_and_goals()
+            with metrics_scope(self.config.name):
+                self.roles, self.goals = await self.agency.generate_roles_and_goals()
 
         # Ensure uniqueness
         self.roles = list(
@@ -515,10 +657,13 @@ class Framer:
             agency=Agency(llm_service=llm_service, context=None),
             brain=Brain(
                 llm_service=llm_service,
-                default_model=config.default_model,
+                default_model=_brain_model(config),
                 roles=config.roles if config.roles is not None else [],
                 goals=config.goals if config.goals is not None else [],
                 soul=Soul(seed=config.soul_seed),
+                decision_cache=_decision_cache(config),
+                max_prompt_actions=config.max_prompt_actions,
+                feature_extractor=_feature_extractor(config),
             ),
             soul=Soul(seed=config.soul_seed),
             workflow_manager=WorkflowManager(),
@@ -603,32 +748,223 @@ class Framer:
         return self.plugin_loading_complete and self.acting
 
     async def sense(
-        self, perception: Union[Perception, Dict[str, Any]]
+        self,
+        perception: Union[Perception, Dict[str, Any]],
+        stream: bool = False,
+        priority: Optional[int] = None,
     ) -> Optional[Decision]:
         """
         Process a perception and make a decision.
 
+        The Framer runs as an actor: perceptions go into its mailbox and one
+        worker task processes them, highest priority first, so concurrent
+        calls never interleave. When the mailbox is full, the configured
+        overflow policy either makes this call wait for room or drops a
+        perception, whose call then returns None. Perceptions of a type with
+        a coalescing window first wait for the window to close, and every
+        call of the window returns the decision made for their merged perception,
+        which is streamed if any of the calls asked to stream.
+
         Args:
             perception (Union[Perception, Dict[str, Any]]): The perception to process, can be a Perception object or a dictionary.
+            stream (bool): Whether to stream the response to the stream observers as it is generated.
+            priority (Optional[int]): Mailbox priority, higher first. Defaults to the perception data's
+                "priority", or ``DEFAULT_PERCEPTION_PRIORITY``.
 
         Returns:
             Decision: The decision made based on the perception.
         """
         if not self.is_ready():
             logger.warning("Framer is not ready. Queuing perception.")
+            if len(self.perceptions_queue) == self.perceptions_queue.maxlen:
+                logger.warning(
+                    "Perception queue is full. Dropping the oldest perception."
+                )
             self.perceptions_queue.append(perception)
             return None  # Return None to indicate the perception was queued
 
+        if _processing.get() is self:
+            # The worker is busy with the perception this one came from.
+            return await self._process(perception, stream)
+
+        if isinstance(perception, dict):
+            perception = Perception.from_dict(perception)
+        if perception.type in self.coalescer.windows:
+            return await self.coalescer.add(
+                perception, _perception_priority(perception, priority), stream
+            )
+        return await self._enqueue(
+            Envelope(
+                perception=perception,
+                priority=_perception_priority(perception, priority),
+                stream=stream,
+            )
+        )
+
+    async def sense_many(
+        self,
+        perceptions: Iterable[Union[Perception, Dict[str, Any]]],
+        max_concurrency: int = 8,
+        ordered: bool = True,
+    ) -> AsyncIterator[Optional[Decision]]:
+        """
+        Process many perceptions, making their decisions concurrently.
+
+        Up to ``max_concurrency`` decisions are made at once, each without
+        seeing the others' perceptions, so the perceptions should be
+        independent, like recorded sensor readings or imported conversations.
+        Each decision is then applied like ``sense`` applies one: through the
+        mailbox, one at a time. With ``ordered``, decisions are applied and
+        yielded in the order of ``perceptions``. Otherwise they are applied
+        and yielded as they are made.
+
+        Args:
+            perceptions (Iterable[Union[Perception, Dict[str, Any]]]): The perceptions, read lazily.
+            max_concurrency (int): Most decisions made at once.
+            ordered (bool): Whether to apply and yield decisions in the order of ``perceptions``.
+
+        Yields:
+            Optional[Decision]: Each perception's decision, or None if none was made or the
+            perception was dropped or queued.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        perceptions = iter(perceptions)
+        if not self.is_ready():
+            for perception in perceptions:
+                yield await self.sense(perception)
+            return
+
+        pending: Deque[asyncio.Task] = deque()
+
+        def fill() -> None:
+            for perception in itertools.islice(
+                perceptions, max_concurrency - len(pending)
+            ):
+                pending.append(asyncio.ensure_future(self._decide(perception)))
+
+        try:
+            fill()
+            while pending:
+                if ordered:
+                    task = pending.popleft()
+                    await asyncio.wait([task])
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    task = next(t for t in pending if t in done)
+                    pending.remove(task)
+                fill()
+                perception, decision = task.result()
+                yield await self._apply(perception, decision)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _decide(
+        self, perception: Union[Perception, Dict[str, Any]]
+    ) -> Tuple[Perception, Optional[Decision]]:
+        """Make a decision for a perception without applying it, for ``sense_many``."""
+        if isinstance(perception, dict):
+            perception = Perception.from_dict(perception)
+        with (
+            budget_owner(self.config.name),
+            metrics_scope(self.config.name),
+            deadline(self.config.perception_deadline),
+        ):
+            return perception, await self.brain.make_decision(perception)
+
+    async def _apply(
+        self, perception: Perception, decision: Optional[Decision]
+    ) -> Optional[Decision]:
+        """Apply a decision made by ``_decide`` through the mailbox."""
+        if decision is None:
+            logger.warning("No decision was made for the given perception.")
+            return None
+        if _processing.get() is self:
+            return await self._process(perception, decision=decision)
+        return await self._enqueue(
+            Envelope(
+                perception=perception,
+                priority=_perception_priority(perception, None),
+                decision=decision,
+            )
+        )
+
+    async def _flush_coalesced(
+        self, perception: Perception, priority: int, count: int, stream: bool
+    ) -> Optional[Decision]:
+        """Process the perception merged from a closed coalescing window."""
+        with metrics_scope(self.config.name):
+            self.metrics.record_coalescing(perception.type, count)
+        return await self._enqueue(
+            Envelope(perception=perception, priority=priority, stream=stream)
+        )
+
+    async def _enqueue(self, envelope: Envelope) -> Optional[Decision]:
+        """Put an envelope in the mailbox and wait for its decision, or None if it is dropped."""
+        mailbox = self._ensure_worker()
+        envelope.future = asyncio.get_running_loop().create_future()
+        dropped = await mailbox.put(envelope)
+        if dropped is not envelope:
+            self._record_mailbox(depth=1)
+        if dropped is not None:
+            logger.warning(
+                f"Mailbox of Framer {self.config.name} is full. "
+                f"Dropping perception: {dropped.perception}"
+            )
+            if dropped is not envelope:
+                self._record_mailbox(depth=-1, dropped=1)
+                if not dropped.future.done():
+                    dropped.future.set_result(None)
+            else:
+                self._record_mailbox(dropped=1)
+                return None
+        return await envelope.future
+
+    async def _process(
+        self,
+        perception: Union[Perception, Dict[str, Any]],
+        stream: bool = False,
+        decision: Optional[Decision] = None,
+    ) -> Optional[Decision]:
+        """
+        Decide on a perception, execute the decision and notify the observers.
+
+        Args:
+            perception (Union[Perception, Dict[str, Any]]): The perception to process.
+            stream (bool): Whether to stream the response to the stream observers.
+            decision (Optional[Decision]): A decision already made for the perception. None makes one.
+
+        Returns:
+            Optional[Decision]: The decision, or None if none was made.
+        """
         # Convert perception to Perception object if it is a dictionary
         if isinstance(perception, dict):
             perception = Perception.from_dict(perception)
         current_goals = self.agency.get_goals()
-        decision = await self.brain.process_perception(perception, current_goals)
+        # Charge every completion made for this perception to the Framer's cost
+        # budget and metrics, and bound the time they may take together.
+        with (
+            budget_owner(self.config.name),
+            metrics_scope(self.config.name),
+            deadline(self.config.perception_deadline),
+        ):
+            # The decision is executed below, once, with the stream state set.
+            decision = await self.brain.process_perception(
+                perception, current_goals, decision=decision, execute=False
+            )
+            if decision:
+                # Handle execution based on execution_mode
+                self.execution_context.set_state("stream", stream)
+                try:
+                    executed_decision = await self.brain.execute_decision(decision)
+                    await self._consume_stream(executed_decision)
+                finally:
+                    self.execution_context.set_state("stream", False)
 
         if decision:
-            # Handle execution based on execution_mode
-            executed_decision = await self.brain.execute_decision(decision)
-
             # Check the status of the executed decision
             if executed_decision.status == "pending_approval":
                 # Notify user or system for approval
@@ -647,19 +983,118 @@ class Framer:
             return None
         return decision
 
-    async def prompt(self, text: str) -> Decision:
+    def _ensure_worker(self) -> PerceptionMailbox:
+        """Start the mailbox worker on the running loop if it is not running there."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and self._worker.get_loop() is not loop:
+            # The old loop's worker and mailbox cannot be used from this one.
+            self._worker.cancel()
+            self._worker = None
+            self.mailbox = _mailbox(self.config)
+        if self._worker is None or self._worker.done():
+            # Start from an empty context, so the worker does not keep the deadline,
+            # budget owner or metrics scope of whichever caller started it.
+            self._worker = contextvars.Context().run(
+                loop.create_task, self._run_mailbox()
+            )
+        return self.mailbox
+
+    async def _run_mailbox(self) -> None:
+        """Process the mailbox's perceptions one at a time, resolving each caller's future."""
+        _processing.set(self)
+        while True:
+            envelope = await self.mailbox.get()
+            self._record_mailbox(
+                depth=-1, wait=time.perf_counter() - envelope.enqueued_at
+            )
+            try:
+                if envelope.future.done():
+                    # The caller stopped waiting.
+                    continue
+                try:
+                    decision = await self._process(
+                        envelope.perception, envelope.stream, envelope.decision
+                    )
+                except asyncio.CancelledError:
+                    envelope.future.cancel()
+                    raise
+                except Exception as e:
+                    if not envelope.future.done():
+                        envelope.future.set_exception(e)
+                else:
+                    if not envelope.future.done():
+                        envelope.future.set_result(decision)
+            finally:
+                await self.mailbox.task_done()
+
+    def _record_mailbox(self, **kwargs) -> None:
+        """Record a mailbox change in the Framer's metrics, under this Framer."""
+        with metrics_scope(self.config.name):
+            self.metrics.record_mailbox(**kwargs)
+
+    async def _stop_worker(self) -> None:
+        """Stop the mailbox worker and resolve the perceptions still queued with None."""
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        loop = asyncio.get_running_loop()
+        worker.cancel()
+        if worker.get_loop() is not loop:
+            self.mailbox = _mailbox(self.config)
+            return
+        if worker is not asyncio.current_task():
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        for envelope in await self.mailbox.drain():
+            self._record_mailbox(depth=-1)
+            if not envelope.future.done():
+                envelope.future.set_result(None)
+
+    async def prompt(self, text: str, stream: bool = False) -> Decision:
         """
         Process a prompt as a new perception of type 'hearing'.
 
         Args:
             text (str): The text of the prompt.
+            stream (bool): Whether to stream the response to the stream observers as it is generated.
 
         Returns:
             Decision: The decision made based on the prompt.
         """
         perception_dict = {"type": "hearing", "data": {"text": text}}
         perception = Perception.from_dict(perception_dict)
-        return await self.sense(perception)
+        return await self.sense(perception, stream=stream)
+
+    async def _consume_stream(self, decision: Decision) -> None:
+        """
+        Forward a streamed response to the stream observers chunk by chunk.
+
+        Each observer is awaited before the next chunk is pulled, so slow
+        observers apply backpressure to the model stream. Once the stream ends
+        the decision's response is replaced with the full text, so decision
+        observers see the same result as for a non-streamed response.
+
+        Args:
+            decision (Decision): The executed decision.
+        """
+        result = getattr(decision, "result", None)
+        if not isinstance(result, dict) or not inspect.isasyncgen(
+            result.get("response")
+        ):
+            return
+
+        parts: List[str] = []
+        try:
+            async for chunk in result["response"]:
+                parts.append(chunk)
+                for observer in list(self.stream_observers):
+                    outcome = observer(chunk)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+        finally:
+            result["response"] = "".join(parts).strip()
 
     def add_observer(self, observer: Observer) -> None:
         """
@@ -679,6 +1114,24 @@ class Framer:
         """
         self.observers.remove(observer)
 
+    def add_stream_observer(self, observer: StreamObserver) -> None:
+        """
+        Add an observer to be called with each chunk of a streamed response.
+
+        Args:
+            observer (StreamObserver): A function or coroutine function taking the chunk text.
+        """
+        self.stream_observers.append(observer)
+
+    def remove_stream_observer(self, observer: StreamObserver) -> None:
+        """
+        Remove a stream observer.
+
+        Args:
+            observer (StreamObserver): The observer to remove.
+        """
+        self.stream_observers.remove(observer)
+
     def notify_observers(self, decision: Decision) -> None:
         """
         Notify all observers about a decision.
@@ -749,21 +1202,28 @@ class Framer:
         prevent memory leaks and ensure optimal performance. This method
         should be called to gracefully shut down the Framer.
 
-        Prints total LLM costs incurred by this Framer instance.
-        """
-        # Get final metrics
-        metrics = self.llm_service.get_metrics()
-        total_cost = self.llm_service.get_total_cost()
-        total_calls = self.llm_service.get_total_calls()
-        
-        print("\nFramer Metrics:")
-        print(f"Total LLM API Calls: {total_calls}")
-        print(f"Total Cost: ${total_cost:.4f}")
-        for model, stats in metrics.items():
-            if isinstance(stats, dict):
-                print(f"\n{model}:")
-                print(f"  Calls: {stats.get('calls', 0)}")
-                print(f"  Cost: ${stats.get('cost', 0):.4f}")
+        Logs the LLM calls, cost and latency attributed to this Framer.
+        Perceptions still in the mailbox or in open coalescing windows are
+        not processed; their ``sense`` calls return None.
+        """
+        self.coalescer.cancel()
+        await self._stop_worker()
+        metrics = self.llm_service.get_metrics(framer=self.config.name)
+        logger.info(
+            f"Framer {self.config.name} closing: "
+            f"{metrics.get('total_calls', 0)} LLM calls, "
+            f"${metrics.get('total_cost', 0.0):.4f} total cost"
+        )
+        for model, stats in metrics.get("models", {}).items():
+            logger.info(
+                f"  {model}: {stats.get('calls', 0)} calls, ${stats.get('cost', 0):.4f}"
+            )
+        for model, call_sites in metrics.get("latency", {}).items():
+            for call_site, latency in call_sites.items():
+                logger.info(
+                    f"  {model} [{call_site}] latency: p50 {latency['p50']:.2f}s, "
+                    f"p95 {latency['p95']:.2f}s, p99 {latency['p99']:.2f}s"
+                )
         # Close all workflows
         for workflow in self.workflow_manager.workflows.values():
             workflow.set_final_task(
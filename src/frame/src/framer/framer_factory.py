@@ -148,7 +148,7 @@ class FramerFactory:
         framer.agency.set_roles(roles)
 
         # Set the Framer instance in Brain
-        framer.brain.set_framer(framer)
+        await framer.brain.set_framer(framer)
 
         # Notify observers about the Framer being opened
         for observer in framer.observers:
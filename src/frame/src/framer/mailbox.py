@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple, Union
+
+from frame.src.framer.common.enums import OverflowPolicy
+
+
+@dataclass
+class Envelope:
+    """
+    A perception waiting in a mailbox.
+
+    Attributes:
+        perception (Any): The perception.
+        priority (int): Higher priorities are processed first.
+        stream (bool): Whether the response should be streamed.
+        decision (Any): A decision already made for the perception, applied instead of making one.
+        future (Optional[asyncio.Future]): Resolved with the decision, or None if the perception is dropped.
+        enqueued_at (float): ``time.perf_counter()`` when the envelope was created.
+    """
+
+    perception: Any
+    priority: int
+    stream: bool = False
+    decision: Any = None
+    future: Optional[asyncio.Future] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class PerceptionMailbox:
+    """
+    Bounded priority queue of perceptions for one Framer.
+
+    Envelopes come out by descending priority, then in the order they were
+    put in. When the mailbox is full, ``overflow`` decides what happens to a
+    new envelope: ``BLOCK`` makes ``put`` wait for room, ``DROP_OLDEST``
+    drops the envelope that has waited longest, and ``DROP_LOWEST_PRIORITY``
+    drops the oldest of the lowest-priority envelopes, or the new one if no
+    queued envelope has a lower priority.
+
+    Attributes:
+        max_size (int): Most envelopes held at once.
+        overflow (OverflowPolicy): What a full mailbox does with a new envelope.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        overflow: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.overflow = OverflowPolicy(overflow)
+        self._heap: List[Tuple[int, int, Envelope]] = []
+        self._order = itertools.count()
+        self._unfinished = 0
+        # Created on first use, so the mailbox can be built outside an event loop.
+        self._changed: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def _remove(self, entry: Tuple[int, int, Envelope]) -> Envelope:
+        self._heap.remove(entry)
+        heapq.heapify(self._heap)
+        self._unfinished -= 1
+        return entry[2]
+
+    async def put(self, envelope: Envelope) -> Optional[Envelope]:
+        """
+        Add an envelope, applying the overflow policy if the mailbox is full.
+
+        Args:
+            envelope (Envelope): The envelope.
+
+        Returns:
+            Optional[Envelope]: The envelope dropped to make room, which is ``envelope``
+            itself if it was rejected, or None if nothing was dropped.
+        """
+        changed = self._condition()
+        async with changed:
+            dropped = None
+            if len(self._heap) >= self.max_size:
+                if self.overflow == OverflowPolicy.BLOCK:
+                    await changed.wait_for(lambda: len(self._heap) < self.max_size)
+                elif self.overflow == OverflowPolicy.DROP_OLDEST:
+                    dropped = self._remove(min(self._heap, key=lambda entry: entry[1]))
+                else:
+                    lowest = max(self._heap, key=lambda entry: (entry[0], -entry[1]))
+                    if envelope.priority <= lowest[2].priority:
+                        return envelope
+                    dropped = self._remove(lowest)
+            heapq.heappush(
+                self._heap, (-envelope.priority, next(self._order), envelope)
+            )
+            self._unfinished += 1
+            changed.notify_all()
+            return dropped
+
+    async def get(self) -> Envelope:
+        """
+        Take the highest-priority envelope, waiting for one if the mailbox is empty.
+
+        Returns:
+            Envelope: The envelope. Call ``task_done`` once it is processed.
+        """
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(lambda: bool(self._heap))
+            _, _, envelope = heapq.heappop(self._heap)
+            changed.notify_all()
+            return envelope
+
+    async def task_done(self) -> None:
+        """Mark an envelope taken with ``get`` as processed."""
+        changed = self._condition()
+        async with changed:
+            self._unfinished -= 1
+            changed.notify_all()
+
+    async def join(self) -> None:
+        """Wait until every envelope put in has been processed or dropped."""
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(lambda: self._unfinished <= 0)
+
+    async def drain(self) -> List[Envelope]:
+        """
+        Remove every queued envelope.
+
+        Returns:
+            List[Envelope]: The removed envelopes, highest priority first.
+        """
+        changed = self._condition()
+        async with changed:
+            envelopes = [entry[2] for entry in sorted(self._heap)]
+            self._heap.clear()
+            self._unfinished -= len(envelopes)
+            changed.notify_all()
+            return envelopes
+
+    def __len__(self) -> int:
+        return len(self._heap)
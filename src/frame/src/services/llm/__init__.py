@@ -3,5 +3,39 @@ LLM Service initialization
 """
 from .llm_adapters import LMQLAdapter, available_adapters, register_adapter
 from .llm_service import LLMService
+from .llm_cache import CompletionCache
+from .request_coalescer import RequestCoalescer
+from .rate_limiter import RateLimiter, RateLimits
+from .client_registry import ClientRegistry, ClientPoolConfig
+from .completion_batch import CompletionResult
+from .model_router import ModelRouter, budget_owner
+from .hedging import HedgePolicy
+from .retry_policy import (
+    RetryPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    deadline,
+)
 
-__all__ = ['LLMService', 'LMQLAdapter', 'available_adapters', 'register_adapter']
+__all__ = [
+    "LLMService",
+    "LMQLAdapter",
+    "CompletionCache",
+    "RequestCoalescer",
+    "RateLimiter",
+    "RateLimits",
+    "ClientRegistry",
+    "ClientPoolConfig",
+    "CompletionResult",
+    "ModelRouter",
+    "budget_owner",
+    "HedgePolicy",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "deadline",
+    "available_adapters",
+    "register_adapter",
+]
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from frame.src.services.llm.llm_adapters.lmql.lmql_interface import LMQLInterface
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClientPoolConfig:
+    """
+    Connection pool settings for provider HTTP clients.
+
+    Attributes:
+        max_connections (int): Maximum number of concurrent connections per endpoint.
+        max_keepalive_connections (int): Maximum number of idle connections kept open per endpoint.
+        keepalive_expiry (float): Seconds an idle connection is kept open.
+        timeout (float): Request timeout in seconds.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 60.0
+
+
+class ClientRegistry:
+    """
+    Registry of long-lived provider clients and LMQL model interfaces.
+
+    Keeps one pooled HTTP client per provider and endpoint, so connections and
+    TLS sessions are reused across adapters and requests, and one
+    ``LMQLInterface`` per model, so ``lmql.model`` is only loaded once.
+
+    Attributes:
+        pool_config (ClientPoolConfig): Connection pool settings for new HTTP clients.
+    """
+
+    def __init__(self, pool_config: Optional[ClientPoolConfig] = None):
+        self.pool_config = pool_config or ClientPoolConfig()
+        self._http_clients: Dict[Tuple[str, Optional[str]], httpx.AsyncClient] = {}
+        self._openai_clients: Dict[Tuple[Optional[str], str], AsyncOpenAI] = {}
+        self._lmql_interfaces: Dict[str, LMQLInterface] = {}
+        self._closing: Optional[asyncio.Task] = None
+
+    def get_http_client(
+        self, provider: str, base_url: Optional[str] = None
+    ) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client for a provider and endpoint, creating it if needed.
+
+        Args:
+            provider (str): The provider name.
+            base_url (Optional[str]): The endpoint. None uses the provider default.
+
+        Returns:
+            httpx.AsyncClient: The shared HTTP client.
+        """
+        key = (provider, base_url)
+        client = self._http_clients.get(key)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.pool_config.max_connections,
+                max_keepalive_connections=self.pool_config.max_keepalive_connections,
+                keepalive_expiry=self.pool_config.keepalive_expiry,
+            )
+            client_class = (
+                DefaultAsyncHttpxClient if provider == "openai" else httpx.AsyncClient
+            )
+            client = client_class(limits=limits, timeout=self.pool_config.timeout)
+            self._http_clients[key] = client
+            logger.debug(
+                f"Created pooled HTTP client for {provider} ({base_url or 'default'})"
+            )
+        return client
+
+    def get_openai_client(
+        self, api_key: str, base_url: Optional[str] = None
+    ) -> AsyncOpenAI:
+        """
+        Get an OpenAI client that uses the pooled HTTP client for its endpoint.
+
+        Args:
+            api_key (str): The OpenAI API key.
+            base_url (Optional[str]): The API endpoint. None uses the OpenAI default.
+
+        Returns:
+            AsyncOpenAI: The shared OpenAI client for this key and endpoint.
+        """
+        key = (base_url, api_key)
+        client = self._openai_clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=self.get_http_client("openai", base_url),
+                # LLMService's RetryPolicy is the only retry layer.
+                max_retries=0,
+            )
+            self._openai_clients[key] = client
+        return client
+
+    def get_lmql_interface(self, model_name: str) -> LMQLInterface:
+        """
+        Get the LMQL interface for a model, loading the model on first use.
+
+        Args:
+            model_name (str): The model name.
+
+        Returns:
+            LMQLInterface: The shared interface for the model.
+        """
+        interface = self._lmql_interfaces.get(model_name)
+        if interface is None:
+            interface = LMQLInterface(model_name=model_name)
+            self._lmql_interfaces[model_name] = interface
+        return interface
+
+    async def aclose(self) -> None:
+        """Close every pooled HTTP client and drop cached clients and interfaces."""
+        closing, self._closing = self._closing, None
+        if closing is not None:
+            await closing
+        await self._close_clients()
+
+    def close(self) -> Optional[asyncio.Task]:
+        """
+        Close the registry from synchronous code.
+
+        Runs ``aclose`` to completion when no event loop is running. Inside a
+        running loop the clients are closed in a task, which is returned and
+        which ``aclose`` also waits for.
+
+        Returns:
+            Optional[asyncio.Task]: The task closing the clients, or None if they are closed.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.aclose())
+            return None
+        if self._closing is None or self._closing.done():
+            self._closing = loop.create_task(self._close_clients())
+        return self._closing
+
+    async def _close_clients(self) -> None:
+        http_clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        self._openai_clients.clear()
+        self._lmql_interfaces.clear()
+        for client in http_clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+
+
+default_client_registry = ClientRegistry()
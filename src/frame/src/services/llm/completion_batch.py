@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class CompletionResult:
+    """
+    The outcome of one request in a batch of completions.
+
+    Attributes:
+        index (int): Position of the request in the batch.
+        result (Optional[str]): The completion, or None if the request failed.
+        error (Optional[Exception]): The error raised by the request, if any.
+    """
+
+    index: int
+    result: Optional[str] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,243 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from frame.src.services.llm.prompt_layout import PromptLayout, PromptSection
+from frame.src.utils.llm_utils import get_context_window
+from frame.src.utils.token_utils import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Tokens taken by the separator between two sections.
+SEPARATOR_TOKENS = 1
+
+Summarizer = Callable[[str, int], Awaitable[str]]
+
+
+@dataclass
+class ContextSection:
+    """
+    A labelled part of a prompt.
+
+    Attributes:
+        name (str): Label the section's tokens are reported under.
+        items (List[str]): The section's entries. Whole entries are dropped before one is cut.
+        priority (int): Higher priorities are cut later. Ties are cut in the order they were added.
+        section (PromptSection): Where the section goes in the prompt layout.
+        required (bool): Whether the section is never cut.
+        keep (str): Which entries, and which end of a cut entry, are kept: "start" or "end".
+        summarize (bool): Whether the section may be summarized instead of cut.
+        header (Optional[str]): Line put above the entries, dropped with the last entry.
+        separator (str): String between entries.
+    """
+
+    name: str
+    items: List[str]
+    priority: int = 0
+    section: PromptSection = PromptSection.CONTEXT
+    required: bool = False
+    keep: str = "start"
+    summarize: bool = False
+    header: Optional[str] = None
+    separator: str = "\n"
+
+    def text(self) -> str:
+        body = self.separator.join(item for item in self.items if item)
+        if not body:
+            return ""
+        return f"{self.header}\n{body}" if self.header else body
+
+
+@dataclass
+class AssembledContext:
+    """
+    Sections fitted into a token budget.
+
+    Attributes:
+        layout (PromptLayout): The fitted sections, laid out for the prompt.
+        tokens (Dict[str, int]): Tokens each section contributed, by name.
+        budget (Optional[int]): The token budget, or None if it was unbounded.
+        truncated (List[str]): Names of the sections that were cut or dropped.
+        summarized (List[str]): Names of the sections that were summarized.
+    """
+
+    layout: PromptLayout
+    tokens: Dict[str, int]
+    budget: Optional[int]
+    truncated: List[str] = field(default_factory=list)
+    summarized: List[str] = field(default_factory=list)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.tokens.values())
+
+
+class ContextAssembler:
+    """
+    Fits labelled prompt sections into a token budget.
+
+    The budget is the model's context window minus the tokens reserved for
+    the completion, capped by ``budget`` when given. When the sections do
+    not fit, the lowest-priority ones are shrunk first: their entries are
+    dropped from the end ``keep`` does not name, the last entry is cut to
+    the tokens left, and sections marked ``summarize`` are summarized down
+    to them instead when a summarizer is available. Required sections are
+    never cut. Tokens are counted with the model's tokenizer.
+
+    Attributes:
+        model (Optional[str]): The model the prompt is for, used to count tokens.
+        budget (Optional[int]): The token budget, or None if it is unbounded.
+        summarizer (Optional[Summarizer]): Shortens a text to about the given number of tokens.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        max_tokens: int = 0,
+        budget: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.model = model
+        window = get_context_window(model) if model else None
+        if window is not None:
+            window = max(window - max_tokens, 0)
+            budget = window if budget is None else min(budget, window)
+        self.budget = budget
+        self.summarizer = summarizer
+        self._sections: List[ContextSection] = []
+
+    def add(
+        self,
+        name: str,
+        content: Union[str, Sequence[str], None],
+        priority: int = 0,
+        section: PromptSection = PromptSection.CONTEXT,
+        required: bool = False,
+        keep: str = "start",
+        summarize: bool = False,
+        header: Optional[str] = None,
+        separator: str = "\n",
+    ) -> "ContextAssembler":
+        """
+        Add a section. Empty content is ignored.
+
+        Args:
+            name (str): Label the section's tokens are reported under.
+            content (Union[str, Sequence[str], None]): The text, or entries that can be dropped one by one.
+            priority (int): Higher priorities are cut later.
+            section (PromptSection): Where the section goes in the prompt layout.
+            required (bool): Whether the section is never cut.
+            keep (str): Which entries, and which end of a cut entry, are kept: "start" or "end".
+            summarize (bool): Whether the section may be summarized instead of cut.
+            header (Optional[str]): Line put above the entries.
+            separator (str): String between entries.
+
+        Returns:
+            ContextAssembler: This assembler, to chain calls.
+
+        Raises:
+            ValueError: If a section with this name was already added.
+        """
+        if any(existing.name == name for existing in self._sections):
+            raise ValueError(f"Duplicate prompt section: {name}")
+        items = [content] if isinstance(content, str) else list(content or [])
+        items = [item for item in items if item]
+        if items:
+            self._sections.append(
+                ContextSection(
+                    name,
+                    items,
+                    priority,
+                    section,
+                    required,
+                    keep,
+                    summarize,
+                    header,
+                    separator,
+                )
+            )
+        return self
+
+    async def assemble(self) -> AssembledContext:
+        """
+        Fit the sections into the budget and lay them out.
+
+        Returns:
+            AssembledContext: The layout and the tokens each section contributed.
+        """
+        tokens = {section.name: self._count(section) for section in self._sections}
+        result = AssembledContext(PromptLayout(), tokens, self.budget)
+        overflow = self._overflow(tokens)
+        if overflow > 0:
+            order = sorted(
+                (section for section in self._sections if not section.required),
+                key=lambda section: section.priority,
+            )
+            for section in order:
+                if overflow <= 0:
+                    break
+                before = tokens[section.name]
+                target = max(before - overflow, 0)
+                if (
+                    section.summarize
+                    and self.summarizer is not None
+                    and target > 0
+                    and await self._summarize(section, target)
+                ):
+                    result.summarized.append(section.name)
+                self._shrink(section, target)
+                tokens[section.name] = self._count(section)
+                if section.name not in result.summarized:
+                    result.truncated.append(section.name)
+                overflow = self._overflow(tokens)
+            if overflow > 0:
+                logger.warning(
+                    f"Required prompt sections exceed the {self.budget} token budget "
+                    f"by {overflow} tokens"
+                )
+
+        for section in self._sections:
+            result.layout.add(section.section, section.text())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Prompt sections (tokens): {tokens}, budget: {self.budget}")
+        return result
+
+    def _count(self, section: ContextSection) -> int:
+        return count_tokens(section.text(), self.model)
+
+    def _overflow(self, tokens: Dict[str, int]) -> int:
+        if self.budget is None:
+            return 0
+        present = [count for count in tokens.values() if count]
+        separators = SEPARATOR_TOKENS * max(len(present) - 1, 0)
+        return sum(present) + separators - self.budget
+
+    async def _summarize(self, section: ContextSection, target: int) -> bool:
+        try:
+            summary = await self.summarizer(section.text(), target)
+        except Exception as e:
+            logger.warning(
+                f"Could not summarize the {section.name} section, cutting it: {e}"
+            )
+            return False
+        section.items = [summary] if summary else []
+        section.header = None
+        return True
+
+    def _shrink(self, section: ContextSection, target: int) -> None:
+        """Drop entries from the end ``keep`` does not name, then cut the last one, to fit ``target``."""
+        while section.items and self._count(section) > target:
+            if len(section.items) == 1:
+                section.items[0] = self._cut(section, target)
+                break
+            section.items.pop(0 if section.keep == "end" else -1)
+        if section.items and not section.items[0]:
+            section.items = []
+
+    def _cut(self, section: ContextSection, target: int) -> str:
+        item = section.items[0]
+        overhead = count_tokens(section.header, self.model) + 1 if section.header else 0
+        room = target - overhead
+        return (
+            truncate_to_tokens(item, room, self.model, section.keep) if room > 0 else ""
+        )
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import math
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from frame.src.services.llm.model_router import current_budget_owner
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Sends a duplicate request when the original is slower than usual.
+
+    Once a request has been outstanding longer than its model's rolling
+    latency percentile, an identical request is sent, to the same model or to
+    the model's entry in ``fallbacks``. Whichever finishes first is used and
+    the other is cancelled. Hedges are limited to ``max_extra_ratio`` of the
+    requests made by each budget owner, so a Framer cannot multiply its load.
+
+    Attributes:
+        max_extra_ratio (float): Largest share of extra requests per budget owner, e.g. 0.05 for 5%.
+        percentile (float): Latency percentile after which a request is hedged.
+        min_samples (int): Latencies a model needs before its requests are hedged.
+        min_delay (float): Shortest time in seconds to wait before hedging.
+        fallbacks (Dict[str, str]): Model to send the hedge to, per original model.
+    """
+
+    def __init__(
+        self,
+        max_extra_ratio: float = 0.05,
+        percentile: float = 0.95,
+        window: int = 100,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        fallbacks: Optional[Dict[str, str]] = None,
+    ):
+        self.max_extra_ratio = max_extra_ratio
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.fallbacks = fallbacks or {}
+        self._latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+        self._budgets: Dict[str, float] = {}
+        self._requests: Dict[Optional[str], int] = defaultdict(int)
+        self._hedges: Dict[Optional[str], int] = defaultdict(int)
+
+    def record_latency(self, model: str, seconds: float) -> None:
+        """
+        Record the latency of a successful call.
+
+        Args:
+            model (str): The model name.
+            seconds (float): The call latency in seconds.
+        """
+        self._latencies[model].append(seconds)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """
+        Get how long a request to a model may run before it is hedged.
+
+        Args:
+            model (str): The model name.
+
+        Returns:
+            Optional[float]: The delay in seconds, or None if too few latencies were recorded.
+        """
+        samples = sorted(self._latencies.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = min(
+            len(samples) - 1, max(0, math.ceil(self.percentile * len(samples)) - 1)
+        )
+        return max(samples[rank], self.min_delay)
+
+    def hedge_model(self, model: str) -> str:
+        """
+        Get the model a hedge for a request to ``model`` is sent to.
+
+        Args:
+            model (str): The model of the original request.
+
+        Returns:
+            str: The hedge's model.
+        """
+        return self.fallbacks.get(model, model)
+
+    def set_budget(self, owner: str, max_extra_ratio: Optional[float]) -> None:
+        """
+        Set the hedge budget of an owner.
+
+        Args:
+            owner (str): The budget owner, usually a Framer name.
+            max_extra_ratio (Optional[float]): Largest share of extra requests, or
+                None to use the policy's ``max_extra_ratio``.
+        """
+        if max_extra_ratio is None:
+            self._budgets.pop(owner, None)
+        else:
+            self._budgets[owner] = max_extra_ratio
+
+    def _take_hedge(self, owner: Optional[str]) -> bool:
+        ratio = self._budgets.get(owner, self.max_extra_ratio)
+        if self._hedges[owner] + 1 > ratio * self._requests[owner]:
+            return False
+        self._hedges[owner] += 1
+        return True
+
+    async def run(
+        self,
+        model: str,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+    ) -> Tuple[T, Optional[bool]]:
+        """
+        Run a request, hedging it if it is slower than the model's percentile.
+
+        Args:
+            model (str): The model of the original request.
+            primary (Callable[[], Awaitable[T]]): Sends the original request.
+            hedge (Callable[[], Awaitable[T]]): Sends the duplicate request.
+
+        Returns:
+            Tuple[T, Optional[bool]]: The first successful result, and whether the
+            hedge won, or None if no hedge was sent.
+
+        Raises:
+            Exception: The original request's error if every request sent failed.
+        """
+        owner = current_budget_owner()
+        self._requests[owner] += 1
+        delay = self.hedge_delay(model)
+        original = asyncio.ensure_future(primary())
+        tasks = [original]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self._take_hedge(owner):
+                    logger.debug(
+                        f"Hedging request to {model} after {delay:.2f}s "
+                        f"with {self.hedge_model(model)}"
+                    )
+                    tasks.append(asyncio.ensure_future(hedge()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Prefer the original when both finished in the same step.
+                for task in sorted(done, key=lambda task: task is not original):
+                    if task.exception() is None:
+                        won = (task is not original) if len(tasks) > 1 else None
+                        return task.result(), won
+            # Every request failed; report the original's error.
+            return original.result(), None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -7,19 +7,35 @@ Core adapter:
 Optional plugin adapters (require explicit permissions):
 - DSPy: Advanced prompt programming (with_dspy)
 - HuggingFace: Local model support (with_huggingface)
+
+Local adapter:
+- Local: Batched CPU inference with transformers (use_local_model)
+
+Testing adapter:
+- Replay: Records real completions and replays them offline for benchmarks
 """
 
 from .lmql import LMQLAdapter
 from .dspy import DSPyAdapter
 from .huggingface import HuggingFaceAdapter
+from .replay import ReplayAdapter
+from .local import LocalModelAdapter
 
-__all__ = ['LMQLAdapter', 'DSPyAdapter', 'HuggingFaceAdapter']
+__all__ = [
+    "LMQLAdapter",
+    "DSPyAdapter",
+    "HuggingFaceAdapter",
+    "ReplayAdapter",
+    "LocalModelAdapter",
+]
 
 # LMQL is the core adapter, always available
 available_adapters = {
-    'lmql': LMQLAdapter,
-    'dspy': DSPyAdapter,
-    'huggingface': HuggingFaceAdapter
+    "lmql": LMQLAdapter,
+    "dspy": DSPyAdapter,
+    "huggingface": HuggingFaceAdapter,
+    "replay": ReplayAdapter,
+    "local": LocalModelAdapter,
 }
 
 def register_adapter(name: str, adapter_class):
@@ -1,9 +1,8 @@
 from typing import Dict, Any, Optional
 import asyncio
-import tenacity
 from frame.src.services.llm.llm_adapter_interface import LLMAdapterInterface
 from frame.src.services.llm.llm_config import LLMConfig
-from .....utils.token_bucket import TokenBucket
+from frame.src.services.llm.rate_limiter import RateLimiter
 
 class DSPyConfig(LLMConfig):
     """Configuration for DSPy operations."""
@@ -19,27 +18,18 @@ class DSPyAdapter(LLMAdapterInterface):
     Adapter for DSPy operations with rate limiting.
 
     This class provides methods to interact with DSPy models, including
-    generating completions with retry logic for handling exceptions.
+    generating completions. Retries are handled by LLMService.
 
     Attributes:
         config (DSPyConfig): Configuration for DSPy operations.
-        token_bucket (TokenBucket): Token bucket for rate limiting.
+        rate_limiter (Optional[RateLimiter]): Shared rate limiter for provider feedback.
     """
 
-    def __init__(self, config: DSPyConfig):
+    def __init__(self, config: DSPyConfig, rate_limiter: Optional[RateLimiter] = None):
         """Initialize the DSPy adapter with configuration."""
         self.config = config
-        self.token_bucket = TokenBucket(
-            tokens=config.rate_limit_tokens,
-            seconds=config.rate_limit_seconds
-        )
+        self.rate_limiter = rate_limiter
 
-    @tenacity.retry(
-        stop=tenacity.stop_after_attempt(5),
-        wait=tenacity.wait_exponential(multiplier=1, min=4, max=10),
-        retry=tenacity.retry_if_exception_type((asyncio.TimeoutError, Exception)),
-        reraise=True,
-    )
     async def get_completion(
         self,
         prompt: str,
@@ -1,10 +1,9 @@
 import os
 from typing import Dict, Any, Optional
 import asyncio
-import tenacity
 from frame.src.services.llm.llm_adapter_interface import LLMAdapterInterface
 from frame.src.services.llm.llm_config import LLMConfig
-from .....utils.token_bucket import TokenBucket
+from frame.src.services.llm.rate_limiter import RateLimiter
 
 class HuggingFaceConfig(LLMConfig):
     """Configuration for HuggingFace operations."""
@@ -20,28 +19,24 @@ class HuggingFaceAdapter(LLMAdapterInterface):
     Adapter for HuggingFace operations with rate limiting.
 
     This class provides methods to interact with HuggingFace models, including
-    generating completions with retry logic for handling exceptions.
+    generating completions. Retries are handled by LLMService.
 
     Attributes:
         config (HuggingFaceConfig): Configuration for HuggingFace operations.
-        token_bucket (TokenBucket): Token bucket for rate limiting.
+        rate_limiter (Optional[RateLimiter]): Shared rate limiter for provider feedback.
     """
 
-    def __init__(self, huggingface_api_key: str = "", **kwargs):
+    def __init__(
+        self,
+        huggingface_api_key: str = "",
+        rate_limiter: Optional[RateLimiter] = None,
+        **kwargs,
+    ):
         """Initialize the HuggingFace adapter with configuration."""
         self.config = HuggingFaceConfig(**kwargs)
-        self.token_bucket = TokenBucket(
-            tokens=self.config.rate_limit_tokens,
-            seconds=self.config.rate_limit_seconds
-        )
+        self.rate_limiter = rate_limiter
         self.api_key = huggingface_api_key or os.getenv("HUGGINGFACE_API_KEY", "")
 
-    @tenacity.retry(
-        stop=tenacity.stop_after_attempt(5),
-        wait=tenacity.wait_exponential(multiplier=1, min=4, max=10),
-        retry=tenacity.retry_if_exception_type((asyncio.TimeoutError, Exception)),
-        reraise=True,
-    )
     async def get_completion(
         self,
         prompt: str,
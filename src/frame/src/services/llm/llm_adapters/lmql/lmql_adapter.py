@@ -1,16 +1,21 @@
 import asyncio
-from frame.src.services.llm.llm_adapters.lmql.lmql_interface import LMQLInterface
 import json
-import tenacity
 import os
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Union
+from typing import AsyncGenerator, Dict, Any, Optional, Union
 import time
 import logging
-from openai import AsyncOpenAI, AuthenticationError, APIStatusError
+from openai import AsyncOpenAI, AuthenticationError, APIStatusError, RateLimitError
 from typing import Protocol, List
 from frame.src.services.llm.llm_adapter_interface import LLMAdapterInterface
+from frame.src.services.llm.retry_policy import is_retryable
+from frame.src.services.llm.rate_limiter import RateLimiter, provider_for_model
+from frame.src.services.llm.client_registry import (
+    ClientRegistry,
+    default_client_registry,
+)
 from frame.src.utils.prompt_formatters import format_lmql_prompt
+from frame.src.utils.token_utils import report_usage
 
 logger = logging.getLogger(__name__)
 
@@ -24,31 +29,9 @@ class LMQLConfig:
     frequency_penalty: float = 0.0
     presence_penalty: float = 0.0
     output_format: str = "json"  # Specify JSON output format
-
-
-class TokenBucket:
-    """
-    Implements token bucket algorithm for rate limiting.
-    """
-
-    def __init__(self, capacity: int, fill_rate: float):
-        self.capacity = capacity
-        self.fill_rate = fill_rate
-        self.tokens = capacity
-        self.last_fill = time.time()
-
-    def _fill(self):
-        now = time.time()
-        delta = now - self.last_fill
-        self.tokens = min(self.capacity, self.tokens + delta * self.fill_rate)
-        self.last_fill = now
-
-    def consume(self, tokens: int) -> bool:
-        self._fill()
-        if tokens <= self.tokens:
-            self.tokens -= tokens
-            return True
-        return False
+    json_mode: bool = False  # Ask the provider for a JSON object response
+    # Chat messages sent as is instead of the LMQL-wrapped prompt
+    messages: Optional[List[Dict[str, str]]] = None
 
 
 from typing import Protocol, runtime_checkable
@@ -64,13 +47,16 @@ class LMQLAdapter(LLMAdapterInterface):
     Adapter for LMQL operations with rate limiting.
 
     This class provides methods to interact with LMQL models, including
-    setting the default model and generating completions with retry logic.
+    setting the default model and generating completions. Retries are
+    handled by LLMService.
 
     Attributes:
+        openai_api_key (Optional[str]): Key the registry's pooled OpenAI client is looked up by.
         openai_client (AsyncOpenAI): Client for OpenAI API operations.
         mistral_client (Any): Client for Mistral API operations (to be implemented).
         default_model (str): The default model to use for completions.
-        token_bucket (TokenBucket): Token bucket for rate limiting.
+        rate_limiter (Optional[RateLimiter]): Shared rate limiter that 429 responses are reported to.
+        client_registry (ClientRegistry): Source of pooled OpenAI clients.
     """
 
     def __init__(
@@ -79,18 +65,34 @@ class LMQLAdapter(LLMAdapterInterface):
         mistral_api_key: Optional[str] = None,
         openai_client: Optional[AsyncOpenAIProtocol] = None,
         mistral_client: Optional[Any] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        client_registry: Optional[ClientRegistry] = None,
     ):
+        self.client_registry = client_registry or default_client_registry
         self.mistral_client = mistral_client
-        self.openai_client = (
-            openai_client
-            if openai_client is not None
-            else (AsyncOpenAI(api_key=openai_api_key) if openai_api_key else None)
-        )
+        self.openai_api_key = openai_api_key
+        self._openai_client = openai_client
         self.mistral_client = None  # Removed MistralClient initialization
         self.default_model = "gpt-3.5-turbo"
-        self.token_bucket = TokenBucket(
-            capacity=60, fill_rate=1
-        )  # 60 requests per minute
+        self.rate_limiter = rate_limiter
+
+    @property
+    def openai_client(self) -> Optional[AsyncOpenAIProtocol]:
+        """
+        The OpenAI client given to the adapter, or else the registry's pooled client for its key.
+
+        The pooled client is looked up on every use, so a registry that was closed
+        hands out a new client instead of one bound to a closed connection pool.
+        """
+        if self._openai_client is not None:
+            return self._openai_client
+        if self.openai_api_key:
+            return self.client_registry.get_openai_client(self.openai_api_key)
+        return None
+
+    @openai_client.setter
+    def openai_client(self, client: Optional[AsyncOpenAIProtocol]) -> None:
+        self._openai_client = client
 
     def format_prompt(
         self,
@@ -166,12 +168,6 @@ class LMQLAdapter(LLMAdapterInterface):
             model=self.default_model, max_tokens=max_tokens, temperature=temperature
         )
 
-    @tenacity.retry(
-        stop=tenacity.stop_after_attempt(5),
-        wait=tenacity.wait_exponential(multiplier=1, min=4, max=10),
-        retry=tenacity.retry_if_exception_type((asyncio.TimeoutError, Exception)),
-        reraise=True,
-    )
     async def get_completion(
         self,
         prompt: str,
@@ -180,32 +176,28 @@ class LMQLAdapter(LLMAdapterInterface):
         additional_context: Optional[Dict[str, Any]] = None,
         decoder: Optional[str] = None,
         decoder_params: Optional[Dict[str, Any]] = None,
-    ) -> str:
+        stream: bool = False,
+    ) -> Union[str, AsyncGenerator[str, None]]:
         """
-        Generate a completion using the LQML model with retry logic.
+        Generate a completion using the LQML model.
 
         Args:
             prompt (str): The input prompt for the model.
             config (LMQLConfig): Configuration for the LQML model.
             model (Optional[Union[str, Dict[str, Any]]], optional): The model to use. If None, uses the default model.
             additional_context (Optional[Dict[str, Any]], optional): Additional context for the model.
-            decoder (Optional[str], optional): The decoding algorithm to use.
+            decoder (Optional[str], optional): The decoding algorithm to use. OpenAI chat
+                completions have no decoder setting, so it is not sent to them.
             decoder_params (Optional[Dict[str, Any]], optional): Parameters for the decoding algorithm.
+            stream (bool, optional): Whether to return an async generator of text chunks.
 
         Returns:
-            str: The generated completion.
+            Union[str, AsyncGenerator[str, None]]: The generated completion, or its chunks when streaming.
         """
         model_name = (
             model.lower() if isinstance(model, str) else self.default_model.lower()
         )
 
-        # Set the decoder in the LMQLInterface
-        lmql_interface = LMQLInterface(model_name=model_name)
-        lmql_interface.set_decoder(decoder, decoder_params)
-
-        if not self.token_bucket.consume(1):
-            await asyncio.sleep(1)  # Wait for a token to become available
-
         if self.mistral_client is None and model_name.startswith("mistral"):
             raise ValueError("Mistral client is not initialized")
         try:
@@ -214,6 +206,14 @@ class LMQLAdapter(LLMAdapterInterface):
             "{prompt}"
             [RESPONSE]
             """
+            if stream:
+                if not model_name.startswith("gpt"):
+                    raise ValueError(
+                        f"Streaming is not supported for model: {model_name}"
+                    )
+                return await self._stream_openai_completion(
+                    lmql_prompt, config, model_name
+                )
             if model_name.startswith("gpt"):
                 response = await self._get_openai_completion(
                     lmql_prompt, config, model_name
@@ -223,6 +223,9 @@ class LMQLAdapter(LLMAdapterInterface):
             else:
                 raise ValueError(f"Unsupported model: {model_name}")
 
+            if isinstance(response, str) and config.json_mode:
+                # The caller parses structured output itself, exactly once.
+                return response
             if isinstance(response, str):
                 # If the response is a string, try to parse it as JSON
                 try:
@@ -247,6 +250,9 @@ class LMQLAdapter(LLMAdapterInterface):
             else:
                 raise ValueError(f"Unexpected response format: {response}")
         except (AuthenticationError, APIStatusError) as e:
+            if is_retryable(e):
+                # Rate limits and server errors keep their type so LLMService can retry them.
+                raise
             error_message = f"API error in get_completion: {e}"
             logger.error(error_message)
             raise ValueError(error_message)
@@ -262,26 +268,113 @@ class LMQLAdapter(LLMAdapterInterface):
     async def _get_openai_completion(
         self, prompt: str, config: LMQLConfig, model_name: str
     ) -> str:
-        if self.openai_client is None:
+        client = self.openai_client
+        if client is None:
             raise ValueError("OpenAI client is not initialized")
 
-        if not isinstance(self.openai_client, AsyncOpenAI):
+        if not isinstance(client, AsyncOpenAI):
             raise ValueError("OpenAI client is not correctly initialized")
 
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=model_name,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=config.max_tokens,
-                temperature=config.temperature,
-                top_p=config.top_p,
-                frequency_penalty=config.frequency_penalty,
-                presence_penalty=config.presence_penalty,
+            response = await client.chat.completions.create(
+                **self._openai_request(prompt, config, model_name)
             )
-            return response.choices[0].message.content.strip()
+        except RateLimitError as e:
+            self._record_rate_limited(e, model_name)
+            raise
         except Exception as e:
             logger.error(f"Error in OpenAI API call: {e}")
             raise
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_success(provider_for_model(model_name), model_name)
+        _report_openai_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content.strip()
+
+    async def _stream_openai_completion(
+        self, prompt: str, config: LMQLConfig, model_name: str
+    ) -> AsyncGenerator[str, None]:
+        """
+        Open a streaming completion from OpenAI.
+
+        The request is sent before this returns, so errors opening the stream
+        are raised here, where they can be retried, rather than on the first chunk.
+
+        Args:
+            prompt (str): The prompt to send.
+            config (LMQLConfig): Configuration for the request.
+            model_name (str): The model to use.
+
+        Returns:
+            AsyncGenerator[str, None]: Chunks of generated text as they arrive.
+        """
+        client = self.openai_client
+        if client is None:
+            raise ValueError("OpenAI client is not initialized")
+
+        try:
+            response = await client.chat.completions.create(
+                **self._openai_request(prompt, config, model_name),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except RateLimitError as e:
+            self._record_rate_limited(e, model_name)
+            raise
+        except Exception as e:
+            logger.error(f"Error in OpenAI streaming API call: {e}")
+            raise
+        return self._read_openai_stream(response, model_name)
+
+    async def _read_openai_stream(
+        self, response: Any, model_name: str
+    ) -> AsyncGenerator[str, None]:
+        async for chunk in response:
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+            _report_openai_usage(getattr(chunk, "usage", None))
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_success(provider_for_model(model_name), model_name)
+
+    @staticmethod
+    def _openai_request(
+        prompt: str, config: LMQLConfig, model_name: str
+    ) -> Dict[str, Any]:
+        request = {
+            "model": model_name,
+            "messages": config.messages or [{"role": "user", "content": prompt}],
+            "max_tokens": config.max_tokens,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "frequency_penalty": config.frequency_penalty,
+            "presence_penalty": config.presence_penalty,
+        }
+        if config.json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def _record_rate_limited(self, error: RateLimitError, model_name: str) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_rate_limited(
+                provider_for_model(model_name),
+                model_name,
+                headers=getattr(error.response, "headers", None),
+            )
+        logger.error(f"Rate limited in OpenAI API call: {error}")
+
+
+def _report_openai_usage(usage: Any) -> None:
+    """Report OpenAI usage, including prompt tokens served from its prompt cache."""
+    if not isinstance(getattr(usage, "prompt_tokens", None), int):
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    report_usage(
+        usage.prompt_tokens,
+        usage.completion_tokens or 0,
+        cached_tokens if isinstance(cached_tokens, int) else 0,
+    )
 
 
 def lmql_adapter(
@@ -7,6 +7,8 @@ from lmql import decorators
 class LMQLInterface:
     def __init__(self, model_name: str):
         self.model = lmql.model(model_name)
+        self.decoder: Optional[str] = None
+        self.decoder_params: Optional[Dict[str, Any]] = None
 
     def format_prompt_with_constraints(
         self, prompt: str, constraints: list, distribution: bool = False
@@ -47,7 +49,10 @@ class LMQLInterface:
         decoder_params: Optional[Dict[str, Any]] = None,
     ):
         """
-        Set the decoding algorithm and its parameters.
+        Set the default decoding algorithm and its parameters.
+
+        Interfaces are shared between requests, so a request that needs another
+        decoder passes it to ``generate`` instead.
 
         Args:
             decoder (Optional[str]): The decoding algorithm to use.
@@ -82,6 +87,8 @@ class LMQLInterface:
         distribution: bool = False,
         control_flow: Optional[Callable] = None,
         decorators: Optional[List[Callable]] = None,
+        decoder: Optional[str] = None,
+        decoder_params: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         Generate a response using LMQL with constraints and optionally obtain a distribution.
@@ -93,6 +100,8 @@ class LMQLInterface:
             constraints (list, optional): Constraints to apply during generation.
             distribution (bool): Whether to obtain a distribution over possible values.
             control_flow (Callable, optional): A function to dynamically construct the prompt with control flow.
+            decoder (Optional[str]): The decoding algorithm for this call. None uses the default.
+            decoder_params (Optional[Dict[str, Any]]): Parameters for this call's decoding algorithm.
 
         Returns:
             str: The generated response or distribution.
@@ -111,9 +120,21 @@ class LMQLInterface:
             # Apply LMQL constraints during generation
             lmql_constraints = self._apply_lmql_constraints(constraints)
             return await self.model.generate(
-                prompt, max_tokens=max_tokens, constraints=lmql_constraints
+                prompt,
+                max_tokens=max_tokens,
+                constraints=lmql_constraints,
+                **self._decoder_kwargs(decoder, decoder_params),
             )
 
+    def _decoder_kwargs(
+        self, decoder: Optional[str], decoder_params: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        if decoder is None:
+            decoder, decoder_params = self.decoder, self.decoder_params
+        if decoder is None:
+            return {}
+        return {"decoder": decoder, **(decoder_params or {})}
+
     def _apply_lmql_constraints(self, constraints: list) -> list:
         """
         Convert user-defined constraints into LMQL-compatible constraints.
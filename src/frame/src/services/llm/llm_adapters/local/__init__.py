@@ -0,0 +1,17 @@
+from .local_adapter import (
+    DEFAULT_LOCAL_MODEL,
+    LOCAL_PREFIX,
+    LocalConfig,
+    LocalModelAdapter,
+    PrefixCache,
+)
+from .micro_batcher import MicroBatcher
+
+__all__ = [
+    "LocalModelAdapter",
+    "LocalConfig",
+    "PrefixCache",
+    "MicroBatcher",
+    "LOCAL_PREFIX",
+    "DEFAULT_LOCAL_MODEL",
+]
@@ -0,0 +1,449 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from frame.src.services.llm.llm_adapter_interface import LLMAdapterInterface
+from frame.src.services.llm.llm_adapters.local.micro_batcher import MicroBatcher
+from frame.src.services.llm.llm_config import LLMConfig
+from frame.src.utils.token_utils import report_usage
+
+logger = logging.getLogger(__name__)
+
+LOCAL_PREFIX = "local/"
+DEFAULT_LOCAL_MODEL = "HuggingFaceTB/SmolLM2-360M-Instruct"
+
+
+class LocalConfig(LLMConfig):
+    """Configuration for local inference."""
+
+    model: str = DEFAULT_LOCAL_MODEL
+
+
+def _common_prefix(a: Sequence[int], b: Sequence[int]) -> Tuple[int, ...]:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return tuple(a[:length])
+
+
+class PrefixCache:
+    """
+    Least recently used KV caches of prompt prefixes shared between requests.
+
+    A prefix is worth caching when the prompts of a batch share it, or when a
+    prompt shares it with a recently seen prompt, as with a common system
+    prompt. Cached prefixes are always shorter than the prompts they serve, so
+    every prompt still has a token left to compute logits from.
+
+    Attributes:
+        max_entries (int): Number of prefixes kept.
+        min_tokens (int): Shortest prefix worth caching.
+    """
+
+    def __init__(self, max_entries: int = 8, min_tokens: int = 16):
+        self.max_entries = max_entries
+        self.min_tokens = min_tokens
+        self._entries: "OrderedDict[Tuple[int, ...], Any]" = OrderedDict()
+        self._recent: Deque[Tuple[int, ...]] = deque(maxlen=max(max_entries, 1) * 4)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, prompts: Sequence[Sequence[int]]) -> Tuple[int, Optional[Any]]:
+        """
+        Find the longest cached prefix shared by every prompt.
+
+        Args:
+            prompts (Sequence[Sequence[int]]): Token ids of the prompts.
+
+        Returns:
+            Tuple[int, Optional[Any]]: The prefix length and its KV cache, or (0, None).
+        """
+        limit = min(len(prompt) for prompt in prompts) - 1
+        best: Tuple[int, ...] = ()
+        for prefix in self._entries:
+            if len(best) < len(prefix) <= limit and all(
+                tuple(prompt[: len(prefix)]) == prefix for prompt in prompts
+            ):
+                best = prefix
+        if not best:
+            return 0, None
+        self._entries.move_to_end(best)
+        return len(best), self._entries[best]
+
+    def candidate(self, prompts: Sequence[Sequence[int]]) -> Optional[Tuple[int, ...]]:
+        """
+        Get the prefix of a batch worth caching, and remember its prompts.
+
+        Args:
+            prompts (Sequence[Sequence[int]]): Token ids of the prompts.
+
+        Returns:
+            Optional[Tuple[int, ...]]: The prefix, or None if none is long enough or it is cached.
+        """
+        shared = tuple(prompts[0])
+        for prompt in prompts[1:]:
+            shared = _common_prefix(shared, prompt)
+        if len(prompts) == 1:
+            shared = max(
+                (_common_prefix(shared, recent) for recent in self._recent),
+                key=len,
+                default=(),
+            )
+        self._recent.extend(tuple(prompt) for prompt in prompts)
+        shared = shared[: min(len(prompt) for prompt in prompts) - 1]
+        if len(shared) < self.min_tokens or shared in self._entries:
+            return None
+        return shared
+
+    def store(self, prefix: Tuple[int, ...], kv_cache: Any) -> None:
+        """
+        Cache the KV cache of a prefix, evicting the least recently used one when full.
+
+        Args:
+            prefix (Tuple[int, ...]): Token ids of the prefix.
+            kv_cache (Any): The model's KV cache for those tokens.
+        """
+        self._entries[prefix] = kv_cache
+        self._entries.move_to_end(prefix)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@dataclass
+class _Request:
+    prompt: str
+    max_tokens: int
+    temperature: float
+    top_p: float
+    messages: Optional[List[Dict[str, str]]]
+    loop: asyncio.AbstractEventLoop
+    queue: "asyncio.Queue[Union[str, BaseException, None]]"
+    cancelled: bool = False
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    def emit(self, item: Union[str, BaseException, None]) -> None:
+        # Called from the inference thread.
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+
+class LocalModelAdapter(LLMAdapterInterface):
+    """
+    Adapter that runs a small causal language model on local CPUs.
+
+    Concurrent requests arriving within ``max_wait`` seconds of each other are
+    decoded together in one batch, one forward pass per generated token for
+    the whole batch. The KV cache of prompt prefixes shared between requests
+    is computed once and reused. Inference runs on a dedicated thread, so the
+    event loop keeps serving other work, and tokens are streamed as they are
+    generated.
+
+    Requires ``transformers`` and ``torch``, installed with
+    ``pip install -r plugins/core/local_inference/requirements.txt``. The model
+    is downloaded and loaded on first use.
+
+    Attributes:
+        model_name (str): The Hugging Face model id.
+        num_threads (Optional[int]): Threads torch may use. None keeps torch's default.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LOCAL_MODEL,
+        max_batch_size: int = 8,
+        max_wait: float = 0.005,
+        num_threads: Optional[int] = None,
+        prefix_cache_size: int = 8,
+        min_prefix_tokens: int = 16,
+    ):
+        self.model_name = model_name
+        self.num_threads = num_threads
+        self._batcher: MicroBatcher[_Request] = MicroBatcher(
+            self._run_batch, max_batch_size, max_wait
+        )
+        self._prefix_cache = PrefixCache(prefix_cache_size, min_prefix_tokens)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="local-inference"
+        )
+        self._torch: Any = None
+        self._tokenizer: Any = None
+        self._model: Any = None
+
+    def format_prompt(self, prompt: str, *args: Any, **kwargs: Any) -> str:
+        """
+        Return the prompt unchanged. The model's chat template is applied when it is tokenized.
+
+        Args:
+            prompt (str): The input prompt.
+
+        Returns:
+            str: The prompt.
+        """
+        return prompt
+
+    def get_config(self, max_tokens: int, temperature: float) -> LocalConfig:
+        """
+        Get the configuration for a request.
+
+        Args:
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): The temperature for text generation. 0 decodes greedily.
+
+        Returns:
+            LocalConfig: The configuration object.
+        """
+        return LocalConfig(
+            model=self.model_name, max_tokens=max_tokens, temperature=temperature
+        )
+
+    async def get_completion(
+        self,
+        prompt: str,
+        config: Optional[LLMConfig] = None,
+        additional_context: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        stream: bool = False,
+    ) -> Union[str, AsyncGenerator[str, None]]:
+        """
+        Generate a completion locally, batched with concurrent requests.
+
+        Args:
+            prompt (str): The input prompt.
+            config (Optional[LLMConfig]): Configuration for the request.
+            additional_context (Optional[Dict[str, Any]]): Unused, accepted for interface compatibility.
+            model (Optional[str]): Unused, the adapter serves ``model_name``.
+            stream (bool): Whether to return an async generator of text chunks.
+
+        Returns:
+            Union[str, AsyncGenerator[str, None]]: The completion, or its chunks when streaming.
+        """
+        config = config or LocalConfig(model=self.model_name)
+        request = _Request(
+            prompt=prompt,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            top_p=config.top_p,
+            messages=config.messages,
+            loop=asyncio.get_running_loop(),
+            queue=asyncio.Queue(),
+        )
+        self._batcher.submit(request)
+        if stream:
+            return self._stream(request)
+        return "".join([chunk async for chunk in self._stream(request)])
+
+    async def _stream(self, request: _Request) -> AsyncGenerator[str, None]:
+        try:
+            while True:
+                item = await request.queue.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+            report_usage(
+                request.prompt_tokens, request.completion_tokens, request.cached_tokens
+            )
+        finally:
+            # Stops decoding this request if the consumer gave up on it.
+            request.cancelled = True
+
+    async def _run_batch(self, batch: List[_Request]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._generate, batch)
+        except Exception as e:
+            logger.error(f"Local inference with {self.model_name} failed: {e}")
+            for request in batch:
+                request.emit(e)
+
+    def _load(self) -> None:
+        if self._model is not None:
+            return
+        try:
+            import torch
+            from transformers import AutoModelForCausalLM, AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Local inference requires transformers and torch. Install them with "
+                "pip install -r plugins/core/local_inference/requirements.txt"
+            ) from e
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        logger.info(f"Loading local model {self.model_name}")
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        model = AutoModelForCausalLM.from_pretrained(self.model_name)
+        model.eval()
+        self._torch, self._tokenizer, self._model = torch, tokenizer, model
+
+    def _prompt_ids(self, request: _Request) -> List[int]:
+        tokenizer = self._tokenizer
+        if getattr(tokenizer, "chat_template", None):
+            ids = tokenizer.apply_chat_template(
+                request.messages or [{"role": "user", "content": request.prompt}],
+                add_generation_prompt=True,
+            )
+        else:
+            ids = tokenizer(request.prompt)["input_ids"]
+        # Keep the end of prompts that leave no room for the completion.
+        window = getattr(self._model.config, "max_position_embeddings", None)
+        if window and len(ids) + request.max_tokens > window:
+            ids = ids[-max(window - request.max_tokens, 1) :]
+        return list(ids)
+
+    def _generate(self, batch: List[_Request]) -> None:
+        self._load()
+        torch = self._torch
+        prompts = [self._prompt_ids(request) for request in batch]
+        for request, ids in zip(batch, prompts):
+            request.prompt_tokens = len(ids)
+
+        with torch.inference_mode():
+            prefix_length, kv_cache = self._prefix_cache.lookup(prompts)
+            for request in batch:
+                request.cached_tokens = prefix_length
+            candidate = self._prefix_cache.candidate(prompts)
+            if candidate is not None and len(candidate) > prefix_length:
+                output = self._model(torch.tensor([candidate]), use_cache=True)
+                kv_cache = _legacy_cache(output.past_key_values)
+                self._prefix_cache.store(candidate, kv_cache)
+                prefix_length = len(candidate)
+            self._decode(batch, prompts, prefix_length, kv_cache)
+
+    def _decode(
+        self,
+        batch: List[_Request],
+        prompts: List[List[int]],
+        prefix_length: int,
+        kv_cache: Optional[Any],
+    ) -> None:
+        torch, tokenizer = self._torch, self._tokenizer
+        size = len(batch)
+        # Prompts share the cached prefix; their suffixes are padded between
+        # the prefix and the suffix, and masked out.
+        suffixes = [ids[prefix_length:] for ids in prompts]
+        width = max(len(suffix) for suffix in suffixes)
+        input_ids = torch.tensor(
+            [[tokenizer.pad_token_id] * (width - len(s)) + s for s in suffixes]
+        )
+        mask = torch.tensor(
+            [
+                [1] * prefix_length + [0] * (width - len(s)) + [1] * len(s)
+                for s in suffixes
+            ]
+        )
+        positions = (mask.cumsum(-1) - 1).clamp(min=0)[:, -width:]
+        if kv_cache is not None:
+            kv_cache = _expand_cache(kv_cache, size)
+        temperatures = torch.tensor([[max(r.temperature, 0.0)] for r in batch])
+        top_ps = torch.tensor([[r.top_p] for r in batch])
+
+        generated: List[List[int]] = [[] for _ in batch]
+        texts = [""] * size
+        done = [False] * size
+
+        def emit_text(index: int) -> None:
+            text = tokenizer.decode(generated[index], skip_special_tokens=True)
+            # Wait for the rest of a multi-byte character before emitting it.
+            if len(text) > len(texts[index]) and not text.endswith("�"):
+                batch[index].emit(text[len(texts[index]) :])
+                texts[index] = text
+
+        def finish(index: int) -> None:
+            done[index] = True
+            text = tokenizer.decode(generated[index], skip_special_tokens=True)
+            if len(text) > len(texts[index]):
+                batch[index].emit(text[len(texts[index]) :])
+            batch[index].completion_tokens = len(generated[index])
+            batch[index].emit(None)
+
+        for _ in range(max(request.max_tokens for request in batch)):
+            output = self._model(
+                input_ids=input_ids,
+                attention_mask=mask,
+                position_ids=positions,
+                past_key_values=kv_cache,
+                use_cache=True,
+            )
+            kv_cache = output.past_key_values
+            next_tokens = _sample(torch, output.logits[:, -1, :], temperatures, top_ps)
+            for index, request in enumerate(batch):
+                if done[index]:
+                    continue
+                if request.cancelled:
+                    done[index] = True
+                    continue
+                token = int(next_tokens[index])
+                if token == tokenizer.eos_token_id:
+                    finish(index)
+                    continue
+                generated[index].append(token)
+                emit_text(index)
+                if len(generated[index]) >= request.max_tokens:
+                    finish(index)
+            if all(done):
+                return
+            input_ids = next_tokens.unsqueeze(-1)
+            mask = torch.cat([mask, torch.ones((size, 1), dtype=mask.dtype)], dim=-1)
+            positions = positions[:, -1:] + 1
+
+        for index in range(size):
+            if not done[index]:
+                finish(index)
+
+    def close(self) -> None:
+        """Release the inference thread."""
+        self._executor.shutdown(wait=False)
+
+
+def _sample(torch: Any, logits: Any, temperatures: Any, top_ps: Any) -> Any:
+    """Pick each row's next token: greedily at temperature 0, else by nucleus sampling."""
+    greedy = logits.argmax(dim=-1)
+    if bool((temperatures <= 0).all()):
+        return greedy
+    probs = torch.softmax(logits / temperatures.clamp(min=1e-5), dim=-1)
+    sorted_probs, order = probs.sort(dim=-1, descending=True)
+    # Drop tokens outside the top_p mass, always keeping the most likely one.
+    outside = sorted_probs.cumsum(dim=-1) - sorted_probs > top_ps
+    sorted_probs = sorted_probs.masked_fill(outside, 0.0)
+    sampled = order.gather(-1, torch.multinomial(sorted_probs, 1)).squeeze(-1)
+    return torch.where(temperatures.squeeze(-1) <= 0, greedy, sampled)
+
+
+def _legacy_cache(kv_cache: Any) -> Any:
+    """Convert a transformers Cache object to per-layer (key, value) tuples."""
+    if hasattr(kv_cache, "to_legacy_cache"):
+        return kv_cache.to_legacy_cache()
+    return kv_cache
+
+
+def _expand_cache(kv_cache: Any, size: int) -> Any:
+    """Copy a batch-of-one KV cache for every row of a batch."""
+    expanded = tuple(
+        tuple(t.expand(size, *t.shape[1:]).contiguous() for t in layer)
+        for layer in kv_cache
+    )
+    try:
+        from transformers import DynamicCache
+    except ImportError:
+        return expanded
+    return DynamicCache.from_legacy_cache(expanded)
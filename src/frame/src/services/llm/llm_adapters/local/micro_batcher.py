@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class MicroBatcher(Generic[T]):
+    """
+    Groups items submitted within a few milliseconds of each other into batches.
+
+    Batches run one at a time. While one runs, new items queue up and form
+    the next batch, so the batch size grows with the load. When a batch is
+    not full, the batcher waits up to ``max_wait`` seconds for more items
+    before running it.
+
+    Attributes:
+        run_batch (Callable[[List[T]], Awaitable[None]]): Processes one batch. It must
+            deliver results and errors to the items itself.
+        max_batch_size (int): Largest number of items in a batch.
+        max_wait (float): Longest time in seconds to wait for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], Awaitable[None]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.005,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[T] = []
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of items waiting for a batch."""
+        return len(self._pending)
+
+    def submit(self, item: T) -> None:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item (T): The item.
+        """
+        self._pending.append(item)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._drain())
+
+    async def _drain(self) -> None:
+        while self._pending:
+            if len(self._pending) < self.max_batch_size and self.max_wait > 0:
+                await asyncio.sleep(self.max_wait)
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            try:
+                await self.run_batch(batch)
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} items failed: {e}")
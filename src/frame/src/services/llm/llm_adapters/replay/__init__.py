@@ -0,0 +1,19 @@
+from .replay_adapter import (
+    LatencyModel,
+    ReplayAdapter,
+    ReplayConfig,
+    ReplayLog,
+    ReplayMiss,
+    RECORD_PREFIX,
+    REPLAY_PREFIX,
+)
+
+__all__ = [
+    "ReplayAdapter",
+    "ReplayConfig",
+    "ReplayLog",
+    "ReplayMiss",
+    "LatencyModel",
+    "RECORD_PREFIX",
+    "REPLAY_PREFIX",
+]
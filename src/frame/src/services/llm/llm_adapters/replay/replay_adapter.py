@@ -0,0 +1,358 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+
+import httpx
+from openai import InternalServerError, RateLimitError
+
+from frame.src.services.llm.llm_adapter_interface import LLMAdapterInterface
+from frame.src.services.llm.llm_config import LLMConfig
+
+logger = logging.getLogger(__name__)
+
+RECORD_PREFIX = "record/"
+REPLAY_PREFIX = "replay/"
+
+
+class ReplayConfig(LLMConfig):
+    """Configuration for record and replay operations."""
+
+    model: str = "replay"
+
+
+class ReplayMiss(LookupError):
+    """Raised when a replayed prompt was never recorded."""
+
+
+@dataclass
+class LatencyModel:
+    """
+    Distribution of simulated response times in replay mode.
+
+    Attributes:
+        kind (str): "fixed", "lognormal" or "recorded".
+        seconds (float): Latency of the "fixed" kind, and of "recorded" when a
+            response has no recorded timing.
+        median (float): Median latency of the "lognormal" kind.
+        sigma (float): Shape of the "lognormal" kind. Larger values give a longer tail.
+        scale (float): Multiplier applied to every sampled latency.
+    """
+
+    kind: str = "recorded"
+    seconds: float = 0.0
+    median: float = 0.5
+    sigma: float = 0.5
+    scale: float = 1.0
+
+    def __post_init__(self):
+        if self.kind not in ("fixed", "lognormal", "recorded"):
+            raise ValueError(f"Unknown latency model: {self.kind}")
+
+    def sample(
+        self, recorded: Optional[float] = None, rng: Optional[random.Random] = None
+    ) -> float:
+        """
+        Draw a latency.
+
+        Args:
+            recorded (Optional[float]): The recorded latency of the response, if any.
+            rng (Optional[random.Random]): Random source. Defaults to the ``random`` module.
+
+        Returns:
+            float: The latency in seconds.
+        """
+        rng = rng or random
+        if self.kind == "lognormal":
+            latency = rng.lognormvariate(math.log(self.median), self.sigma)
+        elif self.kind == "recorded" and recorded is not None:
+            latency = recorded
+        else:
+            latency = self.seconds
+        return max(latency * self.scale, 0.0)
+
+
+class ReplayLog:
+    """
+    Append-only JSON Lines log of prompt hashes, responses and timings.
+
+    Each line holds one recorded call: ``{"k": <prompt hash>, "r": <response>,
+    "t": <latency>}``. Prompts themselves are not stored. When a prompt was
+    recorded more than once, its responses are replayed in turn.
+
+    Attributes:
+        path (str): The log file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def key(prompt: str) -> str:
+        """
+        Hash a prompt into its log key.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            str: The prompt's key.
+        """
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:32]
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Skipping corrupt line {line_number} in {self.path}"
+                    )
+                    continue
+                self._records.setdefault(record["k"], []).append(record)
+        logger.info(f"Loaded {len(self)} recorded prompts from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, prompt: str, response: str, latency: float) -> None:
+        """
+        Record a response.
+
+        Args:
+            prompt (str): The prompt.
+            response (str): The response.
+            latency (float): Seconds the response took.
+        """
+        record = {"k": self.key(prompt), "r": response, "t": round(latency, 4)}
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._records.setdefault(record["k"], []).append(record)
+
+    def lookup(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the next recorded response for a prompt.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            Optional[Dict[str, Any]]: The record, or None if the prompt was never recorded.
+        """
+        key = self.key(prompt)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                return None
+            index = self._next.get(key, 0)
+            self._next[key] = (index + 1) % len(records)
+            return records[index]
+
+
+class ReplayAdapter(LLMAdapterInterface):
+    """
+    Adapter that records real completions or replays them offline.
+
+    In "record" mode it wraps a real adapter and appends every prompt and
+    response to a ``ReplayLog``. In "replay" mode it serves responses from the
+    log without network access, after a latency drawn from ``latency``, and
+    fails a share of requests with simulated 429 and 5xx errors so retries,
+    rate limiting and circuit breakers are exercised as in production.
+
+    Attributes:
+        log (ReplayLog): The log responses are recorded to and replayed from.
+        mode (str): "record" or "replay".
+        target (Optional[Any]): The real adapter in "record" mode.
+        latency (LatencyModel): Simulated response times in "replay" mode.
+        rate_limit_rate (float): Share of replayed requests that fail with a 429.
+        server_error_rate (float): Share of replayed requests that fail with a 503.
+        default_response (Optional[str]): Served for prompts that were never recorded.
+            Such prompts raise ``ReplayMiss`` when None.
+    """
+
+    def __init__(
+        self,
+        log: ReplayLog,
+        mode: str = "replay",
+        target: Optional[Any] = None,
+        latency: Optional[LatencyModel] = None,
+        rate_limit_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        default_response: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if mode == "record" and target is None:
+            raise ValueError("Record mode needs a target adapter")
+        self.log = log
+        self.mode = mode
+        self.target = target
+        self.latency = latency or LatencyModel()
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.default_response = default_response
+        self._rng = random.Random(seed)
+
+    def format_prompt(self, prompt: str, *args: Any, **kwargs: Any) -> str:
+        """
+        Return the prompt unchanged.
+
+        Prompts are logged before the target adapter formats them, so the same
+        prompt has the same key in both modes.
+
+        Args:
+            prompt (str): The input prompt.
+
+        Returns:
+            str: The prompt.
+        """
+        return prompt
+
+    def get_config(self, max_tokens: int, temperature: float) -> ReplayConfig:
+        """
+        Get the configuration for a request.
+
+        Args:
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): The temperature for text generation.
+
+        Returns:
+            ReplayConfig: The configuration object.
+        """
+        return ReplayConfig(max_tokens=max_tokens, temperature=temperature)
+
+    async def get_completion(
+        self,
+        prompt: str,
+        config: Optional[LLMConfig] = None,
+        additional_context: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        stream: bool = False,
+    ) -> Union[str, AsyncGenerator[str, None]]:
+        """
+        Record a completion from the target adapter, or replay a recorded one.
+
+        Args:
+            prompt (str): The input prompt.
+            config (Optional[LLMConfig]): Configuration for the request.
+            additional_context (Optional[Dict[str, Any]]): Additional context for the completion.
+            model (Optional[str]): The model the target adapter is asked for in "record" mode,
+                with or without the "record/" prefix. Unused in "replay" mode.
+            stream (bool): Whether to return an async generator of text chunks.
+
+        Returns:
+            Union[str, AsyncGenerator[str, None]]: The completion, or its chunks when streaming.
+
+        Raises:
+            ReplayMiss: If a replayed prompt was never recorded and there is no default response.
+        """
+        config = config or ReplayConfig()
+        if self.mode == "record":
+            return await self._record(prompt, config, model, additional_context, stream)
+        return await self._replay(prompt, stream)
+
+    async def _record(
+        self,
+        prompt: str,
+        config: LLMConfig,
+        model: Optional[str],
+        additional_context: Optional[Dict[str, Any]],
+        stream: bool,
+    ) -> Union[str, AsyncGenerator[str, None]]:
+        if model is not None and model.startswith(RECORD_PREFIX):
+            model = model[len(RECORD_PREFIX) :]
+        target_config = self.target.get_config(
+            max_tokens=config.max_tokens, temperature=config.temperature
+        )
+        for option in ("json_mode", "messages"):
+            if getattr(config, option, None) and hasattr(target_config, option):
+                setattr(target_config, option, getattr(config, option))
+        start = time.monotonic()
+        result = self.target.get_completion(
+            self.target.format_prompt(prompt),
+            target_config,
+            model=model,
+            additional_context=additional_context,
+            stream=stream,
+        )
+        if inspect.isawaitable(result):
+            result = await result
+        if stream and not isinstance(result, str):
+            return self._record_stream(prompt, result, start)
+        if isinstance(result, dict):
+            result = json.dumps(result)
+        self.log.append(prompt, str(result), time.monotonic() - start)
+        return result
+
+    async def _record_stream(
+        self, prompt: str, chunks: Any, start: float
+    ) -> AsyncGenerator[str, None]:
+        parts: List[str] = []
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        self.log.append(prompt, "".join(parts), time.monotonic() - start)
+
+    async def _replay(
+        self, prompt: str, stream: bool
+    ) -> Union[str, AsyncGenerator[str, None]]:
+        record = self.log.lookup(prompt)
+        if record is None and self.default_response is None:
+            raise ReplayMiss(f"No recorded response for prompt {ReplayLog.key(prompt)}")
+        response = record["r"] if record is not None else self.default_response
+        recorded = record.get("t") if record is not None else None
+
+        await asyncio.sleep(self.latency.sample(recorded, self._rng))
+        self._inject_error()
+        if stream:
+            return self._replay_stream(response)
+        return response
+
+    async def _replay_stream(self, response: str) -> AsyncGenerator[str, None]:
+        words = response.split(" ")
+        for index, word in enumerate(words):
+            yield word if index == len(words) - 1 else word + " "
+            await asyncio.sleep(0)
+
+    def _inject_error(self) -> None:
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            raise RateLimitError(
+                "Simulated rate limit",
+                response=_simulated_response(429, {"retry-after": "1"}),
+                body=None,
+            )
+        if roll < self.rate_limit_rate + self.server_error_rate:
+            raise InternalServerError(
+                "Simulated server error",
+                response=_simulated_response(503),
+                body=None,
+            )
+
+
+def _simulated_response(
+    status: int, headers: Optional[Dict[str, str]] = None
+) -> httpx.Response:
+    request = httpx.Request("POST", "https://replay.invalid/v1/chat/completions")
+    return httpx.Response(status, request=request, headers=headers)
@@ -0,0 +1,292 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _stable_value(value: Any) -> Any:
+    """
+    Encode a value JSON can't encode by what stays the same across processes.
+
+    Callables, such as the bound methods in an action registry, are encoded by
+    their qualified name rather than their repr, which holds a memory address.
+
+    Raises:
+        TypeError: If the value has no process-independent encoding.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if callable(value):
+        function = getattr(value, "__func__", value)
+        name = getattr(function, "__qualname__", type(function).__qualname__)
+        return f"{getattr(function, '__module__', None)}.{name}"
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(
+        f"Object of type {type(value).__name__} can't be part of a cache key"
+    )
+
+
+class CompletionCache:
+    """
+    Two-tier cache for LLM completions.
+
+    The first tier is a bounded in-process LRU. The second, optional tier is a
+    SQLite database in WAL mode, so several worker processes on the same host
+    can share completions for identical prompts.
+
+    Completions produced with a temperature above zero are sampled and are not
+    cached unless ``allow_sampled`` is set.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept in memory.
+        ttl_seconds (Optional[float]): Time to live for entries in both tiers. None disables expiry.
+        db_path (Optional[str]): Path of the SQLite database. None disables the disk tier.
+        max_disk_entries (int): Maximum number of rows kept in the disk tier.
+        allow_sampled (bool): Whether completions with temperature > 0 may be cached.
+    """
+
+    _EVICT_EVERY = 100
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 3600.0,
+        db_path: Optional[str] = None,
+        max_disk_entries: int = 100_000,
+        allow_sampled: bool = False,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self.allow_sampled = allow_sampled
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes_since_evict = 0
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS completions_created_at ON completions(created_at)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        adapter: str,
+        additional_context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build the cache key for a completion request.
+
+        Args:
+            model (str): The model name.
+            prompt (str): The fully formatted prompt sent to the adapter.
+            temperature (float): The sampling temperature.
+            max_tokens (int): The maximum number of tokens to generate.
+            adapter (str): The name of the adapter serving the request.
+            additional_context (Optional[Dict[str, Any]]): Additional context passed to the
+                adapter. Keys are sorted, and callables are keyed by their qualified name,
+                so equal requests get the same key in every process.
+
+        Returns:
+            str: A hex digest identifying the request.
+
+        Raises:
+            TypeError: If the additional context holds a value with no stable encoding.
+        """
+        payload = json.dumps(
+            [
+                model,
+                prompt,
+                float(temperature),
+                int(max_tokens),
+                adapter,
+                additional_context or None,
+            ],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=_stable_value,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """
+        Check whether a request with the given temperature may be cached.
+
+        Args:
+            temperature (float): The sampling temperature of the request.
+
+        Returns:
+            bool: True if the request may be served from and stored in the cache.
+        """
+        return self.allow_sampled or not temperature or temperature <= 0
+
+    def _expires_at(self, created_at: float) -> float:
+        if self.ttl_seconds is None:
+            return float("inf")
+        return created_at + self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a completion, checking memory first and then disk.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[str]: The cached completion, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+        if self._db is None:
+            return None
+
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._expires_at(created_at) <= now:
+                self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+
+        self._remember(key, value, self._expires_at(created_at))
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a completion in both tiers.
+
+        Args:
+            key (str): The cache key.
+            value (str): The completion to store.
+        """
+        now = time.time()
+        self._remember(key, value, self._expires_at(now))
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, now),
+            )
+            self._db.commit()
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= self._EVICT_EVERY:
+                self._evict_disk(now)
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        # Caller holds self._db_lock.
+        self._writes_since_evict = 0
+        if self.ttl_seconds is not None:
+            self._db.execute(
+                "DELETE FROM completions WHERE created_at <= ?",
+                (now - self.ttl_seconds,),
+            )
+        self._db.execute(
+            "DELETE FROM completions WHERE key IN ("
+            "SELECT key FROM completions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+        self._db.commit()
+
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        Async variant of get that keeps disk reads off the event loop.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[str]: The cached completion, or None on a miss.
+        """
+        if self._db is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        """
+        Async variant of set that keeps disk writes off the event loop.
+
+        Args:
+            key (str): The cache key.
+            value (str): The completion to store.
+        """
+        if self._db is None:
+            self.set(key, value)
+            return
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM completions")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the disk tier, if one is open."""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 class LLMConfig(BaseModel):
@@ -13,7 +13,14 @@ class LLMConfig(BaseModel):
     rate_limit_seconds: int = Field(default=60, description="Time window in seconds for rate limiting")
     timeout: Optional[float] = Field(default=30.0, description="Timeout in seconds for API calls")
     retry_count: int = Field(default=3, description="Number of retries for failed API calls")
-from typing import Optional
+    json_mode: bool = Field(
+        default=False, description="Ask the provider for a JSON object response"
+    )
+    messages: Optional[List[Dict[str, str]]] = Field(
+        default=None,
+        description="The prompt as chat messages, sent instead of the formatted prompt when set",
+    )
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 class LLMConfig(BaseModel):
@@ -28,3 +35,10 @@ class LLMConfig(BaseModel):
     rate_limit_seconds: int = Field(default=60, description="Time window in seconds for rate limiting")
     timeout: Optional[float] = Field(default=30.0, description="Timeout in seconds for API calls")
     retry_count: int = Field(default=3, description="Number of retries for failed API calls")
+    json_mode: bool = Field(
+        default=False, description="Ask the provider for a JSON object response"
+    )
+    messages: Optional[List[Dict[str, str]]] = Field(
+        default=None,
+        description="The prompt as chat messages, sent instead of the formatted prompt when set",
+    )
@@ -4,8 +4,21 @@ from frame.src.services.llm.llm_adapters.dspy.dspy_adapter import DSPyAdapter
 import json
 import functools
 from unittest.mock import AsyncMock
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import inspect
+from pydantic import TypeAdapter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +39,10 @@ def clean_response(response: str) -> str:
     return response.strip()
 
 
+async def _as_stream(text: str) -> AsyncGenerator[str, None]:
+    yield text
+
+
 def log_method_call(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -41,7 +58,11 @@ def log_method_call(func):
 
 
 from frame.src.constants import OPENAI_API_KEY
-from .llm_adapters import DSPyAdapter, HuggingFaceAdapter, LMQLAdapter
+from .llm_adapters import DSPyAdapter, HuggingFaceAdapter, LMQLAdapter, ReplayAdapter
+from .llm_adapters.replay import RECORD_PREFIX, REPLAY_PREFIX
+from .llm_adapters.local import LOCAL_PREFIX, LocalModelAdapter
+from .prompt_layout import PromptLayout, PromptSection
+from .context_assembler import ContextAssembler
 from frame.src.constants.api_keys import (
     OPENAI_API_KEY,
     MISTRAL_API_KEY,
@@ -62,7 +83,25 @@ import time
 from typing import Optional, Dict, Any, Union, AsyncGenerator
 
 
-from frame.src.utils.llm_utils import llm_metrics, LLMMetrics
+from frame.src.utils.llm_utils import llm_metrics, LLMMetrics, calculate_cost
+from frame.src.services.llm.llm_cache import CompletionCache
+from frame.src.services.llm.request_coalescer import RequestCoalescer
+from frame.src.services.llm.completion_batch import CompletionResult
+from frame.src.services.llm.model_router import ModelRouter
+from frame.src.services.llm.hedging import HedgePolicy
+from frame.src.services.llm.retry_policy import (
+    DeadlineExceeded,
+    RetryPolicy,
+    deadline as call_deadline,
+    is_retryable,
+)
+from frame.src.services.llm.client_registry import ClientRegistry
+from frame.src.utils.token_utils import TokenUsage, count_tokens, pop_reported_usage
+from frame.src.services.llm.rate_limiter import (
+    RateLimiter,
+    estimate_request_tokens,
+    provider_for_model,
+)
 from frame.src.utils.prompt_formatters import (
     format_lmql_prompt,
     format_dspy_prompt,
@@ -70,6 +109,15 @@ from frame.src.utils.prompt_formatters import (
 )
 
 
+FRAME_CONTEXT = """
+            Frame is a multi-modal cognitive agent framework designed to support fully emergent characteristics.
+            It consists of three main components: Frame, Framed, and Framer.
+            - Frame: The main interface for creating and managing Framer instances.
+            - Framer: An individual AI agent with capabilities for task management, decision-making, and interaction with language models.
+            - Framed: A collection of Framer objects working together to achieve complex tasks.
+            """
+
+
 class LLMService:
     """
     LLMService is responsible for managing interactions with various language models.
@@ -80,6 +128,19 @@ class LLMService:
         openai_api_key (str): API key for OpenAI services.
         mistral_api_key (str): API key for Mistral services.
         huggingface_api_key (str): API key for Hugging Face services.
+        cache (Optional[CompletionCache]): Completion cache. Caching is disabled when None.
+        coalescer (RequestCoalescer): Shares one provider call between identical in-flight requests.
+        rate_limiter (RateLimiter): Requests and tokens per minute budgets shared by every adapter.
+        client_registry (ClientRegistry): Pooled provider clients and cached LMQL interfaces.
+        router (Optional[ModelRouter]): Chooses models per call. Requests use the given model when None.
+        retry_policy (RetryPolicy): Retries transient provider errors and trips per-provider circuit breakers.
+        hedge_policy (Optional[HedgePolicy]): Duplicates slow requests. Hedging is disabled when None.
+        replay (Optional[ReplayAdapter]): Serves "replay/<model>" models offline, and its log
+            records "record/<model>" calls. Those prefixes are unavailable when None.
+        local_options (Dict[str, Any]): Keyword arguments for the ``LocalModelAdapter`` serving
+            "local/<model>" models, such as ``max_batch_size`` or ``num_threads``.
+        max_prompt_tokens (Optional[int]): Largest prompt in tokens. Prompts are also bounded by
+            the model's context window minus ``max_tokens``. Memories are cut to fit.
     """
 
     def __init__(
@@ -89,6 +150,16 @@ class LLMService:
         huggingface_api_key: str = None,
         default_model: str = None,
         metrics: LLMMetrics = None,
+        cache: Optional[CompletionCache] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        client_registry: Optional[ClientRegistry] = None,
+        router: Optional[ModelRouter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        replay: Optional[ReplayAdapter] = None,
+        local_options: Optional[Dict[str, Any]] = None,
+        max_prompt_tokens: Optional[int] = None,
     ):
         self.logger = logging.getLogger(__name__)
         self.openai_api_key = openai_api_key or OPENAI_API_KEY
@@ -98,43 +169,111 @@ class LLMService:
             "gpt-3.5-turbo" if self.openai_api_key else "mistral-medium"
         )
         self.metrics = metrics or llm_metrics
+        self.cache = cache
+        self.coalescer = coalescer if coalescer is not None else RequestCoalescer()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.client_registry = client_registry or ClientRegistry()
+        self.router = router
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.hedge_policy = hedge_policy
+        self.replay = replay
+        self.local_options = local_options or {}
+        self.max_prompt_tokens = max_prompt_tokens
         self._adapters = {}
         self.huggingface_adapter = HuggingFaceAdapter(
-            huggingface_api_key=self.huggingface_api_key
+            huggingface_api_key=self.huggingface_api_key,
+            rate_limiter=self.rate_limiter,
+        )
+        self.dspy_wrapper = DSPyAdapter(
+            config=DSPyConfig(), rate_limiter=self.rate_limiter
+        )
+        self.lmql_wrapper = LMQLAdapter(
+            openai_api_key=self.openai_api_key,
+            rate_limiter=self.rate_limiter,
+            client_registry=self.client_registry,
         )
-        self.dspy_wrapper = DSPyAdapter(config=DSPyConfig())
-        self.lmql_wrapper = LMQLAdapter(openai_api_key=self.openai_api_key)
 
     def get_adapter(self, model_name: str):
         if model_name not in self._adapters:
-            if "gpt" in model_name.lower():
+            provider = provider_for_model(model_name)
+            if (
+                model_name.startswith((RECORD_PREFIX, REPLAY_PREFIX))
+                and self.replay is None
+            ):
+                raise ValueError(f"No replay log configured for model: {model_name}")
+            if model_name.startswith(REPLAY_PREFIX):
+                self._adapters[model_name] = self.replay
+            elif model_name.startswith(RECORD_PREFIX):
+                self._adapters[model_name] = ReplayAdapter(
+                    self.replay.log,
+                    mode="record",
+                    target=self.get_adapter(model_name[len(RECORD_PREFIX) :]),
+                )
+            elif provider == "local":
+                self._adapters[model_name] = LocalModelAdapter(
+                    model_name[len(LOCAL_PREFIX) :], **self.local_options
+                )
+            elif provider == "openai":
                 self._adapters[model_name] = LMQLAdapter(
-                    openai_api_key=self.openai_api_key
+                    openai_api_key=self.openai_api_key,
+                    rate_limiter=self.rate_limiter,
+                    client_registry=self.client_registry,
                 )
-            elif "mistral" in model_name.lower():
+            elif provider == "mistral":
                 self._adapters[model_name] = LMQLAdapter(
-                    mistral_api_key=self.mistral_api_key
+                    mistral_api_key=self.mistral_api_key,
+                    rate_limiter=self.rate_limiter,
+                    client_registry=self.client_registry,
                 )
-            elif "huggingface" in model_name.lower():
+            elif provider == "huggingface":
                 self._adapters[model_name] = HuggingFaceAdapter(
-                    huggingface_api_key=self.huggingface_api_key
-                )
-            elif "dspy" in model_name.lower():
-                self._adapters[model_name] = DSPyAdapter(
-                    openai_api_key=self.openai_api_key
+                    huggingface_api_key=self.huggingface_api_key,
+                    rate_limiter=self.rate_limiter,
                 )
+            else:
                 raise ValueError(f"Unsupported model: {model_name}")
         return self._adapters[model_name]
 
-    def get_metrics(self) -> Dict[str, Any]:
+    async def aclose(self):
+        """Close pooled provider clients, local models and the completion cache."""
+        await self.client_registry.aclose()
+        self._close_local_adapters()
+        if self.cache is not None:
+            self.cache.close()
+
+    def close(self) -> Optional[asyncio.Task]:
+        """
+        Close pooled provider clients and the completion cache from synchronous code.
+
+        When called inside a running event loop, the clients are closed in a
+        task. Await it, or ``aclose``, to wait until they are closed.
+
+        Returns:
+            Optional[asyncio.Task]: The task closing the clients, or None if they are closed.
+        """
+        closing = self.client_registry.close()
+        self._close_local_adapters()
+        if self.cache is not None:
+            self.cache.close()
+        return closing
+
+    def _close_local_adapters(self):
+        for adapter in self._adapters.values():
+            if isinstance(adapter, LocalModelAdapter):
+                adapter.close()
+
+    def get_metrics(self, framer: Optional[str] = None) -> Dict[str, Any]:
         """
         Get the current LLM usage metrics.
 
+        Args:
+            framer (Optional[str]): Only count calls made by this Framer. None counts every call.
+
         Returns:
             Dict[str, Any]: A dictionary containing the call count and cost for each model,
             as well as the total calls and total cost.
         """
-        return self.metrics.get_metrics()
+        return self.metrics.get_metrics(framer)
 
     def get_total_calls(self) -> int:
         """
@@ -143,7 +282,7 @@ class LLMService:
         Returns:
             int: The total number of calls made.
         """
-        return self.metrics._total_calls
+        return self.metrics.get_total_calls()
 
     def get_total_cost(self) -> float:
         """
@@ -152,36 +291,68 @@ class LLMService:
         Returns:
             float: The total cost incurred.
         """
-        return self.metrics._total_cost
+        return self.metrics.get_total_cost()
 
-    def _prepare_full_prompt(
+    def reset_metrics(self):
+        """Reset the metrics recorded by this service's Frame."""
+        self.metrics.reset()
+
+    async def _assemble_prompt(
         self,
         prompt: str,
         include_frame_context: bool,
         recent_memories: Optional[List[Dict[str, Any]]],
-        framer: Optional[Any] = None,
-    ) -> str:
-        full_prompt = prompt
+        system_prompt: Optional[str],
+        model: str,
+        max_tokens: int,
+        context: Optional[str] = None,
+    ) -> PromptLayout:
+        """
+        Lay out the prompt and fit it into the model's token budget.
 
-        if include_frame_context:
-            frame_context = """
-            Frame is a multi-modal cognitive agent framework designed to support fully emergent characteristics.
-            It consists of three main components: Frame, Framed, and Framer.
-            - Frame: The main interface for creating and managing Framer instances.
-            - Framer: An individual AI agent with capabilities for task management, decision-making, and interaction with language models.
-            - Framed: A collection of Framer objects working together to achieve complex tasks.
-            """
-            full_prompt = f"{frame_context}\n\n{full_prompt}"
+        Memories are the only section that can be cut. The oldest are dropped
+        first, assuming they are listed from oldest to newest.
 
-        if recent_memories:
-            memories_context = "Recent memories and perceptions:\n"
-            for memory in recent_memories:
-                memories_context += (
-                    f"- {memory.get('type', 'Memory')}: {memory.get('content', '')}\n"
-                )
-            full_prompt = f"{memories_context}\n{full_prompt}"
+        Args:
+            prompt (str): The prompt.
+            include_frame_context (bool): Whether to add the Frame description.
+            recent_memories (Optional[List[Dict[str, Any]]]): Memories to add before the prompt.
+            system_prompt (Optional[str]): Instructions that stay the same from call to call.
+            model (str): The model the prompt is for.
+            max_tokens (int): Tokens reserved for the completion.
+            context (Optional[str]): Context that changes less often than the memories,
+                placed ahead of them.
 
-        return full_prompt
+        Returns:
+            PromptLayout: The prompt's sections.
+        """
+        assembler = ContextAssembler(model, max_tokens, self.max_prompt_tokens)
+        if include_frame_context:
+            assembler.add(
+                "frame_context",
+                FRAME_CONTEXT,
+                section=PromptSection.SYSTEM,
+                required=True,
+            )
+        assembler.add(
+            "system", system_prompt, section=PromptSection.SYSTEM, required=True
+        )
+        assembler.add("context", context, section=PromptSection.CONTEXT, required=True)
+        assembler.add(
+            "memories",
+            [
+                f"- {memory.get('type', 'Memory')}: {memory.get('content', '')}"
+                for memory in recent_memories or []
+            ],
+            section=PromptSection.MEMORIES,
+            keep="end",
+            header="Recent memories and perceptions:",
+        )
+        assembler.add("prompt", prompt, section=PromptSection.INPUT, required=True)
+
+        context = await assembler.assemble()
+        self.metrics.record_context(model, context.tokens, context.truncated)
+        return context.layout
 
     def set_default_model(self, model: str):
         """
@@ -206,60 +377,697 @@ class LLMService:
         include_frame_context: bool = False,
         framer: Optional[Any] = None,
         recent_memories: Optional[List[Dict[str, Any]]] = None,
-    ) -> str:
+        use_cache: bool = True,
+        priority: int = 0,
+        call_site: Optional[str] = None,
+        escalate: bool = False,
+        deadline: Optional[float] = None,
+        output_type: Optional[TypeAdapter] = None,
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None,
+    ) -> Union[str, Any, AsyncGenerator[str, None]]:
+        try:
+            return await self._complete(
+                prompt,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                additional_context=additional_context,
+                stream=stream,
+                include_frame_context=include_frame_context,
+                recent_memories=recent_memories,
+                use_cache=use_cache,
+                priority=priority,
+                call_site=call_site,
+                escalate=escalate,
+                deadline=deadline,
+                output_type=output_type,
+                system_prompt=system_prompt,
+                context=context,
+            )
+        except Exception as e:
+            self.logger.error(f"Error in get_completion: {str(e)}")
+            return json.dumps(
+                {
+                    "error": str(e),
+                    "fallback_response": "I encountered an error while processing your request. Could you please try again?",
+                }
+            )
+
+    async def get_completions(
+        self,
+        requests: Sequence[Union[str, Dict[str, Any]]],
+        max_concurrency: int = 8,
+        **defaults: Any,
+    ) -> List[CompletionResult]:
+        """
+        Get completions for many requests concurrently.
+
+        At most ``max_concurrency`` requests run at once, and every request
+        still waits for the shared rate limiter, so large batches are paced by
+        the provider budget rather than rejected. A failed request does not
+        affect the others: its error is returned in its result.
+
+        Args:
+            requests (Sequence[Union[str, Dict[str, Any]]]): Prompts, or dicts of
+                ``get_completion`` keyword arguments including ``prompt``.
+            max_concurrency (int): Maximum number of requests in flight at once.
+            **defaults (Any): ``get_completion`` keyword arguments applied to every
+                request unless the request overrides them.
+
+        Returns:
+            List[CompletionResult]: One result per request, in input order.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if defaults.get("stream"):
+            raise ValueError("Streaming is not supported for batched completions")
+
+        results: List[Optional[CompletionResult]] = [None] * len(requests)
+        pending = iter(enumerate(requests))
+        start_time = time.time()
+
+        async def worker() -> None:
+            for index, request in pending:
+                kwargs = dict(defaults)
+                if isinstance(request, str):
+                    kwargs["prompt"] = request
+                else:
+                    kwargs.update(request)
+                kwargs["stream"] = False
+                try:
+                    completion = await self._complete(**kwargs)
+                    results[index] = CompletionResult(index=index, result=completion)
+                except Exception as e:
+                    self.logger.warning(f"Batch request {index} failed: {e}")
+                    results[index] = CompletionResult(index=index, error=e)
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(max_concurrency, len(requests))))
+        )
+
+        failed = sum(1 for result in results if not result.ok)
+        duration = time.time() - start_time
+        self.metrics.record_batch(len(requests), failed, duration)
+        self.logger.debug(
+            f"Batch of {len(requests)} completions finished in {duration:.2f}s "
+            f"with {failed} failures"
+        )
+        return results
+
+    async def _complete(
+        self,
+        prompt: str,
+        model: str = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        additional_context: Optional[Dict[str, Any]] = None,
+        expected_output: Optional[str] = None,
+        use_local: bool = False,
+        stream: bool = False,
+        include_frame_context: bool = False,
+        framer: Optional[Any] = None,
+        recent_memories: Optional[List[Dict[str, Any]]] = None,
+        use_cache: bool = True,
+        priority: int = 0,
+        call_site: Optional[str] = None,
+        escalate: bool = False,
+        deadline: Optional[float] = None,
+        output_type: Optional[TypeAdapter] = None,
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None,
+    ) -> Union[str, Any, AsyncGenerator[str, None]]:
+        """
+        Get a completion, raising on failure instead of returning an error payload.
+
+        Args:
+            prompt (str): The prompt.
+            model (str): The model to use. None uses the default model.
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): The sampling temperature.
+            additional_context (Optional[Dict[str, Any]]): Additional context for the adapter.
+            expected_output (Optional[str]): Unused, accepted for compatibility with ``get_completion``.
+            use_local (bool): Unused, accepted for compatibility with ``get_completion``.
+            stream (bool): Whether to return an async generator of chunks.
+            include_frame_context (bool): Whether to prepend the Frame description.
+            framer (Optional[Any]): Unused, accepted for compatibility with ``get_completion``.
+            recent_memories (Optional[List[Dict[str, Any]]]): Memories to prepend to the prompt.
+            use_cache (bool): Whether the completion cache may be used.
+            priority (int): Rate limiter priority. Higher values are admitted first.
+            call_site (Optional[str]): Where the call comes from, used by the model router.
+            escalate (bool): Whether the model router should skip its cheapest model.
+            deadline (Optional[float]): Seconds the call may take, retries and fallbacks
+                included. It never extends a deadline set by the caller's context.
+            output_type (Optional[TypeAdapter]): Requests JSON mode from the provider and
+                validates the response with this adapter, parsing it exactly once.
+            system_prompt (Optional[str]): Instructions that stay the same from call to call.
+                They are sent as a system message ahead of everything else, so providers
+                can reuse their cached prefix.
+            context (Optional[str]): Context that changes less often than the memories,
+                such as roles and goals. It opens the user message, ahead of the memories
+                and the prompt.
+
+        Returns:
+            Union[str, Any, AsyncGenerator[str, None]]: The completion, the validated
+            object when ``output_type`` is given, or the chunks when streaming.
+        """
+        if output_type is not None and stream:
+            raise ValueError("Structured output cannot be streamed")
+        with call_deadline(deadline):
+            return await self._route_completion(
+                prompt,
+                model,
+                max_tokens,
+                temperature,
+                additional_context,
+                stream,
+                include_frame_context,
+                recent_memories,
+                use_cache,
+                priority,
+                call_site,
+                escalate,
+                output_type,
+                system_prompt,
+                context,
+            )
+
+    async def _route_completion(
+        self,
+        prompt: str,
+        model: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        additional_context: Optional[Dict[str, Any]],
+        stream: bool,
+        include_frame_context: bool,
+        recent_memories: Optional[List[Dict[str, Any]]],
+        use_cache: bool,
+        priority: int,
+        call_site: Optional[str],
+        escalate: bool,
+        output_type: Optional[TypeAdapter],
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None,
+    ) -> Union[str, Any, AsyncGenerator[str, None]]:
         model = model or self.default_model
-        self.logger.debug(f"Using model: {model}")
+        layout = await self._assemble_prompt(
+            prompt,
+            include_frame_context,
+            recent_memories,
+            system_prompt,
+            model,
+            max_tokens,
+            context,
+        )
+        full_prompt = layout.text()
+        args = (full_prompt, max_tokens, temperature, additional_context, stream)
+
+        async def complete(
+            candidate: str,
+        ) -> Union[str, Any, AsyncGenerator[str, None]]:
+            try:
+                result = await self._complete_with_model(
+                    candidate,
+                    *args,
+                    use_cache,
+                    priority,
+                    output_type is not None,
+                    call_site,
+                    layout.messages(),
+                )
+                if output_type is None:
+                    return result
+                # A malformed response raises here, so a router moves on to its next model.
+                return output_type.validate_json(result)
+            except Exception as e:
+                self.metrics.record_error(candidate, e)
+                raise
+
+        if self.router is None:
+            return await complete(model)
 
+        chain = self.router.route(
+            call_site,
+            count_tokens(full_prompt, model),
+            max_tokens,
+            requested_model=model,
+            escalate=escalate,
+        )
+        self.logger.debug(f"Routing {call_site or 'call'} to {chain}")
+        last_error: Optional[Exception] = None
+        for candidate in chain:
+            try:
+                return await complete(candidate)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                self.router.record_failure(candidate)
+                last_error = e
+                self.logger.warning(f"Model {candidate} failed, trying fallback: {e}")
+        raise last_error
+
+    async def _complete_with_model(
+        self,
+        model: str,
+        full_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        additional_context: Optional[Dict[str, Any]],
+        stream: bool,
+        use_cache: bool,
+        priority: int,
+        json_mode: bool = False,
+        call_site: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
+    ) -> Union[str, AsyncGenerator[str, None]]:
+        self.logger.debug(f"Using model: {model}")
         start_time = time.time()
 
-        full_prompt = self._prepare_full_prompt(
-            prompt, include_frame_context, recent_memories
+        adapter = self.get_adapter(model)
+        config = self._adapter_config(
+            adapter, max_tokens, temperature, json_mode, messages
         )
+        formatted_prompt = adapter.format_prompt(full_prompt)
+        if stream:
+            # Retries cover opening the stream. Chunks already handed to the
+            # caller cannot be taken back, so errors after that are raised.
+            async def open_stream() -> Any:
+                await self._acquire_rate_limit(
+                    model, formatted_prompt, max_tokens, priority
+                )
+                with self.metrics.track_in_flight(model):
+                    chunks = adapter.get_completion(
+                        formatted_prompt,
+                        config,
+                        model=model,
+                        additional_context=additional_context,
+                        stream=True,
+                    )
+                    if inspect.isawaitable(chunks):
+                        chunks = await chunks
+                return chunks
+
+            chunks = await self.retry_policy.run(
+                provider_for_model(model), open_stream, self._retry_recorder(model)
+            )
+            return self._stream_completion(
+                chunks, model, formatted_prompt, start_time, call_site
+            )
 
+        adapter_name = type(adapter).__name__ + (":json" if json_mode else "")
         try:
-            adapter = self.get_adapter(model)
-            config = adapter.get_config(max_tokens=max_tokens, temperature=temperature)
-            formatted_prompt = adapter.format_prompt(full_prompt)
-            if stream:
-                result = await adapter.get_completion(
+            request_key = CompletionCache.make_key(
+                model,
+                formatted_prompt,
+                temperature,
+                max_tokens,
+                adapter_name,
+                additional_context,
+            )
+        except TypeError as e:
+            # Without a stable key the request is neither cached nor coalesced.
+            self.logger.debug(f"Not caching request for model {model}: {e}")
+            request_key = None
+        use_cache = (
+            use_cache
+            and request_key is not None
+            and self.cache is not None
+            and self.cache.is_cacheable(temperature)
+        )
+        if use_cache:
+            cached = await self.cache.aget(request_key)
+            if cached is not None:
+                self.metrics.record_cache_hit()
+                self.logger.debug(f"Cache hit for model: {model}")
+                return cached
+            self.metrics.record_cache_miss()
+
+        fetch = self._fetcher(
+            adapter,
+            model,
+            formatted_prompt,
+            config,
+            max_tokens,
+            additional_context,
+            priority,
+            request_key if use_cache else None,
+            start_time,
+        )
+        if self.hedge_policy is not None:
+            fetch = self._hedged(
+                fetch,
+                model,
+                full_prompt,
+                max_tokens,
+                temperature,
+                additional_context,
+                priority,
+                start_time,
+                json_mode,
+                messages,
+            )
+
+        if request_key is None or not self.coalescer.is_coalescable(temperature):
+            result = await fetch()
+        else:
+            result, coalesced = await self.coalescer.run(request_key, fetch)
+            if coalesced:
+                self.metrics.record_coalesced()
+                self.logger.debug(f"Coalesced request for model: {model}")
+        self.metrics.record_latency(model, call_site, time.time() - start_time)
+        return result
+
+    @staticmethod
+    def _adapter_config(
+        adapter: Any,
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+        messages: Optional[List[Dict[str, str]]],
+    ) -> Any:
+        """
+        Build an adapter's configuration for one request.
+
+        Args:
+            adapter (Any): The adapter serving the request.
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): The sampling temperature.
+            json_mode (bool): Whether to ask the provider for JSON output.
+            messages (Optional[List[Dict[str, str]]]): The prompt as chat messages, sent instead
+                of the formatted prompt by adapters whose configuration accepts them.
+
+        Returns:
+            Any: The adapter configuration.
+        """
+        config = adapter.get_config(max_tokens=max_tokens, temperature=temperature)
+        if json_mode:
+            config.json_mode = True
+        if messages is not None and hasattr(config, "messages"):
+            config.messages = messages
+        return config
+
+    def _retry_recorder(self, model: str) -> Callable[[BaseException], None]:
+        """
+        Build the retry policy callback that counts retries of a model.
+
+        Args:
+            model (str): The model name.
+
+        Returns:
+            Callable[[BaseException], None]: Records one retry per call.
+        """
+        return lambda error: self.metrics.record_retry(model)
+
+    def _fetcher(
+        self,
+        adapter: Any,
+        model: str,
+        formatted_prompt: str,
+        config: Any,
+        max_tokens: int,
+        additional_context: Optional[Dict[str, Any]],
+        priority: int,
+        cache_key: Optional[str],
+        start_time: float,
+    ) -> Callable[[], Awaitable[str]]:
+        """
+        Build the function that sends a request, with rate limiting and retries.
+
+        Args:
+            adapter (Any): The adapter serving the request.
+            model (str): The model name.
+            formatted_prompt (str): The prompt sent to the adapter.
+            config (Any): The adapter configuration.
+            max_tokens (int): The maximum number of tokens to generate.
+            additional_context (Optional[Dict[str, Any]]): Additional context for the adapter.
+            priority (int): Rate limiter priority.
+            cache_key (Optional[str]): Key to store the result under, or None to skip caching.
+            start_time (float): When the request started.
+
+        Returns:
+            Callable[[], Awaitable[str]]: Sends the request and returns the completion.
+        """
+
+        async def attempt() -> str:
+            await self._acquire_rate_limit(
+                model, formatted_prompt, max_tokens, priority
+            )
+            with self.metrics.track_in_flight(model):
+                return await self._fetch_completion(
+                    adapter,
+                    model,
                     formatted_prompt,
                     config,
                     additional_context,
-                    stream=stream,
-                    framer=framer,
-                )
-                return result  # This should be an async generator
-            else:
-                result = await adapter.get_completion(
-                    formatted_prompt, config, additional_context
+                    cache_key,
+                    start_time,
                 )
 
-            end_time = time.time()
-            execution_time = end_time - start_time
-            tokens_used = (
-                len(full_prompt.split())
-                + (len(result.split()) if isinstance(result, str) else 0)
-                if result is not None
-                else 0
+        async def fetch() -> str:
+            return await self.retry_policy.run(
+                provider_for_model(model), attempt, self._retry_recorder(model)
             )
 
-            self.metrics.track_usage(model, tokens_used)
+        return fetch
 
-            self.logger.debug(f"Completion generated in {execution_time:.2f} seconds")
-            self.logger.debug(f"Tokens used: {tokens_used}")
+    def _hedged(
+        self,
+        fetch: Callable[[], Awaitable[str]],
+        model: str,
+        full_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        additional_context: Optional[Dict[str, Any]],
+        priority: int,
+        start_time: float,
+        json_mode: bool = False,
+        messages: Optional[List[Dict[str, str]]] = None,
+    ) -> Callable[[], Awaitable[str]]:
+        """
+        Wrap a request so the hedge policy can duplicate it when it is slow.
 
-            if isinstance(result, dict):
-                return json.dumps(result)
-            elif isinstance(result, str):
-                return result
-            else:
-                return str(result)
+        A hedge sent to a different model builds its own request for that model
+        and is not cached, since the cache key belongs to the original model.
 
-        except Exception as e:
-            self.logger.error(f"Error in get_completion: {str(e)}")
-            return json.dumps(
-                {
-                    "error": str(e),
-                    "fallback_response": "I encountered an error while processing your request. Could you please try again?",
-                }
+        Args:
+            fetch (Callable[[], Awaitable[str]]): Sends the original request.
+            model (str): The original request's model.
+            full_prompt (str): The prompt before adapter formatting.
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): The sampling temperature.
+            additional_context (Optional[Dict[str, Any]]): Additional context for the adapter.
+            priority (int): Rate limiter priority.
+            start_time (float): When the request started.
+            json_mode (bool): Whether to ask the hedge's provider for JSON output.
+            messages (Optional[List[Dict[str, str]]]): The prompt as chat messages.
+
+        Returns:
+            Callable[[], Awaitable[str]]: Sends the request, hedging it if needed.
+        """
+        hedge_model = self.hedge_policy.hedge_model(model)
+
+        async def hedge() -> str:
+            if hedge_model == model:
+                return await fetch()
+            adapter = self.get_adapter(hedge_model)
+            config = self._adapter_config(
+                adapter, max_tokens, temperature, json_mode, messages
             )
+            return await self._fetcher(
+                adapter,
+                hedge_model,
+                adapter.format_prompt(full_prompt),
+                config,
+                max_tokens,
+                additional_context,
+                priority,
+                None,
+                start_time,
+            )()
+
+        async def hedged() -> str:
+            result, won = await self.hedge_policy.run(model, fetch, hedge)
+            if won is not None:
+                self.metrics.record_hedge(model, won)
+            return result
+
+        return hedged
+
+    async def _stream_completion(
+        self,
+        chunks: Any,
+        model: str,
+        formatted_prompt: str,
+        start_time: float,
+        call_site: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Forward streamed chunks to the caller and record streaming metrics.
+
+        Chunks are pulled from the adapter only when the caller asks for the
+        next one, so a slow consumer applies backpressure to the provider stream
+        instead of buffering it. Time-to-first-token, tokens per second and
+        token usage are recorded once the stream is exhausted.
+
+        Args:
+            chunks (Any): The adapter's async iterable of chunks, or a complete string.
+            model (str): The model name.
+            formatted_prompt (str): The prompt sent to the adapter.
+            start_time (float): When the request started.
+            call_site (Optional[str]): Where the call came from, used to label its latency.
+
+        Yields:
+            str: Chunks of the completion as they arrive.
+        """
+        if isinstance(chunks, str):
+            chunks = _as_stream(chunks)
+        pop_reported_usage()
+        parts: List[str] = []
+        first_token_time: Optional[float] = None
+        breaker = self.retry_policy.breaker(provider_for_model(model))
+        try:
+            with self.metrics.track_in_flight(model):
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if first_token_time is None:
+                        first_token_time = time.time()
+                    parts.append(chunk)
+                    yield chunk
+        except Exception as e:
+            self.metrics.record_error(model, e)
+            if is_retryable(e):
+                breaker.record_failure()
+            raise
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+        end_time = time.time()
+        result = "".join(parts)
+        usage = pop_reported_usage() or TokenUsage(
+            prompt_tokens=count_tokens(formatted_prompt, model),
+            completion_tokens=count_tokens(result, model),
+        )
+        self.metrics.track_usage(
+            model, usage.prompt_tokens, usage.completion_tokens, usage.cached_tokens
+        )
+
+        first_token_time = first_token_time or end_time
+        time_to_first_token = first_token_time - start_time
+        generation_time = end_time - first_token_time
+        tokens_per_second = (
+            usage.completion_tokens / generation_time if generation_time > 0 else 0.0
+        )
+        self.metrics.record_stream(model, time_to_first_token, tokens_per_second)
+        self.metrics.record_latency(model, call_site, end_time - start_time)
+        self._record_route_outcome(model, end_time - start_time, usage)
+        self.logger.debug(
+            f"Streamed {usage.completion_tokens} tokens, first token after "
+            f"{time_to_first_token:.2f}s, {tokens_per_second:.1f} tokens/s"
+        )
+
+    def _record_route_outcome(
+        self, model: str, latency: float, usage: TokenUsage
+    ) -> None:
+        """
+        Report a successful call's latency and cost to the model router and hedge policy.
+
+        Args:
+            model (str): The model that served the call.
+            latency (float): Seconds the call took.
+            usage (TokenUsage): The call's token usage.
+        """
+        if self.hedge_policy is not None:
+            self.hedge_policy.record_latency(model, latency)
+        if self.router is None:
+            return
+        self.router.record_latency(model, latency)
+        self.router.record_success(model)
+        self.router.record_cost(
+            calculate_cost(model, usage.prompt_tokens, usage.completion_tokens)
+        )
+
+    async def _acquire_rate_limit(
+        self, model: str, prompt: str, max_tokens: int, priority: int
+    ) -> None:
+        """
+        Wait for the provider budget to admit a request.
+
+        Args:
+            model (str): The model name.
+            prompt (str): The prompt sent to the adapter.
+            max_tokens (int): The maximum number of tokens to generate.
+            priority (int): Higher values are admitted first.
+        """
+        if model.startswith(RECORD_PREFIX):
+            # The recorded adapter reports 429s for the model it actually sends.
+            model = model[len(RECORD_PREFIX) :]
+        await self.rate_limiter.acquire(
+            provider_for_model(model),
+            model,
+            estimate_request_tokens(prompt, max_tokens, model),
+            priority,
+        )
+
+    async def _fetch_completion(
+        self,
+        adapter: Any,
+        model: str,
+        formatted_prompt: str,
+        config: Any,
+        additional_context: Optional[Dict[str, Any]],
+        cache_key: Optional[str],
+        start_time: float,
+    ) -> str:
+        """
+        Call the adapter, record usage and store the result in the cache.
+
+        Args:
+            adapter (Any): The adapter serving the request.
+            model (str): The model name.
+            formatted_prompt (str): The prompt sent to the adapter.
+            config (Any): The adapter configuration.
+            additional_context (Optional[Dict[str, Any]]): Additional context for the adapter.
+            cache_key (Optional[str]): Key to store the result under, or None to skip caching.
+            start_time (float): When the request started.
+
+        Returns:
+            str: The completion as a string.
+        """
+        pop_reported_usage()
+        call_start = time.time()
+        result = await adapter.get_completion(
+            formatted_prompt,
+            config,
+            model=model,
+            additional_context=additional_context,
+        )
+
+        end_time = time.time()
+        execution_time = end_time - start_time
+
+        if isinstance(result, dict):
+            result = json.dumps(result)
+        elif not isinstance(result, str):
+            result = str(result)
+
+        usage = pop_reported_usage() or TokenUsage(
+            prompt_tokens=count_tokens(formatted_prompt, model),
+            completion_tokens=count_tokens(result, model),
+        )
+        self.metrics.track_usage(
+            model, usage.prompt_tokens, usage.completion_tokens, usage.cached_tokens
+        )
+        self._record_route_outcome(model, end_time - call_start, usage)
+
+        self.logger.debug(f"Completion generated in {execution_time:.2f} seconds")
+        self.logger.debug(
+            f"Tokens used: {usage.prompt_tokens} prompt, {usage.completion_tokens} completion"
+        )
+
+        if cache_key is not None:
+            await self.cache.aset(cache_key, result)
+        return result
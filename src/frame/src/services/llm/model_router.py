@@ -0,0 +1,290 @@
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, List, Optional
+
+from frame.src.constants.models import DEFAULT_MODEL
+from frame.src.utils.llm_utils import (
+    calculate_cost,
+    choose_best_model_for_tokens,
+    get_context_window,
+)
+
+logger = logging.getLogger(__name__)
+
+# Call sites the Framer and its actions pass to ``get_completion``.
+CALL_SITES = ("decision", "respond", "role_generation", "summarize")
+
+_budget_owner: ContextVar[Optional[str]] = ContextVar("budget_owner", default=None)
+
+
+@contextmanager
+def budget_owner(owner: Optional[str]) -> Iterator[None]:
+    """
+    Charge completions made inside the block to an owner's cost budget.
+
+    Args:
+        owner (Optional[str]): The budget owner, usually a Framer name.
+    """
+    token = _budget_owner.set(owner)
+    try:
+        yield
+    finally:
+        _budget_owner.reset(token)
+
+
+def default_routes(default_model: str = DEFAULT_MODEL) -> Dict[str, List[str]]:
+    """
+    Route every built-in call site to one model.
+
+    Args:
+        default_model (str): The model to route to.
+
+    Returns:
+        Dict[str, List[str]]: The routes, by call site.
+    """
+    return {call_site: [default_model] for call_site in CALL_SITES}
+
+
+def current_budget_owner() -> Optional[str]:
+    """
+    Get the budget owner of the current context.
+
+    Returns:
+        Optional[str]: The owner set by ``budget_owner``, or None outside one.
+    """
+    return _budget_owner.get()
+
+
+class ModelRouter:
+    """
+    Chooses the model chain for each completion.
+
+    Each call site has a route: candidate models ordered from cheapest to
+    largest. A call starts at the cheapest candidate whose context window fits
+    the prompt, and the remaining candidates follow as fallbacks. The chain is
+    then adjusted per call:
+
+    - ``escalate`` skips the cheapest candidate, e.g. after a low-confidence answer.
+    - Candidates whose estimated cost exceeds the caller's remaining budget are dropped.
+    - Candidates slower than the call site's latency target move behind faster ones.
+    - Candidates that recently failed move to the end until their cooldown expires.
+
+    Attributes:
+        routes (Dict[str, List[str]]): Candidate models per call site, cheapest first.
+            Without routes, every built-in call site routes to ``default_model``, or
+            with no ``default_model`` either, each call uses the model it requested,
+            such as its Framer's ``default_model``.
+        fallbacks (Dict[str, List[str]]): Extra fallback models for a requested model with no route.
+        latency_targets (Dict[str, float]): Latency target in seconds per call site.
+        latency_percentile (float): Percentile compared against latency targets.
+        escalation_confidence (float): Decisions below this confidence are retried with ``escalate``.
+        cooldown (float): Seconds a failed model is moved to the end of chains.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, List[str]]] = None,
+        fallbacks: Optional[Dict[str, List[str]]] = None,
+        latency_targets: Optional[Dict[str, float]] = None,
+        latency_percentile: float = 0.95,
+        latency_window: int = 100,
+        escalation_confidence: float = 0.5,
+        cooldown: float = 30.0,
+        default_model: Optional[str] = None,
+    ):
+        if routes is None:
+            routes = default_routes(default_model) if default_model else {}
+        self.routes = dict(routes)
+        self.fallbacks = fallbacks or {}
+        self.latency_targets = latency_targets or {}
+        self.latency_percentile = latency_percentile
+        self.escalation_confidence = escalation_confidence
+        self.cooldown = cooldown
+        self._latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=latency_window)
+        )
+        self._failed_until: Dict[str, float] = {}
+        self._budgets: Dict[str, float] = {}
+        self._spent: Dict[str, float] = defaultdict(float)
+
+    def route(
+        self,
+        call_site: Optional[str],
+        prompt_tokens: int,
+        max_tokens: int,
+        requested_model: Optional[str] = None,
+        escalate: bool = False,
+    ) -> List[str]:
+        """
+        Choose the models to try for a call, in order.
+
+        Args:
+            call_site (Optional[str]): The call site, e.g. "decision" or "respond".
+            prompt_tokens (int): Tokens in the prompt.
+            max_tokens (int): The maximum number of tokens to generate.
+            requested_model (Optional[str]): The model the caller asked for. It is
+                used when the call site has no route, and as the last fallback otherwise.
+            escalate (bool): Whether to skip the cheapest candidate.
+
+        Returns:
+            List[str]: The model chain; the first entry is tried first.
+        """
+        candidates = list(self.routes.get(call_site) or [])
+        if requested_model and requested_model not in candidates:
+            if candidates:
+                candidates.append(requested_model)
+            else:
+                candidates = [requested_model] + [
+                    model
+                    for model in self.fallbacks.get(requested_model, [])
+                    if model != requested_model
+                ]
+
+        needed = prompt_tokens + max_tokens
+        fitting = [model for model in candidates if self._fits(model, needed)]
+        if not fitting:
+            fitting = [choose_best_model_for_tokens(needed)]
+
+        if escalate and len(fitting) > 1:
+            fitting = fitting[1:]
+
+        fitting = self._within_budget(fitting, prompt_tokens, max_tokens)
+
+        target = self.latency_targets.get(call_site)
+        if target is not None:
+            fitting.sort(key=lambda model: self._too_slow(model, target))
+
+        now = time.monotonic()
+        fitting.sort(key=lambda model: self._failed_until.get(model, 0) > now)
+        return fitting
+
+    def should_escalate(self, confidence: Optional[float]) -> bool:
+        """
+        Check whether a decision is uncertain enough to retry with a larger model.
+
+        Args:
+            confidence (Optional[float]): The decision's confidence.
+
+        Returns:
+            bool: True if the decision should be retried with ``escalate``.
+        """
+        return isinstance(confidence, (int, float)) and (
+            confidence < self.escalation_confidence
+        )
+
+    def record_latency(self, model: str, seconds: float) -> None:
+        """
+        Record the latency of a successful call.
+
+        Args:
+            model (str): The model name.
+            seconds (float): The call latency in seconds.
+        """
+        self._latencies[model].append(seconds)
+
+    def get_latency(
+        self, model: str, percentile: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Get a latency percentile over the recent calls to a model.
+
+        Args:
+            model (str): The model name.
+            percentile (Optional[float]): Percentile between 0 and 1. Defaults to ``latency_percentile``.
+
+        Returns:
+            Optional[float]: The latency in seconds, or None if no calls were recorded.
+        """
+        samples = sorted(self._latencies.get(model, ()))
+        if not samples:
+            return None
+        q = self.latency_percentile if percentile is None else percentile
+        return samples[min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))]
+
+    def record_failure(self, model: str) -> None:
+        """
+        Move a model to the end of chains until its cooldown expires.
+
+        Args:
+            model (str): The model that failed or was rate limited.
+        """
+        self._failed_until[model] = time.monotonic() + self.cooldown
+        logger.warning(f"Model {model} failed, deprioritizing for {self.cooldown}s")
+
+    def record_success(self, model: str) -> None:
+        """
+        Clear any cooldown for a model after a successful call.
+
+        Args:
+            model (str): The model name.
+        """
+        self._failed_until.pop(model, None)
+
+    def set_budget(self, owner: str, limit: Optional[float]) -> None:
+        """
+        Set the cost budget of an owner.
+
+        Args:
+            owner (str): The budget owner, usually a Framer name.
+            limit (Optional[float]): The budget in dollars, or None to remove it.
+        """
+        if limit is None:
+            self._budgets.pop(owner, None)
+        else:
+            self._budgets[owner] = limit
+
+    def record_cost(self, cost: float) -> None:
+        """
+        Charge a cost to the budget owner of the current context.
+
+        Args:
+            cost (float): The cost in dollars.
+        """
+        owner = current_budget_owner()
+        if owner is not None:
+            self._spent[owner] += cost
+
+    def remaining_budget(self, owner: Optional[str] = None) -> Optional[float]:
+        """
+        Get the remaining budget of an owner.
+
+        Args:
+            owner (Optional[str]): The owner. Defaults to the owner of the current context.
+
+        Returns:
+            Optional[float]: The remaining budget in dollars, or None if the owner has no budget.
+        """
+        owner = owner if owner is not None else current_budget_owner()
+        if owner not in self._budgets:
+            return None
+        return self._budgets[owner] - self._spent[owner]
+
+    def _fits(self, model: str, needed: int) -> bool:
+        window = get_context_window(model)
+        return window is None or needed <= window
+
+    def _within_budget(
+        self, models: List[str], prompt_tokens: int, max_tokens: int
+    ) -> List[str]:
+        remaining = self.remaining_budget()
+        if remaining is None:
+            return models
+        costs = {
+            model: calculate_cost(model, prompt_tokens, max_tokens) for model in models
+        }
+        affordable = [model for model in models if costs[model] <= remaining]
+        if affordable:
+            return affordable
+        # Over budget: keep only the cheapest model rather than failing the call.
+        logger.warning(
+            f"Cost budget exhausted ({remaining:.4f} left), using cheapest model"
+        )
+        return [min(models, key=costs.get)]
+
+    def _too_slow(self, model: str, target: float) -> bool:
+        latency = self.get_latency(model)
+        return latency is not None and latency > target
@@ -0,0 +1,107 @@
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+
+class PromptSection(IntEnum):
+    """
+    Sections of a prompt, from the most static to the most dynamic.
+
+    Providers cache the longest prompt prefix they have seen recently, so
+    sections that rarely change come first and the perception comes last.
+    """
+
+    SYSTEM = 0
+    ACTIONS = 1
+    CONTEXT = 2
+    MEMORIES = 3
+    INPUT = 4
+
+
+# Sections up to this one form the system message; the rest the user message.
+LAST_SYSTEM_SECTION = PromptSection.ACTIONS
+
+SECTION_SEPARATOR = "\n\n"
+
+
+class PromptLayout:
+    """
+    Assembles prompt sections into chat messages with a stable prefix.
+
+    Sections are ordered by ``PromptSection`` whatever order they are added
+    in, and keep their insertion order within a section. The system message
+    holds the system prompt and action manifest, which are identical from
+    one call to the next, so providers can serve them from their prompt
+    cache. Roles and goals, memories and the input follow in the user
+    message.
+    """
+
+    def __init__(self):
+        self._sections: List[Tuple[PromptSection, str]] = []
+
+    def add(self, section: PromptSection, text: Optional[str]) -> "PromptLayout":
+        """
+        Add text to a section. Empty text is ignored.
+
+        Args:
+            section (PromptSection): The section the text belongs to.
+            text (Optional[str]): The text.
+
+        Returns:
+            PromptLayout: This layout, to chain calls.
+        """
+        if text and text.strip():
+            self._sections.append((section, text))
+        return self
+
+    def section(self, section: PromptSection) -> str:
+        """
+        Get the text of one section.
+
+        Args:
+            section (PromptSection): The section.
+
+        Returns:
+            str: The section's text, in insertion order.
+        """
+        return SECTION_SEPARATOR.join(
+            text for added, text in self._sections if added == section
+        )
+
+    def _join(self, system: bool) -> str:
+        return SECTION_SEPARATOR.join(
+            text
+            for section, text in sorted(self._sections, key=lambda item: item[0])
+            if (section <= LAST_SYSTEM_SECTION) == system
+        )
+
+    @property
+    def system(self) -> str:
+        """The system message: the system prompt and action manifest."""
+        return self._join(system=True)
+
+    @property
+    def user(self) -> str:
+        """The user message: roles and goals, memories and the input."""
+        return self._join(system=False)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """
+        Get the chat messages.
+
+        Returns:
+            List[Dict[str, str]]: A system message, if there is system text, then a user message.
+        """
+        messages = []
+        if self.system:
+            messages.append({"role": "system", "content": self.system})
+        messages.append({"role": "user", "content": self.user})
+        return messages
+
+    def text(self) -> str:
+        """
+        Get the whole prompt as one string, for adapters without chat messages.
+
+        Returns:
+            str: The system text followed by the user text.
+        """
+        return SECTION_SEPARATOR.join(part for part in (self.system, self.user) if part)
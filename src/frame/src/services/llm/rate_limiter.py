@@ -0,0 +1,420 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from frame.src.utils.llm_utils import get_llm_provider
+from frame.src.utils.token_utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+@dataclass
+class RateLimits:
+    """
+    Requests-per-minute and tokens-per-minute budget for one provider and model.
+
+    Attributes:
+        requests_per_minute (float): Maximum number of requests per minute.
+        tokens_per_minute (float): Maximum number of prompt and completion tokens per minute.
+    """
+
+    requests_per_minute: float = 3500
+    tokens_per_minute: float = 90000
+
+
+def provider_for_model(model: str) -> str:
+    """
+    Map a model name to the provider that serves it.
+
+    Args:
+        model (str): The model name.
+
+    Returns:
+        str: The provider name used to key rate limits, or "default" for models
+        no provider claims.
+    """
+    name = (model or "").lower()
+    if name.startswith("replay/"):
+        return "replay"
+    if name.startswith("local/"):
+        return "local"
+    if name.startswith("record/"):
+        name = name[len("record/") :]
+    return get_llm_provider(name, default="default")
+
+
+def estimate_request_tokens(
+    prompt: str, max_tokens: int, model: Optional[str] = None
+) -> int:
+    """
+    Estimate the tokens a request will count against a tokens-per-minute budget.
+
+    Providers count the prompt plus the requested ``max_tokens`` when admitting
+    a request, so both are included.
+
+    Args:
+        prompt (str): The prompt sent to the provider.
+        max_tokens (int): The maximum number of tokens to generate.
+        model (Optional[str]): The model whose tokenizer to use.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return count_tokens(prompt or "", model) + max(int(max_tokens or 0), 0)
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset or retry-after value into seconds.
+
+    Accepts plain seconds ("2", "0.5") and OpenAI style durations ("20ms", "6m0s").
+
+    Args:
+        value (Optional[str]): The header value.
+
+    Returns:
+        Optional[float]: The duration in seconds, or None if it cannot be parsed.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class _Budget:
+    def __init__(self, limits: RateLimits):
+        self.configured = RateLimits(
+            limits.requests_per_minute, limits.tokens_per_minute
+        )
+        self.requests_per_minute = limits.requests_per_minute
+        self.tokens_per_minute = limits.tokens_per_minute
+        self.requests = float(limits.requests_per_minute)
+        self.tokens = float(limits.tokens_per_minute)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.queue: List[list] = []
+        self.changed = asyncio.Event()
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - self.updated, 0.0)
+        self.updated = now
+        self.requests = min(
+            self.requests_per_minute,
+            self.requests + elapsed * self.requests_per_minute / 60.0,
+        )
+        self.tokens = min(
+            self.tokens_per_minute,
+            self.tokens + elapsed * self.tokens_per_minute / 60.0,
+        )
+
+    def delay_for(self, tokens: int, now: float) -> float:
+        self.refill(now)
+        delay = self.paused_until - now
+        if self.requests < 1:
+            delay = max(delay, (1 - self.requests) * 60.0 / self.requests_per_minute)
+        if self.tokens < tokens:
+            delay = max(delay, (tokens - self.tokens) * 60.0 / self.tokens_per_minute)
+        return max(delay, 0.0)
+
+    def notify(self) -> None:
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class RateLimiter:
+    """
+    Async rate limiter enforcing requests-per-minute and tokens-per-minute budgets.
+
+    Budgets are kept per provider and model. Callers await admission in priority
+    order, highest first, and in arrival order within a priority, so a burst of
+    requests is spread over the budget instead of hitting the provider at once.
+    Limits adapt to the provider: rate-limit headers replace the configured
+    limits, and a 429 pauses admission for the advertised retry delay and
+    halves the budget until successful calls restore it.
+
+    Attributes:
+        default_limits (RateLimits): Limits for providers and models without an explicit entry.
+        decrease_factor (float): Factor applied to a budget after a 429 without limit headers.
+        recovery_fraction (float): Fraction of the configured budget restored per successful call.
+        default_retry_after (float): Pause in seconds after a 429 that carries no retry delay.
+    """
+
+    def __init__(
+        self,
+        default_limits: Optional[RateLimits] = None,
+        limits: Optional[Dict[str, RateLimits]] = None,
+        decrease_factor: float = 0.5,
+        recovery_fraction: float = 0.05,
+        default_retry_after: float = 1.0,
+    ):
+        self.default_limits = default_limits or RateLimits()
+        self.decrease_factor = decrease_factor
+        self.recovery_fraction = recovery_fraction
+        self.default_retry_after = default_retry_after
+        self._limits: Dict[str, RateLimits] = dict(limits or {})
+        self._budgets: Dict[Tuple[str, str], _Budget] = {}
+        self._sequence = itertools.count()
+
+    def set_limits(
+        self, provider: str, limits: RateLimits, model: Optional[str] = None
+    ) -> None:
+        """
+        Configure the limits for a provider, or for one model of a provider.
+
+        Args:
+            provider (str): The provider name.
+            limits (RateLimits): The limits to enforce.
+            model (Optional[str]): The model name. None applies to every model of the provider.
+        """
+        key = f"{provider}/{model.lower()}" if model else provider
+        self._limits[key] = limits
+        for (budget_provider, budget_model), budget in self._budgets.items():
+            if budget_provider == provider and (
+                model is None or budget_model == model.lower()
+            ):
+                budget.configured = RateLimits(
+                    limits.requests_per_minute, limits.tokens_per_minute
+                )
+                self._apply_limits(
+                    budget, limits.requests_per_minute, limits.tokens_per_minute
+                )
+                budget.notify()
+
+    def _budget(self, provider: str, model: str) -> _Budget:
+        key = (provider, (model or "").lower())
+        budget = self._budgets.get(key)
+        if budget is None:
+            limits = (
+                self._limits.get(f"{key[0]}/{key[1]}")
+                or self._limits.get(provider)
+                or self.default_limits
+            )
+            budget = self._budgets[key] = _Budget(limits)
+        return budget
+
+    async def acquire(
+        self, provider: str, model: str, tokens: int = 0, priority: int = 0
+    ) -> None:
+        """
+        Wait until a request fits within the provider and model budget, then reserve it.
+
+        Args:
+            provider (str): The provider name.
+            model (str): The model name.
+            tokens (int): Estimated prompt tokens plus max_tokens for the request.
+            priority (int): Higher values are admitted first. Ties are admitted in arrival order.
+        """
+        budget = self._budget(provider, model)
+        tokens = max(int(tokens), 0)
+        entry = [-priority, next(self._sequence), tokens]
+        heapq.heappush(budget.queue, entry)
+        try:
+            while True:
+                changed = budget.changed
+                timeout = None
+                if budget.queue[0] is entry:
+                    # A request larger than the whole budget waits for a full bucket.
+                    needed = min(tokens, budget.tokens_per_minute)
+                    timeout = budget.delay_for(needed, time.monotonic())
+                    if timeout <= 0:
+                        heapq.heappop(budget.queue)
+                        budget.requests -= 1
+                        budget.tokens -= needed
+                        budget.notify()
+                        return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            if entry in budget.queue:
+                budget.queue.remove(entry)
+                heapq.heapify(budget.queue)
+                budget.notify()
+            raise
+
+    def update_from_headers(
+        self, provider: str, model: str, headers: Optional[Mapping[str, str]]
+    ) -> None:
+        """
+        Adopt the limits and remaining budget reported by the provider.
+
+        Understands the ``x-ratelimit-limit-*``, ``x-ratelimit-remaining-*`` and
+        ``x-ratelimit-reset-*`` headers for requests and tokens.
+
+        Args:
+            provider (str): The provider name.
+            model (str): The model name.
+            headers (Optional[Mapping[str, str]]): Response headers.
+        """
+        if not headers:
+            return
+        headers = {str(k).lower(): v for k, v in headers.items()}
+        budget = self._budget(provider, model)
+        now = time.monotonic()
+        budget.refill(now)
+
+        limit_requests = _to_float(headers.get("x-ratelimit-limit-requests"))
+        limit_tokens = _to_float(headers.get("x-ratelimit-limit-tokens"))
+        if limit_requests or limit_tokens:
+            self._apply_limits(budget, limit_requests, limit_tokens)
+            if limit_requests:
+                budget.configured.requests_per_minute = limit_requests
+            if limit_tokens:
+                budget.configured.tokens_per_minute = limit_tokens
+
+        remaining_requests = _to_float(headers.get("x-ratelimit-remaining-requests"))
+        if remaining_requests is not None:
+            budget.requests = min(budget.requests, remaining_requests)
+        remaining_tokens = _to_float(headers.get("x-ratelimit-remaining-tokens"))
+        if remaining_tokens is not None:
+            budget.tokens = min(budget.tokens, remaining_tokens)
+
+        for kind, remaining in (
+            ("requests", remaining_requests),
+            ("tokens", remaining_tokens),
+        ):
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if remaining is not None and remaining < 1 and reset:
+                budget.paused_until = max(budget.paused_until, now + reset)
+        budget.notify()
+
+    def record_rate_limited(
+        self,
+        provider: str,
+        model: str,
+        headers: Optional[Mapping[str, str]] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        React to a 429 response from the provider.
+
+        Admission is paused for the retry delay and the budget is emptied. When
+        the response carries no limit headers, the budget is also reduced by
+        ``decrease_factor``.
+
+        Args:
+            provider (str): The provider name.
+            model (str): The model name.
+            headers (Optional[Mapping[str, str]]): Response headers, if available.
+            retry_after (Optional[float]): Retry delay in seconds, if known.
+        """
+        headers = {str(k).lower(): v for k, v in (headers or {}).items()}
+        budget = self._budget(provider, model)
+        if retry_after is None:
+            retry_after_ms = _to_float(headers.get("retry-after-ms"))
+            retry_after = (
+                retry_after_ms / 1000.0
+                if retry_after_ms is not None
+                else parse_duration(headers.get("retry-after"))
+            )
+        if retry_after is None:
+            retry_after = self.default_retry_after
+
+        if (
+            "x-ratelimit-limit-requests" in headers
+            or "x-ratelimit-limit-tokens" in headers
+        ):
+            self.update_from_headers(provider, model, headers)
+        else:
+            self._apply_limits(
+                budget,
+                budget.requests_per_minute * self.decrease_factor,
+                budget.tokens_per_minute * self.decrease_factor,
+            )
+
+        now = time.monotonic()
+        budget.refill(now)
+        budget.requests = min(budget.requests, 0.0)
+        budget.tokens = min(budget.tokens, 0.0)
+        budget.paused_until = max(budget.paused_until, now + retry_after)
+        logger.warning(
+            f"Rate limited by {provider} for {model}, pausing for {retry_after:.2f}s"
+        )
+        budget.notify()
+
+    def record_success(self, provider: str, model: str) -> None:
+        """
+        Restore part of a budget that was reduced after a 429.
+
+        Args:
+            provider (str): The provider name.
+            model (str): The model name.
+        """
+        budget = self._budget(provider, model)
+        configured = budget.configured
+        if (
+            budget.requests_per_minute >= configured.requests_per_minute
+            and budget.tokens_per_minute >= configured.tokens_per_minute
+        ):
+            return
+        budget.refill(time.monotonic())
+        self._apply_limits(
+            budget,
+            min(
+                configured.requests_per_minute,
+                budget.requests_per_minute
+                + configured.requests_per_minute * self.recovery_fraction,
+            ),
+            min(
+                configured.tokens_per_minute,
+                budget.tokens_per_minute
+                + configured.tokens_per_minute * self.recovery_fraction,
+            ),
+        )
+        budget.notify()
+
+    def get_limits(self, provider: str, model: str) -> RateLimits:
+        """
+        Get the limits currently enforced for a provider and model.
+
+        Args:
+            provider (str): The provider name.
+            model (str): The model name.
+
+        Returns:
+            RateLimits: The effective limits.
+        """
+        budget = self._budget(provider, model)
+        return RateLimits(budget.requests_per_minute, budget.tokens_per_minute)
+
+    def queued(self, provider: str, model: str) -> int:
+        """Return the number of callers waiting for admission."""
+        return len(self._budget(provider, model).queue)
+
+    @staticmethod
+    def _apply_limits(
+        budget: _Budget,
+        requests_per_minute: Optional[float],
+        tokens_per_minute: Optional[float],
+    ) -> None:
+        if requests_per_minute:
+            budget.requests_per_minute = max(requests_per_minute, 1.0)
+            budget.requests = min(budget.requests, budget.requests_per_minute)
+        if tokens_per_minute:
+            budget.tokens_per_minute = max(tokens_per_minute, 1.0)
+            budget.tokens = min(budget.tokens, budget.tokens_per_minute)
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
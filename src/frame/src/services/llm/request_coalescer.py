@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RequestCoalescer:
+    """
+    Single-flight coalescing for identical in-flight LLM requests.
+
+    The first caller for a key starts the request in its own task. Every caller
+    for that key, including the first, awaits a shielded view of the task, so a
+    cancelled caller never cancels the shared request. The request is only
+    cancelled once every waiter has gone away. Errors raised by the request are
+    propagated to all waiters.
+
+    Attributes:
+        allow_sampled (bool): Whether requests with temperature > 0 may be coalesced.
+    """
+
+    def __init__(self, allow_sampled: bool = False):
+        self.allow_sampled = allow_sampled
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+    def is_coalescable(self, temperature: float) -> bool:
+        """
+        Check whether a request with the given temperature may share a result.
+
+        Args:
+            temperature (float): The sampling temperature of the request.
+
+        Returns:
+            bool: True if identical requests may be coalesced.
+        """
+        return self.allow_sampled or not temperature or temperature <= 0
+
+    def in_flight(self) -> int:
+        """Return the number of distinct requests currently in flight."""
+        return len(self._in_flight)
+
+    async def run(
+        self, key: str, factory: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run the request for a key, or join the one already in flight.
+
+        Args:
+            key (str): The request key.
+            factory (Callable[[], Awaitable[Any]]): Starts the request when no identical one is in flight.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether this caller joined an existing request.
+        """
+        task = self._in_flight.get(key)
+        coalesced = task is not None
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        self._waiters[key] += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._release(key, task) == 0:
+                logger.debug(f"All waiters cancelled, cancelling request {key[:12]}")
+                task.cancel()
+            raise
+        self._release(key, task)
+        return result, coalesced
+
+    def _release(self, key: str, task: asyncio.Task) -> int:
+        if self._in_flight.get(key) is not task:
+            return 0
+        self._waiters[key] -= 1
+        return self._waiters[key]
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            del self._waiters[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here so an error nobody awaited is not logged as unhandled.
+            logger.debug(f"Coalesced request failed: {task.exception()}")
@@ -0,0 +1,343 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+import openai
+
+from frame.src.services.llm.rate_limiter import parse_duration
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            f"Circuit breaker for {provider} is open, retry in {retry_in:.1f}s"
+        )
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a call's deadline passes before it could complete."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound the time LLM calls made inside the block may take, retries included.
+
+    Nested deadlines never extend an outer one: the earlier of the two applies.
+
+    Args:
+        seconds (Optional[float]): Seconds from now, or None to leave any outer deadline as is.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Get the time left before the current context's deadline.
+
+    Returns:
+        Optional[float]: Seconds left, possibly negative, or None if no deadline is set.
+    """
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Check whether an error is transient and the call worth retrying.
+
+    Timeouts, connection failures, 429s and 5xx responses are retryable.
+    Everything else, including authentication errors, bad requests and our
+    own ``ValueError``s, is fatal.
+
+    Args:
+        error (BaseException): The error raised by the call.
+
+    Returns:
+        bool: True if the call may succeed when retried.
+    """
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    if isinstance(
+        error,
+        (
+            asyncio.TimeoutError,
+            ConnectionError,
+            openai.APIConnectionError,
+            httpx.TimeoutException,
+            httpx.NetworkError,
+        ),
+    ):
+        return True
+    status = _status_code(error)
+    return status is not None and (status in RETRYABLE_STATUS_CODES or status >= 500)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Get the delay a provider asked for in its Retry-After headers.
+
+    Args:
+        error (BaseException): The error raised by the call.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if the response has none.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        headers = {str(k).lower(): v for k, v in headers.items()}
+    except AttributeError:
+        return None
+    retry_after_ms = parse_duration(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000.0
+    return parse_duration(headers.get("retry-after"))
+
+
+class CircuitBreaker:
+    """
+    Fails calls to a provider fast while it keeps failing.
+
+    The breaker opens after ``failure_threshold`` consecutive transient
+    failures. While open, calls raise ``CircuitOpenError`` without reaching the
+    provider. After ``reset_timeout`` seconds one probe call is let through:
+    success closes the breaker, failure opens it again.
+
+    Attributes:
+        provider (str): The provider this breaker protects.
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds to stay open before probing the provider.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, provider: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self) -> None:
+        """
+        Admit a call, or raise if the breaker is open.
+
+        Raises:
+            CircuitOpenError: If the provider is considered down.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        retry_in = max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+        raise CircuitOpenError(self.provider, retry_in)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        if self._opened_at is not None:
+            logger.info(f"Circuit breaker for {self.provider} closed")
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release(self) -> None:
+        """Let another probe through after a call that neither succeeded nor failed transiently."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the breaker at the threshold."""
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            if self._opened_at is None or self._probing:
+                logger.warning(
+                    f"Circuit breaker for {self.provider} opened after "
+                    f"{self._failures} failures"
+                )
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class RetryPolicy:
+    """
+    Retries transient LLM failures and tracks a circuit breaker per provider.
+
+    Only errors ``is_retryable`` accepts are retried, after a delay drawn with
+    full jitter between zero and ``base_delay * 2 ** (attempt - 1)``, capped at
+    ``max_delay``. A provider's Retry-After delay is used when it is longer.
+    No attempt starts or runs past the deadline of the current context.
+
+    Attributes:
+        max_attempts (int): Attempts per call, the first one included.
+        base_delay (float): Backoff ceiling in seconds for the first retry.
+        max_delay (float): Largest backoff ceiling in seconds.
+        failure_threshold (int): Consecutive transient failures that open a provider's breaker.
+        reset_timeout (float): Seconds a breaker stays open before probing the provider.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker of a provider.
+
+        Args:
+            provider (str): The provider name.
+
+        Returns:
+            CircuitBreaker: The provider's breaker, created on first use.
+        """
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(
+                provider, self.failure_threshold, self.reset_timeout
+            )
+        return self._breakers[provider]
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt (int): The number of the attempt that just failed, starting at 1.
+            error (Optional[BaseException]): The error it raised.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        requested = retry_after(error) if error is not None else None
+        return max(delay, requested) if requested is not None else delay
+
+    async def run(
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[T]],
+        on_retry: Optional[Callable[[BaseException], None]] = None,
+    ) -> T:
+        """
+        Run a call with retries, the provider's circuit breaker and the current deadline.
+
+        Args:
+            provider (str): The provider the call goes to.
+            call (Callable[[], Awaitable[T]]): Makes one attempt. Called once per attempt.
+            on_retry (Optional[Callable[[BaseException], None]]): Called with the error
+                before each retry, e.g. to count retries.
+
+        Returns:
+            T: The result of the first successful attempt.
+
+        Raises:
+            CircuitOpenError: If the provider's breaker is open.
+            DeadlineExceeded: If the deadline passes before an attempt succeeds.
+            Exception: The last attempt's error if it is fatal or retries are exhausted.
+        """
+        breaker = self.breaker(provider)
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before calling {provider}")
+            breaker.before_call()
+            try:
+                if remaining is None:
+                    result = await call()
+                else:
+                    result = await asyncio.wait_for(call(), remaining)
+            except asyncio.CancelledError:
+                # A cancelled half-open probe must not keep rejecting every later call.
+                breaker.release()
+                raise
+            except Exception as e:
+                if remaining is not None and remaining_time() <= 0:
+                    # The caller ran out of time; that says nothing about the provider.
+                    breaker.release()
+                    raise DeadlineExceeded(
+                        f"Deadline exceeded while calling {provider}"
+                    ) from e
+                if not is_retryable(e):
+                    breaker.release()
+                    raise
+                breaker.record_failure()
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff(attempt, e)
+                remaining = remaining_time()
+                if remaining is not None and delay >= remaining:
+                    raise DeadlineExceeded(
+                        f"Deadline leaves no time to retry {provider}"
+                    ) from e
+                logger.warning(
+                    f"Attempt {attempt} to {provider} failed, retrying in {delay:.2f}s: {e}"
+                )
+                if on_retry is not None:
+                    on_retry(e)
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
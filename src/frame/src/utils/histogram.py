@@ -0,0 +1,136 @@
+import bisect
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds, from fast cache-like calls to long generations.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of latencies.
+
+    Observations are counted in the first bucket whose upper bound they do
+    not exceed, so memory stays constant however many calls are recorded.
+    Quantiles are estimated by linear interpolation inside the bucket that
+    holds them, and clamped to the smallest and largest observed values.
+
+    Attributes:
+        bounds (Tuple[float, ...]): Upper bounds of the finite buckets, in ascending order.
+        count (int): Number of observations.
+        sum (float): Sum of all observations.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("Histogram bounds must be unique and ascending")
+        self.bounds = tuple(bounds)
+        # The last bucket holds observations above every bound.
+        self._counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): The latency in seconds.
+        """
+        value = max(value, 0.0)
+        self._counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = value if self._max is None else max(self._max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add another histogram's observations to this one.
+
+        Args:
+            other (LatencyHistogram): A histogram with the same bounds.
+        """
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        counts = list(other._counts)
+        for index, count in enumerate(counts):
+            self._counts[index] += count
+        # Derived from the copied buckets, so it matches them even if
+        # ``other`` is being updated concurrently.
+        self.count += sum(counts)
+        self.sum += other.sum
+        for value in (other._min, other._max):
+            if value is not None:
+                self._min = value if self._min is None else min(self._min, value)
+                self._max = value if self._max is None else max(self._max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of the observations.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            Optional[float]: The estimate in seconds, or None if nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if seen + count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self._max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self._min), self._max)
+            seen += count
+        return self._max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """
+        Get the cumulative bucket counts.
+
+        Returns:
+            List[Tuple[float, int]]: Upper bound and number of observations at or below
+            it for each bucket, ending with ``math.inf``.
+        """
+        cumulative = 0
+        result = []
+        for bound, count in zip(self.bounds + (math.inf,), self._counts):
+            cumulative += count
+            result.append((bound, cumulative))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the count, sum and p50, p95 and p99 estimates.
+
+        Returns:
+            Dict[str, Any]: The summary. Quantiles are None if nothing was observed.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
@@ -1,47 +1,457 @@
-from typing import Dict, Any, Union
+from typing import Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 from collections import defaultdict
+from contextlib import contextmanager
 import logging
 
+from frame.src.utils.histogram import LatencyHistogram
+from frame.src.utils.metrics import (
+    FRAMER,
+    LABEL,
+    MODEL,
+    NAME,
+    MetricsStore,
+    default_store,
+)
+from frame.src.utils.token_utils import count_tokens
+
+# Label of calls made without a call site.
+DEFAULT_CALL_SITE = "default"
+
 
 class LLMMetrics:
-    def __init__(self):
-        self._metrics: Dict[str, Dict[str, Union[int, float]]] = defaultdict(
-            lambda: {"calls": 0, "cost": 0.0}
-        )
-        self._total_calls: int = 0
-        self._total_cost: float = 0.0
+    """
+    LLM usage, cost, latency and error metrics.
+
+    Metrics are recorded into a ``MetricsStore`` without locks and read back
+    per Frame, per Framer and per model. Instances bound to a Frame by
+    ``scoped`` share the store of the instance they came from, label what
+    they record with the Frame and only read back that Frame's metrics.
+    The Framer comes from the ``metrics_scope`` of the recording context.
+
+    Attributes:
+        store (MetricsStore): Where metrics are recorded.
+        frame (Optional[str]): The Frame this instance records for and reads, or None for all Frames.
+    """
+
+    def __init__(
+        self, store: Optional[MetricsStore] = None, frame: Optional[str] = None
+    ):
+        self.store = store if store is not None else MetricsStore()
+        self.frame = frame
+
+    def scoped(self, frame: str) -> "LLMMetrics":
+        """
+        Get metrics bound to a Frame, sharing this instance's store.
+
+        Args:
+            frame (str): The Frame label.
+
+        Returns:
+            LLMMetrics: Records under ``frame`` and reads only its metrics.
+        """
+        return LLMMetrics(self.store, frame)
+
+    def _add(
+        self,
+        name: str,
+        value: float = 1,
+        model: Optional[str] = None,
+        label: Optional[str] = None,
+    ):
+        self.store.add(name, value, model, label, self.frame)
 
     def increment_call(self, model: str):
-        self._metrics[model]["calls"] += 1
-        self._total_calls += 1
+        self._add("calls", 1, model)
 
     def add_cost(self, model: str, cost: float):
-        self._metrics[model]["cost"] += cost
-        self._total_cost += cost
+        self._add("cost", cost, model)
+
+    def add_tokens(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+    ):
+        self._add("prompt_tokens", prompt_tokens, model)
+        self._add("completion_tokens", completion_tokens, model)
+        if cached_tokens:
+            self._add("cached_prompt_tokens", cached_tokens, model)
+
+    def record_cache_hit(self):
+        self._add("cache_hits")
+
+    def record_cache_miss(self):
+        self._add("cache_misses")
+
+    def record_coalesced(self):
+        self._add("coalesced")
+
+    def record_batch(self, size: int, failed: int, duration: float):
+        """
+        Record one batch of completions.
+
+        Args:
+            size (int): Number of requests in the batch.
+            failed (int): Number of requests that failed.
+            duration (float): Seconds the whole batch took.
+        """
+        self._add("batches")
+        self._add("batch_requests", size)
+        self._add("batch_failed", failed)
+        self._add("batch_time", duration)
+
+    def record_stream(
+        self, model: str, time_to_first_token: float, tokens_per_second: float
+    ):
+        """
+        Record the latency and throughput of one streamed completion.
+
+        Args:
+            model (str): The model name.
+            time_to_first_token (float): Seconds from request start to the first chunk.
+            tokens_per_second (float): Completion tokens per second after the first chunk.
+        """
+        self._add("stream_calls", 1, model)
+        self._add("stream_time_to_first_token", time_to_first_token, model)
+        self._add("stream_tokens_per_second", tokens_per_second, model)
+        self.store.observe(
+            "time_to_first_token", time_to_first_token, model, None, self.frame
+        )
+
+    def record_latency(self, model: str, call_site: Optional[str], seconds: float):
+        """
+        Record the latency of one completed call.
+
+        Args:
+            model (str): The model that served the call.
+            call_site (Optional[str]): Where the call came from.
+            seconds (float): Seconds from request start to the full response, retries included.
+        """
+        self.store.observe(
+            "latency", seconds, model, call_site or DEFAULT_CALL_SITE, self.frame
+        )
+
+    def record_context(
+        self, model: str, tokens: Dict[str, int], truncated: Sequence[str] = ()
+    ):
+        """
+        Record the tokens each prompt section contributed to one call.
+
+        Args:
+            model (str): The model the prompt was built for.
+            tokens (Dict[str, int]): Tokens per section name.
+            truncated (Sequence[str]): Names of the sections cut to fit the budget.
+        """
+        for name, count in tokens.items():
+            self._add("context_tokens", count, model, name)
+        for name in truncated:
+            self._add("context_truncated", 1, model, name)
+
+    def record_error(self, model: str, error: BaseException):
+        """
+        Record one failed call.
+
+        Args:
+            model (str): The model the call went to.
+            error (BaseException): The error the call raised.
+        """
+        self._add("errors", 1, model, type(error).__name__)
+
+    def record_retry(self, model: str):
+        """
+        Record one retried attempt.
+
+        Args:
+            model (str): The model the attempt went to.
+        """
+        self._add("retries", 1, model)
+
+    @contextmanager
+    def track_in_flight(self, model: str) -> Iterator[None]:
+        """
+        Count a request as in flight for the duration of the block.
+
+        Args:
+            model (str): The model the request goes to.
+        """
+        self._add("in_flight", 1, model)
+        try:
+            yield
+        finally:
+            self._add("in_flight", -1, model)
+
+    def record_hedge(self, model: str, won: bool):
+        """
+        Record one hedged request.
+
+        Args:
+            model (str): The model of the original request.
+            won (bool): Whether the hedge finished before the original request.
+        """
+        self._add("hedges_fired", 1, model)
+        self._add("hedges_won", int(won), model)
+
+    def get_stream_metrics(
+        self, framer: Optional[str] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get average time-to-first-token and tokens per second for each model.
+
+        Args:
+            framer (Optional[str]): Only count streams of this Framer. None counts every stream.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Streaming averages keyed by model.
+        """
+        return self.get_metrics(framer)["streaming"]
+
+    def _histograms(
+        self, name: str, framer: Optional[str], model: Optional[str]
+    ) -> Dict[Tuple[str, Optional[str]], LatencyHistogram]:
+        # Merge the series of different Frames and Framers of a model and label.
+        merged: Dict[Tuple[str, Optional[str]], LatencyHistogram] = {}
+        histograms = self.store.histograms(
+            name=name, frame=self.frame, framer=framer, model=model
+        )
+        for key, histogram in histograms.items():
+            series = (key[MODEL], key[LABEL])
+            if series not in merged:
+                merged[series] = LatencyHistogram(histogram.bounds)
+            merged[series].merge(histogram)
+        return merged
+
+    def get_latency_metrics(
+        self, framer: Optional[str] = None
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get latency counts and p50, p95 and p99 estimates for each model and call site.
+
+        Args:
+            framer (Optional[str]): Only count calls of this Framer. None counts every call.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: Latency summaries keyed by model, then call site.
+        """
+        latency: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        histograms = self._histograms("latency", framer, None)
+        for (model, call_site), histogram in histograms.items():
+            latency.setdefault(model, {})[call_site] = histogram.summary()
+        return latency
 
     def get_total_calls(self) -> int:
-        return self._total_calls
+        return sum(self.store.counters(name="calls", frame=self.frame).values())
 
     def get_total_cost(self) -> float:
-        return self._total_cost
+        return float(sum(self.store.counters(name="cost", frame=self.frame).values()))
+
+    def get_metrics(
+        self, framer: Optional[str] = None, model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get every metric, merged across threads.
+
+        Args:
+            framer (Optional[str]): Only count what this Framer recorded. None counts everything.
+            model (Optional[str]): Only count calls to this model. None counts every model.
+
+        Returns:
+            Dict[str, Any]: Usage and cost per model and Framer with their totals, cache,
+            batch, streaming and hedging counters, latency summaries, errors, retries,
+            in-flight requests and prompt tokens per section.
+        """
+        models: Dict[str, Dict[str, Union[int, float]]] = defaultdict(
+            lambda: {
+                "calls": 0,
+                "cost": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cached_prompt_tokens": 0,
+            }
+        )
+        framers: Dict[str, Dict[str, Union[int, float]]] = defaultdict(
+            lambda: {"calls": 0, "cost": 0.0}
+        )
+        streams: Dict[str, Dict[str, Union[int, float]]] = defaultdict(
+            lambda: {"calls": 0, "time_to_first_token": 0.0, "tokens_per_second": 0.0}
+        )
+        hedges: Dict[str, Dict[str, int]] = defaultdict(lambda: {"fired": 0, "won": 0})
+        errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        retries: Dict[str, int] = defaultdict(int)
+        context: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"tokens": 0, "truncated": 0}
+        )
+        in_flight: Dict[str, int] = defaultdict(int)
+        totals: Dict[str, Union[int, float]] = defaultdict(int)
+
+        counters = self.store.counters(frame=self.frame, framer=framer, model=model)
+        for key, value in counters.items():
+            name, series_model = key[NAME], key[MODEL]
+            if name in (
+                "calls",
+                "cost",
+                "prompt_tokens",
+                "completion_tokens",
+                "cached_prompt_tokens",
+            ):
+                models[series_model][name] += value
+                if key[FRAMER] is not None and name in ("calls", "cost"):
+                    framers[key[FRAMER]][name] += value
+            elif name.startswith("stream_"):
+                streams[series_model][name[len("stream_") :]] += value
+            elif name.startswith("hedges_"):
+                hedges[series_model][name[len("hedges_") :]] += value
+            elif name == "errors":
+                errors[series_model][key[LABEL]] += value
+            elif name == "retries":
+                retries[series_model] += value
+            elif name.startswith("context_"):
+                context[key[LABEL]][name[len("context_") :]] += value
+            elif name == "in_flight":
+                in_flight[series_model] += value
+            else:
+                totals[name] += value
 
-    def get_metrics(self) -> Dict[str, Any]:
         return {
-            "models": dict(self._metrics),
-            "total_calls": self._total_calls,
-            "total_cost": self._total_cost,
+            "models": dict(models),
+            "framers": dict(framers),
+            "total_calls": sum(stats["calls"] for stats in models.values()),
+            "total_cost": float(sum(stats["cost"] for stats in models.values())),
+            "total_prompt_tokens": sum(
+                stats["prompt_tokens"] for stats in models.values()
+            ),
+            "total_completion_tokens": sum(
+                stats["completion_tokens"] for stats in models.values()
+            ),
+            "total_cached_prompt_tokens": sum(
+                stats["cached_prompt_tokens"] for stats in models.values()
+            ),
+            "cache_hits": totals["cache_hits"],
+            "cache_misses": totals["cache_misses"],
+            "coalesced": totals["coalesced"],
+            "streaming": {
+                series_model: {
+                    "calls": stream["calls"],
+                    "avg_time_to_first_token": stream["time_to_first_token"]
+                    / stream["calls"],
+                    "avg_tokens_per_second": stream["tokens_per_second"]
+                    / stream["calls"],
+                }
+                for series_model, stream in streams.items()
+                if stream["calls"]
+            },
+            "batches": {
+                "batches": totals["batches"],
+                "requests": totals["batch_requests"],
+                "failed": totals["batch_failed"],
+                "total_time": float(totals["batch_time"]),
+            },
+            "hedges": dict(hedges),
+            "latency": {
+                series_model: by_site
+                for series_model, by_site in self.get_latency_metrics(framer).items()
+                if model is None or series_model == model
+            },
+            "time_to_first_token": {
+                series_model: histogram.summary()
+                for (series_model, _), histogram in self._histograms(
+                    "time_to_first_token", framer, model
+                ).items()
+            },
+            "errors": {
+                series_model: dict(by_type) for series_model, by_type in errors.items()
+            },
+            "retries": dict(retries),
+            "in_flight": dict(in_flight),
+            "context": dict(context),
+        }
+
+    def snapshot(self, framer: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a copy of every metric, histogram buckets included.
+
+        The result shares no state with the live metrics, so it can be
+        serialized or exported while calls keep being recorded. Calls recorded
+        while it is taken may be partly included, as ``MetricsStore`` explains.
+
+        Args:
+            framer (Optional[str]): Only include what this Framer recorded. None includes everything.
+
+        Returns:
+            Dict[str, Any]: ``get_metrics()`` with a "histograms" entry holding the
+            cumulative buckets, count and sum of the latency histograms.
+        """
+        snapshot = self.get_metrics(framer)
+        snapshot["histograms"] = {
+            "latency": [
+                {
+                    "model": model,
+                    "call_site": call_site,
+                    "buckets": histogram.buckets(),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                }
+                for (model, call_site), histogram in self._histograms(
+                    "latency", framer, None
+                ).items()
+            ],
+            "time_to_first_token": [
+                {
+                    "model": model,
+                    "buckets": histogram.buckets(),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                }
+                for (model, _), histogram in self._histograms(
+                    "time_to_first_token", framer, None
+                ).items()
+            ],
         }
+        return snapshot
 
-    def track_usage(self, model: str, tokens: int):
+    def reset(self):
+        """Remove every metric this instance reads."""
+        self.store.reset(frame=self.frame)
+
+    def track_usage(
+        self,
+        model: str,
+        tokens: int,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+    ):
+        """
+        Record one call with its token usage and cost.
+
+        Args:
+            model (str): The model name.
+            tokens (int): Prompt tokens, or the total when the split is unknown.
+            completion_tokens (int): Completion tokens.
+            cached_tokens (int): Prompt tokens the provider served from its prompt cache.
+        """
         self.increment_call(model)
-        cost = calculate_cost(model, tokens)
+        self.add_tokens(model, tokens, completion_tokens, cached_tokens)
+        cost = calculate_cost(model, tokens, completion_tokens)
         self.add_cost(model, cost)
 
 
-llm_metrics = LLMMetrics()
+llm_metrics = LLMMetrics(default_store)
+
 
+def get_llm_provider(
+    default_model: str, use_local: bool = False, default: str = "openai"
+) -> str:
+    """
+    Map a model name to the provider that serves it.
+
+    Args:
+        default_model (str): The model name.
+        use_local (bool): Whether models are served locally through Hugging Face.
+        default (str): The provider of models no provider claims.
 
-def get_llm_provider(default_model: str, use_local: bool = False) -> str:
+    Returns:
+        str: The provider name.
+    """
     if use_local:
         return "huggingface"
     if default_model is None:
@@ -56,20 +466,21 @@ def get_llm_provider(default_model: str, use_local: bool = False) -> str:
     elif "huggingface" in default_model_lower:
         return "huggingface"
     else:
-        return "openai"  # Default to OpenAI if unknown
+        return default  # Default to OpenAI if unknown
 
 
-def calculate_token_size(text: str) -> int:
+def calculate_token_size(text: str, model: Optional[str] = None) -> int:
     """
     Calculate the number of tokens in a given text.
 
     Args:
         text (str): The text to calculate tokens for.
+        model (Optional[str]): The model whose tokenizer to use.
 
     Returns:
         int: The number of tokens in the text.
     """
-    return len(text.split())
+    return count_tokens(text, model)
 
 
 def choose_best_model_for_tokens(token_count: int) -> str:
@@ -92,52 +503,128 @@ def choose_best_model_for_tokens(token_count: int) -> str:
         return "gpt-4-32k"
 
 
-def track_llm_usage(model: str, tokens_used: int):
+def track_llm_usage(model: str, tokens_used: int, completion_tokens: int = 0):
     llm_metrics.increment_call(model)
-    cost = calculate_cost(model, tokens_used)
+    llm_metrics.add_tokens(model, tokens_used, completion_tokens)
+    cost = calculate_cost(model, tokens_used, completion_tokens)
     llm_metrics.add_cost(model, cost)
-    logging.info(f"LLM Usage: Model: {model}, Tokens: {tokens_used}, Cost: ${cost:.4f}")
-
-
-def calculate_cost(model: str, tokens_used: int) -> float:
-    # Define cost per 1000 tokens for each model
-    cost_per_1k_tokens = {
-        # OpenAI models
-        "gpt-3.5-turbo": 0.002,
-        "gpt-3.5-turbo-16k": 0.004,
-        "gpt-4": 0.03,
-        "gpt-4-32k": 0.06,
-        "gpt-4-1106-preview": 0.01,
-        "gpt-4-1106-vision-preview": 0.01,
-        # Anthropic models
-        "claude-2": 0.01,
-        "claude-instant-1": 0.0015,
-        # Mistral models
-        "mistral-tiny": 0.00014,
-        "mistral-small": 0.0006,
-        "mistral-medium": 0.0025,
-        "mistral-large": 0.008,
-        # Cohere models
-        "command": 0.015,
-        "command-light": 0.003,
-        # AI21 models
-        "j2-ultra": 0.016,
-        "j2-mid": 0.008,
-        # Google models
-        "palm-2": 0.0005,
-        # Hugging Face models
-        "huggingface-default": 0.0001,
-        # Meta models
-        "llama-2-70b": 0.0007,
-        "llama-2-13b": 0.0004,
-        "llama-2-7b": 0.0002,
-    }
-
-    if model not in cost_per_1k_tokens:
-        # Use a default cost if the model is not found
-        return (tokens_used / 1000) * 0.001  # Default to $0.001 per 1000 tokens
-
-    return (tokens_used / 1000) * cost_per_1k_tokens[model]
+    logging.info(
+        f"LLM Usage: Model: {model}, Tokens: {tokens_used + completion_tokens}, Cost: ${cost:.4f}"
+    )
+
+
+# Cost per 1000 (prompt, completion) tokens for each model
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    # OpenAI models
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-3.5-turbo-16k": (0.003, 0.004),
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-32k": (0.06, 0.12),
+    "gpt-4-1106-preview": (0.01, 0.03),
+    "gpt-4-1106-vision-preview": (0.01, 0.03),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    # Anthropic models
+    "claude-2": (0.008, 0.024),
+    "claude-instant-1": (0.0008, 0.0024),
+    # Mistral models
+    "mistral-tiny": (0.00025, 0.00025),
+    "mistral-small": (0.002, 0.006),
+    "mistral-medium": (0.0027, 0.0081),
+    "mistral-large": (0.008, 0.024),
+    # Cohere models
+    "command": (0.015, 0.015),
+    "command-light": (0.003, 0.003),
+    # AI21 models
+    "j2-ultra": (0.016, 0.016),
+    "j2-mid": (0.008, 0.008),
+    # Google models
+    "palm-2": (0.0005, 0.0005),
+    # Hugging Face models
+    "huggingface-default": (0.0001, 0.0001),
+    # Meta models
+    "llama-2-70b": (0.0007, 0.0007),
+    "llama-2-13b": (0.0004, 0.0004),
+    "llama-2-7b": (0.0002, 0.0002),
+}
+DEFAULT_PRICING: Tuple[float, float] = (0.001, 0.001)
+# Models run in-process with "local/<model>" cost nothing per token
+LOCAL_PRICING: Tuple[float, float] = (0.0, 0.0)
+
+# Maximum prompt plus completion tokens for each model
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-3.5-turbo-16k": 16385,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-1106-preview": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "mistral-tiny": 32000,
+    "mistral-small": 32000,
+    "mistral-medium": 32000,
+    "mistral-large": 32000,
+}
+
+
+def get_model_pricing(model: str) -> Tuple[float, float]:
+    """
+    Get the cost per 1000 prompt and completion tokens for a model.
+
+    Dated or suffixed model names (e.g. "gpt-4-0613") use the price of the
+    longest known prefix.
+
+    Args:
+        model (str): The model name.
+
+    Returns:
+        Tuple[float, float]: Cost per 1000 prompt tokens and per 1000 completion tokens.
+    """
+    if model and model.startswith("local/"):
+        return LOCAL_PRICING
+    return _lookup_model(MODEL_PRICING, model, DEFAULT_PRICING)
+
+
+def get_context_window(model: str) -> Optional[int]:
+    """
+    Get the context window of a model in tokens.
+
+    Args:
+        model (str): The model name.
+
+    Returns:
+        Optional[int]: The maximum prompt plus completion tokens, or None if unknown.
+    """
+    return _lookup_model(MODEL_CONTEXT_WINDOWS, model, None)
+
+
+def _lookup_model(table: Dict[str, Any], model: str, default: Any) -> Any:
+    if model in table:
+        return table[model]
+    prefixes = [name for name in table if model and model.startswith(name + "-")]
+    if prefixes:
+        return table[max(prefixes, key=len)]
+    return default
+
+
+def calculate_cost(model: str, tokens_used: int, completion_tokens: int = 0) -> float:
+    """
+    Calculate the cost of a call from its prompt and completion tokens.
+
+    Args:
+        model (str): The model name.
+        tokens_used (int): Prompt tokens, or the total when the split is unknown.
+        completion_tokens (int): Completion tokens.
+
+    Returns:
+        float: The cost in dollars.
+    """
+    prompt_price, completion_price = get_model_pricing(model)
+    return (tokens_used / 1000) * prompt_price + (
+        completion_tokens / 1000
+    ) * completion_price
 
 
 def get_completion(llm_service, prompt: str, model: str = None, **kwargs) -> str:
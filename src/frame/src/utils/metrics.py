@@ -1,7 +1,385 @@
-from typing import Dict, Any
-from collections import defaultdict
 import threading
-from typing import Type
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from frame.src.utils.histogram import LatencyHistogram
+
+# A series is identified by its metric name, model, extra label (call site,
+# error type...), Frame and Framer.
+SeriesKey = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+NAME, MODEL, LABEL, FRAME, FRAMER = range(5)
+
+_framer_scope: ContextVar[Optional[str]] = ContextVar("metrics_framer", default=None)
+
+
+@contextmanager
+def metrics_scope(framer: Optional[str]) -> Iterator[None]:
+    """
+    Attribute metrics recorded inside the block to a Framer.
+
+    Args:
+        framer (Optional[str]): The Framer name, or None for no Framer.
+    """
+    token = _framer_scope.set(framer)
+    try:
+        yield
+    finally:
+        _framer_scope.reset(token)
+
+
+def current_metrics_scope() -> Optional[str]:
+    """
+    Get the Framer metrics of the current context are attributed to.
+
+    Returns:
+        Optional[str]: The Framer set by ``metrics_scope``, or None outside one.
+    """
+    return _framer_scope.get()
+
+
+class _Shard:
+    """Series owned by one thread. Only that thread writes to it."""
+
+    def __init__(self):
+        self.counters: Dict[SeriesKey, float] = {}
+        self.histograms: Dict[SeriesKey, LatencyHistogram] = {}
+
+
+class MetricsStore:
+    """
+    Counters and histograms sharded per thread and merged when read.
+
+    Each thread records into its own shard, so the hot path takes no lock:
+    asyncio tasks on one thread cannot interleave within a single update, and
+    other threads never write to it. The store lock is taken only the first
+    time a thread records and when shards are read or reset. Reads copy each
+    shard and merge the copies without stopping the threads that record, so
+    they are not consistent snapshots: they may miss a concurrent update, and
+    a histogram read while its thread records may count an observation in its
+    buckets before it is added to its sum.
+
+    Series are labelled by model, an optional extra label, the Frame and the
+    Framer, so every metric can be read per Frame, per Framer and per model.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def add(
+        self,
+        name: str,
+        value: float = 1,
+        model: Optional[str] = None,
+        label: Optional[str] = None,
+        frame: Optional[str] = None,
+    ) -> None:
+        """
+        Add to a counter. Negative values turn it into a gauge.
+
+        Args:
+            name (str): The metric name.
+            value (float): The amount to add.
+            model (Optional[str]): The model label.
+            label (Optional[str]): An extra label, such as a call site or error type.
+            frame (Optional[str]): The Frame label. The Framer label comes from ``metrics_scope``.
+        """
+        key = (name, model, label, frame, _framer_scope.get())
+        counters = self._shard().counters
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        model: Optional[str] = None,
+        label: Optional[str] = None,
+        frame: Optional[str] = None,
+    ) -> None:
+        """
+        Record a histogram observation.
+
+        Args:
+            name (str): The metric name.
+            value (float): The observation, in seconds.
+            model (Optional[str]): The model label.
+            label (Optional[str]): An extra label, such as a call site.
+            frame (Optional[str]): The Frame label. The Framer label comes from ``metrics_scope``.
+        """
+        key = (name, model, label, frame, _framer_scope.get())
+        histograms = self._shard().histograms
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        histogram.observe(value)
+
+    def counters(self, **filters: Any) -> Dict[SeriesKey, float]:
+        """
+        Get the counters matching the filters, merged across threads.
+
+        Args:
+            **filters: Label values to keep, among name, model, label, frame and framer.
+                None values are ignored.
+
+        Returns:
+            Dict[SeriesKey, float]: The merged counters.
+        """
+        matches = _matcher(filters)
+        merged: Dict[SeriesKey, float] = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, value in shard.counters.copy().items():
+                if matches(key):
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def histograms(self, **filters: Any) -> Dict[SeriesKey, LatencyHistogram]:
+        """
+        Get the histograms matching the filters, merged across threads.
+
+        Args:
+            **filters: Label values to keep, among name, model, label, frame and framer.
+                None values are ignored.
+
+        Returns:
+            Dict[SeriesKey, LatencyHistogram]: Merged copies of the histograms. A
+            histogram updated concurrently may be off by the observation in progress.
+        """
+        matches = _matcher(filters)
+        merged: Dict[SeriesKey, LatencyHistogram] = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, histogram in shard.histograms.copy().items():
+                if matches(key):
+                    if key not in merged:
+                        merged[key] = LatencyHistogram(histogram.bounds)
+                    merged[key].merge(histogram)
+        return merged
+
+    def reset(self, **filters: Any) -> None:
+        """
+        Remove the series matching the filters.
+
+        Args:
+            **filters: Label values to remove, among name, model, label, frame and framer.
+                None values are ignored, so no filters remove everything.
+        """
+        matches = _matcher(filters)
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for series in (shard.counters, shard.histograms):
+                for key in [key for key in series.copy() if matches(key)]:
+                    series.pop(key, None)
+
+
+def _matcher(filters: Dict[str, Any]) -> Callable[[SeriesKey], bool]:
+    positions = {
+        "name": NAME,
+        "model": MODEL,
+        "label": LABEL,
+        "frame": FRAME,
+        "framer": FRAMER,
+    }
+    fields = [
+        (positions[field], value)
+        for field, value in filters.items()
+        if value is not None
+    ]
+    return lambda key: all(key[position] == value for position, value in fields)
+
+
+# Store shared by every Frame in the process; Frames are told apart by label.
+default_store = MetricsStore()
+
+
+class FramerMetrics:
+    """
+    Decision rule, decision cache, mailbox and coalescing metrics of Framers.
+
+    Recorded into a ``MetricsStore`` next to the LLM metrics, labelled with
+    the Frame and, from the ``metrics_scope`` of the recording context, the
+    Framer.
+
+    Attributes:
+        store (MetricsStore): Where metrics are recorded.
+        frame (Optional[str]): The Frame this instance records for and reads, or None for all Frames.
+    """
+
+    def __init__(
+        self, store: Optional[MetricsStore] = None, frame: Optional[str] = None
+    ):
+        self.store = store if store is not None else MetricsStore()
+        self.frame = frame
+
+    @classmethod
+    def alongside(cls, metrics: Any) -> "FramerMetrics":
+        """
+        Get Framer metrics recorded next to other metrics, such as an LLM service's.
+
+        Args:
+            metrics (Any): Metrics with a ``store`` and a ``frame``, such as ``LLMMetrics``.
+
+        Returns:
+            FramerMetrics: Records into the same store under the same Frame, or into a
+            new store if ``metrics`` has none.
+        """
+        store = getattr(metrics, "store", None)
+        if not isinstance(store, MetricsStore):
+            return cls()
+        return cls(store, getattr(metrics, "frame", None))
+
+    def _add(self, name: str, value: float = 1, label: Optional[str] = None):
+        self.store.add(name, value, None, label, self.frame)
+
+    def record_rule(self, rule: Optional[str], seconds: float):
+        """
+        Record one check of the decision rules.
+
+        Args:
+            rule (Optional[str]): Name of the rule that decided, or None if none did.
+            seconds (float): Seconds the rules took to evaluate.
+        """
+        if rule is None:
+            self._add("rule_misses")
+        else:
+            self._add("rule_hits", 1, rule)
+        self.store.observe("rule_evaluation", seconds, None, None, self.frame)
+
+    def record_decision_cache(self, perception_type: str, hit: bool):
+        """
+        Record one decision cache lookup.
+
+        Args:
+            perception_type (str): The type of the perception looked up.
+            hit (bool): Whether a cached decision was reused.
+        """
+        self._add(
+            "decision_cache_hits" if hit else "decision_cache_misses",
+            1,
+            perception_type,
+        )
+
+    def record_mailbox(
+        self, depth: int, wait: Optional[float] = None, dropped: int = 0
+    ):
+        """
+        Record a change to a Framer's mailbox.
+
+        Args:
+            depth (int): Change in the number of queued perceptions.
+            wait (Optional[float]): Seconds a perception waited before it was processed, if one was taken.
+            dropped (int): Perceptions dropped by the overflow policy.
+        """
+        if depth:
+            self._add("mailbox_depth", depth)
+        if dropped:
+            self._add("mailbox_dropped", dropped)
+        if wait is not None:
+            self.store.observe("mailbox_wait", wait, None, None, self.frame)
+
+    def record_coalescing(self, perception_type: str, count: int):
+        """
+        Record one closed perception coalescing window.
+
+        Args:
+            perception_type (str): The type of the window's perceptions.
+            count (int): Perceptions merged into the one processed.
+        """
+        self._add("coalescing_windows", 1, perception_type)
+        self._add("coalescing_perceptions", count, perception_type)
+
+    def _histogram(self, name: str, framer: Optional[str]) -> LatencyHistogram:
+        merged = LatencyHistogram()
+        for histogram in self.store.histograms(
+            name=name, frame=self.frame, framer=framer
+        ).values():
+            merged.merge(histogram)
+        return merged
+
+    def get_metrics(self, framer: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get every Framer metric, merged across threads.
+
+        Args:
+            framer (Optional[str]): Only count what this Framer recorded. None counts everything.
+
+        Returns:
+            Dict[str, Any]: Decision rule hits, misses and evaluation time, decision cache
+            hit rates per perception type, mailbox depth and drops per Framer with the
+            time perceptions waited, and coalescing windows and the perceptions merged
+            into them per type.
+        """
+        rule_hits: Dict[str, int] = defaultdict(int)
+        rule_misses = 0
+        decision_cache: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+        mailbox: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        coalescing: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"windows": 0, "perceptions": 0}
+        )
+
+        for key, value in self.store.counters(frame=self.frame, framer=framer).items():
+            name = key[NAME]
+            if name == "rule_hits":
+                rule_hits[key[LABEL]] += value
+            elif name == "rule_misses":
+                rule_misses += value
+            elif name.startswith("decision_cache_"):
+                decision_cache[key[LABEL]][name[len("decision_cache_") :]] += value
+            elif name.startswith("coalescing_"):
+                coalescing[key[LABEL]][name[len("coalescing_") :]] += value
+            elif name.startswith("mailbox_"):
+                mailbox[name[len("mailbox_") :]][key[FRAMER]] += value
+
+        for stats in decision_cache.values():
+            stats["hit_rate"] = stats["hits"] / (stats["hits"] + stats["misses"])
+        return {
+            "rules": {
+                "hits": dict(rule_hits),
+                "misses": rule_misses,
+                "evaluation": self._histogram("rule_evaluation", framer).summary(),
+            },
+            "decision_cache": dict(decision_cache),
+            "mailbox": {
+                "depth": dict(mailbox["depth"]),
+                "dropped": dict(mailbox["dropped"]),
+                "wait": self._histogram("mailbox_wait", framer).summary(),
+            },
+            "coalescing": dict(coalescing),
+        }
+
+    def reset(self):
+        """Remove every metric this instance reads."""
+        for name in (
+            "rule_hits",
+            "rule_misses",
+            "rule_evaluation",
+            "decision_cache_hits",
+            "decision_cache_misses",
+            "mailbox_depth",
+            "mailbox_dropped",
+            "mailbox_wait",
+            "coalescing_windows",
+            "coalescing_perceptions",
+        ):
+            self.store.reset(name=name, frame=self.frame)
 
 
 class SingletonMeta(type):
@@ -18,30 +396,56 @@ class SingletonMeta(type):
 
 
 class MetricsManager(metaclass=SingletonMeta):
-    def __init__(self):
-        if not hasattr(self, "_initialized"):
-            self._metrics = defaultdict(lambda: {"calls": 0, "cost": 0.0})
-            self._total_calls = 0
-            self._total_cost = 0.0
-            self._initialized = True
+    """
+    Call and cost totals per model, kept for compatibility.
+
+    Reads and writes the same store as ``LLMMetrics``, so it reports the
+    calls made by every Frame in the process.
+    """
+
+    def __init__(self, store: Optional[MetricsStore] = None):
+        self._store = store or default_store
 
     def update_metrics(self, model: str, calls: int = 1, cost: float = 0.0):
-        self._metrics[model]["calls"] += calls
-        self._metrics[model]["cost"] += cost
-        self._total_calls += calls
-        self._total_cost += cost
+        self._store.add("calls", calls, model)
+        self._store.add("cost", cost, model)
+
+    @classmethod
+    def update_metric(
+        cls,
+        metric_name: str,
+        value: Union[int, float, str],
+        model: Optional[str] = None,
+    ):
+        """
+        Add to a metric of the shared instance. Prefer ``update_metrics``.
+
+        Kept for callers of the former ``frame.src.utils.metrics_manager`` module.
+        The store only holds numbers, so other values are ignored.
+
+        Args:
+            metric_name (str): The metric name, such as "calls" or "cost".
+            value (Union[int, float, str]): The amount to add.
+            model (Optional[str]): The model label.
+        """
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cls()._store.add(metric_name, value, model)
 
     def get_metrics(self) -> Dict[str, Any]:
+        models: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"calls": 0, "cost": 0.0}
+        )
+        for key, value in self._store.counters().items():
+            if key[NAME] in ("calls", "cost") and key[MODEL] is not None:
+                models[key[MODEL]][key[NAME]] += value
         return {
-            "total_calls": self._total_calls,
-            "total_cost": self._total_cost,
-            "models": dict(self._metrics),
+            "total_calls": sum(stats["calls"] for stats in models.values()),
+            "total_cost": sum(stats["cost"] for stats in models.values()),
+            "models": dict(models),
         }
 
     def reset_metrics(self):
-        self._metrics.clear()
-        self._total_calls = 0
-        self._total_cost = 0.0
+        self._store.reset()
 
     def clear(self):
         self.reset_metrics()
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+from frame.src.utils.llm_utils import LLMMetrics, llm_metrics
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "frame_llm"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram(
+    lines: List[str],
+    name: str,
+    help_text: str,
+    series: List[Dict[str, Any]],
+    **keys: str,
+) -> None:
+    lines.append(f"# TYPE {name} histogram")
+    lines.append(f"# UNIT {name} seconds")
+    lines.append(f"# HELP {name} {help_text}")
+    for entry in series:
+        labels = {label: entry[key] for label, key in keys.items()}
+        for bound, cumulative in entry["buckets"]:
+            lines.append(
+                f"{name}_bucket{_labels(**labels, le=_number(bound))} {cumulative}"
+            )
+        lines.append(f"{name}_count{_labels(**labels)} {entry['count']}")
+        lines.append(f"{name}_sum{_labels(**labels)} {_number(entry['sum'])}")
+
+
+def render_openmetrics(metrics: LLMMetrics) -> str:
+    """
+    Render LLM metrics in the OpenMetrics text format.
+
+    Args:
+        metrics (LLMMetrics): The metrics to render.
+
+    Returns:
+        str: The exposition, terminated by "# EOF".
+    """
+    snapshot = metrics.snapshot()
+    lines: List[str] = []
+
+    _histogram(
+        lines,
+        f"{PREFIX}_request_duration_seconds",
+        "Latency of completed LLM calls, retries included.",
+        snapshot["histograms"]["latency"],
+        model="model",
+        call_site="call_site",
+    )
+    _histogram(
+        lines,
+        f"{PREFIX}_time_to_first_token_seconds",
+        "Time from request start to the first streamed chunk.",
+        snapshot["histograms"]["time_to_first_token"],
+        model="model",
+    )
+
+    models = snapshot["models"]
+    lines.append(f"# TYPE {PREFIX}_requests counter")
+    lines.append(f"# HELP {PREFIX}_requests LLM calls that returned a completion.")
+    for model, stats in models.items():
+        lines.append(f"{PREFIX}_requests_total{_labels(model=model)} {stats['calls']}")
+    lines.append(f"# TYPE {PREFIX}_tokens counter")
+    lines.append(
+        f"# HELP {PREFIX}_tokens Tokens sent to and generated by LLMs. "
+        "cached_prompt counts prompt tokens served from the provider's prompt cache."
+    )
+    for model, stats in models.items():
+        for direction in ("prompt", "completion", "cached_prompt"):
+            lines.append(
+                f"{PREFIX}_tokens_total{_labels(model=model, direction=direction)} "
+                f"{stats[f'{direction}_tokens']}"
+            )
+    lines.append(f"# TYPE {PREFIX}_cost_dollars counter")
+    lines.append(f"# UNIT {PREFIX}_cost_dollars dollars")
+    lines.append(f"# HELP {PREFIX}_cost_dollars Estimated cost of LLM calls.")
+    for model, stats in models.items():
+        lines.append(
+            f"{PREFIX}_cost_dollars_total{_labels(model=model)} {_number(stats['cost'])}"
+        )
+
+    lines.append(f"# TYPE {PREFIX}_errors counter")
+    lines.append(f"# HELP {PREFIX}_errors LLM calls that failed, by error type.")
+    for model, errors in snapshot["errors"].items():
+        for error, count in errors.items():
+            lines.append(
+                f"{PREFIX}_errors_total{_labels(model=model, error=error)} {count}"
+            )
+    lines.append(f"# TYPE {PREFIX}_retries counter")
+    lines.append(f"# HELP {PREFIX}_retries Attempts retried after a transient error.")
+    for model, count in snapshot["retries"].items():
+        lines.append(f"{PREFIX}_retries_total{_labels(model=model)} {count}")
+    lines.append(f"# TYPE {PREFIX}_in_flight gauge")
+    lines.append(f"# HELP {PREFIX}_in_flight Requests currently sent to a provider.")
+    for model, count in snapshot["in_flight"].items():
+        lines.append(f"{PREFIX}_in_flight{_labels(model=model)} {count}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Minimal asyncio HTTP server exposing LLM metrics for scraping.
+
+    ``GET /metrics`` returns the OpenMetrics exposition of ``metrics``; every
+    other path returns 404. It binds to localhost by default and is meant for
+    a local Prometheus agent, not for public exposure.
+
+    Attributes:
+        metrics (LLMMetrics): The metrics to serve.
+        host (str): The interface to listen on.
+        port (int): The port to listen on. 0 picks a free port, available after ``start``.
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[LLMMetrics] = None,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+    ):
+        self.metrics = metrics or llm_metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "MetricsServer":
+        """
+        Start listening.
+
+        Returns:
+            MetricsServer: This server, for chaining.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and wait for the server to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MetricsServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+            # Headers are not used; read them so the client sees a clean close.
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) >= 2 else None
+            if parts and parts[0] in ("GET", "HEAD") and path == "/metrics":
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = render_openmetrics(self.metrics).encode("utf-8")
+            else:
+                status, content_type = "404 Not Found", "text/plain; charset=utf-8"
+                body = b"Not Found\n"
+            head = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            writer.write(head if parts and parts[0] == "HEAD" else head + body)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"Error serving metrics: {e}")
+        finally:
+            writer.close()
@@ -1,6 +1,4 @@
-from frame.src.services.llm.llm_adapters.lmql.lmql_interface import LMQLInterface
-
-lmql_interface = LMQLInterface(model_name="gpt-3.5-turbo")
+from frame.src.services.llm.client_registry import default_client_registry
 
 
 def format_lmql_prompt(prompt: str, expected_output: str = None) -> str:
@@ -17,6 +15,7 @@ def format_lmql_prompt(prompt: str, expected_output: str = None) -> str:
     constraints = []
     if expected_output:
         constraints.append(f"EXPECTED_OUTPUT in [{expected_output}]")
+    lmql_interface = default_client_registry.get_lmql_interface("gpt-3.5-turbo")
     return lmql_interface.format_prompt_with_constraints(prompt, constraints)
 
 
@@ -1,12 +1,224 @@
-def calculate_token_size(text: str) -> int:
+import logging
+import math
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Texts longer than this are split on line boundaries and encoded in parallel.
+BATCH_THRESHOLD_CHARS = 64_000
+_CHUNK_CHARS = 16_000
+# Rough characters-per-token ratio for English text on BPE tokenizers.
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class TokenUsage:
+    """
+    Token counts for a single completion.
+
+    Attributes:
+        prompt_tokens (int): Tokens in the prompt sent to the model.
+        completion_tokens (int): Tokens in the generated completion.
+        cached_tokens (int): Prompt tokens the provider served from its prompt cache.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+_reported_usage: ContextVar[Optional[TokenUsage]] = ContextVar(
+    "reported_token_usage", default=None
+)
+
+
+def report_usage(
+    prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> None:
+    """
+    Record provider-reported usage for the completion in progress.
+
+    Adapters call this when the provider returns usage, so the service can
+    account the exact counts instead of counting tokens itself.
+
+    Args:
+        prompt_tokens (int): Prompt tokens reported by the provider.
+        completion_tokens (int): Completion tokens reported by the provider.
+        cached_tokens (int): Prompt tokens the provider served from its prompt cache.
+    """
+    _reported_usage.set(
+        TokenUsage(int(prompt_tokens), int(completion_tokens), int(cached_tokens))
+    )
+
+
+def pop_reported_usage() -> Optional[TokenUsage]:
+    """
+    Take the usage reported for the current context, if any, and clear it.
+
+    Returns:
+        Optional[TokenUsage]: The reported usage, or None if no adapter reported any.
+    """
+    usage = _reported_usage.get()
+    _reported_usage.set(None)
+    return usage
+
+
+@lru_cache(maxsize=64)
+def get_encoder(model: Optional[str] = None) -> Optional[Any]:
+    """
+    Get the cached tiktoken encoder for a model.
+
+    Args:
+        model (Optional[str]): The model name. None uses the cl100k_base encoding.
+
+    Returns:
+        Optional[Any]: The encoder, or None if the model is unknown to tiktoken
+        or its encoding cannot be loaded.
+    """
+    try:
+        if model is None:
+            return tiktoken.get_encoding("cl100k_base")
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            if "gpt" in model.lower():
+                return tiktoken.get_encoding("cl100k_base")
+            return None
+    except Exception as e:
+        logger.warning(
+            f"Could not load tokenizer for {model}, using approximate token counts: {e}"
+        )
+        return None
+
+
+def approximate_token_count(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without a tokenizer.
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / _CHARS_PER_TOKEN), len(text.split()))
+
+
+def _split_for_batch(text: str) -> List[str]:
+    chunks, start = [], 0
+    while start < len(text):
+        end = min(start + _CHUNK_CHARS, len(text))
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Count the tokens in a text using the model's tokenizer.
+
+    Long texts are split on line boundaries and encoded in parallel. Models
+    without a tiktoken encoding fall back to an approximate count.
+
+    Args:
+        text (str): The text to count.
+        model (Optional[str]): The model name.
+
+    Returns:
+        int: The number of tokens in the text.
+    """
+    if not text:
+        return 0
+    encoder = get_encoder(model)
+    if encoder is None:
+        return approximate_token_count(text)
+    if len(text) > BATCH_THRESHOLD_CHARS:
+        return sum(
+            len(tokens)
+            for tokens in encoder.encode_ordinary_batch(_split_for_batch(text))
+        )
+    return len(encoder.encode_ordinary(text))
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int, model: Optional[str] = None, keep: str = "start"
+) -> str:
+    """
+    Cut a text down to at most ``max_tokens`` tokens.
+
+    Models without a tiktoken encoding are cut by approximate character count.
+
+    Args:
+        text (str): The text to cut.
+        max_tokens (int): The largest number of tokens to keep.
+        model (Optional[str]): The model name.
+        keep (str): Which end of the text to keep, "start" or "end".
+
+    Returns:
+        str: The text, or the kept part of it.
+    """
+    if max_tokens <= 0:
+        return ""
+    encoder = get_encoder(model)
+    if encoder is None:
+        if approximate_token_count(text) <= max_tokens:
+            return text
+        limit = max_tokens * _CHARS_PER_TOKEN
+        cut = text[:limit] if keep == "start" else text[-limit:]
+        # Texts of many short words count one token per word.
+        words = cut.split()
+        if len(words) > max_tokens:
+            words = words[:max_tokens] if keep == "start" else words[-max_tokens:]
+            cut = " ".join(words)
+        return cut
+    tokens = encoder.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return text
+    kept = tokens[:max_tokens] if keep == "start" else tokens[-max_tokens:]
+    return encoder.decode(kept)
+
+
+def count_tokens_batch(texts: Sequence[str], model: Optional[str] = None) -> List[int]:
+    """
+    Count the tokens in several texts, encoding them in parallel.
+
+    Args:
+        texts (Sequence[str]): The texts to count.
+        model (Optional[str]): The model name.
+
+    Returns:
+        List[int]: The number of tokens in each text.
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        return [approximate_token_count(text) for text in texts]
+    return [len(tokens) for tokens in encoder.encode_ordinary_batch(list(texts))]
+
+
+def calculate_token_size(text: str, model: Optional[str] = None) -> int:
     """
     Calculate the number of tokens in a given text.
 
     Args:
         text (str): The text to calculate tokens for.
+        model (Optional[str]): The model whose tokenizer to use.
 
     Returns:
         int: The number of tokens in the text.
     """
-    # Assuming a simple tokenization logic for demonstration purposes
-    return len(text.split())
+    return count_tokens(text, model)
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from frame.src.framer.agency import Agency
+from frame.src.framer.agency.goals import Goal
+from frame.src.framer.agency.roles import Role
+from frame.src.framer.agency.tasks.status import TaskStatus
+from frame.src.framer.agency.tasks.task import Task
+from frame.src.services.llm.completion_batch import CompletionResult
+from frame.src.services.llm.llm_service import LLMService
+
+
+@pytest.fixture
+def agency():
+    llm_service = AsyncMock(spec=LLMService)
+    execution_context = Mock()
+    execution_context.llm_service = llm_service
+    return Agency(
+        llm_service=llm_service, context={}, execution_context=execution_context
+    )
+
+
+@pytest.mark.asyncio
+async def test_perform_tasks_batches_completions(agency):
+    tasks = [
+        Task(description="Task 1", workflow_id="default"),
+        Task(description="Task 2", workflow_id="default"),
+    ]
+    agency.llm_service.get_completions = AsyncMock(
+        return_value=[
+            CompletionResult(index=0, result="Done"),
+            CompletionResult(index=1, error=RuntimeError("provider down")),
+        ]
+    )
+
+    results = await agency.perform_tasks(tasks, max_concurrency=2)
+
+    agency.llm_service.get_completions.assert_called_once()
+    prompts = agency.llm_service.get_completions.call_args.args[0]
+    assert len(prompts) == 2 and "Task 1" in prompts[0] and "Task 2" in prompts[1]
+    assert results[0] == {"output": "Done"}
+    assert results[1]["error"] == "provider down"
+    assert tasks[0].status == TaskStatus.COMPLETED
+    assert tasks[1].status == TaskStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_roles_and_goals_are_generated_concurrently(agency):
+    started = []
+    release = asyncio.Event()
+
+    async def generate(name, result):
+        started.append(name)
+        await release.wait()
+        return result
+
+    role = Role(id="1", name="Driver", description="Drive safely.")
+    goal = Goal(name="Arrive", description="Arrive without incident.")
+    agency.generate_roles = lambda: generate("roles", [role])
+    agency.generate_goals = lambda: generate("goals", [goal])
+
+    generating = asyncio.ensure_future(agency.generate_roles_and_goals())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert sorted(started) == ["goals", "roles"]
+    release.set()
+    roles, goals = await generating
+
+    assert [r.name for r in roles] == ["Driver"]
+    assert [g.name for g in goals] == ["Arrive"]
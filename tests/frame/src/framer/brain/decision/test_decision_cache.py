@@ -0,0 +1,123 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from frame.src.framer.agency.goals import Goal
+from frame.src.framer.brain import Brain, Decision
+from frame.src.framer.brain.decision import DecisionCache, DecisionCachePolicy
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+FINGERPRINT = DecisionCache.fingerprint([], [], 0)
+
+
+def hearing(text, **data):
+    return Perception(type="hearing", data={"text": text, **data})
+
+
+def decision(action="respond", confidence=0.9):
+    return Decision(
+        action=action, parameters={}, reasoning="test", confidence=confidence
+    )
+
+
+def test_near_duplicate_perceptions_share_a_key():
+    cache = DecisionCache()
+    key = cache.make_key(
+        hearing("What are your hours?", timestamp="10:00"), FINGERPRINT
+    )
+
+    assert (
+        cache.make_key(
+            hearing("  what are   your hours? ", timestamp="11:00"), FINGERPRINT
+        )
+        == key
+    )
+    assert cache.make_key(hearing("Where are you?"), FINGERPRINT) != key
+    assert (
+        cache.make_key(
+            Perception(
+                type="hearing",
+                data={"text": "What are your hours?"},
+                timestamp=datetime.now() + timedelta(hours=1),
+            ),
+            FINGERPRINT,
+        )
+        == key
+    )
+    assert (
+        cache.make_key(
+            hearing("What are your hours?"), DecisionCache.fingerprint([], [], 1)
+        )
+        != key
+    )
+
+
+def test_policies_are_per_perception_type():
+    cache = DecisionCache(
+        default_policy=None,
+        policies={
+            "hearing": DecisionCachePolicy(
+                min_confidence=0.5, ignore_fields=("speaker",)
+            )
+        },
+    )
+
+    assert (
+        cache.make_key(Perception(type="visual", data={"object": "cat"}), FINGERPRINT)
+        is None
+    )
+    key = cache.make_key(hearing("hi", speaker="a"), FINGERPRINT)
+    assert key == cache.make_key(hearing("hi", speaker="b"), FINGERPRINT)
+    assert not cache.set(key, "hearing", decision(confidence=0.4))
+    assert not cache.set(key, "hearing", decision(action="error"))
+    assert cache.set(key, "hearing", decision())
+    assert cache.get(key).action == "respond"
+
+
+def test_entries_expire_and_are_evicted_least_recently_used_first():
+    cache = DecisionCache(
+        max_entries=2, default_policy=DecisionCachePolicy(ttl_seconds=10)
+    )
+    with patch(
+        "frame.src.framer.brain.decision.decision_cache.time.time", return_value=100.0
+    ):
+        for key in ("a", "b"):
+            cache.set(key, "hearing", decision(key))
+        cache.get("a")
+        cache.set("c", "hearing", decision("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a").action == "a"
+    with patch(
+        "frame.src.framer.brain.decision.decision_cache.time.time", return_value=110.0
+    ):
+        assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_brain_reuses_decisions_until_its_goals_change():
+    service = LLMService(metrics=LLMMetrics())
+    output = {"action": "respond", "reasoning": "Greeting", "confidence": 0.9}
+    service.get_completion = AsyncMock(return_value=json.dumps(output))
+    brain = Brain(
+        llm_service=service,
+        decision_cache=DecisionCache(
+            default_policy=None, policies={"hearing": DecisionCachePolicy()}
+        ),
+    )
+
+    first = await brain.make_decision(hearing("Hello"))
+    second = await brain.make_decision(hearing("hello "))
+    await brain.make_decision(Perception(type="visual", data={"object": "cat"}))
+    brain.set_goals([Goal(name="Sell", description="Sell more")])
+    await brain.make_decision(hearing("Hello"))
+
+    assert second.action == first.action == "respond"
+    assert second is not first
+    assert service.get_completion.await_count == 3
+    assert brain.metrics.get_metrics()["decision_cache"] == {
+        "hearing": {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    }
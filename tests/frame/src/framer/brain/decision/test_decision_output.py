@@ -0,0 +1,93 @@
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from pydantic import ValidationError
+from frame.src.framer.agency.priority import Priority
+from frame.src.framer.brain.decision.decision_output import (
+    DECISION_OUTPUT,
+    DecisionOutput,
+    parse_decision_output,
+)
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+def test_parses_json_into_typed_decision():
+    output = parse_decision_output(
+        json.dumps(
+            {
+                "action": "respond",
+                "parameters": {"response_content": "Hi"},
+                "reasoning": "Greeting",
+                "confidence": 0.9,
+                "priority": "HIGH",
+                "related_roles": ["Assistant"],
+                "related_goals": [],
+                "unexpected": True,
+            }
+        )
+    )
+
+    assert isinstance(output, DecisionOutput)
+    assert output.parameters == {"response_content": "Hi"}
+    assert output.priority == Priority.HIGH.value
+    assert output.related_roles == ["Assistant"]
+
+
+def test_validation_is_lenient_about_details():
+    output = parse_decision_output(
+        {
+            "priority": "medium_high",
+            "confidence": 3,
+            "parameters": [],
+            "related_goals": "x",
+        }
+    )
+
+    assert output.action == "respond"
+    assert output.priority == Priority.MEDIUM_HIGH.value
+    assert output.confidence == 1.0
+    assert output.parameters == {}
+    assert output.related_goals == []
+    assert (
+        parse_decision_output('{"priority": "unknown"}').priority
+        == Priority.MEDIUM.value
+    )
+
+
+def test_rejects_responses_that_are_not_objects():
+    with pytest.raises(ValidationError):
+        parse_decision_output("not json")
+    with pytest.raises(ValidationError):
+        parse_decision_output("[1, 2]")
+
+
+@pytest.mark.asyncio
+async def test_llm_service_returns_typed_output_in_json_mode():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_config.side_effect = lambda max_tokens, temperature: MagicMock(
+        json_mode=False
+    )
+    configs = []
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        configs.append(config)
+        return '{"action": "respond", "confidence": 0.8}'
+
+    adapter.get_completion = get_completion
+    service = LLMService(metrics=LLMMetrics())
+
+    with patch.object(service, "get_adapter", return_value=adapter):
+        output = await service.get_completion(
+            "Decide", model="gpt-4o-mini", output_type=DECISION_OUTPUT
+        )
+        text = await service.get_completion("Decide", model="gpt-4o-mini")
+
+    assert isinstance(output, DecisionOutput)
+    assert output.confidence == 0.8
+    assert configs[0].json_mode is True
+    assert configs[1].json_mode is False
+    assert isinstance(text, str)
@@ -0,0 +1,160 @@
+import json
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from frame.src.framer.brain.decision import Decision
+from frame.src.framer.brain.mind.perception import (
+    CoalescingWindow,
+    Perception,
+    PerceptionCoalescer,
+    merge_perceptions,
+)
+
+
+def frame(distance, obj="car", camera="front"):
+    return Perception(
+        type="visual", data={"object": obj, "distance": distance}, source=camera
+    )
+
+
+def recording_flush():
+    flushed = []
+
+    async def flush(perception, priority, count, stream):
+        flushed.append((perception, priority, count, stream))
+        return len(flushed)
+
+    return flush, flushed
+
+
+def test_merge_keeps_latest_values_and_summarizes_fields():
+    merged = merge_perceptions(
+        [frame(10), frame(6, "pedestrian"), frame(8)], fields={"object": set}
+    )
+
+    assert merged.type == "visual"
+    assert merged.data["distance"] == 8
+    assert merged.data["object"] == {"car", "pedestrian"}
+    coalesced = merged.data["coalesced"]
+    assert coalesced["count"] == 3
+    assert coalesced["fields"] == {"distance": {"min": 6, "max": 10, "mean": 8}}
+    single = frame(3)
+    assert merge_perceptions([single]) is single
+
+
+@pytest.mark.asyncio
+async def test_window_closes_after_its_time_or_count():
+    flush, flushed = recording_flush()
+    coalescer = PerceptionCoalescer(
+        flush, {"visual": CoalescingWindow(seconds=0.02, max_count=3)}
+    )
+
+    results = await asyncio.gather(
+        coalescer.add(frame(9), 5),
+        coalescer.add(frame(7), 9, stream=True),
+        coalescer.add(frame(5), 5),
+        coalescer.add(frame(4), 1),
+    )
+
+    assert results == [1, 1, 1, 2]
+    (merged, priority, count, stream), (last, _, last_count, last_stream) = flushed
+    assert (priority, count, stream, merged.data["distance"]) == (9, 3, True, 5)
+    assert (last_count, last_stream, last.data["distance"]) == (1, False, 4)
+    assert len(coalescer) == 0
+
+
+@pytest.mark.asyncio
+async def test_debounced_window_stays_open_while_perceptions_arrive():
+    flush, flushed = recording_flush()
+    coalescer = PerceptionCoalescer(
+        flush, {"visual": CoalescingWindow(seconds=0.05, debounce=True)}
+    )
+
+    first = asyncio.ensure_future(coalescer.add(frame(9), 5))
+    for distance in (8, 7):
+        await asyncio.sleep(0.02)
+        asyncio.ensure_future(coalescer.add(frame(distance), 5))
+    assert not flushed
+
+    assert await first == 1
+    assert flushed[0][2] == 3
+
+
+@pytest.mark.asyncio
+async def test_windows_are_split_by_key_and_other_types_pass_through():
+    flush, flushed = recording_flush()
+    coalescer = PerceptionCoalescer(
+        flush,
+        {"visual": CoalescingWindow(seconds=0.01, key=lambda p: p.source)},
+    )
+
+    await asyncio.gather(
+        coalescer.add(frame(9, camera="front"), 5),
+        coalescer.add(frame(3, camera="rear"), 5),
+        coalescer.add(Perception(type="audio", data={"sound": "siren"}), 5),
+    )
+
+    assert sorted(p.source or p.type for p, _, _, _ in flushed) == [
+        "audio",
+        "front",
+        "rear",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_framer_decides_once_per_window(make_framer):
+    framer = make_framer(
+        "Vehicle Framer", coalesce_perceptions={"visual": {"seconds": 0.02}}
+    )
+    streamed = []
+
+    def execute(decision):
+        streamed.append(framer.execution_context.get_state("stream"))
+        return decision
+
+    framer.brain.execute_decision = AsyncMock(side_effect=execute)
+    framer.brain.process_perception = AsyncMock(
+        return_value=Decision(action="brake_vehicle", parameters={}, reasoning="test")
+    )
+
+    decisions = await asyncio.gather(
+        framer.sense(frame(30).to_dict()),
+        framer.sense(frame(20).to_dict(), stream=True),
+        framer.sense(frame(10).to_dict()),
+    )
+
+    assert [decision.action for decision in decisions] == ["brake_vehicle"] * 3
+    framer.brain.process_perception.assert_awaited_once()
+    merged = framer.brain.process_perception.await_args.args[0]
+    assert merged.data["coalesced"]["count"] == 3
+    assert streamed == [True]
+    assert framer.metrics.get_metrics()["coalescing"] == {
+        "visual": {"windows": 1, "perceptions": 3}
+    }
+    await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_equivalent_bursts_reuse_a_cached_decision(make_framer):
+    framer = make_framer(
+        "Vehicle Framer",
+        coalesce_perceptions={"visual": {"seconds": 0.02}},
+        decision_cache_types=["visual"],
+    )
+    framer.agency.get_goals.return_value = []
+    framer.soul.get_essence.return_value = "A careful driver."
+    framer.brain.llm_service.get_completion = AsyncMock(
+        return_value=json.dumps(
+            {"action": "respond", "reasoning": "Slow down", "confidence": 0.9}
+        )
+    )
+
+    for _ in range(2):
+        await asyncio.gather(
+            framer.sense(frame(30).to_dict()), framer.sense(frame(20).to_dict())
+        )
+
+    # The bursts were seen at different times, which must not change the key.
+    framer.brain.llm_service.get_completion.assert_awaited_once()
+    assert framer.brain.metrics.get_metrics()["decision_cache"]["visual"]["hits"] == 1
+    await framer.close()
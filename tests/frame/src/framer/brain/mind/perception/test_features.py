@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+from frame.src.framer.brain import Brain
+from frame.src.framer.brain.mind.perception import (
+    FeatureExtractor,
+    FeatureSpec,
+    Perception,
+    RingBuffer,
+    summarize,
+)
+from frame.src.framer.brain.rules import Rule
+from frame.src.services.llm.llm_service import LLMService
+
+
+def test_ring_buffer_keeps_the_latest_samples_in_order():
+    buffer = RingBuffer(5)
+
+    buffer.extend(np.array([1.0, 2.0, 3.0]))
+    buffer.extend(np.array([4.0, 5.0, 6.0, 7.0]))
+    assert buffer.values().tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+    buffer.extend(np.arange(10.0))
+    assert buffer.values().tolist() == [5.0, 6.0, 7.0, 8.0, 9.0]
+    assert len(buffer) == 5
+
+
+def test_summarize_computes_rolling_statistics():
+    features = summarize(np.array([1.0, 2.0, 3.0, 4.0, 10.0]), threshold=3.5)
+
+    assert features == {
+        "n": 5,
+        "last": 10.0,
+        "min": 1.0,
+        "max": 10.0,
+        "mean": 4.0,
+        "slope": 2.0,
+        "zscore": 1.8974,
+        "crossings": 1,
+    }
+    assert summarize(np.array([5.0]))["zscore"] == 0.0
+
+
+def test_extractor_replaces_arrays_and_buffers_each_sensor():
+    extractor = FeatureExtractor(
+        {
+            "lidar": FeatureSpec(thresholds={"distances": 2.0}),
+            "speed": FeatureSpec(fields=["kmh"], window=3),
+        }
+    )
+    sweep = Perception(
+        type="lidar",
+        data={"distances": [5.0, 1.5, 3.0], "heading": 90, "label": "roof"},
+        source="roof",
+    )
+
+    summarized = extractor.extract(sweep)
+
+    assert summarized.data["distances"]["min"] == 1.5
+    assert summarized.data["distances"]["crossings"] == 2
+    assert summarized.data["heading"] == 90 and summarized.data["label"] == "roof"
+    assert sweep.data["distances"] == [5.0, 1.5, 3.0]
+
+    for kmh in (10, 20, 30, 40):
+        front = extractor.extract(
+            Perception(type="speed", data={"kmh": kmh}, source="front")
+        )
+    rear = extractor.extract(Perception(type="speed", data={"kmh": 5}, source="rear"))
+    assert front.data["kmh"]["n"] == 3
+    assert front.data["kmh"]["slope"] == 10.0
+    assert rear.data["kmh"]["n"] == 1
+    other = Perception(type="hearing", data={"text": "hello"})
+    assert extractor.extract(other) is other
+
+
+@pytest.mark.asyncio
+async def test_brain_decides_on_features():
+    service = LLMService()
+    service.get_completion = AsyncMock(return_value={"action": "respond"})
+    brain = Brain(
+        llm_service=service,
+        feature_extractor=FeatureExtractor(
+            {"lidar": FeatureSpec(fields=["distances"])}
+        ),
+    )
+    brain.ruleset.add_rule(
+        Rule(
+            lambda data: data["distances"]["min"] < 1.0,
+            perception_type="lidar",
+            decision="brake_vehicle",
+            name="obstacle_ahead",
+        )
+    )
+
+    clear = Perception(type="lidar", data={"distances": list(np.linspace(2, 30, 720))})
+    await brain.make_decision(clear)
+    prompt = service.get_completion.await_args.args[0]
+    assert "'min': 2.0" in prompt
+    assert "29.96" not in prompt
+
+    blocked = Perception(type="lidar", data={"distances": [12.0, 0.4, 12.0]})
+    decision = await brain.make_decision(blocked)
+    assert decision.action == "brake_vehicle"
+    assert service.get_completion.await_count == 1
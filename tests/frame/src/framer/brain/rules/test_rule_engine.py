@@ -0,0 +1,146 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from frame.src.framer.brain import Brain, Decision
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.framer.brain.plugins import BasePlugin
+from frame.src.framer.brain.rules import Rule, RuleEngine, Ruleset
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+def obstacle(distance="close"):
+    return Perception(type="visual", data={"object": "obstacle", "distance": distance})
+
+
+def test_engine_only_checks_candidate_rules():
+    checked = []
+
+    def condition(data):
+        checked.append(data["object"])
+        return True
+
+    rules = [
+        Rule(
+            condition,
+            perception_type="visual",
+            match={"object": "pedestrian"},
+            decision="slow_down",
+        ),
+        Rule(
+            condition,
+            perception_type="audio",
+            match={"sound": "siren"},
+            decision="change_lane",
+        ),
+        Rule(
+            condition,
+            perception_type="visual",
+            match={"object": "obstacle"},
+            decision="brake",
+        ),
+    ]
+    engine = RuleEngine(rules)
+
+    assert engine.candidates(obstacle()) == [rules[2]]
+    rule, decision = engine.decide(obstacle())
+    assert rule is rules[2]
+    assert decision.action == "brake"
+    assert decision.confidence == 1.0
+    assert checked == ["obstacle"]
+
+
+def test_engine_keeps_rule_order_and_falls_through():
+    rules = [
+        Rule(
+            perception_type="visual",
+            match={"distance": lambda d: d == "close"},
+            decision=lambda p: None,
+        ),
+        Rule(match={"object": "obstacle", "distance": "far"}, decision="no_action"),
+        Rule(perception_type="visual", match={"object": "obstacle"}, decision="brake"),
+        Rule(lambda data: True, lambda data: None),
+    ]
+    engine = RuleEngine(rules)
+
+    assert engine.size == 3
+    assert engine.candidates(obstacle()) == rules[:3]
+    assert engine.decide(obstacle())[0] is rules[2]
+    assert engine.decide(obstacle("far"))[0] is rules[1]
+    assert engine.decide(Perception(type="visual", data={"object": ["a"]})) is None
+
+
+def test_decision_rules_return_fresh_decisions():
+    template = Decision(action="brake", parameters={"force": 1}, reasoning="Obstacle")
+    rule = Rule(decision=template)
+
+    decision = rule.decide(obstacle())
+    decision.parameters["force"] = 2
+
+    assert template.parameters == {"force": 1}
+
+
+def test_ruleset_evaluate_still_runs_actions():
+    fired = []
+    ruleset = Ruleset()
+    ruleset.add_rule(Rule(lambda context: context["temperature"] > 30, fired.append))
+
+    ruleset.evaluate({"temperature": 35})
+
+    assert fired == [{"temperature": 35}]
+    assert ruleset.version == 1
+
+
+@pytest.mark.asyncio
+async def test_brain_decides_by_rules_before_the_llm():
+    service = LLMService(metrics=LLMMetrics())
+    service.get_completion = AsyncMock(return_value=None)
+    brain = Brain(llm_service=service)
+    plugin = BasePlugin(MagicMock())
+    plugin.add_rule(
+        perception_type="visual",
+        match={"object": "obstacle"},
+        decision="brake",
+        name="obstacle",
+    )
+    brain.framer = MagicMock(plugins={"vehicle": plugin})
+
+    decision = await brain.make_decision(obstacle())
+    await brain.make_decision(Perception(type="visual", data={"object": "tree"}))
+
+    assert decision.action == "brake"
+    assert service.get_completion.await_count == 1
+    rules = brain.metrics.get_metrics()["rules"]
+    assert rules["hits"] == {"obstacle": 1}
+    assert rules["misses"] == 1
+    assert rules["evaluation"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_framer_factory_brain_uses_plugin_rules():
+    from frame.src.framer.agency import Goal, Role
+    from frame.src.framer.config import FramerConfig
+    from frame.src.framer.framer_factory import FramerFactory
+
+    service = LLMService(metrics=LLMMetrics())
+    service.get_completion = AsyncMock(return_value=None)
+    framer = await FramerFactory(
+        FramerConfig(name="Vehicle Framer"), service
+    ).create_framer(
+        roles=[Role(id="1", name="Driver", description="Drive safely.")],
+        goals=[Goal(name="Arrive", description="Arrive without incident.")],
+    )
+    plugin = BasePlugin(framer)
+    plugin.add_rule(
+        perception_type="visual",
+        match={"object": "obstacle"},
+        decision="brake",
+        name="obstacle",
+    )
+    framer.plugins["vehicle"] = plugin
+
+    decision = await framer.brain.make_decision(obstacle())
+
+    assert framer.brain.framer is framer
+    assert decision.action == "brake"
+    service.get_completion.assert_not_awaited()
+    await framer.close()
@@ -0,0 +1,105 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from frame.src.framer.brain import Brain
+from frame.src.framer.brain.action_index import ActionIndex, terms
+from frame.src.framer.brain.action_registry import ActionRegistry
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.services import ExecutionContext
+from frame.src.services.llm.llm_service import LLMService
+
+
+async def noop(execution_context, **kwargs):
+    return {"response": "ok"}
+
+
+VEHICLE_ACTIONS = {
+    "brake_vehicle": "Apply the brakes when an obstacle or pedestrian is ahead",
+    "change_lane": "Move to another lane to let an emergency vehicle with a siren pass",
+    "play_music": "Play a song from the music library",
+    "order_pizza": "Order a pizza for delivery",
+}
+
+
+def registry_with_vehicle_actions():
+    registry = ActionRegistry(execution_context=ExecutionContext(llm_service=Mock()))
+    for name, description in VEHICLE_ACTIONS.items():
+        registry.add_action(name, noop, description)
+    return registry
+
+
+def test_terms_are_stemmed_without_stopwords():
+    assert terms("The brake, brakes and braking") == ["brak", "brak", "brak"]
+    assert terms("passes pass boxes") == ["pass", "pass", "box"]
+    assert terms("change_lane") == ["chang", "lan"]
+
+
+def test_top_k_actions_ranks_by_relevance_and_keeps_mandatory_ones():
+    registry = registry_with_vehicle_actions()
+
+    top = registry.top_k_actions(
+        Perception(type="audio", data={"sound": "siren", "distance": "close"}), 1
+    )
+
+    assert list(top) == ["change_lane", "respond", "error"]
+    assert top["change_lane"] is registry.actions["change_lane"]
+    obstacle = Perception(type="visual", data={"object": "pedestrian"})
+    assert list(registry.top_k_actions(obstacle, 2))[0] == "brake_vehicle"
+
+
+def test_index_and_valid_actions_are_rebuilt_only_when_the_registry_changes():
+    registry = registry_with_vehicle_actions()
+
+    index = registry.action_index()
+    valid = registry.get_all_actions()
+    assert registry.action_index() is index
+    assert registry.get_all_actions() is valid
+
+    registry.add_action("honk", noop, "Sound the horn")
+    assert registry.action_index() is not index
+    assert "honk" in registry.get_all_actions()
+    registry.valid_actions.remove("honk")
+    assert "honk" not in registry.get_all_actions()
+
+
+def test_manifest_is_stable_for_the_same_actions():
+    index = ActionIndex(
+        {
+            "b": {"description": "B", "priority": 5},
+            "a": {"description": "A", "priority": 5},
+        }
+    )
+
+    manifest = index.manifest(["a", "b", "unknown"])
+
+    assert manifest == index.manifest(["b", "a"])
+    assert list(json.loads(manifest)) == ["b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_brain_lists_only_the_most_relevant_actions():
+    service = LLMService()
+    service.get_completion = AsyncMock(return_value={"action": "respond"})
+    brain = Brain(llm_service=service, max_prompt_actions=2)
+    for name, description in VEHICLE_ACTIONS.items():
+        brain.action_registry.add_action(name, noop, description)
+
+    await brain._get_decision_prompt(
+        Perception(type="visual", data={"object": "obstacle ahead"})
+    )
+
+    call = service.get_completion.await_args
+    prompt, system = call.args[0], call.kwargs["system_prompt"]
+    assert '"brake_vehicle"' in prompt and '"respond"' in prompt
+    assert '"order_pizza"' not in prompt and '"play_music"' not in prompt
+    assert prompt.index('"brake_vehicle"') < prompt.index("obstacle ahead")
+    assert len(call.kwargs["additional_context"]["valid_actions"]) == 4
+    # The shortened manifest changes with the perception, so it stays out of
+    # the system message that prefix caching relies on.
+    assert '"brake_vehicle"' not in system
+
+    await brain._get_decision_prompt(
+        Perception(type="hearing", data={"text": "play some music"})
+    )
+
+    assert service.get_completion.await_args.kwargs["system_prompt"] == system
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import Mock
+from frame.src.framer.agency.goals import Goal, GoalStatus
+from frame.src.framer.agency.roles import Role, RoleStatus
+from frame.src.framer.brain.action_registry import ActionRegistry
+from frame.src.framer.brain.decision_prompt import DecisionPromptTemplate
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.services import ExecutionContext
+
+
+@pytest.fixture
+def action_registry():
+    return ActionRegistry(execution_context=ExecutionContext(llm_service=Mock()))
+
+
+@pytest.fixture
+def template(action_registry):
+    return DecisionPromptTemplate(action_registry)
+
+
+async def custom_action(execution_context, **kwargs):
+    return {"response": "done"}
+
+
+def test_render_fills_perception_and_context(template):
+    perception = Perception(type="hearing", data={"text": "Hello there"})
+
+    prompt = template.render(perception, roles='["Helper"]', goals='["Assist"]')
+
+    assert "Hello there" in prompt
+    assert '["Helper"]' in prompt
+    assert '"respond"' in prompt
+    assert '"CRITICAL"' in prompt
+    assert "{" + "perception}" not in prompt
+
+
+def test_action_manifest_is_cached_until_registry_changes(template, action_registry):
+    manifest = template.action_manifest()
+    assert template.action_manifest() is manifest
+
+    action_registry.add_action("custom", custom_action, description="Custom action")
+    updated = template.action_manifest()
+    assert updated is not manifest
+    assert '"custom"' in updated
+
+
+@pytest.mark.asyncio
+async def test_remove_action_invalidates_manifest(template, action_registry):
+    action_registry.add_action("custom", custom_action, description="Custom action")
+    assert '"custom"' in template.action_manifest()
+
+    await action_registry.remove_action("custom")
+
+    assert '"custom"' not in template.action_manifest()
+
+
+def test_entries_block_is_cached_until_version_changes(template):
+    roles = [Role(id="1", name="Helper", description="Helps")]
+
+    block = template.entries_block("roles", roles, 0, RoleStatus.ACTIVE)
+    assert template.entries_block("roles", roles, 0, RoleStatus.ACTIVE) is block
+
+    roles = roles + [Role(id="2", name="Planner", description="Plans")]
+    updated = template.entries_block("roles", roles, 1, RoleStatus.ACTIVE)
+    assert "Planner" in updated
+
+
+def test_entries_block_sees_in_place_status_changes(template):
+    goals = [Goal(name="Assist"), Goal(name="Learn")]
+    assert "Learn" in template.entries_block("goals", goals, 0, GoalStatus.ACTIVE)
+
+    goals[1].status = GoalStatus.COMPLETED
+
+    assert "Learn" not in template.entries_block("goals", goals, 0, GoalStatus.ACTIVE)
+
+
+@pytest.mark.asyncio
+async def test_brain_bumps_versions_and_renders_decision_prompt():
+    from unittest.mock import AsyncMock
+    from frame.src.framer.brain.brain import Brain
+
+    llm_service = AsyncMock()
+    llm_service.get_completion.return_value = "{}"
+    brain = Brain(llm_service=llm_service)
+    goals = [Goal(name="Assist")]
+
+    brain.set_roles([Role(id="1", name="Helper", description="Helps")])
+    brain.set_goals(goals)
+    brain.set_goals(list(goals))
+    assert brain.roles_version == 1
+    assert brain.goals_version == 1
+
+    await brain._get_decision_prompt(
+        Perception(type="hearing", data={"text": "Hello there"})
+    )
+
+    call = llm_service.get_completion.call_args
+    assert "Helper (Priority: " in call.kwargs["context"]
+    assert "Assist (Priority: " in call.kwargs["context"]
+    assert "Hello there" in call.args[0]
@@ -0,0 +1,28 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from frame.src.framer.config import FramerConfig
+from frame.src.framer.framer import Framer
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def make_framer():
+    """Build Framers that are ready to sense, with mocked agency, soul and workflows."""
+
+    def make(name="Test Framer", **config):
+        llm_service = LLMService()
+        llm_service.metrics = LLMMetrics()
+        framer = Framer(
+            config=FramerConfig(name=name, **config),
+            llm_service=llm_service,
+            agency=Mock(),
+            soul=Mock(),
+            workflow_manager=Mock(workflows={}),
+        )
+        framer.plugin_loading_complete = True
+        framer._consume_stream = AsyncMock()
+        framer.brain.execute_decision = AsyncMock(side_effect=lambda decision: decision)
+        return framer
+
+    return make
@@ -0,0 +1,86 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from frame.src.framer.agency import Goal, Role
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.framer.config import FramerConfig
+from frame.src.framer.framer_factory import FramerFactory
+from frame.src.models.framer.soul.soul import Soul
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+def decision_adapter():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_completion = AsyncMock(
+        return_value=json.dumps(
+            {
+                "action": "respond",
+                "parameters": {"response": "Hello"},
+                "reasoning": "Greet the user.",
+                "confidence": 0.9,
+                "priority": 5,
+            }
+        )
+    )
+    return adapter
+
+
+async def create_framer(service, soul_seed="You are a careful driver."):
+    return await FramerFactory(
+        FramerConfig(name="Factory Framer", soul_seed=soul_seed), service
+    ).create_framer(
+        roles=[Role(id="1", name="Driver", description="Drive safely.")],
+        goals=[Goal(name="Arrive", description="Arrive without incident.")],
+    )
+
+
+@pytest.mark.asyncio
+async def test_factory_framer_decides_with_its_soul():
+    adapter = decision_adapter()
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=adapter):
+        framer = await create_framer(service)
+        decision = await framer.brain.make_decision(
+            Perception(type="hearing", data={"text": "Hello there"})
+        )
+
+    assert isinstance(framer.soul, Soul)
+    assert decision.action == "respond"
+    prompt = adapter.get_completion.await_args.args[0]
+    assert prompt.startswith("You are a careful driver.")
+    await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_decision_roles_and_goals_precede_memories_and_perception():
+    adapter = decision_adapter()
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=adapter):
+        framer = await create_framer(service)
+        with patch.object(service, "_complete", wraps=service._complete) as complete:
+            await framer.brain.make_decision(
+                Perception(type="hearing", data={"text": "Hello there"})
+            )
+
+    call = complete.await_args
+    assert call.kwargs["context"].startswith("Current active roles:")
+    assert "Hello there" not in call.kwargs["context"]
+    assert "Current active roles:" not in call.args[0]
+    assert "Hello there" in call.args[0]
+    await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_factory_framer_executes_each_sensed_decision_once():
+    adapter = decision_adapter()
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=adapter):
+        framer = await create_framer(service)
+        decision = await framer.sense({"type": "hearing", "data": {"text": "Hi"}})
+
+    # One completion to decide, and one for the respond action.
+    assert decision.action == "respond"
+    assert adapter.get_completion.await_count == 2
+    await framer.close()
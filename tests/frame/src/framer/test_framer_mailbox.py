@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from frame.src.framer.brain.decision import Decision
+from frame.src.framer.common.enums import OverflowPolicy
+from frame.src.framer.mailbox import Envelope, PerceptionMailbox
+
+
+def hearing(text, priority=None):
+    data = {"text": text}
+    if priority is not None:
+        data["priority"] = priority
+    return {"type": "hearing", "data": data}
+
+
+@pytest.mark.asyncio
+async def test_mailbox_orders_by_priority_then_arrival():
+    mailbox = PerceptionMailbox(max_size=4)
+    for name, priority in [("a", 1), ("b", 5), ("c", 5), ("d", 9)]:
+        await mailbox.put(Envelope(perception=name, priority=priority))
+
+    order = [(await mailbox.get()).perception for _ in range(4)]
+
+    assert order == ["d", "b", "c", "a"]
+
+
+@pytest.mark.asyncio
+async def test_mailbox_overflow_policies():
+    oldest = PerceptionMailbox(max_size=2, overflow=OverflowPolicy.DROP_OLDEST)
+    await oldest.put(Envelope(perception="first", priority=9))
+    await oldest.put(Envelope(perception="second", priority=1))
+    dropped = await oldest.put(Envelope(perception="third", priority=1))
+    assert dropped.perception == "first"
+    assert len(oldest) == 2
+
+    lowest = PerceptionMailbox(max_size=2, overflow="drop_lowest_priority")
+    await lowest.put(Envelope(perception="low", priority=1))
+    await lowest.put(Envelope(perception="high", priority=9))
+    rejected = Envelope(perception="also low", priority=1)
+    assert await lowest.put(rejected) is rejected
+    dropped = await lowest.put(Envelope(perception="medium", priority=5))
+    assert dropped.perception == "low"
+    assert [(await lowest.get()).perception for _ in range(2)] == ["high", "medium"]
+
+
+@pytest.mark.asyncio
+async def test_blocking_mailbox_waits_for_room():
+    mailbox = PerceptionMailbox(max_size=1)
+    await mailbox.put(Envelope(perception="first", priority=5))
+
+    put = asyncio.ensure_future(mailbox.put(Envelope(perception="second", priority=5)))
+    await asyncio.sleep(0)
+    assert not put.done()
+
+    assert (await mailbox.get()).perception == "first"
+    assert await put is None
+    assert len(mailbox) == 1
+
+
+@pytest.mark.asyncio
+async def test_framer_processes_concurrent_perceptions_one_at_a_time(make_framer):
+    framer = make_framer("Mailbox Framer")
+    active, seen = [], []
+
+    async def process_perception(perception, goals, **kwargs):
+        active.append(perception)
+        assert len(active) == 1
+        seen.append(perception.data["text"])
+        await asyncio.sleep(0.01)
+        active.remove(perception)
+        return Decision(action="respond", parameters={}, reasoning="test")
+
+    framer.brain.process_perception = process_perception
+
+    first = asyncio.ensure_future(framer.sense(hearing("first")))
+    while not seen and not first.done():
+        await asyncio.sleep(0)
+    decisions = await asyncio.gather(
+        first,
+        framer.sense(hearing("background", priority=1)),
+        framer.sense(hearing("urgent", priority=9)),
+    )
+
+    assert all(decision.action == "respond" for decision in decisions)
+    assert seen == ["first", "urgent", "background"]
+    mailbox = framer.metrics.get_metrics()["mailbox"]
+    assert mailbox["depth"] == {"Mailbox Framer": 0}
+    assert mailbox["wait"]["count"] == 3
+    await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_framer_drops_and_closes_with_none(make_framer):
+    framer = make_framer(
+        "Mailbox Framer", mailbox_size=1, mailbox_overflow=OverflowPolicy.DROP_OLDEST
+    )
+    release = asyncio.Event()
+
+    async def process_perception(perception, goals, **kwargs):
+        await release.wait()
+        return Decision(action="respond", parameters={}, reasoning="test")
+
+    framer.brain.process_perception = process_perception
+
+    running = asyncio.ensure_future(framer.sense(hearing("running")))
+    await asyncio.sleep(0)
+    dropped = asyncio.ensure_future(framer.sense(hearing("dropped")))
+    await asyncio.sleep(0)
+    queued = asyncio.ensure_future(framer.sense(hearing("queued")))
+    await asyncio.sleep(0)
+
+    assert await dropped is None
+    assert framer.metrics.get_metrics()["mailbox"]["dropped"] == {"Mailbox Framer": 1}
+    await framer.close()
+    assert await queued is None
+    with pytest.raises(asyncio.CancelledError):
+        await running
+    assert framer.metrics.get_metrics()["mailbox"]["depth"] == {"Mailbox Framer": 0}
+
+
+def test_perceptions_queue_is_per_framer_and_bounded(make_framer):
+    first = make_framer("Mailbox Framer", mailbox_size=2)
+    second = make_framer("Mailbox Framer")
+    first.acting = False
+
+    for text in ["a", "b", "c"]:
+        asyncio.run(first.sense(hearing(text)))
+
+    assert [p["data"]["text"] for p in first.perceptions_queue] == ["b", "c"]
+    assert not second.perceptions_queue
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from frame.src.framer.brain.decision import Decision
+
+
+def slow_decisions(framer, delays):
+    """Make decisions take delays[i] seconds for reading i, tracking concurrency."""
+    state = {"active": 0, "peak": 0}
+
+    async def make_decision(perception):
+        reading = perception.data["reading"]
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(delays[reading])
+        finally:
+            state["active"] -= 1
+        return Decision(
+            action="respond", parameters={"reading": reading}, reasoning="test"
+        )
+
+    framer.brain.make_decision = make_decision
+    return state
+
+
+def readings(count):
+    return ({"type": "sensor", "data": {"reading": i}} for i in range(count))
+
+
+@pytest.mark.asyncio
+async def test_sense_many_applies_and_yields_in_order(make_framer):
+    framer = make_framer("Batch Framer")
+    state = slow_decisions(framer, [0.03, 0.02, 0.01, 0.0, 0.0])
+    applied = []
+    framer.add_observer(lambda decision: applied.append(decision.parameters["reading"]))
+
+    decisions = [
+        decision.parameters["reading"]
+        async for decision in framer.sense_many(readings(5), max_concurrency=3)
+    ]
+
+    assert decisions == [0, 1, 2, 3, 4]
+    assert applied == [0, 1, 2, 3, 4]
+    assert state["peak"] == 3
+    assert len(framer.brain.mind.perceptions) == 5
+    await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_sense_many_unordered_yields_as_decisions_complete(make_framer):
+    framer = make_framer("Batch Framer")
+    slow_decisions(framer, [0.05, 0.0, 0.02])
+
+    decisions = [
+        decision.parameters["reading"]
+        async for decision in framer.sense_many(
+            readings(3), max_concurrency=3, ordered=False
+        )
+    ]
+
+    assert decisions == [1, 2, 0]
+    await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_sense_many_cancels_pending_decisions_when_the_caller_stops(make_framer):
+    framer = make_framer("Batch Framer")
+    state = slow_decisions(framer, [0.0] + [10.0] * 3)
+
+    batch = framer.sense_many(readings(4), max_concurrency=4)
+    first = await batch.__anext__()
+    await batch.aclose()
+    await asyncio.sleep(0)
+
+    assert first.parameters["reading"] == 0
+    assert state["active"] == 0
+    await framer.close()
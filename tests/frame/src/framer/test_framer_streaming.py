@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import AsyncMock
+from frame.src.framer.brain.decision import Decision
+
+
+@pytest.mark.asyncio
+async def test_stream_observers_receive_chunks(make_framer):
+    framer = make_framer("Stream Framer")
+    # Stream for real instead of through the fixture's mock.
+    del framer._consume_stream
+
+    async def chunks():
+        yield "Hello"
+        yield ", world"
+
+    async def execute_decision(decision):
+        decision.result = {"response": chunks()}
+        return decision
+
+    framer.brain.process_perception = AsyncMock(
+        return_value=Decision(action="respond", parameters={}, reasoning="test")
+    )
+    framer.brain.execute_decision = execute_decision
+    received, decided = [], []
+
+    async def async_observer(chunk):
+        received.append(("async", chunk))
+
+    framer.add_stream_observer(lambda chunk: received.append(("sync", chunk)))
+    framer.add_stream_observer(async_observer)
+    framer.add_observer(lambda decision: decided.append(decision.result["response"]))
+
+    decision = await framer.sense(
+        {"type": "hearing", "data": {"text": "Hi"}}, stream=True
+    )
+
+    assert received == [
+        ("sync", "Hello"),
+        ("async", "Hello"),
+        ("sync", ", world"),
+        ("async", ", world"),
+    ]
+    assert decision.result["response"] == "Hello, world"
+    assert decided == ["Hello, world"]
+    await framer.close()
@@ -3,7 +3,6 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from frame.src.services.llm.llm_adapters.huggingface.huggingface_adapter import (
     HuggingFaceAdapter,
     HuggingFaceConfig,
-    TokenBucket,
 )
 
 
@@ -16,7 +15,7 @@ def test_huggingface_adapter_initialization(huggingface_adapter):
     assert isinstance(huggingface_adapter, HuggingFaceAdapter)
     assert huggingface_adapter.huggingface_api_key == "fake_api_key"
     assert huggingface_adapter.default_model == "gpt2"
-    assert isinstance(huggingface_adapter.token_bucket, TokenBucket)
+    assert huggingface_adapter.rate_limiter is None
 
 
 def test_set_default_model(huggingface_adapter):
@@ -34,10 +33,3 @@ async def test_get_completion(huggingface_adapter):
         result = await huggingface_adapter.get_completion("Test prompt", config)
         assert result == "Test completion"
         mock_completion.assert_called_once_with("Test prompt", config, "gpt2")
-
-
-def test_token_bucket():
-    bucket = TokenBucket(capacity=10, fill_rate=1)
-    assert bucket.consume(5)
-    assert not bucket.consume(6)
-    assert bucket.consume(5)
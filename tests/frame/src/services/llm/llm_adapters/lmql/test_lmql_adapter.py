@@ -1,12 +1,13 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
 from frame.src.services.llm.llm_adapters.lmql.lmql_adapter import (
     LMQLAdapter,
     LMQLConfig,
 )
 
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, RateLimitError
 
 
 @pytest.fixture
@@ -69,50 +70,53 @@ async def test_get_completion_unsupported_model(lmql_adapter):
 
 
 @pytest.mark.asyncio
-async def test_rate_limiting(lmql_adapter, mock_openai_client):
-    config = LMQLConfig(model="gpt-3.5-turbo")
-    mock_openai_client.chat.completions.create.return_value = AsyncMock(
-        choices=[AsyncMock(message=AsyncMock(content="Test completion"))]
+async def test_rate_limiting(mock_openai_client):
+    rate_limiter = MagicMock()
+    lmql_adapter = LMQLAdapter(
+        openai_client=mock_openai_client, rate_limiter=rate_limiter
+    )
+    headers = {"retry-after": "2"}
+    error = RateLimitError(
+        "Rate limited",
+        response=httpx.Response(
+            429, headers=headers, request=httpx.Request("POST", "https://api")
+        ),
+        body=None,
     )
+    mock_openai_client.chat.completions.create.side_effect = error
 
-    # Simulate rate limiting
-    with patch(
-        "frame.src.services.llm.llm_adapters.lmql.lmql_adapter.TokenBucket.consume",
-        return_value=False,
-    ):
-        with patch("asyncio.sleep") as mock_sleep:
-            result = await lmql_adapter.get_completion("Test prompt", config)
-            mock_sleep.assert_called_once_with(1)
+    with pytest.raises(RateLimitError):
+        await lmql_adapter._get_openai_completion(
+            "Test prompt", LMQLConfig(model="gpt-3.5-turbo"), "gpt-3.5-turbo"
+        )
 
-    assert result == "Test completion"
-    mock_openai_client.chat.completions.create.assert_called_once()
+    rate_limiter.record_rate_limited.assert_called_once()
+    args, kwargs = rate_limiter.record_rate_limited.call_args
+    assert args == ("openai", "gpt-3.5-turbo")
+    assert kwargs["headers"]["retry-after"] == "2"
 
 
 @pytest.mark.asyncio
-async def test_retry_logic(lmql_adapter, mock_openai_client):
+async def test_errors_are_not_retried_by_the_adapter(lmql_adapter, mock_openai_client):
     config = LMQLConfig(model="gpt-3.5-turbo")
 
-    # Mock the _get_openai_completion method
+    # Retries are handled by LLMService, so the adapter makes one attempt
     lmql_adapter._get_openai_completion = AsyncMock()
-    lmql_adapter._get_openai_completion.side_effect = [
-        Exception("API Error"),
-        Exception("API Error"),
-        AsyncMock(choices=[AsyncMock(message=AsyncMock(content="Test completion"))]),
-    ]
-
-    result = await lmql_adapter.get_completion("Test prompt", config)
-    assert result == "Test completion"
-    assert lmql_adapter._get_openai_completion.call_count == 3
-
-    # Test for retries
-    lmql_adapter._get_openai_completion.side_effect = [
-        Exception("Reached end of response stream unexpectedly")
-    ] * 2
-    with pytest.raises(Exception, match="Reached end of response stream unexpectedly"):
+    lmql_adapter._get_openai_completion.side_effect = Exception("API Error")
+    with pytest.raises(Exception, match="API Error"):
+        await lmql_adapter.get_completion("Test prompt", config)
+    assert lmql_adapter._get_openai_completion.call_count == 1
+
+    # Rate limits keep their type so the retry policy can classify them
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    rate_limited = RateLimitError(
+        "Rate limited",
+        response=httpx.Response(429, request=request),
+        body=None,
+    )
+    lmql_adapter._get_openai_completion.side_effect = rate_limited
+    with pytest.raises(RateLimitError):
         await lmql_adapter.get_completion("Test prompt", config)
-    assert (
-        lmql_adapter._get_openai_completion.call_count == 8
-    )  # 3 from previous + 5 new calls
 
     # Test for StopAsyncIteration
     lmql_adapter._get_openai_completion.side_effect = StopAsyncIteration(
@@ -125,3 +129,71 @@ async def test_retry_logic(lmql_adapter, mock_openai_client):
 
     # Reset side_effect for future tests
     lmql_adapter._get_openai_completion.side_effect = None
+
+
+def _stream_chunk(content=None, usage=None):
+    delta = MagicMock(content=content)
+    choices = [MagicMock(delta=delta)] if content is not None else []
+    return MagicMock(choices=choices, usage=usage)
+
+
+@pytest.mark.asyncio
+async def test_get_completion_stream(lmql_adapter, mock_openai_client):
+    from frame.src.utils.token_utils import pop_reported_usage
+
+    async def provider_stream():
+        yield _stream_chunk("Hello")
+        yield _stream_chunk(", world")
+        yield _stream_chunk(usage=MagicMock(prompt_tokens=5, completion_tokens=3))
+
+    mock_openai_client.chat.completions.create.return_value = provider_stream()
+    pop_reported_usage()
+
+    stream = await lmql_adapter.get_completion(
+        "Test prompt", LMQLConfig(model="gpt-3.5-turbo"), stream=True
+    )
+    chunks = [chunk async for chunk in stream]
+
+    assert chunks == ["Hello", ", world"]
+    kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["stream_options"] == {"include_usage": True}
+    usage = pop_reported_usage()
+    assert (usage.prompt_tokens, usage.completion_tokens) == (5, 3)
+
+
+@pytest.mark.asyncio
+async def test_json_mode_requests_json_and_returns_raw_text(
+    lmql_adapter, mock_openai_client
+):
+    content = '{"action": "respond",  "confidence": 0.9}'
+    mock_openai_client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=content))], usage=None
+    )
+
+    result = await lmql_adapter.get_completion(
+        "Test prompt", LMQLConfig(model="gpt-4o-mini", json_mode=True)
+    )
+
+    assert result == content
+    request = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert request["response_format"] == {"type": "json_object"}
+
+
+@pytest.mark.asyncio
+async def test_llm_service_sends_the_requested_model(lmql_adapter, mock_openai_client):
+    from frame.src.services.llm.llm_service import LLMService
+    from frame.src.utils.llm_utils import LLMMetrics
+
+    mock_openai_client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content="Test completion"))], usage=None
+    )
+    service = LLMService(metrics=LLMMetrics())
+
+    with patch.object(service, "get_adapter", return_value=lmql_adapter):
+        await service.get_completion(
+            "Test prompt", model="gpt-4o", additional_context={"user": "a"}
+        )
+
+    request = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert request["model"] == "gpt-4o"
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from frame.src.services.llm.llm_adapters.local import (
+    LocalModelAdapter,
+    MicroBatcher,
+    PrefixCache,
+)
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.rate_limiter import provider_for_model
+from frame.src.utils.llm_utils import LLMMetrics, get_model_pricing
+from frame.src.utils.metrics import MetricsStore
+from frame.src.utils.token_utils import pop_reported_usage
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_groups_concurrent_submissions():
+    batches = []
+
+    async def run_batch(batch):
+        batches.append(list(batch))
+
+    batcher = MicroBatcher(run_batch, max_batch_size=3, max_wait=0.01)
+    for item in range(5):
+        batcher.submit(item)
+    await asyncio.sleep(0.05)
+
+    assert batches == [[0, 1, 2], [3, 4]]
+    assert batcher.pending == 0
+
+
+def test_prefix_cache_reuses_prefixes_shared_across_calls():
+    cache = PrefixCache(max_entries=2, min_tokens=3)
+    system = [1, 2, 3, 4]
+
+    # The first prompt has nothing to share with; the second shares the system prompt.
+    assert cache.candidate([system + [5, 6]]) is None
+    prefix = cache.candidate([system + [7]])
+    assert prefix == (1, 2, 3, 4)
+    cache.store(prefix, "kv")
+
+    assert cache.lookup([system + [8], system + [9, 10]]) == (4, "kv")
+    # A prompt must keep at least one token of its own.
+    assert cache.lookup([system]) == (0, None)
+    assert cache.lookup([[1, 2, 9, 9, 9]]) == (0, None)
+
+    # Prompts of one batch share prefixes with each other.
+    assert cache.candidate([[5, 6, 7, 8, 1], [5, 6, 7, 9]]) == (5, 6, 7)
+    cache.store((5, 6, 7), "kv2")
+    cache.store((9, 9, 9), "kv3")
+    assert len(cache) == 2
+    assert cache.lookup([system + [8]]) == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_decoded_in_one_batch():
+    adapter = LocalModelAdapter("test/model", max_batch_size=4, max_wait=0.01)
+    batch_sizes = []
+
+    def generate(batch):
+        # Stands in for the model: echoes each prompt back word by word.
+        batch_sizes.append(len(batch))
+        for request in batch:
+            words = request.prompt.split()
+            for word in words:
+                request.emit(word + " ")
+            request.prompt_tokens = len(words)
+            request.completion_tokens = len(words)
+            request.emit(None)
+
+    adapter._generate = generate
+    try:
+        results = await asyncio.gather(
+            *(adapter.get_completion(f"hello {i}") for i in range(3))
+        )
+        assert results == ["hello 0 ", "hello 1 ", "hello 2 "]
+        assert batch_sizes == [3]
+
+        pop_reported_usage()
+        stream = await adapter.get_completion("one two", stream=True)
+        assert [chunk async for chunk in stream] == ["one ", "two "]
+        usage = pop_reported_usage()
+        assert (usage.prompt_tokens, usage.completion_tokens) == (2, 2)
+    finally:
+        adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_inference_errors_reach_every_request_of_the_batch():
+    adapter = LocalModelAdapter("test/model", max_wait=0.01)
+
+    def generate(batch):
+        raise RuntimeError("out of memory")
+
+    adapter._generate = generate
+    try:
+        results = await asyncio.gather(
+            adapter.get_completion("a"),
+            adapter.get_completion("b"),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+    finally:
+        adapter.close()
+
+
+def test_llm_service_serves_local_models_for_free():
+    service = LLMService(
+        openai_api_key="test",
+        metrics=LLMMetrics(MetricsStore()),
+        local_options={"max_batch_size": 2},
+    )
+    model = "local/HuggingFaceTB/SmolLM2-360M-Instruct"
+    adapter = service.get_adapter(model)
+
+    assert isinstance(adapter, LocalModelAdapter)
+    assert adapter.model_name == "HuggingFaceTB/SmolLM2-360M-Instruct"
+    assert service.get_adapter(model) is adapter
+    assert provider_for_model(model) == "local"
+    assert get_model_pricing(model) == (0.0, 0.0)
+    service.close()
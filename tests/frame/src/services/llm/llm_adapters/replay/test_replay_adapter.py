@@ -0,0 +1,113 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from openai import InternalServerError, RateLimitError
+from frame.src.services.llm.llm_adapters.lmql.lmql_adapter import LMQLAdapter
+from frame.src.services.llm.llm_adapters.replay import (
+    LatencyModel,
+    ReplayAdapter,
+    ReplayLog,
+    ReplayMiss,
+)
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.retry_policy import RetryPolicy
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "replay" / "completions.jsonl")
+
+
+@pytest.fixture
+def target():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: f"formatted {prompt}"
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        adapter.models.append(model)
+        return f"answer to {prompt}"
+
+    adapter.models = []
+
+    adapter.get_completion = get_completion
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_recorded_responses_are_replayed_from_disk(log_path, target):
+    recorder = ReplayAdapter(ReplayLog(log_path), mode="record", target=target)
+    config = recorder.get_config(max_tokens=100, temperature=0)
+    assert await recorder.get_completion("Hello", config) == "answer to formatted Hello"
+
+    with open(log_path) as f:
+        record = json.loads(f.readline())
+    assert set(record) == {"k", "r", "t"}
+    assert "Hello" not in record["k"]
+    assert target.models == [None]
+    await recorder.get_completion("Hi", config, model="record/gpt-4o")
+    assert target.models == [None, "gpt-4o"]
+
+    replayer = ReplayAdapter(ReplayLog(log_path), latency=LatencyModel(kind="fixed"))
+    assert await replayer.get_completion("Hello") == "answer to formatted Hello"
+
+    stream = await replayer.get_completion("Hello", stream=True)
+    assert "".join([chunk async for chunk in stream]) == "answer to formatted Hello"
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_prompts_miss_or_use_default(log_path):
+    with pytest.raises(ReplayMiss):
+        await ReplayAdapter(ReplayLog(log_path)).get_completion("Unknown")
+
+    replayer = ReplayAdapter(ReplayLog(log_path), default_response="{}")
+    assert await replayer.get_completion("Unknown") == "{}"
+
+
+def test_latency_models():
+    assert LatencyModel(kind="fixed", seconds=0.2, scale=2).sample() == 0.4
+    assert LatencyModel(kind="recorded", seconds=0.1).sample(0.3) == 0.3
+    assert LatencyModel(kind="recorded", seconds=0.1).sample(None) == 0.1
+    samples = [
+        LatencyModel(kind="lognormal", median=0.5, sigma=1.0).sample()
+        for _ in range(200)
+    ]
+    assert all(sample > 0 for sample in samples)
+    assert max(samples) > 0.5 > min(samples)
+    with pytest.raises(ValueError):
+        LatencyModel(kind="uniform")
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_look_like_provider_errors(log_path):
+    log = ReplayLog(log_path)
+    log.append("Hello", "Hi", 0.0)
+
+    with pytest.raises(RateLimitError):
+        await ReplayAdapter(log, rate_limit_rate=1.0).get_completion("Hello")
+    with pytest.raises(InternalServerError):
+        await ReplayAdapter(log, server_error_rate=1.0).get_completion("Hello")
+
+
+@pytest.mark.asyncio
+async def test_llm_service_selects_replay_adapters_by_prefix(log_path):
+    log = ReplayLog(log_path)
+    replay = ReplayAdapter(log, latency=LatencyModel(kind="fixed"))
+    service = LLMService(
+        metrics=LLMMetrics(), replay=replay, retry_policy=RetryPolicy(max_attempts=1)
+    )
+
+    assert service.get_adapter("replay/gpt-4o-mini") is replay
+    recorder = service.get_adapter("record/gpt-4o-mini")
+    assert recorder.mode == "record"
+    assert isinstance(recorder.target, LMQLAdapter)
+    assert recorder.log is log
+
+    log.append("What is 2+2?", "4", 0.0)
+    result = await service.get_completion("What is 2+2?", model="replay/gpt-4o-mini")
+    assert result == "4"
+
+    with pytest.raises(ValueError):
+        LLMService().get_adapter("replay/gpt-4o-mini")
@@ -0,0 +1,126 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from frame.src.services.llm.client_registry import ClientPoolConfig, ClientRegistry
+from frame.src.services.llm.llm_adapters.lmql.lmql_adapter import (
+    LMQLAdapter,
+    LMQLConfig,
+)
+from frame.src.services.llm.llm_service import LLMService
+
+
+@pytest.fixture
+def registry():
+    return ClientRegistry(ClientPoolConfig(max_connections=10, keepalive_expiry=5.0))
+
+
+def test_http_client_is_shared_per_provider_and_endpoint(registry):
+    first = registry.get_http_client("openai")
+    assert registry.get_http_client("openai") is first
+    assert registry.get_http_client("openai", "https://example.com/v1") is not first
+    assert registry.get_http_client("mistral") is not first
+
+
+def test_openai_clients_share_pooled_http_client(registry):
+    client = registry.get_openai_client("sk-one")
+    assert registry.get_openai_client("sk-one") is client
+    other = registry.get_openai_client("sk-two")
+    assert other is not client
+    assert other._client is client._client is registry.get_http_client("openai")
+
+
+def test_lmql_interface_is_cached_per_model(registry):
+    with patch(
+        "frame.src.services.llm.client_registry.LMQLInterface"
+    ) as mock_interface:
+        mock_interface.side_effect = lambda model_name: MagicMock(name=model_name)
+        first = registry.get_lmql_interface("gpt-4")
+        assert registry.get_lmql_interface("gpt-4") is first
+        registry.get_lmql_interface("gpt-3.5-turbo")
+    assert mock_interface.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_pooled_clients(registry):
+    client = registry.get_http_client("openai")
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.get_http_client("openai") is not client
+
+
+def test_close_without_running_loop(registry):
+    client = registry.get_http_client("openai")
+    registry.close()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_close_in_running_loop_returns_awaitable_task(registry):
+    client = registry.get_http_client("openai")
+    closing = registry.close()
+    assert registry.close() is closing
+    await closing
+    assert client.is_closed
+
+    registry.get_http_client("openai")
+    registry.close()
+    await registry.aclose()
+    assert registry._closing is None
+
+
+@pytest.mark.asyncio
+async def test_lmql_adapter_leaves_shared_interfaces_alone(registry):
+    openai_client = registry.get_openai_client("sk-test")
+    adapter = LMQLAdapter(openai_client=openai_client, client_registry=registry)
+    with (
+        patch("frame.src.services.llm.client_registry.LMQLInterface") as mock_interface,
+        patch.object(adapter, "_get_openai_completion", return_value="done"),
+    ):
+        await adapter.get_completion(
+            "Prompt", LMQLConfig(model="gpt-3.5-turbo"), decoder="beam"
+        )
+    mock_interface.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lmql_interface_takes_decoder_per_call():
+    from frame.src.services.llm.llm_adapters.lmql.lmql_interface import LMQLInterface
+
+    with patch("frame.src.services.llm.llm_adapters.lmql.lmql_interface.lmql") as lmql:
+        lmql.model.return_value.generate = AsyncMock(return_value="done")
+        interface = LMQLInterface("gpt-3.5-turbo")
+        interface.set_decoder("argmax")
+        await interface.generate(
+            "Prompt", constraints=[], decoder="beam", decoder_params={"n": 2}
+        )
+        await interface.generate("Prompt", constraints=[])
+
+    first, second = interface.model.generate.await_args_list
+    assert (first.kwargs["decoder"], first.kwargs["n"]) == ("beam", 2)
+    assert second.kwargs["decoder"] == "argmax"
+    assert interface.decoder == "argmax"
+
+
+def test_llm_service_adapters_share_registry_clients(registry):
+    service = LLMService(openai_api_key="sk-test", client_registry=registry)
+    gpt4 = service.get_adapter("gpt-4")
+    gpt35 = service.get_adapter("gpt-3.5-turbo")
+    assert gpt4.openai_client is gpt35.openai_client
+    assert gpt4.openai_client is service.lmql_wrapper.openai_client
+
+    http_client = registry.get_http_client("openai")
+    service.close()
+    assert http_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_llm_service_adapters_get_new_clients_after_aclose(registry):
+    service = LLMService(openai_api_key="sk-test", client_registry=registry)
+    adapter = service.get_adapter("gpt-4")
+    before = adapter.openai_client
+
+    await service.aclose()
+
+    assert before._client.is_closed
+    assert adapter.openai_client is not before
+    assert not adapter.openai_client._client.is_closed
+    assert service.lmql_wrapper.openai_client is adapter.openai_client
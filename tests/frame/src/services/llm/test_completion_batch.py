@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def mock_adapter():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.active = 0
+    adapter.peak = 0
+
+    async def get_completion(prompt, config, additional_context=None, model=None):
+        adapter.active += 1
+        adapter.peak = max(adapter.peak, adapter.active)
+        try:
+            # Later prompts finish first, so ordering must not depend on completion order.
+            await asyncio.sleep(0.01 / (int(prompt.split()[-1]) + 1))
+            if "fail" in prompt:
+                raise RuntimeError("provider down")
+            return f"completion for {prompt}"
+        finally:
+            adapter.active -= 1
+
+    adapter.get_completion = get_completion
+    return adapter
+
+
+@pytest.fixture
+def llm_service(mock_adapter):
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=mock_adapter):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_results_preserve_input_order(llm_service):
+    prompts = [f"prompt {i}" for i in range(10)]
+
+    results = await llm_service.get_completions(prompts, max_concurrency=4)
+
+    assert [r.index for r in results] == list(range(10))
+    assert [r.result for r in results] == [f"completion for {p}" for p in prompts]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(llm_service, mock_adapter):
+    await llm_service.get_completions(
+        [f"prompt {i}" for i in range(10)], max_concurrency=3
+    )
+
+    assert mock_adapter.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_partial_failure_returns_errors_per_item(llm_service):
+    results = await llm_service.get_completions(
+        ["prompt 0", {"prompt": "fail 1"}, "prompt 2"], max_concurrency=2
+    )
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, RuntimeError)
+    assert results[1].result is None
+    assert results[2].result == "completion for prompt 2"
+
+
+@pytest.mark.asyncio
+async def test_batch_metrics_are_recorded(llm_service):
+    await llm_service.get_completions(["prompt 0", "fail 1", "prompt 2"])
+
+    batches = llm_service.get_metrics()["batches"]
+    assert batches["batches"] == 1
+    assert batches["requests"] == 3
+    assert batches["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_override_shared_defaults(llm_service, mock_adapter):
+    await llm_service.get_completions(
+        ["prompt 0", {"prompt": "prompt 1", "max_tokens": 10}], max_tokens=50
+    )
+
+    max_tokens = [
+        call.kwargs["max_tokens"] for call in mock_adapter.get_config.call_args_list
+    ]
+    assert max_tokens == [50, 10]
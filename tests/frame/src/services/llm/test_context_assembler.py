@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.services.llm.context_assembler import ContextAssembler
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.prompt_layout import PromptSection
+from frame.src.utils.llm_utils import LLMMetrics
+from frame.src.utils.token_utils import count_tokens, truncate_to_tokens
+
+
+def test_budget_comes_from_the_context_window():
+    assert ContextAssembler("gpt-4", max_tokens=1000).budget == 8192 - 1000
+    assert ContextAssembler("gpt-4", max_tokens=1000, budget=500).budget == 500
+    assert ContextAssembler("unknown-model").budget is None
+
+
+@pytest.mark.asyncio
+async def test_everything_fits_without_a_budget():
+    context = await (
+        ContextAssembler()
+        .add("system", "Be brief.", section=PromptSection.SYSTEM, required=True)
+        .add("memories", ["first", "second"], header="Memories:")
+        .add("input", "Hello", section=PromptSection.INPUT, required=True)
+        .assemble()
+    )
+
+    assert context.layout.text() == "Be brief.\n\nMemories:\nfirst\nsecond\n\nHello"
+    assert context.tokens["input"] == count_tokens("Hello")
+    assert context.truncated == []
+
+
+@pytest.mark.asyncio
+async def test_low_priority_sections_are_cut_first():
+    old = ["old memory " * 20, "older memory " * 20]
+    recent = "recent memory"
+    roles = "Roles: helper"
+    question = "What should I do next?"
+    budget = (
+        count_tokens(roles)
+        + count_tokens(question)
+        + count_tokens(f"Memories:\n{recent}")
+        + 2
+    )
+
+    context = await (
+        ContextAssembler(budget=budget)
+        .add("roles", roles, priority=2)
+        .add("memories", old + [recent], priority=1, keep="end", header="Memories:")
+        .add("input", question, section=PromptSection.INPUT, required=True)
+        .assemble()
+    )
+
+    text = context.layout.text()
+    assert roles in text and question in text and recent in text
+    assert "older memory" not in text
+    assert context.truncated == ["memories"]
+    assert context.total_tokens <= budget
+
+
+@pytest.mark.asyncio
+async def test_sections_are_summarized_when_a_summarizer_is_given():
+    summarized = []
+
+    async def summarizer(text, max_tokens):
+        summarized.append(max_tokens)
+        return "short summary"
+
+    context = await (
+        ContextAssembler(budget=20, summarizer=summarizer)
+        .add("memories", "long memory " * 50, summarize=True)
+        .add("input", "Question?", section=PromptSection.INPUT, required=True)
+        .assemble()
+    )
+
+    assert "short summary" in context.layout.text()
+    assert context.summarized == ["memories"]
+    assert summarized and summarized[0] <= 20
+
+
+def test_truncate_to_tokens_keeps_the_requested_end():
+    text = " ".join(f"word{i}" for i in range(100))
+
+    start = truncate_to_tokens(text, 10)
+    end = truncate_to_tokens(text, 10, keep="end")
+
+    assert count_tokens(start) <= 10 and text.startswith(start)
+    assert count_tokens(end) <= 10 and text.endswith(end)
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+@pytest.mark.asyncio
+async def test_llm_service_bounds_memories_and_reports_section_tokens():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    prompts = []
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        prompts.append(prompt)
+        return "ok"
+
+    adapter.get_completion = get_completion
+    service = LLMService(metrics=LLMMetrics(), max_prompt_tokens=40)
+    memories = [
+        {"type": "Memory", "content": f"memory number {i} " * 5} for i in range(20)
+    ]
+    with patch.object(service, "get_adapter", return_value=adapter):
+        await service.get_completion(
+            "Question?", model="gpt-4o-mini", recent_memories=memories
+        )
+
+    assert "memory number 19" in prompts[0]
+    assert "memory number 0 " not in prompts[0]
+    context = service.get_metrics()["context"]
+    assert context["memories"]["truncated"] == 1
+    assert context["prompt"]["tokens"] == count_tokens("Question?", "gpt-4o-mini")
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.services.llm.hedging import HedgePolicy
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.model_router import budget_owner
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+def _warm(policy, model, latency=0.01, samples=20):
+    for _ in range(samples):
+        policy.record_latency(model, latency)
+
+
+def test_hedge_delay_needs_enough_samples():
+    policy = HedgePolicy(min_samples=5, min_delay=0.0)
+    _warm(policy, "gpt-4o-mini", samples=4)
+    assert policy.hedge_delay("gpt-4o-mini") is None
+
+    policy.record_latency("gpt-4o-mini", 1.0)
+    assert policy.hedge_delay("gpt-4o-mini") == 1.0
+    assert HedgePolicy(min_samples=1, min_delay=0.5).hedge_delay("gpt-4o") is None
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    policy = HedgePolicy(max_extra_ratio=1.0, min_delay=0.0)
+    _warm(policy, "gpt-4o-mini")
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    result, won = await policy.run("gpt-4o-mini", slow, fast)
+    await asyncio.sleep(0)
+
+    assert (result, won) == ("fast", True)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged():
+    policy = HedgePolicy(max_extra_ratio=1.0, min_delay=0.0)
+    _warm(policy, "gpt-4o-mini", latency=0.5)
+    hedge_calls = 0
+
+    async def fast():
+        return "fast"
+
+    async def hedge():
+        nonlocal hedge_calls
+        hedge_calls += 1
+        return "hedge"
+
+    assert await policy.run("gpt-4o-mini", fast, hedge) == ("fast", None)
+    assert hedge_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_limited_per_owner():
+    policy = HedgePolicy(max_extra_ratio=0.0, min_delay=0.0)
+    policy.set_budget("Researcher", 0.5)
+    _warm(policy, "gpt-4o-mini")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    # Framers without a budget of their own use max_extra_ratio
+    with budget_owner("Support"):
+        assert await policy.run("gpt-4o-mini", slow, fast) == ("slow", None)
+
+    with budget_owner("Researcher"):
+        # One request allows no hedge at 50%, two allow one
+        assert await policy.run("gpt-4o-mini", slow, fast) == ("slow", None)
+        assert await policy.run("gpt-4o-mini", slow, fast) == ("fast", True)
+        assert await policy.run("gpt-4o-mini", slow, fast) == ("slow", None)
+
+
+@pytest.mark.asyncio
+async def test_llm_service_hedges_to_fallback_model():
+    adapters = {}
+    for model, delay in (("gpt-4o", 1.0), ("gpt-4o-mini", 0.0)):
+        adapter = MagicMock()
+        adapter.format_prompt.side_effect = lambda prompt: prompt
+
+        async def get_completion(
+            prompt,
+            config,
+            additional_context=None,
+            stream=False,
+            model=model,
+            delay=delay,
+        ):
+            await asyncio.sleep(delay)
+            return f"from {model}"
+
+        adapter.get_completion = get_completion
+        adapters[model] = adapter
+
+    policy = HedgePolicy(
+        max_extra_ratio=1.0, min_delay=0.0, fallbacks={"gpt-4o": "gpt-4o-mini"}
+    )
+    _warm(policy, "gpt-4o")
+    service = LLMService(metrics=LLMMetrics(), hedge_policy=policy)
+
+    with patch.object(service, "get_adapter", side_effect=adapters.__getitem__):
+        result = await service.get_completion("Test prompt", model="gpt-4o")
+
+    assert result == "from gpt-4o-mini"
+    assert service.get_metrics()["hedges"] == {"gpt-4o": {"fired": 1, "won": 1}}
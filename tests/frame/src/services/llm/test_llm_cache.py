@@ -0,0 +1,205 @@
+import os
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from frame.src.services.llm.llm_cache import CompletionCache
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def mock_adapter():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_completion = AsyncMock(return_value="cached completion")
+    return adapter
+
+
+@pytest.fixture
+def llm_service(mock_adapter):
+    service = LLMService(
+        metrics=LLMMetrics(), cache=CompletionCache(max_entries=8, ttl_seconds=60)
+    )
+    with patch.object(service, "get_adapter", return_value=mock_adapter):
+        yield service
+
+
+def test_make_key_varies_with_request_fields():
+    base = CompletionCache.make_key("gpt-4", "prompt", 0.0, 100, "LMQLAdapter")
+    assert base == CompletionCache.make_key("gpt-4", "prompt", 0.0, 100, "LMQLAdapter")
+    assert base != CompletionCache.make_key("gpt-4", "prompt", 0.0, 200, "LMQLAdapter")
+    assert base != CompletionCache.make_key("gpt-4", "other", 0.0, 100, "LMQLAdapter")
+    assert base != CompletionCache.make_key("gpt-4", "prompt", 0.0, 100, "DSPyAdapter")
+
+
+def test_make_key_varies_with_additional_context():
+    def key(context):
+        return CompletionCache.make_key(
+            "gpt-4", "prompt", 0.0, 100, "LMQLAdapter", context
+        )
+
+    assert (
+        key(None)
+        == key({})
+        == CompletionCache.make_key("gpt-4", "prompt", 0.0, 100, "LMQLAdapter")
+    )
+    assert key({"a": 1, "b": [2]}) == key({"b": [2], "a": 1})
+    assert key({"a": 1}) != key({"a": 2})
+    assert key({"a": 1}) != key(None)
+
+
+DECISION_KEY_SCRIPT = """
+from frame.src.framer.brain.action_registry import ActionRegistry
+from frame.src.services import ExecutionContext, LLMService
+from frame.src.services.llm.llm_cache import CompletionCache
+
+registry = ActionRegistry(ExecutionContext(llm_service=LLMService()))
+context = {"valid_actions": registry.get_all_actions()}
+print("key", CompletionCache.make_key("gpt-4", "prompt", 0.0, 100, "LMQLAdapter", context))
+"""
+
+
+def decision_key_in_new_process():
+    src = Path(__file__).resolve().parents[5] / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", DECISION_KEY_SCRIPT],
+        env={**os.environ, "PYTHONPATH": str(src)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # The process also logs its cleanup to stdout.
+    (key,) = [line for line in result.stdout.splitlines() if line.startswith("key ")]
+    return key
+
+
+def test_make_key_for_decision_context_is_stable_across_processes():
+    assert decision_key_in_new_process() == decision_key_in_new_process()
+
+
+def test_make_key_keys_callables_by_name_and_rejects_other_objects():
+    def key(context):
+        return CompletionCache.make_key(
+            "gpt-4", "prompt", 0.0, 100, "LMQLAdapter", context
+        )
+
+    class Action:
+        def execute(self):
+            pass
+
+    assert key({"f": Action().execute}) == key({"f": Action().execute})
+    assert key({"f": Action().execute}) != key({"f": test_memory_tier_lru_eviction})
+    with pytest.raises(TypeError):
+        key({"obj": object()})
+
+
+def test_memory_tier_lru_eviction():
+    cache = CompletionCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_ttl_expiry():
+    cache = CompletionCache(ttl_seconds=10)
+    with patch("frame.src.services.llm.llm_cache.time.time", return_value=1000.0):
+        cache.set("key", "value")
+    with patch("frame.src.services.llm.llm_cache.time.time", return_value=1005.0):
+        assert cache.get("key") == "value"
+    with patch("frame.src.services.llm.llm_cache.time.time", return_value=1011.0):
+        assert cache.get("key") is None
+
+
+def test_disk_tier_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / "completions.db")
+    writer = CompletionCache(db_path=db_path)
+    writer.set("key", "value")
+    reader = CompletionCache(db_path=db_path)
+    assert reader.get("key") == "value"
+    writer.close()
+    reader.close()
+
+
+def test_disk_tier_size_eviction(tmp_path):
+    cache = CompletionCache(db_path=str(tmp_path / "c.db"), max_disk_entries=5)
+    cache._EVICT_EVERY = 1
+    for i in range(10):
+        cache.set(f"key{i}", str(i))
+    count = cache._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+    assert count == 5
+    cache.close()
+
+
+def test_is_cacheable():
+    assert CompletionCache().is_cacheable(0.0)
+    assert not CompletionCache().is_cacheable(0.7)
+    assert CompletionCache(allow_sampled=True).is_cacheable(0.7)
+
+
+@pytest.mark.asyncio
+async def test_get_completion_serves_repeat_from_cache(llm_service, mock_adapter):
+    first = await llm_service.get_completion("Same prompt", temperature=0.0)
+    second = await llm_service.get_completion("Same prompt", temperature=0.0)
+
+    assert first == second == "cached completion"
+    mock_adapter.get_completion.assert_called_once()
+    metrics = llm_service.get_metrics()
+    assert metrics["cache_hits"] == 1
+    assert metrics["cache_misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_completion_skips_cache_for_unkeyable_context(
+    llm_service, mock_adapter
+):
+    for _ in range(2):
+        result = await llm_service.get_completion(
+            "Same prompt", temperature=0.0, additional_context={"obj": object()}
+        )
+
+    assert result == "cached completion"
+    assert mock_adapter.get_completion.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_completion_keys_cache_on_additional_context(
+    llm_service, mock_adapter
+):
+    await llm_service.get_completion(
+        "Same prompt", temperature=0.0, additional_context={"user": "a"}
+    )
+    await llm_service.get_completion(
+        "Same prompt", temperature=0.0, additional_context={"user": "b"}
+    )
+    await llm_service.get_completion(
+        "Same prompt", temperature=0.0, additional_context={"user": "a"}
+    )
+
+    assert mock_adapter.get_completion.call_count == 2
+    assert llm_service.get_metrics()["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_completion_bypasses_cache_when_sampling(llm_service, mock_adapter):
+    await llm_service.get_completion("Same prompt", temperature=0.7)
+    await llm_service.get_completion("Same prompt", temperature=0.7)
+
+    assert mock_adapter.get_completion.call_count == 2
+    assert llm_service.get_metrics()["cache_misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_completion_does_not_cache_errors(llm_service, mock_adapter):
+    mock_adapter.get_completion.side_effect = [RuntimeError("boom"), "recovered"]
+
+    first = await llm_service.get_completion("Prompt", temperature=0.0)
+    second = await llm_service.get_completion("Prompt", temperature=0.0)
+
+    assert "boom" in first
+    assert second == "recovered"
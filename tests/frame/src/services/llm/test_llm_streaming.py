@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def mock_adapter():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.pulled = 0
+
+    async def chunks():
+        for chunk in ["one ", "two ", "three"]:
+            adapter.pulled += 1
+            await asyncio.sleep(0)
+            yield chunk
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        return chunks() if stream else "one two three"
+
+    adapter.get_completion = get_completion
+    return adapter
+
+
+@pytest.fixture
+def llm_service(mock_adapter):
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=mock_adapter):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_chunks_as_they_arrive(llm_service):
+    stream = await llm_service.get_completion("Test prompt", stream=True)
+
+    assert hasattr(stream, "__aiter__")
+    assert "".join([chunk async for chunk in stream]) == "one two three"
+
+
+@pytest.mark.asyncio
+async def test_stream_is_pulled_by_the_consumer(llm_service, mock_adapter):
+    stream = await llm_service.get_completion("Test prompt", stream=True)
+
+    assert mock_adapter.pulled == 0
+    assert await stream.__anext__() == "one "
+    assert mock_adapter.pulled == 1
+    await stream.aclose()
+    assert mock_adapter.pulled == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_records_ttft_and_throughput(llm_service):
+    stream = await llm_service.get_completion(
+        "Test prompt", model="gpt-4o-mini", stream=True
+    )
+    async for _ in stream:
+        pass
+
+    metrics = llm_service.get_metrics()
+    streaming = metrics["streaming"]["gpt-4o-mini"]
+    assert streaming["calls"] == 1
+    assert streaming["avg_time_to_first_token"] >= 0
+    assert streaming["avg_tokens_per_second"] >= 0
+    assert metrics["models"]["gpt-4o-mini"]["calls"] == 1
+    assert metrics["models"]["gpt-4o-mini"]["completion_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_stream_wraps_adapters_that_return_text(llm_service, mock_adapter):
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        return "full text"
+
+    mock_adapter.get_completion = get_completion
+    stream = await llm_service.get_completion("Test prompt", stream=True)
+
+    assert [chunk async for chunk in stream] == ["full text"]
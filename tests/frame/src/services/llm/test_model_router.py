@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.model_router import ModelRouter, budget_owner
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def router():
+    return ModelRouter(
+        routes={"decision": ["gpt-4o-mini", "gpt-4o"], "summarize": ["gpt-4"]},
+        fallbacks={"gpt-4": ["gpt-4o"]},
+    )
+
+
+def test_routes_cheapest_model_first_with_fallbacks(router):
+    assert router.route("decision", 100, 100) == ["gpt-4o-mini", "gpt-4o"]
+
+
+def test_default_routes_use_the_configured_default_model():
+    assert ModelRouter(default_model="mistral-medium").route("decision", 100, 100) == [
+        "mistral-medium"
+    ]
+    assert ModelRouter().route("decision", 100, 100, requested_model="gpt-4") == [
+        "gpt-4"
+    ]
+
+
+def test_requested_model_is_last_resort_for_routed_call_sites(router):
+    assert router.route("decision", 100, 100, requested_model="gpt-4") == [
+        "gpt-4o-mini",
+        "gpt-4o",
+        "gpt-4",
+    ]
+
+
+def test_unrouted_call_sites_use_requested_model_and_its_fallbacks(router):
+    assert router.route(None, 100, 100, requested_model="gpt-4") == ["gpt-4", "gpt-4o"]
+
+
+def test_models_without_room_for_the_prompt_are_skipped(router):
+    assert router.route("summarize", 9000, 500) == ["gpt-4-32k"]
+    assert router.route(None, 9000, 500, requested_model="gpt-4") == ["gpt-4o"]
+
+
+def test_escalate_skips_the_cheapest_model(router):
+    assert router.route("decision", 100, 100, escalate=True) == ["gpt-4o"]
+    assert router.should_escalate(0.2)
+    assert not router.should_escalate(0.9)
+    assert not router.should_escalate(None)
+
+
+def test_failed_models_move_to_the_end_until_success(router):
+    router.record_failure("gpt-4o-mini")
+    assert router.route("decision", 100, 100) == ["gpt-4o", "gpt-4o-mini"]
+
+    router.record_success("gpt-4o-mini")
+    assert router.route("decision", 100, 100) == ["gpt-4o-mini", "gpt-4o"]
+
+
+def test_slow_models_move_behind_faster_ones(router):
+    router.latency_targets["decision"] = 1.0
+    for _ in range(20):
+        router.record_latency("gpt-4o-mini", 3.0)
+        router.record_latency("gpt-4o", 0.5)
+
+    assert router.get_latency("gpt-4o-mini") == 3.0
+    assert router.route("decision", 100, 100) == ["gpt-4o", "gpt-4o-mini"]
+
+
+def test_budget_drops_models_the_owner_cannot_afford(router):
+    router.set_budget("framer", 0.01)
+
+    with budget_owner("framer"):
+        # gpt-4o costs about 0.0125 for this call, gpt-4o-mini well under a cent.
+        assert router.route("decision", 1000, 1000) == ["gpt-4o-mini"]
+        router.record_cost(0.05)
+        assert router.remaining_budget() == pytest.approx(-0.04)
+        assert router.route("decision", 1000, 1000) == ["gpt-4o-mini"]
+
+    assert router.route("decision", 1000, 1000) == ["gpt-4o-mini", "gpt-4o"]
+
+
+@pytest.mark.asyncio
+async def test_llm_service_falls_back_when_a_model_fails(router):
+    service = LLMService(metrics=LLMMetrics(), router=router)
+    adapters = {}
+
+    def get_adapter(model):
+        adapter = MagicMock()
+        adapter.format_prompt.side_effect = lambda prompt: prompt
+
+        async def get_completion(prompt, config, additional_context=None, model=None):
+            if model == "gpt-4o-mini":
+                raise RuntimeError("provider down")
+            return f"{model} answer"
+
+        adapter.get_completion = get_completion
+        adapters[model] = adapter
+        return adapter
+
+    with patch.object(service, "get_adapter", side_effect=get_adapter):
+        result = await service.get_completion(
+            "Decide", call_site="decision", temperature=0
+        )
+
+    assert result == "gpt-4o answer"
+    assert router.route("decision", 10, 10)[-1] == "gpt-4o-mini"
+    assert router.get_latency("gpt-4o") is not None
@@ -0,0 +1,134 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+from frame.src.framer.brain.action_registry import ActionRegistry
+from frame.src.framer.brain.decision_prompt import DecisionPromptTemplate
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.services import ExecutionContext
+from frame.src.services.llm.llm_adapters.lmql.lmql_adapter import (
+    LMQLAdapter,
+    LMQLConfig,
+    _report_openai_usage,
+)
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.prompt_layout import PromptLayout, PromptSection
+from frame.src.utils.llm_utils import LLMMetrics
+from frame.src.utils.token_utils import pop_reported_usage, report_usage
+
+
+def test_sections_are_ordered_from_static_to_dynamic():
+    layout = (
+        PromptLayout()
+        .add(PromptSection.INPUT, "perception")
+        .add(PromptSection.MEMORIES, "memories")
+        .add(PromptSection.CONTEXT, "roles")
+        .add(PromptSection.ACTIONS, "actions")
+        .add(PromptSection.SYSTEM, "soul")
+        .add(PromptSection.SYSTEM, "instructions")
+        .add(PromptSection.MEMORIES, "")
+    )
+
+    assert layout.messages() == [
+        {"role": "system", "content": "soul\n\ninstructions\n\nactions"},
+        {"role": "user", "content": "roles\n\nmemories\n\nperception"},
+    ]
+    assert (
+        layout.text()
+        == "soul\n\ninstructions\n\nactions\n\nroles\n\nmemories\n\nperception"
+    )
+    assert PromptLayout().add(PromptSection.INPUT, "hi").messages() == [
+        {"role": "user", "content": "hi"}
+    ]
+    assert layout.section(PromptSection.SYSTEM) == "soul\n\ninstructions"
+    assert layout.section(PromptSection.ACTIONS) == "actions"
+
+
+def test_decision_prompts_share_their_system_message():
+    template = DecisionPromptTemplate(
+        ActionRegistry(execution_context=ExecutionContext(llm_service=Mock()))
+    )
+
+    first = template.layout(
+        Perception(type="hearing", data={"text": "Hello"}), "[]", "[]", soul="Be kind."
+    )
+    second = template.layout(
+        Perception(type="sight", data={"object": "cat"}), "[]", "[]", soul="Be kind."
+    )
+
+    assert first.system == second.system
+    assert first.system.startswith("Be kind.")
+    assert '"respond"' in first.system
+    assert "Hello" not in first.system
+    assert first.user.startswith("Current active roles:")
+    assert first.user.rstrip().endswith(str({"text": "Hello"}))
+
+
+@pytest.mark.asyncio
+async def test_service_sends_chat_messages_and_counts_cached_tokens():
+    adapter = MagicMock()
+    adapter.get_config.side_effect = lambda max_tokens, temperature: LMQLConfig(
+        model="gpt-4o-mini", max_tokens=max_tokens, temperature=temperature
+    )
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    sent = []
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        sent.append(config.messages)
+        report_usage(1200, 10, cached_tokens=1024)
+        return "ok"
+
+    adapter.get_completion = get_completion
+    service = LLMService(openai_api_key="test", metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=adapter):
+        result = await service.get_completion(
+            "What now?",
+            model="gpt-4o-mini",
+            system_prompt="You are a Framer.",
+            context="Current active roles: Helper",
+            recent_memories=[{"type": "Memory", "content": "It rained"}],
+        )
+
+    assert result == "ok"
+    system, user = sent[0]
+    assert system == {"role": "system", "content": "You are a Framer."}
+    assert user["role"] == "user"
+    assert user["content"].startswith("Current active roles: Helper")
+    assert user["content"].index("It rained") < user["content"].index("What now?")
+    metrics = service.get_metrics()
+    assert metrics["models"]["gpt-4o-mini"]["cached_prompt_tokens"] == 1024
+    assert metrics["total_cached_prompt_tokens"] == 1024
+
+
+def test_lmql_adapter_sends_messages_as_is():
+    messages = [
+        {"role": "system", "content": "static"},
+        {"role": "user", "content": "dynamic"},
+    ]
+    config = LMQLConfig(model="gpt-4o-mini", messages=messages)
+
+    request = LMQLAdapter._openai_request("ignored", config, "gpt-4o-mini")
+
+    assert request["messages"] == messages
+    assert LMQLAdapter._openai_request(
+        "prompt", LMQLConfig(model="gpt-4o-mini"), "gpt-4o-mini"
+    )["messages"] == [{"role": "user", "content": "prompt"}]
+
+
+def test_openai_cached_tokens_are_reported():
+    pop_reported_usage()
+    _report_openai_usage(
+        SimpleNamespace(
+            prompt_tokens=2000,
+            completion_tokens=50,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+        )
+    )
+
+    usage = pop_reported_usage()
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.cached_tokens) == (
+        2000,
+        50,
+        1536,
+    )
@@ -0,0 +1,207 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.rate_limiter import (
+    RateLimiter,
+    RateLimits,
+    estimate_request_tokens,
+    parse_duration,
+    provider_for_model,
+)
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+def test_provider_for_model():
+    assert provider_for_model("gpt-4o") == "openai"
+    assert provider_for_model("mistral-medium") == "mistral"
+    assert provider_for_model("something-else") == "default"
+    assert provider_for_model("claude-3-opus") == "anthropic"
+    assert provider_for_model("record/gpt-4o") == "openai"
+
+
+def test_estimate_request_tokens_includes_max_tokens():
+    assert estimate_request_tokens("abcdefgh", 100) == 102
+
+
+def test_parse_duration():
+    assert parse_duration("2") == 2.0
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_within_budget_does_not_wait():
+    limiter = RateLimiter(RateLimits(requests_per_minute=60, tokens_per_minute=1000))
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.acquire("openai", "gpt-4", tokens=100)
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_spreads_burst():
+    # Two requests of burst, then one every 50ms.
+    limiter = RateLimiter(RateLimits(requests_per_minute=1200, tokens_per_minute=1e9))
+    limiter._budget("openai", "gpt-4").requests = 2
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire("openai", "gpt-4")
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_tokens_per_minute_is_enforced():
+    limiter = RateLimiter(RateLimits(requests_per_minute=1e6, tokens_per_minute=6000))
+    await limiter.acquire("openai", "gpt-4", tokens=6000)
+    start = time.monotonic()
+    await limiter.acquire("openai", "gpt-4", tokens=10)
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_budgets_are_per_provider_and_model():
+    limiter = RateLimiter(RateLimits(requests_per_minute=1, tokens_per_minute=1e6))
+    await limiter.acquire("openai", "gpt-4")
+    await asyncio.wait_for(limiter.acquire("openai", "gpt-3.5-turbo"), timeout=0.1)
+    await asyncio.wait_for(limiter.acquire("mistral", "gpt-4"), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_admission_is_fifo_within_priority_and_priority_first():
+    limiter = RateLimiter(RateLimits(requests_per_minute=600, tokens_per_minute=1e9))
+    limiter._budget("openai", "gpt-4").requests = 0
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire("openai", "gpt-4", priority=priority)
+        order.append(name)
+
+    tasks = [
+        asyncio.create_task(request("low-1", 0)),
+        asyncio.create_task(request("low-2", 0)),
+        asyncio.create_task(request("high", 5)),
+    ]
+    await asyncio.gather(*tasks)
+    assert order == ["high", "low-1", "low-2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limiter = RateLimiter(RateLimits(requests_per_minute=1, tokens_per_minute=1e6))
+    await limiter.acquire("openai", "gpt-4")
+    waiter = asyncio.create_task(limiter.acquire("openai", "gpt-4"))
+    await asyncio.sleep(0.01)
+    assert limiter.queued("openai", "gpt-4") == 1
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queued("openai", "gpt-4") == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_pauses_and_reduces_budget():
+    limiter = RateLimiter(RateLimits(requests_per_minute=6000, tokens_per_minute=1e6))
+    limiter.record_rate_limited("openai", "gpt-4", headers={"retry-after-ms": "100"})
+
+    assert limiter.get_limits("openai", "gpt-4").requests_per_minute == 3000
+    start = time.monotonic()
+    await limiter.acquire("openai", "gpt-4")
+    assert time.monotonic() - start >= 0.09
+
+    for _ in range(40):
+        limiter.record_success("openai", "gpt-4")
+    assert limiter.get_limits("openai", "gpt-4").requests_per_minute == 6000
+
+
+def test_update_from_headers_adopts_provider_limits():
+    limiter = RateLimiter()
+    limiter.update_from_headers(
+        "openai",
+        "gpt-4",
+        {
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-limit-tokens": "30000",
+            "x-ratelimit-remaining-requests": "10",
+            "x-ratelimit-remaining-tokens": "2000",
+            "x-ratelimit-reset-requests": "1s",
+        },
+    )
+    limits = limiter.get_limits("openai", "gpt-4")
+    assert limits.requests_per_minute == 500
+    assert limits.tokens_per_minute == 30000
+    budget = limiter._budget("openai", "gpt-4")
+    assert budget.requests <= 10.1
+    assert budget.tokens <= 2100
+
+
+@pytest.mark.asyncio
+async def test_llm_service_acquires_before_calling_adapter():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_completion = AsyncMock(return_value="completion")
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock()
+    service = LLMService(metrics=LLMMetrics(), rate_limiter=limiter)
+
+    with patch.object(service, "get_adapter", return_value=adapter):
+        await service.get_completion("Hello", model="gpt-4", max_tokens=50, priority=3)
+
+    limiter.acquire.assert_awaited_once_with(
+        "openai", "gpt-4", estimate_request_tokens("Hello", 50), 3
+    )
+
+
+@pytest.mark.asyncio
+async def test_429_delays_the_next_acquire_for_the_model_sent():
+    import httpx
+    from openai import AsyncOpenAI, RateLimitError
+    from frame.src.services.llm.llm_adapters.lmql.lmql_adapter import LMQLAdapter
+    from frame.src.services.llm.retry_policy import RetryPolicy
+
+    client = AsyncMock(spec=AsyncOpenAI)
+    client.chat = AsyncMock()
+    client.chat.completions = AsyncMock()
+    client.chat.completions.create = AsyncMock(
+        side_effect=RateLimitError(
+            "Rate limited",
+            response=httpx.Response(
+                429,
+                headers={"retry-after-ms": "200"},
+                request=httpx.Request("POST", "https://api"),
+            ),
+            body=None,
+        )
+    )
+    service = LLMService(metrics=LLMMetrics(), retry_policy=RetryPolicy(max_attempts=1))
+    adapter = LMQLAdapter(openai_client=client, rate_limiter=service.rate_limiter)
+
+    with patch.object(service, "get_adapter", return_value=adapter):
+        await service.get_completion("Hello", model="gpt-4o")
+
+    start = time.monotonic()
+    await service.rate_limiter.acquire("openai", "gpt-4o-mini")
+    assert time.monotonic() - start < 0.1
+    await service.rate_limiter.acquire("openai", "gpt-4o")
+    assert time.monotonic() - start >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_record_mode_acquires_for_the_recorded_model():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_completion = AsyncMock(return_value="completion")
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock()
+    service = LLMService(metrics=LLMMetrics(), rate_limiter=limiter)
+
+    with patch.object(service, "get_adapter", return_value=adapter):
+        await service.get_completion("Hello", model="record/gpt-4", max_tokens=50)
+
+    limiter.acquire.assert_awaited_once_with(
+        "openai", "gpt-4", estimate_request_tokens("Hello", 50), 0
+    )
@@ -0,0 +1,205 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.framer.agency import Goal, Role
+from frame.src.framer.brain.mind.perception import Perception
+from frame.src.framer.config import FramerConfig
+from frame.src.framer.framer_factory import FramerFactory
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.request_coalescer import RequestCoalescer
+from frame.src.utils.llm_utils import LLMMetrics
+
+
+@pytest.fixture
+def release():
+    return asyncio.Event()
+
+
+@pytest.fixture
+def mock_adapter(release):
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.calls = 0
+
+    async def get_completion(prompt, config, additional_context=None, model=None):
+        adapter.calls += 1
+        await release.wait()
+        if "fail" in prompt:
+            raise RuntimeError("provider down")
+        return f"completion for {prompt}"
+
+    adapter.get_completion = get_completion
+    return adapter
+
+
+@pytest.fixture
+def llm_service(mock_adapter):
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=mock_adapter):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_request(
+    llm_service, mock_adapter, release
+):
+    tasks = [
+        asyncio.create_task(llm_service.get_completion("Hello", temperature=0.0))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == ["completion for Hello"] * 5
+    assert mock_adapter.calls == 1
+    assert llm_service.get_metrics()["coalesced"] == 4
+    assert llm_service.coalescer.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_prompts_are_not_coalesced(llm_service, mock_adapter, release):
+    release.set()
+    await asyncio.gather(
+        llm_service.get_completion("A", temperature=0.0),
+        llm_service.get_completion("B", temperature=0.0),
+    )
+    assert mock_adapter.calls == 2
+    assert llm_service.get_metrics()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_additional_context_is_not_coalesced(
+    llm_service, mock_adapter, release
+):
+    release.set()
+    await asyncio.gather(
+        llm_service.get_completion(
+            "Hello", temperature=0.0, additional_context={"user": "a"}
+        ),
+        llm_service.get_completion(
+            "Hello", temperature=0.0, additional_context={"user": "b"}
+        ),
+    )
+    assert mock_adapter.calls == 2
+    assert llm_service.get_metrics()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_framers_share_one_request_for_the_same_decision(mock_adapter, release):
+    service = LLMService(
+        metrics=LLMMetrics(), coalescer=RequestCoalescer(allow_sampled=True)
+    )
+    factory = FramerFactory(FramerConfig(name="Fleet Framer"), service)
+    framers = [
+        await factory.create_framer(
+            roles=[Role(id="1", name="Driver", description="Drive safely.")],
+            goals=[Goal(name="Arrive", description="Arrive without incident.")],
+        )
+        for _ in range(2)
+    ]
+    broadcast = Perception(type="hearing", data={"text": "Road closed ahead"})
+
+    with patch.object(service, "get_adapter", return_value=mock_adapter):
+        decisions = [
+            asyncio.create_task(framer.brain.make_decision(broadcast))
+            for framer in framers
+        ]
+        while not mock_adapter.calls:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*decisions)
+
+    assert mock_adapter.calls == 1
+    assert service.get_metrics()["coalesced"] == 1
+    for framer in framers:
+        await framer.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_does_not_cancel_leader(
+    llm_service, mock_adapter, release
+):
+    leader = asyncio.create_task(llm_service.get_completion("Hello", temperature=0.0))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(llm_service.get_completion("Hello", temperature=0.0))
+    await asyncio.sleep(0)
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+    release.set()
+    assert await leader == "completion for Hello"
+    assert mock_adapter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_follower(
+    llm_service, mock_adapter, release
+):
+    leader = asyncio.create_task(llm_service.get_completion("Hello", temperature=0.0))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(llm_service.get_completion("Hello", temperature=0.0))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    release.set()
+    assert await follower == "completion for Hello"
+    assert mock_adapter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_request_cancelled_when_all_waiters_cancel():
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def request():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    coalescer = RequestCoalescer()
+    waiter = asyncio.create_task(coalescer.run("key", request))
+    await started.wait()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+    assert coalescer.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_waiter(llm_service, mock_adapter, release):
+    tasks = [
+        asyncio.create_task(llm_service.get_completion("fail", temperature=0.0))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert all("provider down" in result for result in results)
+    assert mock_adapter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_are_not_coalesced_by_default(
+    llm_service, mock_adapter, release
+):
+    tasks = [
+        asyncio.create_task(llm_service.get_completion("Hello", temperature=0.7))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert mock_adapter.calls == 3
+    assert llm_service.get_metrics()["coalesced"] == 0
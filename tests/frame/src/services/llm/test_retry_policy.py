@@ -0,0 +1,208 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+from openai import (
+    APITimeoutError,
+    AuthenticationError,
+    InternalServerError,
+    RateLimitError,
+)
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.retry_policy import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    deadline,
+    is_retryable,
+    remaining_time,
+)
+from frame.src.utils.llm_utils import LLMMetrics
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(error_type, status, headers=None):
+    response = httpx.Response(status, request=_REQUEST, headers=headers)
+    return error_type("error", response=response, body=None)
+
+
+def test_errors_are_classified():
+    assert is_retryable(_status_error(RateLimitError, 429))
+    assert is_retryable(_status_error(InternalServerError, 503))
+    assert is_retryable(APITimeoutError(request=_REQUEST))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(_status_error(AuthenticationError, 401))
+    assert not is_retryable(ValueError("Unsupported model"))
+    assert not is_retryable(Exception("API Error"))
+    assert not is_retryable(CircuitOpenError("openai", 1.0))
+
+
+def test_backoff_uses_full_jitter_and_honors_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+
+    delays = [policy.backoff(10) for _ in range(50)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+    rate_limited = _status_error(RateLimitError, 429, headers={"retry-after": "6"})
+    assert policy.backoff(1, rate_limited) == 6.0
+
+
+@pytest.mark.asyncio
+async def test_retryable_errors_are_retried_until_success():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    errors = [_status_error(InternalServerError, 503), asyncio.TimeoutError()]
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert await policy.run("openai", call) == "ok"
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_fatal_errors_are_not_retried():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise _status_error(AuthenticationError, 401)
+
+    with pytest.raises(AuthenticationError):
+        await policy.run("openai", call)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_probes():
+    policy = RetryPolicy(max_attempts=1, failure_threshold=2, reset_timeout=0.05)
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise _status_error(InternalServerError, 503)
+
+    for _ in range(2):
+        with pytest.raises(InternalServerError):
+            await policy.run("openai", failing)
+    assert policy.breaker("openai").state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        await policy.run("openai", failing)
+    assert calls == 2
+
+    # Other providers have their own breaker
+    async def succeed():
+        return "ok"
+
+    assert await policy.run("huggingface", succeed) == "ok"
+
+    await asyncio.sleep(0.06)
+    assert policy.breaker("openai").state == CircuitBreaker.HALF_OPEN
+    assert await policy.run("openai", succeed) == "ok"
+    assert policy.breaker("openai").state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_lets_the_next_call_probe():
+    policy = RetryPolicy(max_attempts=1, failure_threshold=1, reset_timeout=0.01)
+
+    async def failing():
+        raise _status_error(InternalServerError, 503)
+
+    async def hanging():
+        await asyncio.sleep(10)
+
+    async def succeed():
+        return "ok"
+
+    with pytest.raises(InternalServerError):
+        await policy.run("openai", failing)
+    await asyncio.sleep(0.02)
+    probe = asyncio.ensure_future(policy.run("openai", hanging))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert await policy.run("openai", succeed) == "ok"
+    assert policy.breaker("openai").state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_attempts_and_retries():
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    start = time.monotonic()
+    with deadline(0.05):
+        with deadline(10):
+            assert remaining_time() <= 0.05
+        with pytest.raises(DeadlineExceeded):
+            await policy.run("openai", slow)
+    assert time.monotonic() - start < 0.5
+    assert remaining_time() is None
+    # The caller running out of time does not count against the provider
+    assert policy.breaker("openai").state == CircuitBreaker.CLOSED
+
+
+@pytest.fixture
+def failing_adapter():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.errors = []
+    adapter.calls = 0
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        adapter.calls += 1
+        if adapter.errors:
+            raise adapter.errors.pop(0)
+        return "completion"
+
+    adapter.get_completion = get_completion
+    return adapter
+
+
+@pytest.fixture
+def llm_service(failing_adapter):
+    service = LLMService(
+        metrics=LLMMetrics(), retry_policy=RetryPolicy(base_delay=0.001)
+    )
+    with patch.object(service, "get_adapter", return_value=failing_adapter):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_llm_service_retries_transient_errors(llm_service, failing_adapter):
+    failing_adapter.errors = [_status_error(RateLimitError, 429)]
+
+    result = await llm_service.get_completion("Test prompt", model="gpt-4o-mini")
+
+    assert result == "completion"
+    assert failing_adapter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_service_fails_fast_on_fatal_errors(llm_service, failing_adapter):
+    failing_adapter.errors = [_status_error(AuthenticationError, 401)]
+
+    result = await llm_service.get_completion("Test prompt", model="gpt-4o-mini")
+
+    assert "fallback_response" in json.loads(result)
+    assert failing_adapter.calls == 1
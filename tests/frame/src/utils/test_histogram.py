@@ -0,0 +1,35 @@
+import math
+import pytest
+from frame.src.utils.histogram import LatencyHistogram
+
+
+def test_quantiles_are_interpolated_within_buckets():
+    histogram = LatencyHistogram(bounds=(0.1, 1.0, 10.0))
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(10):
+        histogram.observe(5.0)
+
+    assert 0.05 <= histogram.quantile(0.5) <= 0.1
+    assert 1.0 <= histogram.quantile(0.95) <= 5.0
+    assert histogram.quantile(0.99) == pytest.approx(5.0)
+    assert histogram.buckets() == [(0.1, 90), (1.0, 90), (10.0, 100), (math.inf, 100)]
+    assert histogram.summary()["count"] == 100
+
+
+def test_empty_and_overflowing_histograms():
+    histogram = LatencyHistogram(bounds=(0.1, 1.0))
+    assert histogram.summary() == {
+        "count": 0,
+        "sum": 0.0,
+        "p50": None,
+        "p95": None,
+        "p99": None,
+    }
+
+    histogram.observe(30.0)
+    assert histogram.quantile(0.99) == 30.0
+    assert histogram.buckets()[-1] == (math.inf, 1)
+
+    with pytest.raises(ValueError):
+        LatencyHistogram(bounds=(1.0, 0.1))
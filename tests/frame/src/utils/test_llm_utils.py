@@ -71,3 +71,42 @@ def test_get_llm_provider_local_model():
 
 def test_get_llm_provider_default_to_openai():
     assert get_llm_provider("unknown-model", False) == "openai"
+
+
+def test_calculate_cost_splits_prompt_and_completion():
+    from frame.src.utils.llm_utils import calculate_cost
+
+    assert calculate_cost("gpt-4", 1000, 1000) == pytest.approx(0.03 + 0.06)
+    assert calculate_cost("gpt-4", 1000) == pytest.approx(0.03)
+
+
+def test_get_model_pricing_matches_dated_models():
+    from frame.src.utils.llm_utils import (
+        DEFAULT_PRICING,
+        MODEL_PRICING,
+        get_model_pricing,
+    )
+
+    assert get_model_pricing("gpt-4-0613") == MODEL_PRICING["gpt-4"]
+    assert get_model_pricing("gpt-4-32k-0613") == MODEL_PRICING["gpt-4-32k"]
+    assert get_model_pricing("unknown-model") == DEFAULT_PRICING
+
+
+def test_llm_metrics_tracks_token_split():
+    from frame.src.utils.llm_utils import LLMMetrics
+
+    metrics = LLMMetrics()
+    metrics.track_usage("gpt-4", 100, 50)
+    result = metrics.get_metrics()
+    assert result["models"]["gpt-4"]["prompt_tokens"] == 100
+    assert result["models"]["gpt-4"]["completion_tokens"] == 50
+    assert result["total_prompt_tokens"] == 100
+    assert result["total_completion_tokens"] == 50
+
+
+def test_get_context_window_matches_dated_models():
+    from frame.src.utils.llm_utils import get_context_window
+
+    assert get_context_window("gpt-4") == 8192
+    assert get_context_window("gpt-4o-2024-08-06") == 128000
+    assert get_context_window("unknown-model") is None
@@ -0,0 +1,115 @@
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.utils.llm_utils import LLMMetrics
+from frame.src.utils.metrics import (
+    FramerMetrics,
+    MetricsManager,
+    MetricsStore,
+    metrics_scope,
+)
+
+
+def test_threads_record_into_their_own_shards():
+    store = MetricsStore()
+
+    def record():
+        for _ in range(1000):
+            store.add("calls", 1, "gpt-4o")
+            store.observe("latency", 0.01, "gpt-4o")
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.counters(name="calls") == {("calls", "gpt-4o", None, None, None): 8000}
+    assert (
+        store.histograms(name="latency")[("latency", "gpt-4o", None, None, None)].count
+        == 8000
+    )
+    assert len(store._shards) == 8
+
+
+def test_metrics_are_scoped_by_frame_framer_and_model():
+    metrics = LLMMetrics()
+    support, research = metrics.scoped("support"), metrics.scoped("research")
+
+    with metrics_scope("Triage"):
+        support.track_usage("gpt-4o-mini", 100, 10)
+        support.track_usage("gpt-4o", 100, 10)
+    with metrics_scope("Writer"):
+        support.track_usage("gpt-4o-mini", 100, 10)
+    research.track_usage("gpt-4o-mini", 100, 10)
+
+    assert metrics.get_total_calls() == 4
+    assert support.get_total_calls() == 3
+    assert support.get_metrics(framer="Triage")["total_calls"] == 2
+    assert support.get_metrics(model="gpt-4o")["total_calls"] == 1
+    assert set(support.get_metrics()["framers"]) == {"Triage", "Writer"}
+    assert research.get_metrics()["framers"] == {}
+
+    support.reset()
+    assert support.get_total_calls() == 0
+    assert research.get_total_calls() == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_service_counts_each_call_once_per_framer():
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        return "completion"
+
+    adapter.get_completion = get_completion
+    service = LLMService(metrics=LLMMetrics().scoped("frame"))
+
+    with patch.object(service, "get_adapter", return_value=adapter):
+        with metrics_scope("Triage"):
+            await service.get_completion("Test prompt", model="gpt-4o-mini")
+        await service.get_completion("Other prompt", model="gpt-4o-mini")
+
+    assert service.get_total_calls() == 2
+    assert service.get_metrics(framer="Triage")["total_calls"] == 1
+    assert service.get_metrics()["latency"]["gpt-4o-mini"]["default"]["count"] == 2
+
+
+def test_framer_metrics_share_the_llm_store_but_not_its_report():
+    llm = LLMMetrics().scoped("support")
+    framer = FramerMetrics.alongside(llm)
+
+    with metrics_scope("Triage"):
+        framer.record_mailbox(depth=2, dropped=1)
+        framer.record_mailbox(depth=-1, wait=0.01)
+        framer.record_rule("obstacle", 0.001)
+        llm.track_usage("gpt-4o-mini", 100, 10)
+
+    assert framer.store is llm.store and framer.frame == "support"
+    metrics = framer.get_metrics()
+    assert metrics["mailbox"]["depth"] == {"Triage": 1}
+    assert metrics["mailbox"]["dropped"] == {"Triage": 1}
+    assert metrics["rules"]["hits"] == {"obstacle": 1}
+    assert "mailbox" not in llm.get_metrics()
+    assert FramerMetrics.alongside(None).store is not llm.store
+
+    framer.reset()
+    assert framer.get_metrics()["mailbox"]["depth"] == {}
+    assert llm.get_total_calls() == 1
+
+
+def test_metrics_manager_update_metric_shim():
+    store = MetricsStore()
+    MetricsManager()._store, previous = store, MetricsManager()._store
+    try:
+        MetricsManager.update_metric("calls", 2, "gpt-4o")
+        MetricsManager.update_metric("status", "ok")
+        assert MetricsManager().get_metrics()["models"] == {
+            "gpt-4o": {"calls": 2, "cost": 0.0}
+        }
+    finally:
+        MetricsManager()._store = previous
@@ -0,0 +1,116 @@
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+from openai import InternalServerError
+from frame.src.services.llm.llm_service import LLMService
+from frame.src.services.llm.retry_policy import RetryPolicy
+from frame.src.utils.llm_utils import LLMMetrics
+from frame.src.utils.openmetrics import MetricsServer, render_openmetrics
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+@pytest.fixture
+def metrics():
+    return LLMMetrics()
+
+
+@pytest.fixture
+def adapter(metrics):
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.errors = []
+    adapter.in_flight = []
+
+    async def get_completion(
+        prompt, config, additional_context=None, model=None, stream=False
+    ):
+        adapter.in_flight.append(dict(metrics.get_metrics()["in_flight"]))
+        if adapter.errors:
+            raise adapter.errors.pop(0)
+        return "completion"
+
+    adapter.get_completion = get_completion
+    return adapter
+
+
+@pytest.fixture
+def llm_service(adapter, metrics):
+    service = LLMService(metrics=metrics, retry_policy=RetryPolicy(base_delay=0.001))
+    with patch.object(service, "get_adapter", return_value=adapter):
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_llm_service_records_latency_retries_and_in_flight(llm_service, adapter):
+    response = httpx.Response(503, request=_REQUEST)
+    adapter.errors = [InternalServerError("error", response=response, body=None)]
+
+    await llm_service.get_completion(
+        "Test prompt", model="gpt-4o-mini", call_site="decision"
+    )
+    await llm_service.get_completion("Other prompt", model="gpt-4o-mini")
+
+    metrics = llm_service.get_metrics()
+    assert metrics["latency"]["gpt-4o-mini"]["decision"]["count"] == 1
+    assert metrics["latency"]["gpt-4o-mini"]["default"]["p99"] is not None
+    assert metrics["retries"] == {"gpt-4o-mini": 1}
+    assert adapter.in_flight[0] == {"gpt-4o-mini": 1}
+    assert metrics["in_flight"] == {"gpt-4o-mini": 0}
+
+
+@pytest.mark.asyncio
+async def test_llm_service_records_errors(llm_service, adapter):
+    adapter.errors = [ValueError("Unsupported model")]
+
+    await llm_service.get_completion("Test prompt", model="gpt-4o-mini")
+
+    assert llm_service.get_metrics()["errors"] == {"gpt-4o-mini": {"ValueError": 1}}
+
+
+def test_render_openmetrics():
+    metrics = LLMMetrics()
+    metrics.track_usage("gpt-4o", 100, 20)
+    metrics.record_latency("gpt-4o", "decision", 0.3)
+    metrics.record_stream("gpt-4o", 0.2, 50.0)
+    metrics.record_error("gpt-4o", ValueError())
+    metrics.record_retry("gpt-4o")
+
+    text = render_openmetrics(metrics)
+
+    assert text.endswith("# EOF\n")
+    assert "# TYPE frame_llm_request_duration_seconds histogram" in text
+    assert (
+        'frame_llm_request_duration_seconds_bucket{model="gpt-4o",call_site="decision",le="0.25"} 0'
+        in text
+    )
+    assert (
+        'frame_llm_request_duration_seconds_bucket{model="gpt-4o",call_site="decision",le="0.5"} 1'
+        in text
+    )
+    assert (
+        'frame_llm_request_duration_seconds_bucket{model="gpt-4o",call_site="decision",le="+Inf"} 1'
+        in text
+    )
+    assert 'frame_llm_time_to_first_token_seconds_count{model="gpt-4o"} 1' in text
+    assert 'frame_llm_tokens_total{model="gpt-4o",direction="completion"} 20' in text
+    assert 'frame_llm_errors_total{model="gpt-4o",error="ValueError"} 1' in text
+    assert 'frame_llm_retries_total{model="gpt-4o"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_server_serves_openmetrics():
+    metrics = LLMMetrics()
+    metrics.record_latency("gpt-4o", None, 0.1)
+
+    async with MetricsServer(metrics, port=0) as server:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{server.port}"
+        ) as client:
+            response = await client.get("/metrics")
+            missing = await client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+    assert 'call_site="default"' in response.text
+    assert missing.status_code == 404
@@ -0,0 +1,125 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from frame.src.utils import token_utils
+from frame.src.utils.token_utils import (
+    TokenUsage,
+    approximate_token_count,
+    count_tokens,
+    count_tokens_batch,
+    get_encoder,
+    pop_reported_usage,
+    report_usage,
+)
+
+
+class FakeEncoder:
+    """Encodes one token per character so counts are easy to check."""
+
+    def __init__(self):
+        self.batch_calls = 0
+
+    def encode_ordinary(self, text):
+        return list(text)
+
+    def encode_ordinary_batch(self, texts):
+        self.batch_calls += 1
+        return [list(text) for text in texts]
+
+
+@pytest.fixture
+def fake_encoder():
+    encoder = FakeEncoder()
+    with patch.object(token_utils, "get_encoder", return_value=encoder):
+        yield encoder
+
+
+@pytest.fixture(autouse=True)
+def clear_encoder_cache():
+    get_encoder.cache_clear()
+    yield
+    get_encoder.cache_clear()
+
+
+def test_count_tokens_uses_encoder(fake_encoder):
+    assert count_tokens("hello", "gpt-4") == 5
+    assert count_tokens("", "gpt-4") == 0
+
+
+def test_count_tokens_batches_large_text(fake_encoder):
+    text = "line of text\n" * 10_000
+    assert len(text) > token_utils.BATCH_THRESHOLD_CHARS
+    assert count_tokens(text, "gpt-4") == len(text)
+    assert fake_encoder.batch_calls == 1
+
+
+def test_count_tokens_batch(fake_encoder):
+    assert count_tokens_batch(["a", "bb", ""], "gpt-4") == [1, 2, 0]
+
+
+def test_unknown_model_falls_back_to_approximation():
+    with patch.object(token_utils.tiktoken, "encoding_for_model", side_effect=KeyError):
+        assert get_encoder("mistral-medium") is None
+        assert count_tokens("a" * 40, "mistral-medium") == 10
+        assert count_tokens_batch(["a" * 8], "mistral-medium") == [2]
+
+
+def test_encoder_load_failure_falls_back_and_is_cached():
+    with patch.object(
+        token_utils.tiktoken, "encoding_for_model", side_effect=OSError("offline")
+    ) as encoding_for_model:
+        assert count_tokens("a" * 40, "gpt-4") == 10
+        assert count_tokens("a" * 40, "gpt-4") == 10
+    encoding_for_model.assert_called_once()
+
+
+def test_approximate_token_count_never_below_word_count():
+    assert approximate_token_count("a b c d e f") == 6
+    assert approximate_token_count("") == 0
+
+
+def test_reported_usage_roundtrip():
+    assert pop_reported_usage() is None
+    report_usage(12, 3)
+    usage = pop_reported_usage()
+    assert usage == TokenUsage(12, 3)
+    assert usage.total_tokens == 15
+    assert pop_reported_usage() is None
+
+
+@pytest.mark.asyncio
+async def test_llm_service_prefers_provider_reported_usage():
+    from frame.src.services.llm.llm_service import LLMService
+    from frame.src.utils.llm_utils import LLMMetrics
+
+    async def get_completion(prompt, config, additional_context=None, model=None):
+        report_usage(100, 20)
+        return "completion"
+
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_completion = get_completion
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=adapter):
+        await service.get_completion("Hello", model="gpt-4", temperature=0.0)
+
+    metrics = service.get_metrics()
+    assert metrics["models"]["gpt-4"]["prompt_tokens"] == 100
+    assert metrics["models"]["gpt-4"]["completion_tokens"] == 20
+    assert metrics["total_cost"] == pytest.approx(0.1 * 0.03 + 0.02 * 0.06)
+
+
+@pytest.mark.asyncio
+async def test_llm_service_counts_tokens_without_reported_usage(fake_encoder):
+    from frame.src.services.llm.llm_service import LLMService
+    from frame.src.utils.llm_utils import LLMMetrics
+
+    adapter = MagicMock()
+    adapter.format_prompt.side_effect = lambda prompt: prompt
+    adapter.get_completion = AsyncMock(return_value="abc")
+    service = LLMService(metrics=LLMMetrics())
+    with patch.object(service, "get_adapter", return_value=adapter):
+        await service.get_completion("Hello", model="gpt-4", temperature=0.0)
+
+    metrics = service.get_metrics()
+    assert metrics["total_prompt_tokens"] == 5
+    assert metrics["total_completion_tokens"] == 3